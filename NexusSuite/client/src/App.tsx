@@ -36,6 +36,7 @@ import { DashboardLayout } from '@/components/DashboardLayout';
 
 // Services
 import { queryClient } from '@/lib/queryClient';
+import { ReadySignal } from '@/lib/ready';
 
 // Create a single query client instance
 const queryClientInstance = queryClient;
@@ -326,6 +327,9 @@ function App() {
 
           {/* Global toast notifications */}
           <Toaster />
+
+          {/* Resolves window.__NEXUS_READY__ for UI tests */}
+          <ReadySignal />
         </OrganizationProvider>
       </AuthProvider>
     </QueryClientProvider>
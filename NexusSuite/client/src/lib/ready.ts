@@ -0,0 +1,77 @@
+/**
+ * App-ready signal for automated UI tests.
+ *
+ * `window.__NEXUS_READY__` is created before the first render and resolves
+ * once the session check has answered, the organization context has
+ * loaded, the first route's queries have settled and the result has been
+ * painted. Test harnesses wait on this one promise instead of guessing with
+ * load-state timeouts.
+ */
+
+import { useEffect } from 'react';
+import { useIsFetching, useIsMutating } from '@tanstack/react-query';
+import { useAuth } from '@/contexts/AuthContext';
+import { useOrganization } from '@/contexts/OrganizationContext';
+
+export interface AppReady {
+  route: string;
+  ms: number; // since navigation start
+}
+
+export interface ReadyTarget {
+  __NEXUS_READY__?: Promise<AppReady>;
+  __NEXUS_READY_STATE__?: AppReady | null;
+}
+
+declare global {
+  interface Window extends ReadyTarget {}
+}
+
+/**
+ * Create the promise on `target` and return the function that resolves it.
+ * Only the first call counts; later route changes keep the first state.
+ */
+export function installReadySignal(target: ReadyTarget, now: () => number) {
+  let resolve!: (state: AppReady) => void;
+  target.__NEXUS_READY__ = new Promise<AppReady>(r => {
+    resolve = r;
+  });
+  target.__NEXUS_READY_STATE__ = null;
+  return (route: string) => {
+    if (target.__NEXUS_READY_STATE__) return;
+    const state = { route, ms: Math.round(now()) };
+    target.__NEXUS_READY_STATE__ = state;
+    resolve(state);
+  };
+}
+
+let markReady: (route: string) => void = () => {};
+
+export function initReadySignal() {
+  markReady = installReadySignal(window, () => performance.now());
+}
+
+/**
+ * Renders nothing; marks the app ready once auth and organization state are
+ * known and no query or mutation is in flight. Must sit inside the Auth and
+ * Organization providers.
+ */
+export function ReadySignal() {
+  const { isLoading: authLoading } = useAuth();
+  const { isLoading: orgLoading } = useOrganization();
+  const fetching = useIsFetching();
+  const mutating = useIsMutating();
+  const busy = authLoading || orgLoading || fetching > 0 || mutating > 0;
+
+  useEffect(() => {
+    if (busy) return;
+    // Two frames: queries the route mounts start in effects, which flip
+    // `busy` and cancel the pending mark before it fires.
+    let frame = requestAnimationFrame(() => {
+      frame = requestAnimationFrame(() => markReady(window.location.pathname));
+    });
+    return () => cancelAnimationFrame(frame);
+  }, [busy]);
+
+  return null;
+}
@@ -1,9 +1,12 @@
 import { createRoot } from 'react-dom/client';
 import App from './App';
+import { initReadySignal } from './lib/ready';
 
 // 👇 import your theme first
 import './themes/theme.css';
 // 👇 then import your main Tailwind index.css
 import './index.css';
 
+// Before the first render, so a test can await it from page load on.
+initReadySignal();
 createRoot(document.getElementById('root')!).render(<App />);
@@ -0,0 +1,29 @@
+import { describe, it, expect } from "vitest";
+import { installReadySignal, type ReadyTarget } from "@/lib/ready";
+
+describe("installReadySignal", () => {
+  it("exposes a pending promise and no state before the app is ready", () => {
+    const target: ReadyTarget = {};
+    installReadySignal(target, () => 0);
+    expect(target.__NEXUS_READY__).toBeInstanceOf(Promise);
+    expect(target.__NEXUS_READY_STATE__).toBeNull();
+  });
+
+  it("resolves with the route and time of the first mark", async () => {
+    const target: ReadyTarget = {};
+    const mark = installReadySignal(target, () => 1234.6);
+    mark("/dashboard");
+    await expect(target.__NEXUS_READY__).resolves.toEqual({ route: "/dashboard", ms: 1235 });
+    expect(target.__NEXUS_READY_STATE__).toEqual({ route: "/dashboard", ms: 1235 });
+  });
+
+  it("keeps the first state when marked again", async () => {
+    const target: ReadyTarget = {};
+    let t = 10;
+    const mark = installReadySignal(target, () => t);
+    mark("/login");
+    t = 99;
+    mark("/dashboard");
+    await expect(target.__NEXUS_READY__).resolves.toEqual({ route: "/login", ms: 10 });
+  });
+});
@@ -0,0 +1,304 @@
+/**
+ * server/db/memory.ts
+ * In-memory stand-in for the Supabase client, enabled with NEXUS_STORAGE=memory.
+ *
+ * Every repo, the BetterAuth adapter and useStorage reach the database through
+ * getSupabase(), so answering the PostgREST query-builder calls they make
+ * (select/insert/upsert/update/delete with eq, contains, order, limit, range,
+ * maybeSingle, count) from process memory gives a complete backend with no
+ * external service. Used by the UI test harness, which starts one server per
+ * worker with its own store.
+ *
+ * NEXUS_SEED points at a JSON file of { table: rows[] } loaded at startup.
+ * A seeded user may carry a plain `password`; it becomes a credential row in
+ * `accounts` with a bcrypt hash, and a member without `permissions` gets its
+ * role's defaults -- as registration and invites would have written them.
+ * The seeded state is kept as the "seed" snapshot.
+ */
+
+import fs from "fs";
+import { randomUUID } from "crypto";
+import { AsyncLocalStorage } from "async_hooks";
+import bcrypt from "bcryptjs";
+import { ROLE_PERMISSIONS, type OrgRole } from "../org/types";
+
+type Row = Record<string, any>;
+type Filter = (row: Row) => boolean;
+
+// Conflict targets for upsert; everything else is keyed by id.
+const KEYS: Record<string, string[]> = {
+  sessions: ["token"],
+  accounts: ["account_id", "provider_id"],
+};
+
+const clone = <T>(value: T): T => (value === undefined ? value : JSON.parse(JSON.stringify(value)));
+
+function contains(haystack: any, needle: any): boolean {
+  if (needle === null || typeof needle !== "object") return haystack === needle;
+  if (Array.isArray(needle)) {
+    return Array.isArray(haystack) && needle.every((n) => haystack.some((h) => contains(h, n)));
+  }
+  if (!haystack || typeof haystack !== "object") return false;
+  return Object.entries(needle).every(([k, v]) => contains(haystack[k], v));
+}
+
+function compare(a: any, b: any): number {
+  if (a === b) return 0;
+  if (a === null || a === undefined) return 1;  // nulls last, as Postgres does ascending
+  if (b === null || b === undefined) return -1;
+  return a < b ? -1 : 1;
+}
+
+export type Snapshot = ReadonlyMap<string, readonly Row[]>;
+
+export class MemoryStore {
+  tables = new Map<string, Row[]>();
+
+  // Copy-on-write: a store restored from a snapshot reads the snapshot's
+  // rows until it first writes to a table, and only then copies that table.
+  constructor(private base: Snapshot = new Map()) {}
+
+  rows(name: string): readonly Row[] {
+    return this.tables.get(name) || this.base.get(name) || [];
+  }
+
+  table(name: string): Row[] {
+    let rows = this.tables.get(name);
+    if (!rows) this.tables.set(name, (rows = clone([...(this.base.get(name) || [])])));
+    return rows;
+  }
+
+  keyOf(table: string): string[] {
+    return KEYS[table] || ["id"];
+  }
+
+  prepare(table: string, row: Row): Row {
+    const out = clone(row);
+    const stamp = new Date().toISOString();
+    if (!KEYS[table] && out.id === undefined) out.id = `${table}_${randomUUID()}`;
+    if (table === "accounts" && out.id === undefined) out.id = randomUUID();
+    if (out.created_at === undefined) out.created_at = stamp;
+    return out;
+  }
+
+  snapshot(): Snapshot {
+    const names = new Set([...this.base.keys(), ...this.tables.keys()]);
+    return new Map([...names].map((name) => [name, Object.freeze(clone([...this.rows(name)]))]));
+  }
+
+  seed(tables: Record<string, Row[]>): void {
+    for (const [name, rows] of Object.entries(tables)) {
+      for (const raw of rows) {
+        const { password, ...row } = raw;
+        if (name === "org_members" && row.permissions === undefined) {
+          row.permissions = ROLE_PERMISSIONS[row.role as OrgRole] || [];
+        }
+        this.table(name).push(this.prepare(name, row));
+        if (name === "users" && password) {
+          this.table("accounts").push(this.prepare("accounts", {
+            user_id: row.id,
+            provider_id: "credential",
+            account_id: row.email,
+            // Low cost: compare() reads it from the hash, and logins stay fast.
+            password_hash: bcrypt.hashSync(String(password), 4),
+          }));
+        }
+      }
+    }
+  }
+
+  from(table: string): QueryBuilder {
+    return new QueryBuilder(this, table);
+  }
+}
+
+class QueryBuilder implements PromiseLike<any> {
+  private action: "select" | "insert" | "upsert" | "update" | "delete" = "select";
+  private payload: Row[] = [];
+  private patch: Row = {};
+  private filters: Filter[] = [];
+  private sort: { column: string; ascending: boolean }[] = [];
+  private window: { from: number; to?: number } | null = null;
+  private returning = false;
+  private columns = "*";
+  private countMode = false;
+  private head = false;
+  private expect: "one" | "maybe" | null = null;
+
+  constructor(private store: MemoryStore, private name: string) {}
+
+  select(columns = "*", options: { count?: string; head?: boolean } = {}) {
+    this.columns = columns;
+    this.countMode = Boolean(options.count);
+    this.head = Boolean(options.head);
+    if (this.action !== "select") this.returning = true;
+    return this;
+  }
+
+  insert(values: Row | Row[]) { this.action = "insert"; this.payload = [values].flat(); return this; }
+  upsert(values: Row | Row[]) { this.action = "upsert"; this.payload = [values].flat(); return this; }
+  update(values: Row) { this.action = "update"; this.patch = values; return this; }
+  delete() { this.action = "delete"; return this; }
+
+  eq(column: string, value: any) { this.filters.push((r) => r[column] === value); return this; }
+  neq(column: string, value: any) { this.filters.push((r) => r[column] !== value); return this; }
+  gt(column: string, value: any) { this.filters.push((r) => r[column] != null && r[column] > value); return this; }
+  gte(column: string, value: any) { this.filters.push((r) => r[column] != null && r[column] >= value); return this; }
+  lt(column: string, value: any) { this.filters.push((r) => r[column] != null && r[column] < value); return this; }
+  lte(column: string, value: any) { this.filters.push((r) => r[column] != null && r[column] <= value); return this; }
+  is(column: string, value: any) { this.filters.push((r) => (r[column] ?? null) === value); return this; }
+  in(column: string, values: any[]) { this.filters.push((r) => values.includes(r[column])); return this; }
+  contains(column: string, value: any) { this.filters.push((r) => contains(r[column], value)); return this; }
+  match(query: Row) { this.filters.push((r) => Object.entries(query).every(([k, v]) => r[k] === v)); return this; }
+
+  order(column: string, options: { ascending?: boolean } = {}) {
+    this.sort.push({ column, ascending: options.ascending !== false });
+    return this;
+  }
+
+  limit(n: number) { this.window = { from: this.window?.from || 0, to: (this.window?.from || 0) + n - 1 }; return this; }
+  range(from: number, to: number) { this.window = { from, to }; return this; }
+
+  maybeSingle() { this.expect = "maybe"; return this; }
+  single() { this.expect = "one"; return this; }
+
+  then<A = any, B = never>(onfulfilled?: ((value: any) => A | PromiseLike<A>) | null, onrejected?: ((reason: any) => B | PromiseLike<B>) | null): PromiseLike<A | B> {
+    return Promise.resolve().then(() => this.execute()).then(onfulfilled, onrejected);
+  }
+
+  private matching(rows: readonly Row[]): Row[] {
+    return rows.filter((row) => this.filters.every((f) => f(row)));
+  }
+
+  private mutate(): Row[] {
+    const rows = this.store.table(this.name);
+    if (this.action === "insert" || this.action === "upsert") {
+      const key = this.store.keyOf(this.name);
+      return this.payload.map((values) => {
+        const row = this.store.prepare(this.name, values);
+        const existing = this.action === "upsert"
+          ? rows.find((r) => key.every((k) => r[k] === row[k]))
+          : undefined;
+        if (existing) {
+          Object.assign(existing, clone(values), { updated_at: new Date().toISOString() });
+          return existing;
+        }
+        if (rows.some((r) => key.every((k) => r[k] === row[k]))) {
+          throw { code: "23505", message: `duplicate key value violates unique constraint on ${this.name}` };
+        }
+        rows.push(row);
+        return row;
+      });
+    }
+    const hit = this.matching(rows);
+    if (this.action === "update") {
+      for (const row of hit) Object.assign(row, clone(this.patch));
+    } else if (this.action === "delete") {
+      this.store.tables.set(this.name, rows.filter((r) => !hit.includes(r)));
+    }
+    return hit;
+  }
+
+  private project(row: Row): Row {
+    const out: Row = { ...row };
+    // Embedded resources: "*, users:users(id,email,name)" joins on <singular>_id.
+    for (const m of this.columns.matchAll(/(\w+):(\w+)\(([^)]*)\)/g)) {
+      const [, alias, table, cols] = m;
+      const fk = `${table.replace(/s$/, "")}_id`;
+      const target = this.store.rows(table).find((r) => r.id === row[fk]);
+      out[alias] = target
+        ? Object.fromEntries(cols.split(",").map((c) => c.trim()).map((c) => [c, target[c]]))
+        : null;
+    }
+    const plain = this.columns.replace(/\w+:\w+\([^)]*\)/g, "").split(",").map((c) => c.trim()).filter(Boolean);
+    if (plain.length && !plain.includes("*")) {
+      return Object.fromEntries(plain.map((c) => [c, out[c]]));
+    }
+    return out;
+  }
+
+  private execute(): { data: any; error: any; count: number | null } {
+    let rows: Row[];
+    try {
+      rows = this.action === "select" ? this.matching(this.store.rows(this.name)) : this.mutate();
+    } catch (error) {
+      return { data: null, error, count: null };
+    }
+    for (const { column, ascending } of [...this.sort].reverse()) {
+      rows = [...rows].sort((a, b) => (ascending ? 1 : -1) * compare(a[column], b[column]));
+    }
+    const count = this.countMode ? rows.length : null;
+    if (this.window) rows = rows.slice(this.window.from, this.window.to === undefined ? undefined : this.window.to + 1);
+    if (this.head || (this.action !== "select" && !this.returning)) return { data: null, error: null, count };
+    const data = rows.map((r) => clone(this.project(r)));
+    if (this.expect) {
+      if (data.length > 1 || (this.expect === "one" && !data.length)) {
+        return { data: null, error: { code: "PGRST116", message: `expected one row, got ${data.length}` }, count };
+      }
+      return { data: data[0] ?? null, error: null, count };
+    }
+    return { data, error: null, count };
+  }
+}
+
+export function isMemoryStorage(): boolean {
+  return String(process.env.NEXUS_STORAGE || "").toLowerCase() === "memory";
+}
+
+/**
+ * What getSupabase() returns in memory mode: the seeded root store, named
+ * snapshots of it, and per-test stores restored from those snapshots. A
+ * request carrying `x-nexus-store: <id>` is served from that test's store
+ * (see routes/testing.ts), so concurrent tests on one server stay isolated.
+ */
+export class MemoryRegistry {
+  snapshots = new Map<string, Snapshot>();
+  stores = new Map<string, MemoryStore>();
+  private scope = new AsyncLocalStorage<MemoryStore>();
+
+  constructor(public root: MemoryStore) {}
+
+  current(): MemoryStore {
+    return this.scope.getStore() || this.root;
+  }
+
+  run<T>(storeId: string | undefined, fn: () => T): T {
+    const store = storeId ? this.stores.get(storeId) : undefined;
+    return store ? this.scope.run(store, fn) : fn();
+  }
+
+  from(table: string): QueryBuilder {
+    return this.current().from(table);
+  }
+
+  capture(name: string, store: MemoryStore = this.current()): Snapshot {
+    const snapshot = store.snapshot();
+    this.snapshots.set(name, snapshot);
+    return snapshot;
+  }
+
+  restore(storeId: string, name: string): boolean {
+    const snapshot = this.snapshots.get(name);
+    if (!snapshot) return false;
+    this.stores.set(storeId, new MemoryStore(snapshot));
+    return true;
+  }
+}
+
+let registry: MemoryRegistry | null = null;
+
+export function getMemoryRegistry(): MemoryRegistry | null {
+  return registry;
+}
+
+export function createMemoryClient(): MemoryRegistry {
+  const store = new MemoryStore();
+  const seedPath = process.env.NEXUS_SEED;
+  if (seedPath) {
+    store.seed(JSON.parse(fs.readFileSync(seedPath, "utf-8")));
+    console.log("🧪 In-memory storage seeded from:", seedPath);
+  }
+  registry = new MemoryRegistry(store);
+  registry.capture("seed", store);
+  return registry;
+}
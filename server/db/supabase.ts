@@ -1,9 +1,12 @@
 import { createClient } from "@supabase/supabase-js";
+import { createMemoryClient, isMemoryStorage } from "./memory";
 
 const url = process.env.SUPABASE_URL as string | undefined;
 const key = (process.env.SUPABASE_SERVICE_KEY as string | undefined) || (process.env.SUPABASE_KEY as string | undefined);
 
 export const supabase = (() => {
+  // NEXUS_STORAGE=memory: local test backend, no Supabase project needed
+  if (isMemoryStorage()) return createMemoryClient() as any;
   if (!url || !key) return null as any;
   return createClient(url, key, {
     auth: { persistSession: false },
@@ -11,5 +14,5 @@ export const supabase = (() => {
 })();
 
 export function isSupabaseEnabled(): boolean {
-  return Boolean(url && key);
+  return isMemoryStorage() || Boolean(url && key);
 }
\ No newline at end of file
@@ -32,17 +32,20 @@ import {
   requestLogger,
   timeout,
   securityHeaders,
-  healthCheck
+  healthCheck,
+  runtimeMetrics
 } from "./middleware/validation";
 
 // Import routes
 import apiRouter from "./routes/index";
+import testingRouter, { storeScope } from "./routes/testing";
 // Vite will be created in development for frontend middleware serving
 // We use dynamic import to avoid bundling vite in production
 
 // Import services
 import { getSupabase } from "./db/useSupabase";
 import { getMem0 } from "./memory/mem0Client";
+import { isMemoryStorage } from "./db/memory";
 
 // __filename and __dirname are defined above for unified env loader
 
@@ -99,12 +102,23 @@ app.use(requestLogger);
 // Timeout middleware (30 seconds)
 app.use(timeout(30000));
 
-// Health check
+// Health check and runtime metrics. /api/metrics is unauthenticated and can
+// reset its counters, so it is only mounted for the in-memory test backend or
+// when NEXUS_METRICS=true is set explicitly.
 app.use(healthCheck());
+if (isMemoryStorage() || process.env.NEXUS_METRICS === "true") {
+  app.use(runtimeMetrics());
+}
 app.get("/health", (_req, res) => {
   res.json({ status: "healthy", service: "nexussuite-dev", timestamp: new Date().toISOString() });
 });
 
+// In-memory test backend: per-test stores and fixture snapshots
+if (isMemoryStorage()) {
+  app.use(storeScope);
+  app.use("/api/__test__", testingRouter);
+}
+
 // Rate limiting
 const isDev = (process.env.NODE_ENV || "development") === "development";
 const generalRateLimit = rateLimit({
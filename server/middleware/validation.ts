@@ -1,4 +1,5 @@
 import { Request, Response, NextFunction } from "express";
+import { monitorEventLoopDelay } from "perf_hooks";
 import { ZodSchema, ZodError } from "zod";
 import { AppError, ErrorCode, ErrorType, createErrorResponse } from "./errorHandler";
 
@@ -191,15 +192,19 @@ export function requestId(req: Request, res: Response, next: NextFunction): void
 export function requestLogger(req: Request, res: Response, next: NextFunction): void {
   const startTime = Date.now();
   
-  // Log request
-  console.log(`[${new Date().toISOString()}] ${req.method} ${req.url} - Request ID: ${(req as any).id}`);
+  // Log request. originalUrl, not url: routers mounted with app.use("/api", ...)
+  // strip their prefix from req.url, and the finish handler runs after them.
+  console.log(`[${new Date().toISOString()}] ${req.method} ${req.originalUrl} - Request ID: ${(req as any).id}`);
   
   // Log response
   res.on("finish", () => {
     const duration = Date.now() - startTime;
+    // Set by routes that resolve the caller's organization; lets log replay group traffic per tenant.
+    const tenantId = (req as any).tenantId;
     console.log(
-      `[${new Date().toISOString()}] ${req.method} ${req.url} - ` +
-      `${res.statusCode} ${res.statusMessage} - ${duration}ms - Request ID: ${(req as any).id}`
+      `[${new Date().toISOString()}] ${req.method} ${req.originalUrl} - ` +
+      `${res.statusCode} ${res.statusMessage} - ${duration}ms - ` +
+      `${tenantId ? `Tenant: ${tenantId} - ` : ""}Request ID: ${(req as any).id}`
     );
   });
   
@@ -257,9 +262,10 @@ export function securityHeaders() {
  */
 export function healthCheck() {
   return (req: Request, res: Response, next: NextFunction): void => {
-    if (req.path === "/health" || req.path === "/healthz") {
+    if (req.path === "/health" || req.path === "/healthz" || req.path === "/api/health") {
       res.json({
         status: "healthy",
+        storage: process.env.NEXUS_STORAGE || "supabase",
         timestamp: new Date().toISOString(),
         uptime: process.uptime(),
         memory: process.memoryUsage(),
@@ -269,4 +275,47 @@ export function healthCheck() {
     
     next();
   };
-}
\ No newline at end of file
+}
+
+/**
+ * Runtime metrics middleware: memory, event-loop delay and response counts
+ * since the last reset, for soak tests watching the server drift over hours.
+ * GET /api/metrics?reset=1 starts a new window after reading. Anyone can read
+ * and reset it, so server/index.ts mounts it only for the in-memory backend or
+ * with NEXUS_METRICS=true.
+ */
+export function runtimeMetrics() {
+  const loop = monitorEventLoopDelay({ resolution: 10 });
+  loop.enable();
+  let windowStart = Date.now();
+  let responses = { total: 0, serverErrors: 0 };
+
+  return (req: Request, res: Response, next: NextFunction): void => {
+    if (req.path !== "/api/metrics") {
+      res.on("finish", () => {
+        responses.total += 1;
+        if (res.statusCode >= 500) responses.serverErrors += 1;
+      });
+      return next();
+    }
+    const ms = (ns: number) => (Number.isFinite(ns) ? ns / 1e6 : 0);
+    res.json({
+      timestamp: new Date().toISOString(),
+      uptime: process.uptime(),
+      windowSeconds: (Date.now() - windowStart) / 1000,
+      memory: process.memoryUsage(),
+      eventLoopDelay: {
+        mean: ms(loop.mean),
+        p50: ms(loop.percentile(50)),
+        p99: ms(loop.percentile(99)),
+        max: ms(loop.max),
+      },
+      responses,
+    });
+    if (req.query.reset) {
+      loop.reset();
+      windowStart = Date.now();
+      responses = { total: 0, serverErrors: 0 };
+    }
+  };
+}
@@ -65,10 +65,10 @@ router.use("/tenant", tenantRoutes);
 
 async function resolveOrgId(req: any): Promise<string | null> {
   const direct = (req.body?.organizationId || req.query?.organizationId || req.user?.orgId || req.user?.organizationId) as string | undefined;
-  if (direct) return String(direct);
+  if (direct) return (req.tenantId = String(direct));
   try {
     const existing = await organizationService.getUserOrganization(String(req.user?.id || ""));
-    return existing?.organization?.id || null;
+    return (req.tenantId = existing?.organization?.id || null);
   } catch {
     return null;
   }
@@ -0,0 +1,80 @@
+/**
+ * Test Fixture Routes
+ * Snapshot and restore of the in-memory store (NEXUS_STORAGE=memory only).
+ *
+ * The UI harness builds its golden dataset once per server as a named
+ * snapshot, then gives every test its own store restored from it. A restore
+ * is copy-on-write, so it costs nothing until the test writes.
+ */
+
+import { Router, type NextFunction, type Request, type Response } from "express";
+import { MemoryStore, getMemoryRegistry, type MemoryRegistry } from "../db/memory";
+
+export const STORE_HEADER = "x-nexus-store";
+
+const router = Router();
+
+function registry(): MemoryRegistry {
+  const r = getMemoryRegistry();
+  if (!r) throw new Error("In-memory storage is not enabled");
+  return r;
+}
+
+/**
+ * Serve a request from the test store named in its x-nexus-store header
+ */
+export function storeScope(req: Request, _res: Response, next: NextFunction): void {
+  const id = req.get(STORE_HEADER);
+  registry().run(id || undefined, next);
+}
+
+function counts(snapshot: ReadonlyMap<string, readonly unknown[]>) {
+  return Object.fromEntries([...snapshot].map(([table, rows]) => [table, rows.length]));
+}
+
+/**
+ * List snapshots with their row counts
+ * GET /api/__test__/snapshots
+ */
+router.get("/snapshots", (_req, res) => {
+  const r = registry();
+  res.json(Object.fromEntries([...r.snapshots].map(([name, snap]) => [name, counts(snap)])));
+});
+
+/**
+ * Build a snapshot: `tables` seeded on top of snapshot `from` (default "seed")
+ * POST /api/__test__/snapshots/:name
+ */
+router.post("/snapshots/:name", (req, res) => {
+  const r = registry();
+  const { from = "seed", tables } = req.body || {};
+  const base = r.snapshots.get(String(from));
+  if (!base) return res.status(404).json({ success: false, error: `Unknown snapshot ${from}` });
+  const store = new MemoryStore(base);
+  if (tables && typeof tables === "object") store.seed(tables);
+  const snapshot = r.capture(req.params.name, store);
+  return res.json({ success: true, name: req.params.name, tables: counts(snapshot) });
+});
+
+/**
+ * Create (or reset) a test store from a snapshot
+ * POST /api/__test__/stores/:id
+ */
+router.post("/stores/:id", (req, res) => {
+  const name = String(req.body?.snapshot || "seed");
+  if (!registry().restore(req.params.id, name)) {
+    return res.status(404).json({ success: false, error: `Unknown snapshot ${name}` });
+  }
+  return res.json({ success: true, store: req.params.id, snapshot: name });
+});
+
+/**
+ * Drop a test store
+ * DELETE /api/__test__/stores/:id
+ */
+router.delete("/stores/:id", (req, res) => {
+  registry().stores.delete(req.params.id);
+  res.json({ success: true });
+});
+
+export default router;
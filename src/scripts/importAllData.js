@@ -2,6 +2,8 @@
 
 const admin = require('firebase-admin');
 const fs = require('fs'); // Node.js File System module
+const path = require('path');
+const readline = require('readline');
 const get = require('lodash.get'); // Helper for safely accessing nested JSON paths
 
 // --- IMPORTANT: CONFIGURE THESE PATHS & DATA MAPPINGS ---
@@ -9,8 +11,11 @@ const get = require('lodash.get'); // Helper for safely accessing nested JSON pa
 // 1. Path to your Firebase Admin SDK service account key
 const serviceAccountPath = './esports-app-44b10-firebase-adminsdk-fbsvc-249cba7525.json'; // <<-- UPDATE FILENAME
 
-// 2. Path to your downloaded FULL JSON data file from Replit
-const pathToReplitData = './replit_full_database.json'; // <<-- UPDATE FILENAME
+// 2. Path to your downloaded FULL JSON data file from Replit, or to a directory
+//    of <table>.ndjson files (one JSON object per line), as written by
+//    `python -m harness dataset --ndjson DIR` in testsprite_tests.
+//    Can also be given as the first command-line argument.
+const pathToReplitData = process.argv[2] || './replit_full_database.json'; // <<-- UPDATE FILENAME
 
 // 3. Define the mappings from your JSON paths to Firestore collections
 //    Add an entry for each "table" (array of objects) in your JSON.
@@ -60,6 +65,41 @@ const COLLECTION_MAPS = [
     firestoreCollection: 'invites',
     idField: 'id' // Assuming staff objects also have an 'id' field
   },
+  {
+    jsonPath: 'data.rosters',
+    firestoreCollection: 'rosters',
+    idField: 'id'
+  },
+  {
+    jsonPath: 'data.wallets',
+    firestoreCollection: 'wallets',
+    idField: 'id'
+  },
+  {
+    jsonPath: 'data.transactions',
+    firestoreCollection: 'transactions',
+    idField: 'id'
+  },
+  {
+    jsonPath: 'data.tournaments',
+    firestoreCollection: 'tournaments',
+    idField: 'id'
+  },
+  {
+    jsonPath: 'data.tournamentRounds',
+    firestoreCollection: 'tournamentRounds',
+    idField: 'id'
+  },
+  {
+    jsonPath: 'data.socialAccounts',
+    firestoreCollection: 'socialAccounts',
+    idField: 'id'
+  },
+  {
+    jsonPath: 'data.socialMetrics',
+    firestoreCollection: 'socialMetrics',
+    idField: 'id'
+  },
   // Add more entries here for any other collections you have:
   // {
   //   jsonPath: 'data.products',
@@ -109,15 +149,27 @@ function convertDateStringsToDates(obj) {
   return obj;
 }
 
+// Reads one table of a directory of NDJSON files line by line, so datasets too
+// large for a single JSON.parse never sit in memory at once.
+async function* readNdjson(file) {
+  const lines = readline.createInterface({ input: fs.createReadStream(file, 'utf8'), crlfDelay: Infinity });
+  for await (const line of lines) {
+    if (line.trim()) yield JSON.parse(line);
+  }
+}
+
 // Main import function
 async function importAllData() {
+  const fromNdjson = fs.existsSync(pathToReplitData) && fs.statSync(pathToReplitData).isDirectory();
   let replitRawData;
-  try {
-    replitRawData = JSON.parse(fs.readFileSync(pathToReplitData, 'utf8'));
-    console.log(`Successfully loaded data from ${pathToReplitData}`);
-  } catch (error) {
-    console.error(`Error reading or parsing Replit data file: ${pathToReplitData}`, error);
-    process.exit(1);
+  if (!fromNdjson) {
+    try {
+      replitRawData = JSON.parse(fs.readFileSync(pathToReplitData, 'utf8'));
+      console.log(`Successfully loaded data from ${pathToReplitData}`);
+    } catch (error) {
+      console.error(`Error reading or parsing Replit data file: ${pathToReplitData}`, error);
+      process.exit(1);
+    }
   }
 
   // Batch writes for efficiency and to respect Firestore limits (max 500 operations per batch)
@@ -127,24 +179,34 @@ async function importAllData() {
     const { jsonPath, firestoreCollection, idField } = mapping;
     console.log(`\n--- Processing '${jsonPath}' into Firestore collection '${firestoreCollection}' ---`);
 
-    // Use lodash.get to safely access deeply nested data
-    const dataToImport = get(replitRawData, jsonPath);
-
-    if (!Array.isArray(dataToImport)) {
-      console.warn(`Path '${jsonPath}' in your JSON is not an array or does not exist. Skipping this collection.`);
-      continue;
-    }
+    let dataToImport;
+    if (fromNdjson) {
+      const file = path.join(pathToReplitData, `${jsonPath.split('.').pop()}.ndjson`);
+      if (!fs.existsSync(file)) {
+        console.warn(`No file ${file}. Skipping this collection.`);
+        continue;
+      }
+      dataToImport = readNdjson(file);
+    } else {
+      // Use lodash.get to safely access deeply nested data
+      dataToImport = get(replitRawData, jsonPath);
+
+      if (!Array.isArray(dataToImport)) {
+        console.warn(`Path '${jsonPath}' in your JSON is not an array or does not exist. Skipping this collection.`);
+        continue;
+      }
 
-    if (dataToImport.length === 0) {
-      console.log(`No items found for '${jsonPath}'. Skipping this collection.`);
-      continue;
+      if (dataToImport.length === 0) {
+        console.log(`No items found for '${jsonPath}'. Skipping this collection.`);
+        continue;
+      }
     }
 
     let batch = db.batch();
     let itemsProcessed = 0;
     let batchCount = 0;
 
-    for (const item of dataToImport) {
+    for await (const item of dataToImport) {
       // Create a deep copy to avoid modifying the original 'item' in 'dataToImport'
       const itemDataForFirestore = JSON.parse(JSON.stringify(item));
 
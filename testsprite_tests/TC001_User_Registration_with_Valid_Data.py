@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness.forms import fill_form
 
 async def run_test():
     pw = None
@@ -53,48 +54,18 @@ async def run_test():
         await page.wait_for_timeout(3000); await elem.click(timeout=5000)
         
 
-        # -> Fill in the registration form with valid first name, last name, email, organization name, password, and confirm password.
+        # -> Fill in the registration form with valid first name, last name, email, organization name, password, and confirm password, then submit it.
         frame = context.pages[-1]
-        # Input first name
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('John')
-        
-
-        frame = context.pages[-1]
-        # Input last name
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Doe')
-        
-
-        frame = context.pages[-1]
-        # Input valid email address
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('john.doe@example.com')
-        
-
-        frame = context.pages[-1]
-        # Input organization name
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Acme Esports')
-        
-
-        frame = context.pages[-1]
-        # Input strong password
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPassw0rd!')
-        
-
-        frame = context.pages[-1]
-        # Confirm strong password
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[5]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPassw0rd!')
-        
-
-        # -> Click the 'Create Account' button to submit the registration form.
-        frame = context.pages[-1]
-        # Click the 'Create Account' button to submit the registration form.
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # Fill and submit the registration form in one round trip
+        form = frame.locator('form').nth(0)
+        await page.wait_for_timeout(3000); await fill_form(form, {
+            'name': 'John Doe',
+            'email': 'john.doe@example.com',
+            'password': 'StrongPassw0rd!',
+            'confirmPassword': 'StrongPassw0rd!',
+            'organizationName': 'Acme Esports',
+            'acceptTerms': True,
+        })
         
 
         # -> Verify that the password is stored in hashed form using bcryptjs in the backend.
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness.forms import fill_form
 
 async def run_test():
     pw = None
@@ -46,23 +47,14 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Enter valid email and password.
+        # -> Enter valid email and password and submit the login form.
         frame = context.pages[-1]
-        # Enter valid email in the email input field
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('validuser@example.com')
-        
-
-        frame = context.pages[-1]
-        # Enter valid password in the password input field
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('ValidPassword123')
-        
-
-        frame = context.pages[-1]
-        # Click the Sign In button to submit login form
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # Fill and submit the login form in one round trip
+        form = frame.locator('form').nth(0)
+        await page.wait_for_timeout(3000); await fill_form(form, {
+            'email': 'validuser@example.com',
+            'password': 'ValidPassword123',
+        })
         
 
         # --> Assertions to verify final state
@@ -1,6 +1,7 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from harness.forms import fill_form
 
 async def run_test():
     pw = None
@@ -57,21 +58,12 @@ async def run_test():
 
         # -> Input Club Admin credentials and click Sign In button
         frame = context.pages[-1]
-        # Input Club Admin email
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('clubadmin@example.com')
-        
-
-        frame = context.pages[-1]
-        # Input Club Admin password
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('securepassword123')
-        
-
-        frame = context.pages[-1]
-        # Click Sign In button
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # Fill and submit the login form with Club Admin credentials
+        form = frame.locator('form').nth(0)
+        await page.wait_for_timeout(3000); await fill_form(form, {
+            'email': 'clubadmin@example.com',
+            'password': 'securepassword123',
+        })
         
 
         # -> Check for any error messages or hints on the login page, or try to reset password or use sign up link to create a new account with analytics access.
@@ -83,64 +75,26 @@ async def run_test():
 
         # -> Fill in the sign-up form with valid details and submit to create account
         frame = context.pages[-1]
-        # Input First Name
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('John')
-        
-
-        frame = context.pages[-1]
-        # Input Last Name
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Doe')
-        
-
-        frame = context.pages[-1]
-        # Input Email
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('clubadmin@example.com')
-        
-
-        frame = context.pages[-1]
-        # Input Organization Name
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Acme Esports')
-        
-
-        frame = context.pages[-1]
-        # Input Password
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('SecurePass123!')
-        
-
-        frame = context.pages[-1]
-        # Input Confirm Password
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[5]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('SecurePass123!')
-        
-
-        frame = context.pages[-1]
-        # Click Create Account button
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # Fill and submit the sign-up form in one round trip
+        form = frame.locator('form').nth(0)
+        await page.wait_for_timeout(3000); await fill_form(form, {
+            'name': 'John Doe',
+            'email': 'clubadmin@example.com',
+            'password': 'SecurePass123!',
+            'confirmPassword': 'SecurePass123!',
+            'organizationName': 'Acme Esports',
+            'acceptTerms': True,
+        })
         
 
         # -> Input new account email and password, then click Sign In
         frame = context.pages[-1]
-        # Input new account email
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('clubadmin@example.com')
-        
-
-        frame = context.pages[-1]
-        # Input new account password
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('SecurePass123!')
-        
-
-        frame = context.pages[-1]
-        # Click Sign In button
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # Fill and submit the login form with the new account
+        form = frame.locator('form').nth(0)
+        await page.wait_for_timeout(3000); await fill_form(form, {
+            'email': 'clubadmin@example.com',
+            'password': 'SecurePass123!',
+        })
         
 
         # -> Click on the Analytics menu item to navigate to the analytics dashboards
@@ -1,161 +1,16 @@
 import asyncio
-from playwright import async_api
-from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:5000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Input email and password, then click Sign In to authenticate.
-        frame = context.pages[-1]
-        # Input email for login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testuser@example.com')
-        
-
-        frame = context.pages[-1]
-        # Input password for login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123')
-        
-
-        frame = context.pages[-1]
-        # Click Sign In button to log in
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Request valid login credentials or try alternative authentication method to access the system.
-        frame = context.pages[-1]
-        # Click Sign up link to check if registration or alternative login options are available
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Fill in the registration form with valid details and submit to create a new account.
-        frame = context.pages[-1]
-        # Input first name
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('John')
-        
-
-        frame = context.pages[-1]
-        # Input last name
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Doe')
-        
-
-        frame = context.pages[-1]
-        # Input email
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('john.doe@example.com')
-        
+from harness.load import run_scenario
 
-        frame = context.pages[-1]
-        # Input organization name
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Acme Esports')
-        
-
-        frame = context.pages[-1]
-        # Input password
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPass!2025')
-        
-
-        frame = context.pages[-1]
-        # Confirm password
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[5]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPass!2025')
-        
-
-        frame = context.pages[-1]
-        # Click Create Account button to submit registration form
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the 'Sign in' link to return to the login page and attempt login with valid credentials or alternative authentication.
-        frame = context.pages[-1]
-        # Click 'Sign in' link to navigate back to login page
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/div/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input valid email and password, then click Sign In to authenticate.
-        frame = context.pages[-1]
-        # Input email for login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('john.doe@example.com')
-        
-
-        frame = context.pages[-1]
-        # Input password for login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('StrongPass!2025')
-        
+async def run_test():
+    # Generate open-loop load against the key API endpoints, signed in as a
+    # Club Admin from the cached session (see harness/load.py)
+    report = await run_scenario("key-endpoints")
 
-        frame = context.pages[-1]
-        # Click Sign In button to log in
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # --> Assertions to verify final state
+    failures = report.check()
+    if failures:
+        raise AssertionError("Test plan failed: key API endpoints missed their latency targets under load: " + "; ".join(failures) + "\n" + report.format())
+    return report
 
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=API response time exceeded 300ms threshold').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError('Test plan failed: The 95th percentile latency for key API endpoints exceeded 300ms under simulated load conditions.')
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
 asyncio.run(run_test())
-    
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""In-process harness for the generated TestSprite TC scripts.
+
+The TC*.py scripts in this directory are generated one-shot programs: each one
+starts Playwright, launches its own Chromium, runs a single flow and exits.
+The harness loads their ``run_test`` coroutines instead, and runs many of them
+concurrently against a small pool of shared browsers, one fresh browser
+context per test.
+
+Run it from the ``testsprite_tests`` directory::
+
+    python -m harness run                 # whole suite
+    python -m harness run TC00[1-3]*      # a subset, by file-name pattern
+    python -m harness run --changed main  # cases impacted since main
+    python -m harness history streaks     # what has been failing lately
+"""
+
+from .config import DEFAULT_BASE_URL, TESTS_DIR, TMP_DIR
+from .runner import SuiteRunner, TestResult
+from .scripts import TestCase, discover
+
+__all__ = [
+    "DEFAULT_BASE_URL",
+    "TESTS_DIR",
+    "TMP_DIR",
+    "SuiteRunner",
+    "TestCase",
+    "TestResult",
+    "discover",
+]
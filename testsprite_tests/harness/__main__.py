@@ -0,0 +1,5 @@
+from .cli import main
+
+# Guarded: spawned shard processes re-import this module as __mp_main__.
+if __name__ == "__main__":
+    raise SystemExit(main())
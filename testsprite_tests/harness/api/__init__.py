@@ -0,0 +1,57 @@
+"""Typed async client for the NexusSuite REST API.
+
+TC009/TC010 (transactions) and TC015 (audit logs) check what the API
+stores, yet they drive the browser to do it, at UI speed. test-api.js and
+test-api.sh cannot be called from Python. ``NexusClient`` can be used by API
+tests, seeders and load tools:
+
+* one ``httpx`` pool of keep-alive HTTP/1.1 connections per client;
+* a cookie session, either from ``auth.login`` or reused from the
+  harness's session cache (``NexusClient.for_role``);
+* retries with jittered exponential backoff on 429 and 503, honouring
+  ``Retry-After``;
+* ``bulk`` to send many creates concurrently over the pool.
+
+Route groups are attributes: ``api.tournaments``, ``api.rounds``,
+``api.contracts`` and the rest. Server/routes/index.ts, which server/index.ts
+mounts, serves auth, profile, tournaments, rounds, matches, rosters,
+contracts, audit logs and analytics. Wallets, invites, social accounts,
+contract files and ``/api/auth/user`` are defined in server/routes.ts.
+Transactions use the /api/finance paths the finance page calls. Against a
+server that does not mount those routes, their calls raise ``ApiError``
+with status 404.
+"""
+
+from .client import ApiError, NexusClient, RetryPolicy
+from .resources import (
+    AuditLog,
+    Contract,
+    ContractFile,
+    Invite,
+    Match,
+    Roster,
+    SocialAccount,
+    Tournament,
+    TournamentRound,
+    Transaction,
+    User,
+    Wallet,
+)
+
+__all__ = [
+    "ApiError",
+    "AuditLog",
+    "Contract",
+    "ContractFile",
+    "Invite",
+    "Match",
+    "NexusClient",
+    "RetryPolicy",
+    "Roster",
+    "SocialAccount",
+    "Tournament",
+    "TournamentRound",
+    "Transaction",
+    "User",
+    "Wallet",
+]
@@ -0,0 +1,179 @@
+"""Transport: one pooled keep-alive connection set, a cookie session, retries."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, Mapping, TypeVar
+
+import httpx
+
+from ..config import DEFAULT_BASE_URL
+from ..sessions import SessionCache
+from .resources import (
+    Analytics,
+    AuditLogs,
+    Auth,
+    Contracts,
+    Invites,
+    Matches,
+    Rosters,
+    Rounds,
+    Social,
+    Tournaments,
+    Transactions,
+    Wallets,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class ApiError(RuntimeError):
+    """A non-2xx reply, after any retries."""
+
+    def __init__(self, method: str, path: str, status: int, body: Any):
+        self.method = method
+        self.path = path
+        self.status = status
+        self.body = body
+        message = body.get("message") if isinstance(body, dict) else None
+        super().__init__(f"{method} {path} -> {status}" + (f": {message}" if message else ""))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter, for replies that mean "try again later"."""
+
+    attempts: int = 4
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    statuses: frozenset[int] = frozenset({429, 503})
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        # Full jitter spreads a burst of clients that were throttled together.
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        return max(backoff, retry_after or 0.0)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    try:
+        return float(response.headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
+
+class NexusClient:
+    """Async client for the NexusSuite REST API.
+
+    Use it as an async context manager, so the pool is closed::
+
+        async with await NexusClient.for_role("club_admin") as api:
+            tour = await api.tournaments.create({"name": "Spring Cup", ...})
+    """
+
+    def __init__(
+        self,
+        base: str = DEFAULT_BASE_URL,
+        *,
+        cookies: Mapping[str, str] | None = None,
+        headers: Mapping[str, str] | None = None,
+        max_connections: int = 32,
+        timeout: float = 30.0,
+        retry: RetryPolicy = RetryPolicy(),
+    ):
+        self.base = base.rstrip("/")
+        self.retry = retry
+        self.http = httpx.AsyncClient(
+            base_url=self.base,
+            cookies=dict(cookies or {}),
+            headers=dict(headers or {}),
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=30.0,
+            ),
+        )
+        self.auth = Auth(self)
+        self.wallets = Wallets(self)
+        self.transactions = Transactions(self)
+        self.tournaments = Tournaments(self)
+        self.rounds = Rounds(self)
+        self.matches = Matches(self)
+        self.rosters = Rosters(self)
+        self.contracts = Contracts(self)
+        self.invites = Invites(self)
+        self.social = Social(self)
+        self.audit_logs = AuditLogs(self)
+        self.analytics = Analytics(self)
+
+    @classmethod
+    async def for_role(cls, role: str, cache: SessionCache | None = None, **kwargs: Any) -> NexusClient:
+        """A client signed in as ``role``, reusing the harness's cached session cookies."""
+        cache = cache or SessionCache()
+        await cache.ensure([role])
+        return cls(cache.base, cookies=cache.cookies(role), **kwargs)
+
+    async def __aenter__(self) -> NexusClient:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: Any = None,
+        params: Mapping[str, Any] | None = None,
+    ) -> Any:
+        """Send one request and return the decoded JSON body; raise ApiError otherwise."""
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        for attempt in range(self.retry.attempts):
+            last = attempt == self.retry.attempts - 1
+            try:
+                response = await self.http.request(method, path, json=json, params=params)
+            except httpx.ConnectError:
+                # Nothing reached the server, so even a POST is safe to resend.
+                if last:
+                    raise
+                await asyncio.sleep(self.retry.delay(attempt))
+                continue
+            if response.status_code in self.retry.statuses and not last:
+                await asyncio.sleep(self.retry.delay(attempt, _retry_after(response)))
+                continue
+            try:
+                body = response.json() if response.content else None
+            except ValueError:
+                body = response.text
+            if not response.is_success:
+                raise ApiError(method, path, response.status_code, body)
+            return body
+        raise AssertionError("unreachable")
+
+    async def bulk(
+        self,
+        call: Callable[[T], Awaitable[R]],
+        items: Iterable[T],
+        *,
+        concurrency: int = 16,
+        return_exceptions: bool = False,
+    ) -> list[R | BaseException]:
+        """``call`` for every item, ``concurrency`` at a time over the pooled connections.
+
+        Results come back in the order of ``items``. ``concurrency`` above
+        ``max_connections`` only queues requests inside the pool.
+        """
+        gate = asyncio.Semaphore(concurrency)
+
+        async def one(item: T) -> R:
+            async with gate:
+                return await call(item)
+
+        return await asyncio.gather(*(one(item) for item in items), return_exceptions=return_exceptions)
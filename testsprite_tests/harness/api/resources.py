@@ -0,0 +1,317 @@
+"""One class per route group, with the row shapes from shared/schema.ts.
+
+Rows are plain dicts, typed as ``TypedDict`` with ``total=False``: the
+server returns whatever its storage layer holds, and the in-memory, Firestore
+and Postgres stores do not agree on the optional columns.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Generic, Mapping, TypedDict, TypeVar
+
+if TYPE_CHECKING:
+    from .client import NexusClient
+
+
+class User(TypedDict, total=False):
+    id: str
+    email: str
+    firstName: str
+    lastName: str
+    tenantId: str
+    role: str
+
+
+class Wallet(TypedDict, total=False):
+    id: str
+    tenantId: str
+    name: str
+    type: str  # cash, bank, card, paypal, crypto, other
+    currency: str
+    balance: str
+    isDefault: bool
+
+
+class Transaction(TypedDict, total=False):
+    id: str
+    tenantId: str
+    type: str  # income, expense
+    category: str
+    amount: str
+    description: str
+    date: str
+    paymentMethod: str
+    reference: str
+    walletId: str
+
+
+class Tournament(TypedDict, total=False):
+    id: str
+    tenantId: str
+    name: str
+    game: str
+    format: str  # single_elimination, double_elimination, round_robin, league, custom
+    startDate: str
+    endDate: str
+    prizePool: str
+    status: str  # upcoming, ongoing, completed, cancelled
+    description: str
+    maxTeams: int
+
+
+class TournamentRound(TypedDict, total=False):
+    id: str
+    tournamentId: str
+    name: str
+    roundNumber: int
+    format: str
+    startDate: str
+    status: str
+
+
+class Match(TypedDict, total=False):
+    id: str
+    tenantId: str
+    tournamentId: str
+    roundId: str
+    teamA: str
+    teamB: str
+    scoreA: int
+    scoreB: int
+    date: str
+    game: str
+    status: str  # upcoming, live, completed
+
+
+class Roster(TypedDict, total=False):
+    id: str
+    tenantId: str
+    playerId: str
+    game: str
+    role: str
+
+
+class Contract(TypedDict, total=False):
+    id: str
+    tenantId: str
+    fileName: str
+    fileUrl: str
+    type: str  # Player, Staff, Sponsor
+    linkedPerson: str
+    expirationDate: str
+    status: str
+
+
+class ContractFile(TypedDict, total=False):
+    id: str
+    contractId: str
+    fileName: str
+    fileUrl: str
+
+
+class Invite(TypedDict, total=False):
+    id: str
+    tenantId: str
+    email: str
+    role: str
+    permissions: list[str]
+    token: str
+    status: str  # pending, accepted, expired
+    expiresAt: str
+
+
+class SocialAccount(TypedDict, total=False):
+    id: str
+    tenantId: str
+    platform: str
+    accountName: str
+    accountId: str
+    isActive: bool
+
+
+class AuditLog(TypedDict, total=False):
+    id: str
+    tenantId: str
+    userId: str
+    userName: str
+    action: str
+    entity: str
+    entityId: str
+    actionType: str  # create, update, delete
+    timestamp: str
+
+
+Row = TypeVar("Row", bound=Mapping[str, Any])
+
+
+class _Resource:
+    def __init__(self, client: NexusClient):
+        self._client = client
+
+    async def _call(self, method: str, path: str, **kwargs: Any) -> Any:
+        return await self._client.request(method, path, **kwargs)
+
+
+class _Crud(_Resource, Generic[Row]):
+    path: str
+
+    async def list(self, **params: Any) -> list[Row]:
+        return await self._call("GET", self.path, params=params)
+
+    async def create(self, data: Row) -> Row:
+        return await self._call("POST", self.path, json=data)
+
+    async def update(self, id: str, data: Mapping[str, Any]) -> Row:
+        return await self._call("PATCH", f"{self.path}/{id}", json=data)
+
+    async def delete(self, id: str) -> Any:
+        return await self._call("DELETE", f"{self.path}/{id}")
+
+
+class Auth(_Resource):
+    async def login(self, email: str, password: str) -> User:
+        """Sign in; the session cookie lands in this client's jar."""
+        body = await self._call("POST", "/api/auth/login", json={"email": email, "password": password})
+        return body.get("user", body) if isinstance(body, dict) else body
+
+    async def register(
+        self,
+        email: str,
+        password: str,
+        *,
+        first_name: str | None = None,
+        last_name: str | None = None,
+        tenant_name: str | None = None,
+    ) -> User:
+        data = {
+            "email": email,
+            "password": password,
+            "firstName": first_name,
+            "lastName": last_name,
+            "tenantName": tenant_name,
+        }
+        body = await self._call(
+            "POST", "/api/auth/register", json={k: v for k, v in data.items() if v is not None}
+        )
+        return body.get("user", body) if isinstance(body, dict) else body
+
+    async def logout(self) -> Any:
+        return await self._call("POST", "/api/auth/logout")
+
+    async def user(self) -> User:
+        return await self._call("GET", "/api/auth/user")
+
+    async def profile(self) -> User:
+        return await self._call("GET", "/api/profile")
+
+    async def update_profile(self, data: Mapping[str, Any]) -> User:
+        return await self._call("POST", "/api/profile", json=data)
+
+
+class Wallets(_Crud[Wallet]):
+    path = "/api/wallets"
+
+
+class Transactions(_Crud[Transaction]):
+    """Finance transactions, at the /api/finance paths the finance page calls."""
+
+    path = "/api/finance"
+
+    async def list(self, organization_id: str | None = None, **params: Any) -> list[Transaction]:
+        return await super().list(organizationId=organization_id, **params)
+
+    async def monthly(self, organization_id: str | None = None) -> Any:
+        return await self._call("GET", f"{self.path}/monthly", params={"organizationId": organization_id})
+
+
+class Tournaments(_Crud[Tournament]):
+    path = "/api/tournaments"
+
+
+class Rounds(_Resource):
+    async def list(self, tournament_id: str) -> list[TournamentRound]:
+        return await self._call("GET", f"/api/tournaments/{tournament_id}/rounds")
+
+    async def create(self, tournament_id: str, data: TournamentRound) -> TournamentRound:
+        return await self._call("POST", f"/api/tournaments/{tournament_id}/rounds", json=data)
+
+    async def update(self, id: str, data: Mapping[str, Any]) -> TournamentRound:
+        return await self._call("PATCH", f"/api/rounds/{id}", json=data)
+
+    async def delete(self, id: str) -> Any:
+        return await self._call("DELETE", f"/api/rounds/{id}")
+
+    async def matches(self, id: str) -> list[Match]:
+        return await self._call("GET", f"/api/rounds/{id}/matches")
+
+
+class Matches(_Resource):
+    async def list(self) -> list[Match]:
+        return await self._call("GET", "/api/matches")
+
+
+class Rosters(_Crud[Roster]):
+    path = "/api/rosters"
+
+
+class Contracts(_Crud[Contract]):
+    path = "/api/contracts"
+
+    async def get(self, id: str) -> Contract:
+        return await self._call("GET", f"{self.path}/{id}")
+
+    async def files(self, id: str) -> list[ContractFile]:
+        return await self._call("GET", f"{self.path}/{id}/files")
+
+    async def add_file(self, id: str, data: ContractFile) -> ContractFile:
+        return await self._call("POST", f"{self.path}/{id}/files", json=data)
+
+    async def delete_file(self, file_id: str) -> Any:
+        return await self._call("DELETE", f"/api/contract-files/{file_id}")
+
+
+class Invites(_Resource):
+    async def list(self) -> list[Invite]:
+        return await self._call("GET", "/api/invites")
+
+    async def create(self, data: Invite) -> Invite:
+        return await self._call("POST", "/api/invites", json=data)
+
+    async def get(self, token: str) -> Invite:
+        return await self._call("GET", f"/api/invites/{token}")
+
+    async def accept(self, token: str) -> Any:
+        return await self._call("POST", f"/api/invites/{token}/accept")
+
+    async def delete(self, id: str) -> Any:
+        return await self._call("DELETE", f"/api/invites/{id}")
+
+
+class Social(_Resource):
+    async def accounts(self) -> list[SocialAccount]:
+        return await self._call("GET", "/api/social/accounts")
+
+    async def add_account(self, data: SocialAccount) -> SocialAccount:
+        return await self._call("POST", "/api/social/accounts", json=data)
+
+    async def update_account(self, id: str, data: Mapping[str, Any]) -> SocialAccount:
+        return await self._call("PATCH", f"/api/social/accounts/{id}", json=data)
+
+    async def delete_account(self, id: str) -> Any:
+        return await self._call("DELETE", f"/api/social/accounts/{id}")
+
+    async def analytics(self) -> Any:
+        return await self._call("GET", "/api/social/analytics")
+
+    async def sync(self, account_id: str) -> Any:
+        return await self._call("POST", f"/api/social/sync/{account_id}")
+
+
+class AuditLogs(_Resource):
+    async def list(self, limit: int | None = None) -> list[AuditLog]:
+        return await self._call("GET", "/api/audit-logs", params={"limit": limit})
+
+
+class Analytics(_Resource):
+    async def get(self) -> dict[str, Any]:
+        return await self._call("GET", "/api/analytics")
@@ -0,0 +1,151 @@
+"""A local backend per worker: the Express app on in-memory storage.
+
+Against the shared server on localhost:5000 the suite needs Supabase or
+Firestore credentials, every test pays a round trip to a hosted database,
+and parallel tests see each other's users and clubs. With ``run --local``
+the harness instead starts server/index.ts itself, once per browser
+worker, with ``NEXUS_STORAGE=memory`` (server/db/memory.ts answers the
+Supabase calls from process memory) on a free port, and waits for
+``/api/health`` before any test starts.
+
+Each store is seeded from local_seed.json with the accounts, roles and
+club the generated scripts log in with, so a worker's backend starts in
+the same state every run and no two workers share one.
+
+The scripts still navigate to localhost:5000; ``LocalBackends`` hands
+every context its worker's origin as ``base_url`` and the runner rebases
+the scripts' URLs onto it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import shlex
+from pathlib import Path
+from typing import Any, Sequence
+
+from .config import PROJECT_ROOT, TESTS_DIR, TMP_DIR
+from .runner import Hook
+from .scripts import TestCase
+from .shards import ShardServer
+
+SEED_FILE = TESTS_DIR / "local_seed.json"
+BACKENDS_DIR = TMP_DIR / "backends"
+LOCAL_COMMAND = "npx tsx server/index.ts"
+
+
+def with_inspector(command: str, port: int) -> str:
+    """``command`` with the V8 inspector listening on ``port``.
+
+    The flag goes right after the ``node`` or ``tsx`` that runs the server,
+    not into NODE_OPTIONS: npx and tsx are node processes too, and the first
+    of them would take the port.
+    """
+    parts = shlex.split(command)
+    for i, part in enumerate(parts):
+        if Path(part).name in ("node", "tsx"):
+            return shlex.join([*parts[: i + 1], f"--inspect=127.0.0.1:{port}", *parts[i + 1 :]])
+    raise ValueError(f"no node or tsx in {command!r} to pass --inspect to")
+
+
+class LocalBackend(ShardServer):
+    """server/index.ts on a free port, with a seeded in-memory store."""
+
+    health_path = "/api/health"
+
+    def __init__(
+        self,
+        log_path: Path,
+        *,
+        seed: Path = SEED_FILE,
+        command: str = LOCAL_COMMAND,
+        project_root: Path = PROJECT_ROOT,
+        ready_timeout: float = 120.0,
+        inspect_port: int | None = None,
+    ):
+        if inspect_port is not None:
+            command = with_inspector(command, inspect_port)
+        super().__init__(command, project_root, log_path, ready_timeout)
+        self.seed = seed
+        self.inspect_port = inspect_port
+
+    def environment(self) -> dict[str, str]:
+        return {
+            **super().environment(),
+            "NODE_ENV": "development",
+            "NEXUS_STORAGE": "memory",
+            "NEXUS_SEED": str(self.seed.resolve()),
+            # Serve the SPA from the same origin, talking to this server only.
+            "VITE_MIDDLEWARE": "true",
+            "VITE_APP_URL": self.base,
+            "VITE_API_URL": self.base,
+            "BETTER_AUTH_URL": self.base,
+            "BETTER_AUTH_SECRET": os.environ.get("BETTER_AUTH_SECRET", "nexus-local-backend"),
+            "JWT_SECRET": os.environ.get("JWT_SECRET", "nexus-local-backend"),
+            # Set, even empty, so NexusSuite/.env cannot switch these on.
+            "POLAR_ACCESS_TOKEN": "",
+            "FIREBASE_DISABLED": "true",
+        }
+
+
+class LocalBackends(Hook):
+    """One ``LocalBackend`` per browser worker, assigned the way the runner does."""
+
+    def __init__(
+        self,
+        count: int,
+        *,
+        seed: Path = SEED_FILE,
+        command: str = LOCAL_COMMAND,
+        project_root: Path = PROJECT_ROOT,
+        log_dir: Path = BACKENDS_DIR,
+    ):
+        self.count = max(1, count)
+        self.seed = seed
+        self.command = command
+        self.project_root = project_root
+        self.log_dir = log_dir
+        self.backends: list[LocalBackend] = []
+        self.assigned: dict[str, LocalBackend] = {}
+
+    async def on_run_start(self, cases: Sequence[TestCase]) -> None:
+        count = min(self.count, len(cases)) or 1
+        self.backends = [
+            LocalBackend(
+                self.log_dir / f"{i + 1}.log",
+                seed=self.seed,
+                command=self.command,
+                project_root=self.project_root,
+            )
+            for i in range(count)
+        ]
+        started = await asyncio.gather(
+            *(asyncio.to_thread(backend.__enter__) for backend in self.backends),
+            return_exceptions=True,
+        )
+        errors = [e for e in started if isinstance(e, BaseException)]
+        if errors:
+            self.close()
+            raise errors[0]
+        # Case i runs on browser i % workers; give it that worker's backend.
+        self.assigned = {case.key: self.backends[i % count] for i, case in enumerate(cases)}
+        for backend in self.backends:
+            print(f"local backend on {backend.base} (log {backend.log_path})")
+
+    def base_for(self, case: TestCase) -> str:
+        return self.assigned[case.key].base
+
+    async def context_options(self, case: TestCase) -> dict[str, Any]:
+        return {"base_url": self.base_for(case)}
+
+    def case_base(self, case: TestCase) -> str | None:
+        return self.base_for(case)
+
+    async def on_run_end(self, results: Sequence[Any]) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for backend in self.backends:
+            backend.__exit__()
+        self.backends = []
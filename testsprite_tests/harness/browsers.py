@@ -0,0 +1,288 @@
+"""A warm browser pool that runs outside the harness process.
+
+``python -m harness browsers serve`` keeps a pool of Chromium browser
+servers running -- Playwright's ``launchServer``, started through the
+Node driver that ships inside the Python package, since the Python API has
+no ``launch_server`` of its own. The runner then leases a WebSocket
+endpoint and attaches with ``chromium.connect`` instead of launching, so
+in an edit-run loop a run starts with browsers that are already up.
+
+The daemon health-checks each browser every few seconds by connecting and
+opening a context, replaces dead ones, and recycles a browser after it has
+served ``recycle_after`` contexts, once its current leases are returned,
+so renderer memory does not creep up across hundreds of runs.
+
+Clients find the daemon through tmp/browsers.json and talk to it with one
+JSON line per request on a localhost socket. When the file is missing or
+the daemon does not answer, the runner launches its own browsers as
+before.
+
+Finding that Node driver takes ``playwright._impl``, which is private and
+may move in any release, so requirements.txt pins the Playwright version.
+On a version without it ``serve`` refuses to start and runs launch
+locally.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Sequence
+
+from playwright.async_api import Browser, Error, Playwright, async_playwright
+
+try:
+    from playwright._impl._driver import compute_driver_executable
+except ImportError:
+    compute_driver_executable = None
+
+from .config import TMP_DIR
+
+DAEMON_FILE = TMP_DIR / "browsers.json"
+
+# Runs under Playwright's bundled Node; argv: <playwright-core dir> <options json>.
+_LAUNCH_SERVER_JS = """
+const { chromium } = require(process.argv[1]);
+(async () => {
+  const server = await chromium.launchServer(JSON.parse(process.argv[2]));
+  process.stdout.write(server.wsEndpoint() + "\\n");
+  const stop = () => server.close().finally(() => process.exit(0));
+  process.on("SIGTERM", stop);
+  process.stdin.on("end", stop);  // the daemon went away
+  process.stdin.resume();
+})().catch((err) => { console.error(err); process.exit(1); });
+"""
+
+
+UNSUPPORTED = (
+    "this Playwright does not expose the Node driver the pool starts browser servers with;"
+    " install the version requirements.txt pins"
+)
+
+
+def pool_supported() -> bool:
+    """Whether this Playwright has the driver entry point the pool relies on."""
+    return compute_driver_executable is not None
+
+
+@dataclass
+class BrowserServer:
+    process: asyncio.subprocess.Process
+    ws: str
+    started: float = field(default_factory=time.time)
+    active: int = 0  # outstanding leases
+    contexts: int = 0  # contexts reported back by released leases
+    draining: bool = False
+
+    @classmethod
+    async def start(cls, args: Sequence[str], timeout: float = 30.0) -> "BrowserServer":
+        if not pool_supported():
+            raise RuntimeError(UNSUPPORTED)
+        node, cli = compute_driver_executable()
+        options = {"headless": True, "args": list(args)}
+        process = await asyncio.create_subprocess_exec(
+            node,
+            "-e",
+            _LAUNCH_SERVER_JS,
+            str(Path(cli).parent),
+            json.dumps(options),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+        try:
+            line = await asyncio.wait_for(process.stdout.readline(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            raise RuntimeError("browser server did not report an endpoint") from None
+        ws = line.decode().strip()
+        if not ws.startswith("ws"):
+            raise RuntimeError(f"browser server failed to start (exit {process.returncode})")
+        return cls(process, ws)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def stop(self) -> None:
+        if self.alive:
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), 10)
+            except asyncio.TimeoutError:
+                self.process.kill()
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        size: int = 2,
+        *,
+        recycle_after: int = 200,
+        health_interval: float = 15.0,
+        args: Sequence[str] = (),
+    ):
+        self.size = max(1, size)
+        self.recycle_after = recycle_after
+        self.health_interval = health_interval
+        self.args = list(args)
+        self.servers: list[BrowserServer] = []
+        self.lock = asyncio.Lock()
+
+    async def fill(self) -> None:
+        async with self.lock:
+            self.servers = [s for s in self.servers if s.alive]
+            missing = self.size - sum(not s.draining for s in self.servers)
+            if missing > 0:
+                started = await asyncio.gather(*(BrowserServer.start(self.args) for _ in range(missing)))
+                self.servers.extend(started)
+
+    async def lease(self) -> str:
+        await self.fill()
+        ready = [s for s in self.servers if s.alive and not s.draining]
+        server = min(ready, key=lambda s: s.active)
+        server.active += 1
+        return server.ws
+
+    async def release(self, ws: str, contexts: int) -> None:
+        for server in self.servers:
+            if server.ws != ws:
+                continue
+            server.active = max(0, server.active - 1)
+            server.contexts += contexts
+            if server.contexts >= self.recycle_after:
+                server.draining = True
+        await self._retire()
+        await self.fill()
+
+    async def _retire(self) -> None:
+        done = [s for s in self.servers if s.draining and not s.active]
+        for server in done:
+            self.servers.remove(server)
+        await asyncio.gather(*(s.stop() for s in done))
+
+    async def check(self, pw: Playwright) -> None:
+        """Connect to each browser and open a context; replace the ones that fail."""
+        for server in list(self.servers):
+            if server.draining:
+                continue
+            try:
+                browser = await pw.chromium.connect(server.ws, timeout=5000)
+                context = await browser.new_context()
+                await context.close()
+                await browser.close()
+            except Error:
+                server.draining = True
+                server.active = 0
+                await server.stop()
+        await self._retire()
+        await self.fill()
+
+    def status(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "ws": s.ws,
+                "pid": s.process.pid,
+                "active": s.active,
+                "contexts": s.contexts,
+                "draining": s.draining,
+                "uptime": round(time.time() - s.started),
+            }
+            for s in self.servers
+        ]
+
+    async def close(self) -> None:
+        await asyncio.gather(*(s.stop() for s in self.servers))
+        self.servers = []
+
+
+async def serve(pool: BrowserPool, state_file: Path = DAEMON_FILE) -> None:
+    """Run the daemon until it is told to stop."""
+    stopped = asyncio.Event()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            message = json.loads(await reader.readline())
+            op = message.get("op")
+            if op == "lease":
+                reply: dict[str, Any] = {"ws": await pool.lease()}
+            elif op == "release":
+                await pool.release(message["ws"], int(message.get("contexts", 0)))
+                reply = {"ok": True}
+            elif op == "status":
+                reply = {"servers": pool.status()}
+            elif op == "stop":
+                stopped.set()
+                reply = {"ok": True}
+            else:
+                reply = {"error": f"unknown op {op!r}"}
+        except Exception as exc:  # a bad client must not take the daemon down
+            reply = {"error": str(exc)}
+        writer.write(json.dumps(reply).encode() + b"\n")
+        await writer.drain()
+        writer.close()
+
+    await pool.fill()
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    state_file.write_text(json.dumps({"pid": os.getpid(), "port": port}), encoding="utf-8")
+    print(f"browser pool of {pool.size} on port {port}")
+    try:
+        async with async_playwright() as pw:
+            while not stopped.is_set():
+                try:
+                    await asyncio.wait_for(stopped.wait(), pool.health_interval)
+                except asyncio.TimeoutError:
+                    await pool.check(pw)
+    finally:
+        server.close()
+        state_file.unlink(missing_ok=True)
+        await pool.close()
+
+
+# -- client -----------------------------------------------------------------
+
+
+async def request(op: str, state_file: Path = DAEMON_FILE, timeout: float = 30.0, **fields: Any) -> dict[str, Any] | None:
+    """Send one request to the daemon; None when no daemon is reachable."""
+    try:
+        port = json.loads(state_file.read_text(encoding="utf-8"))["port"]
+        reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), 1.0)
+    except (OSError, ValueError, KeyError, asyncio.TimeoutError):
+        return None
+    try:
+        writer.write(json.dumps({"op": op, **fields}).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await asyncio.wait_for(reader.readline(), timeout))
+    except (OSError, ValueError, asyncio.TimeoutError):
+        return None
+    finally:
+        writer.close()
+
+
+@dataclass
+class Lease:
+    browser: Browser
+    ws: str | None = None  # None: launched locally
+    contexts: int = 0
+
+    async def close(self) -> None:
+        await self.browser.close()
+        if self.ws is not None:
+            await request("release", ws=self.ws, contexts=self.contexts)
+
+
+async def acquire(pw: Playwright, *, headless: bool, args: Sequence[str], use_daemon: bool = True) -> Lease:
+    """A browser from the daemon when one is running, else a local launch."""
+    if use_daemon and headless:
+        reply = await request("lease")
+        if reply and "ws" in reply:
+            try:
+                return Lease(await pw.chromium.connect(reply["ws"]), reply["ws"])
+            except Error:
+                await request("release", ws=reply["ws"], contexts=0)
+    return Lease(await pw.chromium.launch(headless=headless, args=list(args)))
@@ -0,0 +1,992 @@
+"""Command-line entry point: ``python -m harness <command>``."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import dataclasses
+import fnmatch
+import shutil
+import time
+from pathlib import Path
+from typing import Sequence
+
+from .backend import BACKENDS_DIR, SEED_FILE, LocalBackend, LocalBackends
+from .browsers import UNSUPPORTED, BrowserPool, pool_supported, request as daemon_request, serve as serve_browsers
+from .config import PROJECT_ROOT, TESTS_DIR, TMP_DIR, base_url
+from .cpuprofile import (
+    CPU_PROFILE_FILE,
+    CpuProfile,
+    InspectorError,
+    format_diff,
+    format_profile,
+    profile_during,
+    save_profile,
+    write_collapsed,
+)
+from .dataset import (
+    DATASET_FILE,
+    DEFAULT_SIZES,
+    DatasetGenerator,
+    JsonSink,
+    NdjsonSink,
+    format_stats,
+    load_sizes,
+    write_dataset,
+)
+from .fixtures import GOLDEN_FILE, Fixtures
+from .har import HAR_DIR, HAR_MODES, HarRecorder, HarReplayer
+from .history import HISTORY_FILE, History, HistorySink, slope
+from .latency import BASELINE_FILE, LATENCY_FILE, LatencyRecorder, LatencyRun, compare
+from .leaks import DEFAULT_ROUTES, LEAKS_FILE, format_report, hunt
+from .load import SCENARIOS, LoadReport, Scenario, run_scenario
+from .logstats import LOGSTATS_FILE, SORT_KEYS, LogStats, format_logstats, read_logs
+from .replay import REPLAY_FILE, Replayer, format_replay, read_entries
+from .routes import app_tsx, client_routes
+from .runner import LAUNCH_ARGS, PASSED, Hook, SuiteRunner, TestResult
+from .scripts import TestCase, discover
+from .shards import ShardSpec, durations, format_plan, free_port, plan, run_sharded
+from .selection import ImpactSelector, ResultCache, build_hash
+from .sessions import AUTH_DIR, ROLES, SessionCache, SessionError
+from .soak import SOAK_FILE, Soak, format_soak
+from .vitals import (
+    BUDGETS_FILE,
+    VITALS_ALL_FILE,
+    VITALS_FILE,
+    VitalsRecorder,
+    check_budgets,
+    format_vitals,
+    load_budgets,
+)
+from .throttle import PROFILES_FILE, THROTTLE_DIR, Throttle, load_profiles
+from .trace import RequestIds, format_splits, join, read_log
+from .waterfall import (
+    WATERFALL_FILE,
+    WaterfallRecorder,
+    format_ranking,
+    format_waterfall,
+    load_waterfalls,
+    rank_endpoints,
+)
+from .waits import SLEEP_MODES, Settler
+
+
+def _print_results(results: Sequence[TestResult], wall: float) -> None:
+    for result in sorted(results, key=lambda r: r.case.key):
+        print(f"{result.status:<7} {result.duration:7.1f}s  {result.case.key}")
+        if result.error:
+            print(f"        {result.error.splitlines()[0]}")
+        for miss in result.details.get("har_misses", [])[:3]:
+            print(f"        not in HAR: {miss}")
+    passed = sum(r.passed for r in results)
+    serial = sum(r.duration for r in results)
+    print(
+        f"\n{passed}/{len(results)} passed in {wall:.1f}s wall"
+        f" ({serial:.1f}s of test time)"
+    )
+
+
+def _select_changed(args: argparse.Namespace, cases: list[TestCase]) -> list[TestCase]:
+    selector = ImpactSelector(args.tests_dir)
+    files = args.files or selector.changed_files(args.changed or None)
+    selection = selector.select(files, cases)
+    if selection.everything:
+        print(f"{len(files)} changed files reach shared code; selecting every case")
+    else:
+        print(f"{len(files)} changed files select {len(selection.cases)}/{len(cases)} cases")
+    return selection.cases
+
+
+def _cmd_run(args: argparse.Namespace) -> int:
+    cases = discover(args.tests_dir, args.patterns)
+    if args.changed is not None or args.files:
+        cases = _select_changed(args, cases)
+    if args.shard:
+        index, total = args.shard
+        cases = plan(cases, total, durations(cases))[index - 1].cases
+    if not cases:
+        print("no TC scripts matched")
+        return 2
+    if args.local and (args.sessions or args.har == "replay" or args.serve):
+        print("--local starts its own backends; drop --sessions, --har replay and --serve")
+        return 2
+    if args.fixtures and not args.local:
+        print("--fixtures restores snapshots on the in-memory backend; add --local")
+        return 2
+    if args.shards and (args.sessions or args.har):
+        # Shard processes install their own hooks; these would be dropped silently.
+        print("--shards does not support --sessions or --har; run without --shards")
+        return 2
+    if not args.no_vitals:
+        error = _route_table_error()
+        if error:
+            print(f"error: {error} (--no-vitals runs without it)")
+            return 1
+    if args.shards:
+        return _run_sharded(args, cases)
+    settler = Settler(upper_bound_ms=args.settle_timeout)
+    recorder = LatencyRecorder()
+    request_ids = RequestIds()
+    waterfall = WaterfallRecorder(request_id=request_ids.id_for)
+    hooks = [settler, recorder, request_ids, waterfall]
+    if args.sessions:
+        hooks.append(SessionCache())
+    if args.har == "record":
+        hooks.append(HarRecorder(args.har_dir))
+    elif args.har == "replay":
+        hooks.append(HarReplayer(args.har_dir, static_dir=args.static))
+    if not args.no_history:
+        hooks.append(HistorySink(artifacts=args.report, tests_dir=args.tests_dir))
+    vitals = None
+    if not args.no_vitals:
+        vitals = VitalsRecorder(app_tsx=app_tsx(PROJECT_ROOT))
+        hooks.append(vitals)
+    if args.cache:
+        cache = ResultCache(build_hash(PROJECT_ROOT))
+        cases, cached = cache.partition(cases)
+        for case in cached:
+            print(f"CACHED  {case.key}")
+        if not cases:
+            print(f"all {len(cached)} cases already passed against build {cache.build}")
+            return 0
+        hooks.append(cache)
+    runner = SuiteRunner(
+        concurrency=args.concurrency,
+        workers=args.workers,
+        headless=not args.headed,
+        hooks=hooks,
+        sleep=settler.script_sleep(args.sleeps),
+        test_timeout=args.test_timeout,
+        use_daemon=not args.no_daemon,
+    )
+    backends = None
+    if args.local:
+        # First, so every other hook sees the backends already up.
+        backends = LocalBackends(runner.workers, seed=args.seed, project_root=PROJECT_ROOT)
+        runner.hooks.insert(0, backends)
+        if args.fixtures:
+            runner.hooks.insert(1, Fixtures(backends.base_for, args.fixtures))
+    loop = asyncio.new_event_loop()
+    try:
+        started = loop.time()
+        results = loop.run_until_complete(runner.run(cases))
+        wall = loop.time() - started
+    except SessionError as exc:
+        print(f"error: {exc}")
+        return 1
+    finally:
+        loop.close()
+        if backends is not None:
+            backends.close()
+    _print_results(results, wall)
+    ranking = rank_endpoints(waterfall.steps)
+    if ranking:
+        print("\nendpoints by UI time (python -m harness waterfall for per-step detail)")
+        print(format_ranking(ranking, limit=5))
+    ok = all(r.passed for r in results)
+    if args.baseline:
+        ok = _gate(recorder.run, args.baseline, args.tolerance) and ok
+    if vitals is not None:
+        ok = _budget_gate(vitals.run, args.budgets) and ok
+    return 0 if ok else 1
+
+
+def _route_table_error() -> str | None:
+    """Why the served client's App.tsx cannot key vitals by route, if it cannot."""
+    try:
+        client_routes(app_tsx(PROJECT_ROOT))
+    except FileNotFoundError as exc:
+        return str(exc)
+    return None
+
+
+def _run_sharded(args: argparse.Namespace, cases: list[TestCase]) -> int:
+    cache = None
+    if args.cache:
+        cache = ResultCache(build_hash(PROJECT_ROOT))
+        cases, cached = cache.partition(cases)
+        for case in cached:
+            print(f"CACHED  {case.key}")
+        if not cases:
+            print(f"all {len(cached)} cases already passed against build {cache.build}")
+            return 0
+    estimates = durations(cases)
+    shards = [s for s in plan(cases, args.shards, estimates) if s.cases]
+    print(format_plan(shards, estimates).splitlines()[0])
+    specs = [
+        ShardSpec(
+            index=shard.index,
+            cases=shard.cases,
+            concurrency=args.concurrency,
+            sleeps=args.sleeps,
+            settle_timeout=args.settle_timeout,
+            test_timeout=args.test_timeout,
+            headless=not args.headed,
+            serve=args.serve,
+            local=args.local,
+            seed=args.seed,
+            fixtures=args.fixtures,
+            vitals=not args.no_vitals,
+            project_root=PROJECT_ROOT,
+        )
+        for shard in shards
+    ]
+    started = time.perf_counter()
+    results = run_sharded(specs)
+    wall = time.perf_counter() - started
+    # Hooks that only need results are fed here, once, rather than per shard.
+    hooks: list[Hook] = []
+    if not args.no_history:
+        hooks.append(HistorySink(artifacts=args.report, tests_dir=args.tests_dir))
+    if cache is not None:
+        hooks.append(cache)
+
+    async def record() -> None:
+        for hook in hooks:
+            await hook.on_run_start(cases)
+            for result in results:
+                await hook.on_finish(None, result.case, result)
+            await hook.on_run_end(results)
+
+    asyncio.run(record())
+    _print_results(results, wall)
+    # The same gates as an unsharded run, over what run_sharded merged.
+    ok = all(r.passed for r in results)
+    if args.baseline:
+        ok = _gate(LatencyRun.load(LATENCY_FILE), args.baseline, args.tolerance) and ok
+    if not args.no_vitals and VITALS_FILE.exists():
+        ok = _budget_gate(LatencyRun.load(VITALS_FILE), args.budgets) and ok
+    return 0 if ok else 1
+
+
+def _shard_arg(value: str) -> tuple[int, int]:
+    try:
+        index, total = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected I/K, e.g. 2/4") from None
+    if not 1 <= index <= total:
+        raise argparse.ArgumentTypeError("shard index must be between 1 and K")
+    return index, total
+
+
+def _cmd_shards(args: argparse.Namespace) -> int:
+    cases = discover(args.tests_dir, args.patterns)
+    estimates = durations(cases, runs=args.runs)
+    print(format_plan(plan(cases, args.k, estimates), estimates))
+    return 0
+
+
+def _budget_gate(run: LatencyRun, budgets_path: Path) -> bool:
+    violations = check_budgets(run, load_budgets(budgets_path))
+    for violation in violations:
+        print(f"OVER BUDGET {violation}")
+    return not violations
+
+
+def _gate(run: LatencyRun, baseline_path: Path, tolerance: float) -> bool:
+    if not baseline_path.exists():
+        print(f"no baseline at {baseline_path}; skipping the latency gate")
+        return True
+    regressions = compare(run, LatencyRun.load(baseline_path), tolerance=tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return not regressions
+
+
+def _cmd_latency(args: argparse.Namespace) -> int:
+    if args.save_baseline:
+        shutil.copyfile(args.run, args.baseline)
+        print(f"saved {args.run} as baseline {args.baseline}")
+        return 0
+    run = LatencyRun.load(args.run)
+    for kind, family in sorted(run.series.items()):
+        for key, hist in sorted(family.items()):
+            p = hist.percentiles()
+            print(f"{kind:<9} {hist.count:>6} p50 {p[50]:>8.1f} p95 {p[95]:>8.1f} p99 {p[99]:>8.1f}  {key}")
+    return 0 if _gate(run, args.baseline, args.tolerance) else 1
+
+
+def _cmd_select(args: argparse.Namespace) -> int:
+    cases = discover(args.tests_dir, args.patterns)
+    selector = ImpactSelector(args.tests_dir)
+    files = args.files or selector.changed_files(args.base)
+    selection = selector.select(files, cases)
+    for case in selection.cases:
+        print(case.key)
+        if args.why:
+            for reason in selection.reasons[case.key][:3]:
+                print(f"    {reason}")
+    if args.cache:
+        cache = ResultCache(build_hash(PROJECT_ROOT))
+        hits = [c.key for c in selection.cases if cache.hit(c)]
+        print(f"\n{len(hits)} of them already passed against build {cache.build}")
+    return 0
+
+
+def _cmd_history(args: argparse.Namespace) -> int:
+    if not args.db.exists():
+        print(f"no run history at {args.db}")
+        return 1
+    history = History(args.db)
+    try:
+        if args.query == "slowest":
+            for row in history.slowest(args.limit, args.runs):
+                print(f"{row['mean']:7.1f}s mean {row['worst']:7.1f}s worst {row['n']:>3} runs  {row['case_key']}")
+            if args.steps:
+                print()
+                for row in history.slowest_steps(args.limit, args.runs):
+                    print(f"{row['mean']:7.1f}s mean {row['worst']:7.1f}s worst  {row['case_key']} :: {row['name']}")
+        elif args.query == "streaks":
+            for key, n, error in history.failure_streaks(args.runs):
+                print(f"{n:>3} failing  {key}")
+                if error:
+                    print(f"           {error.splitlines()[0]}")
+        else:
+            keys = [k for k in history.case_keys() if not args.cases or any(fnmatch.fnmatch(k, p) for p in args.cases)]
+            for key in keys:
+                rows = history.trend(key, args.runs)
+                durations = [r["duration"] for r in rows]
+                marks = " ".join(f"{r['duration']:.1f}{'' if r['status'] == PASSED else '!'}" for r in rows)
+                print(f"{slope(durations):+6.2f}s/run  {key}\n             {marks}")
+    finally:
+        history.close()
+    return 0
+
+
+def _cmd_vitals(args: argparse.Namespace) -> int:
+    path = VITALS_ALL_FILE if args.all else args.run
+    if not path.exists():
+        print(f"no vitals at {path}")
+        return 1
+    run = LatencyRun.load(path)
+    print(f"p{args.pct:g} per route ({path.name})")
+    print(format_vitals(run, args.pct))
+    return 0 if _budget_gate(run, args.budgets) else 1
+
+
+def _cmd_throttle(args: argparse.Namespace) -> int:
+    profiles = load_profiles(args.profiles_file)
+    names = args.profile or list(profiles)
+    unknown = [name for name in names if name not in profiles]
+    if unknown:
+        print(f"unknown profile {', '.join(unknown)}; {args.profiles_file.name} has {', '.join(profiles)}")
+        return 2
+    cases = discover(args.tests_dir, args.patterns)
+    if not cases:
+        print("no TC scripts matched")
+        return 2
+    routes_file = app_tsx(PROJECT_ROOT)
+    error = _route_table_error()
+    if error:
+        print(f"error: {error}")
+        return 1
+    summary = []
+    ok = True
+    for name in names:
+        profile = profiles[name]
+        print(f"== {name}: {profile.label or 'no label'}")
+        settler = Settler(upper_bound_ms=args.settle_timeout)
+        vitals = VitalsRecorder(app_tsx=routes_file, path=profile.vitals_path(args.out), all_path=None)
+        runner = SuiteRunner(
+            concurrency=args.concurrency,
+            headless=not args.headed,
+            hooks=[settler, Throttle(profile), vitals],
+            sleep=settler.script_sleep("settle"),
+            test_timeout=args.test_timeout,
+        )
+        backends = None
+        if args.local:
+            backends = LocalBackends(runner.workers, seed=args.seed, project_root=PROJECT_ROOT)
+            runner.hooks.insert(0, backends)
+        started = time.perf_counter()
+        try:
+            results = asyncio.run(runner.run(cases))
+        finally:
+            if backends is not None:
+                backends.close()
+        wall = time.perf_counter() - started
+        _print_results(results, wall)
+        print(f"\np{args.pct:g} per route under {name} ({profile.vitals_path(args.out)})")
+        print(format_vitals(vitals.run, args.pct))
+        violations = check_budgets(vitals.run, profile.budgets, pct=args.pct)
+        for violation in violations:
+            print(f"OVER BUDGET [{name}] {violation}")
+        passed = sum(r.passed for r in results)
+        summary.append((name, passed, len(results), wall, len(violations)))
+        ok = ok and passed == len(results) and not violations
+        print()
+    print(f"{'profile':<20} {'passed':>9} {'wall':>8} {'over budget':>12}")
+    for name, passed, total, wall, over in summary:
+        print(f"{name:<20} {passed:>4}/{total:<4} {wall:>7.1f}s {over:>12}")
+    return 0 if ok else 1
+
+
+def _cmd_waterfall(args: argparse.Namespace) -> int:
+    if not args.file.exists():
+        print(f"no waterfall at {args.file}")
+        return 1
+    waterfalls = load_waterfalls(args.file)
+    if args.rank:
+        print(format_ranking(rank_endpoints(waterfalls), limit=args.limit))
+        return 0
+    for key, steps in waterfalls.items():
+        if not args.cases or any(fnmatch.fnmatch(key, p) for p in args.cases):
+            print(format_waterfall(key, steps))
+    return 0
+
+
+def _cmd_trace(args: argparse.Namespace) -> int:
+    for path in (args.waterfall, args.log):
+        if not path.exists():
+            print(f"no such file: {path}")
+            return 1
+    waterfalls = load_waterfalls(args.waterfall)
+    server = read_log(args.log)
+    splits = join(waterfalls, server, min_ms=args.min_ms)
+    calls = sum(len(s.calls) for s in splits)
+    joined = sum(s.joined for s in splits)
+    print(f"{len(splits)} steps over {args.min_ms:g} ms; {joined}/{calls} calls found in {args.log.name}\n")
+    print(format_splits(splits[: args.limit], calls=not args.steps_only))
+    return 0
+
+
+def _cmd_dataset(args: argparse.Namespace) -> int:
+    try:
+        sizes = load_sizes(args.sizes) if args.sizes else DEFAULT_SIZES
+    except (OSError, ValueError, TypeError) as exc:
+        print(f"error: {exc}")
+        return 1
+    generator = DatasetGenerator(args.tenants, sizes=sizes, seed=args.seed, chunk=args.chunk)
+    sink = NdjsonSink(args.ndjson) if args.ndjson else JsonSink(args.out)
+    print(format_stats(write_dataset(generator, sink)))
+    print(f"\nwrote {args.ndjson or args.out}")
+    return 0
+
+
+def _cmd_browsers(args: argparse.Namespace) -> int:
+    if args.action == "serve":
+        if not pool_supported():
+            print(f"error: {UNSUPPORTED}; runs launch their own browsers meanwhile")
+            return 1
+        pool = BrowserPool(
+            args.pool,
+            recycle_after=args.recycle,
+            health_interval=args.health_interval,
+            args=LAUNCH_ARGS,
+        )
+        try:
+            asyncio.run(serve_browsers(pool))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    reply = asyncio.run(daemon_request(args.action))
+    if reply is None:
+        print("no browser pool running")
+        return 1
+    for server in reply.get("servers", []):
+        state = "draining" if server["draining"] else "ready"
+        print(
+            f"pid {server['pid']:<7} {state:<8} {server['active']} leased"
+            f"  {server['contexts']} contexts  up {server['uptime']}s  {server['ws']}"
+        )
+    return 0
+
+
+def _cmd_sessions(args: argparse.Namespace) -> int:
+    cache = SessionCache(ttl=args.ttl)
+    try:
+        states = asyncio.run(cache.ensure(args.roles or list(ROLES), refresh=args.refresh))
+    except SessionError as exc:
+        print(f"error: {exc}")
+        return 1
+    for role, state in sorted(states.items()):
+        print(f"{role:<12} {len(state['cookies'])} cookies  {cache.path(role)}")
+    return 0
+
+
+def _cmd_leaks(args: argparse.Namespace) -> int:
+    if args.cycles <= args.warmup + 1:
+        print("--cycles must exceed --warmup by at least 2 to measure a slope")
+        return 2
+    backend = None
+    try:
+        # Inside the try: an interrupt during start-up still stops the server.
+        if args.local:
+            backend = LocalBackend(BACKENDS_DIR / "leaks.log", seed=args.seed, project_root=PROJECT_ROOT)
+            backend.__enter__()
+        # A local backend gets its own session cache: its port changes every run.
+        cache = SessionCache(base=backend.base, cache_dir=AUTH_DIR / "local") if backend else SessionCache()
+        state = asyncio.run(cache.ensure([args.role]))[args.role]
+        report = asyncio.run(
+            hunt(
+                cache.base,
+                state,
+                routes=args.routes,
+                cycles=args.cycles,
+                warmup=args.warmup,
+                snapshot_every=args.snapshot_every,
+                threshold_kb=args.threshold_kb,
+                headless=not args.headed,
+            )
+        )
+    except SessionError as exc:
+        print(f"error: {exc}")
+        return 1
+    finally:
+        if backend is not None:
+            backend.__exit__()
+    report.save(args.out)
+    print(format_report(report))
+    return 1 if report.leaking else 0
+
+
+async def _load(scenario: Scenario, cache: SessionCache, args: argparse.Namespace, inspect_port: int | None) -> LoadReport:
+    # Sign in before any profiling: bcrypt at login would otherwise top the profile.
+    await cache.ensure([scenario.role])
+    work = run_scenario(
+        scenario, base=cache.base, cookies=cache.cookies(scenario.role), connections=args.connections, seed=args.seed
+    )
+    if inspect_port is None:
+        return await work
+    report, profile = await profile_during(inspect_port, work, interval_us=args.sampling_interval)
+    save_profile(profile, args.cpu_profile)
+    return report
+
+
+def _cmd_load(args: argparse.Namespace) -> int:
+    scenario = SCENARIOS[args.scenario]
+    overrides = {k: getattr(args, k) for k in ("rate", "duration") if getattr(args, k)}
+    scenario = dataclasses.replace(scenario, **overrides)
+    if args.cpu_profile and not (args.local or args.inspect):
+        print("--cpu-profile needs --local, or --inspect with the port of a server started with --inspect")
+        return 2
+    backend = None
+    try:
+        # Inside the try: an interrupt during start-up still stops the server.
+        if args.local:
+            backend = LocalBackend(
+                BACKENDS_DIR / "load.log",
+                seed=args.local_seed,
+                project_root=PROJECT_ROOT,
+                inspect_port=free_port() if args.cpu_profile else None,
+            )
+            backend.__enter__()
+        cache = SessionCache(base=backend.base, cache_dir=AUTH_DIR / "local") if backend else SessionCache()
+        inspect_port = (backend.inspect_port if backend else args.inspect) if args.cpu_profile else None
+        report = asyncio.run(_load(scenario, cache, args, inspect_port))
+    except (SessionError, InspectorError) as exc:
+        print(f"error: {exc}")
+        return 1
+    finally:
+        if backend is not None:
+            backend.__exit__()
+    print(report.format())
+    if args.cpu_profile:
+        print()
+        print(format_profile(CpuProfile.load(args.cpu_profile, PROJECT_ROOT), limit=15))
+        print(f"\nCPU profile written to {args.cpu_profile}")
+    run = LatencyRun(meta={"scenario": scenario.name})
+    for name, stats in report.endpoints.items():
+        run.histogram("endpoints", name).merge(stats.latency)
+    run.save(TMP_DIR / "latency_load.json")
+    failures = report.check()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+def _duration_arg(value: str) -> float:
+    """Seconds from ``90``, ``90s``, ``30m`` or ``4h``."""
+    units = {"s": 1, "m": 60, "h": 3600}
+    scale = units.get(value[-1:].lower())
+    try:
+        seconds = float(value[:-1] if scale else value) * (scale or 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a duration like 90s, 30m or 4h, got {value!r}") from None
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError("duration must be positive")
+    return seconds
+
+
+def _cmd_cpuprofile(args: argparse.Namespace) -> int:
+    missing = [str(path) for path in (args.profile, args.diff) if path and not path.exists()]
+    if missing:
+        print(f"no such file: {', '.join(missing)}")
+        return 1
+    try:
+        profile = CpuProfile.load(args.profile, PROJECT_ROOT)
+        base = CpuProfile.load(args.diff, PROJECT_ROOT) if args.diff else None
+    except (ValueError, KeyError) as exc:
+        print(f"error: not a .cpuprofile: {exc}")
+        return 1
+    if args.collapsed:
+        write_collapsed(profile, args.collapsed)
+        print(f"collapsed stacks written to {args.collapsed}")
+    if base is not None:
+        print(format_diff(base, profile, limit=args.top))
+    else:
+        print(format_profile(profile, by=args.by, limit=args.top))
+    return 0
+
+
+def _cmd_logstats(args: argparse.Namespace) -> int:
+    missing = [str(path) for path in args.logs if not path.exists()]
+    if missing:
+        print(f"no such file: {', '.join(missing)}")
+        return 1
+    if args.step > args.window:
+        print("--step must not exceed --window")
+        return 2
+    stats = LogStats(window=args.window, step=args.step, min_count=args.min_count, max_routes=args.max_routes)
+    stats.consume(read_logs(args.logs))
+    stats.save(args.out)
+    if args.prom:
+        stats.write_prometheus(args.prom)
+    print(format_logstats(stats, sort=args.sort, limit=args.top))
+    return 0 if stats.lines else 1
+
+
+def _cmd_replay(args: argparse.Namespace) -> int:
+    missing = [str(path) for path in args.logs if not path.exists()]
+    if missing:
+        print(f"no such file: {', '.join(missing)}")
+        return 1
+    backend = None
+    try:
+        # Inside the try: an interrupt during start-up still stops the server.
+        if args.local:
+            backend = LocalBackend(BACKENDS_DIR / "replay.log", seed=args.seed, project_root=PROJECT_ROOT)
+            backend.__enter__()
+        target = backend.base if backend else args.target or base_url()
+        replayer = Replayer(target, speed=args.speed, limit=args.limit, connections=args.connections)
+        report = asyncio.run(replayer.run(read_entries(args.logs)))
+    finally:
+        if backend is not None:
+            backend.__exit__()
+    report.save(args.out)
+    print(format_replay(report))
+    return 0 if report.sent else 1
+
+
+def _cmd_soak(args: argparse.Namespace) -> int:
+    if args.window > args.duration:
+        print("--window must not exceed --duration")
+        return 2
+    backend = None
+    soak = None
+    try:
+        # Inside the try: an interrupt during start-up still stops the server.
+        if args.local:
+            backend = LocalBackend(BACKENDS_DIR / "soak.log", seed=args.seed, project_root=PROJECT_ROOT)
+            backend.__enter__()
+        cache = SessionCache(base=backend.base, cache_dir=AUTH_DIR / "local") if backend else SessionCache()
+        soak = Soak(
+            cache.base,
+            cache,
+            role=args.role,
+            duration=args.duration,
+            window=args.window,
+            rate=args.rate,
+            browser=not args.no_browser,
+            headless=not args.headed,
+            availability_target=args.availability,
+            max_rss_drift=args.max_rss_drift,
+            path=args.out,
+        )
+        report = asyncio.run(soak.run())
+    except SessionError as exc:
+        print(f"error: {exc}")
+        return 1
+    except KeyboardInterrupt:
+        if soak is None:
+            return 130
+        # Windows are saved as they close; report what was measured.
+        report = soak.report
+    finally:
+        if backend is not None:
+            backend.__exit__()
+    print(format_soak(report))
+    failures = report.check()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m harness")
+    parser.add_argument(
+        "--tests-dir",
+        type=Path,
+        default=TESTS_DIR,
+        help="directory holding the TC*.py scripts (default: %(default)s)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run TC scripts concurrently")
+    run.add_argument("patterns", nargs="*", help="file-name globs, e.g. TC00[1-3]*")
+    run.add_argument("-j", "--concurrency", type=int, help="tests in flight (default: CPU count)")
+    run.add_argument("--workers", type=int, help="browser processes (default: one per 4 tests in flight)")
+    run.add_argument("--test-timeout", type=float, default=300, help="per-test limit in seconds")
+    run.add_argument(
+        "--sleeps",
+        choices=SLEEP_MODES,
+        default="settle",
+        help="what the scripts' fixed 3 s sleeps become: a readiness wait capped"
+        " at the original sleep, nothing, or the original sleep (default: %(default)s)",
+    )
+    run.add_argument("--settle-timeout", type=float, default=10_000, help="upper bound for any readiness wait, ms")
+    run.add_argument("--headed", action="store_true", help="show the browser windows")
+    run.add_argument(
+        "--sessions",
+        action="store_true",
+        help="start role-mapped cases signed in, from the tmp/auth storage-state cache",
+    )
+    run.add_argument(
+        "--changed",
+        nargs="?",
+        const="",
+        metavar="REF",
+        help="only cases impacted by uncommitted changes, plus commits since REF if given",
+    )
+    run.add_argument("--files", nargs="+", help="only cases impacted by these project-relative files")
+    run.add_argument(
+        "--cache",
+        action="store_true",
+        help="skip cases that already passed with the same script and app build",
+    )
+    run.add_argument(
+        "--har",
+        choices=HAR_MODES,
+        help="record each case's /api/* traffic, or replay it instead of calling the backend",
+    )
+    run.add_argument("--har-dir", type=Path, default=HAR_DIR, help="HAR directory (default: %(default)s)")
+    run.add_argument("--static", type=Path, help="with --har replay, serve the app shell from this built client")
+    run.add_argument("--no-daemon", action="store_true", help="launch browsers even if a warm pool is running")
+    run.add_argument("--shard", type=_shard_arg, metavar="I/K", help="run only shard I of a K-way duration-balanced plan")
+    run.add_argument("--shards", type=int, metavar="K", help="run a K-way plan on local worker processes")
+    run.add_argument(
+        "--serve",
+        metavar="CMD",
+        help="with --shards, start CMD (e.g. 'npx tsx server/index.ts') per shard with PORT set to a free port",
+    )
+    run.add_argument(
+        "--local",
+        action="store_true",
+        help="start the server on seeded in-memory storage, one per browser worker (or per shard)",
+    )
+    run.add_argument("--seed", type=Path, default=SEED_FILE, help="with --local, the seed data (default: %(default)s)")
+    run.add_argument(
+        "--fixtures",
+        type=Path,
+        nargs="?",
+        const=GOLDEN_FILE,
+        metavar="DATASET",
+        help="with --local, snapshot DATASET once per backend and restore it for every test"
+        " (default: %(const)s)",
+    )
+    run.add_argument("--no-history", action="store_true", help="do not record the run in tmp/history.sqlite")
+    run.add_argument(
+        "--report",
+        action="store_true",
+        help="also rewrite TestSprite's tmp/test_results.json and tmp/raw_report.md from the history",
+    )
+    run.add_argument("--no-vitals", action="store_true", help="skip Web Vitals capture and the budget gate")
+    run.add_argument("--budgets", type=Path, default=BUDGETS_FILE, help="per-route vitals budgets (default: %(default)s)")
+    run.add_argument("--baseline", type=Path, help="fail if p95/p99 regressed against this latency file")
+    run.add_argument("--tolerance", type=float, default=0.10, help="allowed relative growth (default: %(default)s)")
+    run.set_defaults(func=_cmd_run)
+
+    select = commands.add_parser("select", help="list the cases a change set impacts")
+    select.add_argument("patterns", nargs="*", help="restrict to these file-name globs")
+    select.add_argument("--base", metavar="REF", help="also include commits since REF (default: uncommitted only)")
+    select.add_argument("--files", nargs="+", help="use these project-relative files instead of git")
+    select.add_argument("--why", action="store_true", help="show which changed files selected each case")
+    select.add_argument("--cache", action="store_true", help="report how many selected cases are cached passes")
+    select.set_defaults(func=_cmd_select)
+
+    history = commands.add_parser("history", help="query the run history")
+    history.add_argument(
+        "query",
+        choices=("slowest", "streaks", "trend"),
+        help="slowest cases, current failure streaks, or per-case duration trends",
+    )
+    history.add_argument("cases", nargs="*", help="case-key globs for trend (default: all)")
+    history.add_argument("--runs", type=int, default=10, help="look at the last N runs (default: %(default)s)")
+    history.add_argument("--limit", type=int, default=10, help="rows to show for slowest")
+    history.add_argument("--steps", action="store_true", help="also rank individual steps")
+    history.add_argument("--db", type=Path, default=HISTORY_FILE, help="history database (default: %(default)s)")
+    history.set_defaults(func=_cmd_history)
+
+    vitals = commands.add_parser("vitals", help="show per-route Web Vitals and check them against the budgets")
+    vitals.add_argument("--run", type=Path, default=VITALS_FILE, help="vitals file of the run (default: %(default)s)")
+    vitals.add_argument("--all", action="store_true", help="use the aggregate of every recorded run instead")
+    vitals.add_argument("--pct", type=float, default=75, help="percentile to report (default: %(default)s)")
+    vitals.add_argument("--budgets", type=Path, default=BUDGETS_FILE, help="budget file (default: %(default)s)")
+    vitals.set_defaults(func=_cmd_vitals)
+
+    throttle = commands.add_parser(
+        "throttle", help="run cases under CDP network/CPU throttling profiles and check per-profile budgets"
+    )
+    throttle.add_argument("patterns", nargs="*", help="file-name globs, e.g. 'TC00[1-3]*' (default: all)")
+    throttle.add_argument(
+        "-p",
+        "--profile",
+        action="append",
+        help="profile to run; repeat for several (default: every profile in the file)",
+    )
+    throttle.add_argument(
+        "--profiles-file", type=Path, default=PROFILES_FILE, help="profiles and budgets (default: %(default)s)"
+    )
+    throttle.add_argument(
+        "-j", "--concurrency", type=int, default=2, help="tests in flight; CPU throttling is relative to the host (default: %(default)s)"
+    )
+    throttle.add_argument("--test-timeout", type=float, default=600, help="per-test limit in seconds")
+    throttle.add_argument("--settle-timeout", type=float, default=30_000, help="upper bound for any readiness wait, ms")
+    throttle.add_argument("--pct", type=float, default=75, help="percentile checked against the budgets (default: %(default)s)")
+    throttle.add_argument("--out", type=Path, default=THROTTLE_DIR, help="per-profile vitals directory (default: %(default)s)")
+    throttle.add_argument("--headed", action="store_true", help="show the browser windows")
+    throttle.add_argument("--local", action="store_true", help="start seeded in-memory backends, as run --local does")
+    throttle.add_argument("--seed", type=Path, default=SEED_FILE, help="with --local, the seed data (default: %(default)s)")
+    throttle.set_defaults(func=_cmd_throttle)
+
+    waterfall = commands.add_parser("waterfall", help="show per-step /api waterfalls of the last run")
+    waterfall.add_argument("cases", nargs="*", help="case-key globs (default: all)")
+    waterfall.add_argument("--rank", action="store_true", help="rank endpoints by UI time across the suite instead")
+    waterfall.add_argument("--limit", type=int, default=15, help="rows to show with --rank")
+    waterfall.add_argument("--file", type=Path, default=WATERFALL_FILE, help="waterfall file (default: %(default)s)")
+    waterfall.set_defaults(func=_cmd_waterfall)
+
+    trace = commands.add_parser("trace", help="split slow steps into network, handler and client time")
+    trace.add_argument("log", type=Path, help="server output containing requestLogger lines")
+    trace.add_argument("--waterfall", type=Path, default=WATERFALL_FILE, help="waterfall of the run (default: %(default)s)")
+    trace.add_argument("--min-ms", type=float, default=500, help="only steps at least this long (default: %(default)s)")
+    trace.add_argument("--limit", type=int, default=20, help="steps to show")
+    trace.add_argument("--steps-only", action="store_true", help="omit the per-call lines")
+    trace.set_defaults(func=_cmd_trace)
+
+    shards = commands.add_parser("shards", help="show the duration-balanced shard plan")
+    shards.add_argument("patterns", nargs="*", help="restrict to these file-name globs")
+    shards.add_argument("-k", type=int, default=4, help="number of shards (default: %(default)s)")
+    shards.add_argument("--runs", type=int, default=10, help="average durations over the last N runs")
+    shards.set_defaults(func=_cmd_shards)
+
+    dataset = commands.add_parser("dataset", help="generate a synthetic multi-tenant dataset for importAllData.js")
+    dataset.add_argument("-n", "--tenants", type=int, default=100, help="clubs to generate (default: %(default)s)")
+    dataset.add_argument("--out", type=Path, default=DATASET_FILE, help="JSON file in the importer's layout (default: %(default)s)")
+    dataset.add_argument("--ndjson", type=Path, metavar="DIR", help="write one <table>.ndjson per table into DIR instead")
+    dataset.add_argument("--sizes", type=Path, help="JSON file overriding the per-table size distributions")
+    dataset.add_argument("--seed", type=int, default=0, help="random seed; the same seed gives the same data (default: %(default)s)")
+    dataset.add_argument("--chunk", type=int, default=100_000, help="rows generated per batch (default: %(default)s)")
+    dataset.set_defaults(func=_cmd_dataset)
+
+    browsers = commands.add_parser("browsers", help="run or query the warm browser pool")
+    browsers.add_argument("action", choices=("serve", "status", "stop"))
+    browsers.add_argument("--pool", type=int, default=2, help="browsers kept warm (default: %(default)s)")
+    browsers.add_argument("--recycle", type=int, default=200, help="replace a browser after this many contexts")
+    browsers.add_argument("--health-interval", type=float, default=15, help="seconds between health checks")
+    browsers.set_defaults(func=_cmd_browsers)
+
+    sessions = commands.add_parser("sessions", help="build or refresh the per-role session cache")
+    sessions.add_argument(
+        "roles", nargs="*", metavar="ROLE", help=f"one of {', '.join(ROLES)} (default: all)"
+    )
+    sessions.add_argument("--refresh", action="store_true", help="sign in again even if the cache is valid")
+    sessions.add_argument("--ttl", type=float, default=12 * 3600, help="seconds a cached session is trusted without probing")
+    sessions.set_defaults(func=_cmd_sessions)
+
+    leaks = commands.add_parser("leaks", help="cycle through the app's routes and report heap growth per cycle")
+    leaks.add_argument(
+        "routes", nargs="*", default=list(DEFAULT_ROUTES), help=f"routes to cycle through (default: {' '.join(DEFAULT_ROUTES)})"
+    )
+    leaks.add_argument("-n", "--cycles", type=int, default=10, help="passes over the routes (default: %(default)s)")
+    leaks.add_argument("--warmup", type=int, default=2, help="leading cycles left out of the slope (default: %(default)s)")
+    leaks.add_argument("--snapshot-every", type=int, default=5, help="cycles between heap snapshots (default: %(default)s)")
+    leaks.add_argument(
+        "--threshold-kb", type=float, default=256, help="fail above this heap growth per cycle (default: %(default)s)"
+    )
+    leaks.add_argument("--role", choices=sorted(ROLES), default="club_admin", help="who signs in (default: %(default)s)")
+    leaks.add_argument("--out", type=Path, default=LEAKS_FILE, help="report file (default: %(default)s)")
+    leaks.add_argument("--headed", action="store_true", help="show the browser window")
+    leaks.add_argument("--local", action="store_true", help="start a seeded in-memory backend, as run --local does")
+    leaks.add_argument("--seed", type=Path, default=SEED_FILE, help="with --local, the seed data (default: %(default)s)")
+    leaks.set_defaults(func=_cmd_leaks)
+
+    load = commands.add_parser("load", help="generate open-loop API load and gate on latency")
+    load.add_argument("scenario", nargs="?", default="key-endpoints", choices=sorted(SCENARIOS))
+    load.add_argument("--rate", type=float, help="arrivals per second (default: the scenario's)")
+    load.add_argument("--duration", type=float, help="seconds of load (default: the scenario's)")
+    load.add_argument("--connections", type=int, default=64, help="keep-alive pool size")
+    load.add_argument("--seed", type=int, help="seed the arrival process for repeatable runs")
+    load.add_argument("--local", action="store_true", help="load a seeded in-memory backend the harness starts")
+    load.add_argument("--local-seed", type=Path, default=SEED_FILE, help="with --local, the seed data (default: %(default)s)")
+    load.add_argument(
+        "--cpu-profile",
+        type=Path,
+        nargs="?",
+        const=CPU_PROFILE_FILE,
+        metavar="PATH",
+        help="profile the server's CPU during the load and write a .cpuprofile (default: %(const)s)",
+    )
+    load.add_argument("--inspect", type=int, metavar="PORT", help="without --local, the inspector port of the server to profile")
+    load.add_argument("--sampling-interval", type=int, default=1000, help="profiler sampling interval in microseconds (default: %(default)s)")
+    load.set_defaults(func=_cmd_load)
+
+    cpuprofile = commands.add_parser("cpuprofile", help="summarize a .cpuprofile: hot functions, files, flamegraph stacks, diffs")
+    cpuprofile.add_argument("profile", type=Path, help="a .cpuprofile, e.g. from load --cpu-profile")
+    cpuprofile.add_argument("--by", choices=("function", "file"), default="function", help="group self time by (default: %(default)s)")
+    cpuprofile.add_argument("--top", type=int, default=25, help="rows to print (default: %(default)s)")
+    cpuprofile.add_argument("--collapsed", type=Path, help="also write folded stacks here, for flamegraph.pl, inferno or speedscope")
+    cpuprofile.add_argument("--diff", type=Path, metavar="BASE", help="compare against this earlier profile instead")
+    cpuprofile.set_defaults(func=_cmd_cpuprofile)
+
+    logstats = commands.add_parser("logstats", help="per-route latency, throughput and errors from requestLogger output")
+    logstats.add_argument("logs", nargs="+", type=Path, help="server logs with requestLogger lines; .gz is read as gzip")
+    logstats.add_argument("--window", type=_duration_arg, default=300.0, help="sliding window length (default: 5m)")
+    logstats.add_argument("--step", type=_duration_arg, default=60.0, help="how far the window slides (default: 1m)")
+    logstats.add_argument("--sort", choices=SORT_KEYS, default="time", help="rank routes by total handler time, a percentile, requests or 5xx (default: %(default)s)")
+    logstats.add_argument("--top", type=int, default=25, help="routes to print (default: %(default)s)")
+    logstats.add_argument("--min-count", type=int, default=20, help="requests a window or route needs for its percentiles to rank (default: %(default)s)")
+    logstats.add_argument("--max-routes", type=int, default=500, help="routes tracked before the rest fold into OTHER (default: %(default)s)")
+    logstats.add_argument("--out", type=Path, default=LOGSTATS_FILE, help="report file (default: %(default)s)")
+    logstats.add_argument("--prom", type=Path, help="also write a Prometheus textfile here, e.g. for node_exporter")
+    logstats.set_defaults(func=_cmd_logstats)
+
+    replay = commands.add_parser("replay", help="replay requestLogger traffic against a server and compare latency per route")
+    replay.add_argument("logs", nargs="+", type=Path, help="server logs with requestLogger lines, oldest first")
+    replay.add_argument("--target", help="server to replay against (default: the configured base URL)")
+    replay.add_argument("--speed", type=float, default=1.0, help="time compression: 10 replays an hour in 6 minutes (default: %(default)s)")
+    replay.add_argument("--limit", type=int, help="stop after this many requests")
+    replay.add_argument("--connections", type=int, default=8, help="keep-alive connections per tenant (default: %(default)s)")
+    replay.add_argument("--out", type=Path, default=REPLAY_FILE, help="report file (default: %(default)s)")
+    replay.add_argument("--local", action="store_true", help="replay against a seeded in-memory backend")
+    replay.add_argument("--seed", type=Path, default=SEED_FILE, help="with --local, the seed data (default: %(default)s)")
+    replay.set_defaults(func=_cmd_replay)
+
+    soak = commands.add_parser("soak", help="run mixed API and browser traffic for hours and report drift per window")
+    soak.add_argument("--duration", type=_duration_arg, default=3600.0, help="how long to run, e.g. 90m or 4h (default: 1h)")
+    soak.add_argument("--window", type=_duration_arg, default=60.0, help="sampling window, e.g. 60s or 5m (default: 60s)")
+    soak.add_argument("--rate", type=float, default=2.0, help="API flows started per second (default: %(default)s)")
+    soak.add_argument("--role", choices=sorted(ROLES), default="club_admin", help="who signs in (default: %(default)s)")
+    soak.add_argument(
+        "--availability", type=float, default=99.9, help="fail below this percentage of successful requests (default: %(default)s)"
+    )
+    soak.add_argument("--max-rss-drift", type=float, help="fail when server RSS grows faster than this many MB per hour")
+    soak.add_argument("--no-browser", action="store_true", help="API traffic only, without the long-lived tab")
+    soak.add_argument("--out", type=Path, default=SOAK_FILE, help="report file (default: %(default)s)")
+    soak.add_argument("--headed", action="store_true", help="show the browser window")
+    soak.add_argument("--local", action="store_true", help="start a seeded in-memory backend, as run --local does")
+    soak.add_argument("--seed", type=Path, default=SEED_FILE, help="with --local, the seed data (default: %(default)s)")
+    soak.set_defaults(func=_cmd_soak)
+
+    latency = commands.add_parser("latency", help="show a run's latency histograms and diff them against a baseline")
+    latency.add_argument("--run", type=Path, default=LATENCY_FILE, help="latency file of the run (default: %(default)s)")
+    latency.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="baseline latency file (default: %(default)s)")
+    latency.add_argument("--tolerance", type=float, default=0.10, help="allowed relative growth of p95/p99")
+    latency.add_argument("--save-baseline", action="store_true", help="promote the run to the new baseline")
+    latency.set_defaults(func=_cmd_latency)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,52 @@
+"""Paths and endpoints shared by the harness modules."""
+
+from __future__ import annotations
+
+import json
+import os
+from contextvars import ContextVar
+from pathlib import Path
+
+HARNESS_DIR = Path(__file__).resolve().parent
+TESTS_DIR = HARNESS_DIR.parent
+# The repository the harness ships in, with server/ and NexusSuite/client.
+# --tests-dir may point at a mirror of the scripts elsewhere (such as
+# NexusSuite/testsprite_tests); the app under test still runs from here.
+PROJECT_ROOT = TESTS_DIR.parent
+TMP_DIR = TESTS_DIR / "tmp"
+
+# Every generated script hard-codes this origin in its page.goto() call.
+DEFAULT_BASE_URL = "http://localhost:5000"
+
+# The origin a hook gave the running case (``run --local``'s per-worker
+# backend); set by the runner for the case's task only.
+CASE_BASE: ContextVar[str | None] = ContextVar("CASE_BASE", default=None)
+
+
+def base_url(tests_dir: Path = TESTS_DIR) -> str:
+    """Return the app origin under test.
+
+    The running case's own backend wins, then ``NEXUS_BASE_URL``, then the
+    ``localEndpoint`` TestSprite recorded in tmp/config.json, then the origin
+    the scripts were generated against.
+    """
+    case = CASE_BASE.get()
+    if case:
+        return case.rstrip("/")
+    env = os.environ.get("NEXUS_BASE_URL")
+    if env:
+        return env.rstrip("/")
+    try:
+        with open(tests_dir / "tmp" / "config.json", encoding="utf-8") as fh:
+            endpoint = json.load(fh).get("localEndpoint")
+    except (OSError, ValueError):
+        endpoint = None
+    return (endpoint or DEFAULT_BASE_URL).rstrip("/")
+
+
+def rebase(url: str, base: str | None = None) -> str:
+    """Point a script's hard-coded ``DEFAULT_BASE_URL`` at the app under test."""
+    base = base or base_url()
+    if base != DEFAULT_BASE_URL and url.startswith(DEFAULT_BASE_URL):
+        return base + url[len(DEFAULT_BASE_URL):]
+    return url
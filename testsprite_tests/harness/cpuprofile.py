@@ -0,0 +1,373 @@
+"""Where the server spends its CPU: V8 profiles over the inspector, summarized.
+
+A load run says an endpoint got slower, not why. With ``load --cpu-profile``
+the harness starts server/index.ts with ``--inspect`` on a free port, then
+attaches over the Chrome DevTools Protocol. It calls ``Profiler.start``
+when the arrivals begin and ``Profiler.stop`` when they end, so start-up and
+sign-in stay out of the profile. The ``.cpuprofile`` it writes opens in
+Chrome DevTools or speedscope as it is.
+
+``python -m harness cpuprofile FILE`` reads one and prints:
+
+* self and total time per function -- self is time on top of the stack;
+  total counts each sample once per function below it, recursion included;
+* ``--by file`` -- self time per source file, node internals and
+  node_modules included, so a dependency's share shows at a glance;
+* ``--collapsed OUT`` -- one ``frame;frame;frame microseconds`` line per
+  stack, the input flamegraph.pl, inferno and speedscope take;
+* ``--diff BASE`` -- each function's share of busy time in BASE and FILE,
+  ranked by the change. Shares, unlike milliseconds, compare runs of
+  different length or rate.
+
+Sample weights come from ``timeDeltas``, not a nominal interval: V8 samples
+late when the thread is busy. ``(idle)`` time is reported but left out of
+the shares. ``(program)`` and ``(garbage collector)`` stay in them.
+
+No WebSocket package is needed. The inspector speaks plain RFC 6455, and
+``Inspector`` implements the little of it that CDP needs on the standard
+library's streams.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import os
+import struct
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Iterator, TypeVar
+from urllib.parse import unquote, urlsplit
+
+import httpx
+
+from .config import PROJECT_ROOT, TMP_DIR
+
+CPU_PROFILE_FILE = TMP_DIR / "load.cpuprofile"
+
+T = TypeVar("T")
+
+IDLE = "(idle)"
+ROOT = "(root)"
+
+
+class InspectorError(RuntimeError):
+    pass
+
+
+class Inspector:
+    """One CDP session with a Node process started with ``--inspect``.
+
+    Calls go one at a time; events are read and dropped while waiting for
+    a reply. That is enough for the Profiler domain, which sends none
+    unless console.profile() is used.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+
+    @classmethod
+    async def connect(cls, port: int, host: str = "127.0.0.1", timeout: float = 10.0) -> Inspector:
+        async with httpx.AsyncClient(timeout=timeout) as http:
+            try:
+                targets = (await http.get(f"http://{host}:{port}/json/list")).json()
+            except httpx.HTTPError as exc:
+                raise InspectorError(f"no inspector on {host}:{port}: {exc}") from exc
+        if not targets:
+            raise InspectorError(f"the inspector on {host}:{port} lists no targets")
+        url = urlsplit(targets[0]["webSocketDebuggerUrl"])
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(url.hostname, url.port), timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        writer.write(
+            (
+                f"GET {url.path} HTTP/1.1\r\nHost: {url.netloc}\r\nUpgrade: websocket\r\n"
+                f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+            ).encode()
+        )
+        await writer.drain()
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+        status = head.split(b"\r\n", 1)[0].decode(errors="replace")
+        if " 101 " not in status:
+            writer.close()
+            raise InspectorError(f"websocket upgrade refused: {status}")
+        return cls(reader, writer)
+
+    async def __aenter__(self) -> Inspector:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        try:
+            await self._send_frame(0x8, struct.pack("!H", 1000))
+        except (ConnectionError, RuntimeError):
+            pass
+        self.writer.close()
+
+    async def call(self, method: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        self.next_id += 1
+        message = {"id": self.next_id, "method": method, "params": params or {}}
+        await self._send_frame(0x1, json.dumps(message).encode())
+        while True:
+            reply = json.loads(await self._receive())
+            if reply.get("id") != self.next_id:
+                continue  # an event
+            if "error" in reply:
+                raise InspectorError(f"{method}: {reply['error'].get('message', reply['error'])}")
+            return reply.get("result", {})
+
+    # -- RFC 6455, client side -------------------------------------------
+
+    async def _send_frame(self, opcode: int, payload: bytes) -> None:
+        # Client frames must be masked; FIN is always set, nothing is fragmented.
+        mask = os.urandom(4)
+        size = len(payload)
+        if size < 126:
+            header = struct.pack("!BB", 0x80 | opcode, 0x80 | size)
+        elif size < 1 << 16:
+            header = struct.pack("!BBH", 0x80 | opcode, 0x80 | 126, size)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 0x80 | 127, size)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        self.writer.write(header + mask + masked)
+        await self.writer.drain()
+
+    async def _receive(self) -> bytes:
+        """The next complete text message; pings are answered on the way."""
+        message = bytearray()
+        while True:
+            first, second = await self.reader.readexactly(2)
+            size = second & 0x7F
+            if size == 126:
+                (size,) = struct.unpack("!H", await self.reader.readexactly(2))
+            elif size == 127:
+                (size,) = struct.unpack("!Q", await self.reader.readexactly(8))
+            mask = await self.reader.readexactly(4) if second & 0x80 else b""
+            payload = await self.reader.readexactly(size)
+            if mask:
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+            opcode = first & 0x0F
+            if opcode == 0x8:
+                raise InspectorError("the inspector closed the connection")
+            if opcode == 0x9:
+                await self._send_frame(0xA, payload)
+                continue
+            if opcode == 0xA:
+                continue
+            message += payload
+            if first & 0x80:
+                return bytes(message)
+
+
+async def profile_during(
+    port: int, work: Awaitable[T], *, interval_us: int = 1000, host: str = "127.0.0.1"
+) -> tuple[T, dict[str, Any]]:
+    """Await ``work`` with the V8 sampling profiler running in the process on ``port``.
+
+    Returns ``work``'s result and the raw profile. If ``work`` raises, the
+    profiler is still stopped and the error propagates.
+    """
+    async with await Inspector.connect(port, host) as inspector:
+        await inspector.call("Profiler.enable")
+        await inspector.call("Profiler.setSamplingInterval", {"interval": interval_us})
+        await inspector.call("Profiler.start")
+        try:
+            result = await work
+        finally:
+            profile = (await inspector.call("Profiler.stop"))["profile"]
+            await inspector.call("Profiler.disable")
+    return result, profile
+
+
+def save_profile(profile: dict[str, Any], path: Path = CPU_PROFILE_FILE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(profile), encoding="utf-8")
+    tmp.replace(path)
+
+
+# -- analysis -----------------------------------------------------------------
+
+
+def _display_file(url: str, root: Path) -> str:
+    if not url:
+        return "(native)"
+    if url.startswith("file://"):
+        path = unquote(urlsplit(url).path)
+        try:
+            return str(Path(path).relative_to(root))
+        except ValueError:
+            return path
+    return url  # node:internal/..., evalmachine, ...
+
+
+@dataclass(frozen=True)
+class Frame:
+    function: str
+    file: str
+    line: int  # 1-based; 0 when V8 has none
+
+    @property
+    def meta(self) -> bool:
+        """``(program)``, ``(idle)``, ``(garbage collector)`` and the like."""
+        return self.function.startswith("(") and self.file == "(native)"
+
+    @property
+    def location(self) -> str:
+        return self.file if self.meta or not self.line else f"{self.file}:{self.line}"
+
+    @property
+    def name(self) -> str:
+        """The frame as a flamegraph label, without the line, so it survives edits."""
+        return self.function if self.meta else f"{self.function} ({self.file})"
+
+
+class CpuProfile:
+    """A parsed ``.cpuprofile``: V8's call tree, with sample time per node."""
+
+    def __init__(self, data: dict[str, Any], root: Path = PROJECT_ROOT):
+        self.frames: dict[int, Frame] = {}
+        self.parent: dict[int, int] = {}
+        for node in data["nodes"]:
+            call = node["callFrame"]
+            self.frames[node["id"]] = Frame(
+                function=call.get("functionName") or "(anonymous)",
+                file=_display_file(call.get("url", ""), root),
+                line=call.get("lineNumber", -1) + 1,
+            )
+            for child in node.get("children", ()):
+                self.parent[child] = node["id"]
+        self.start_us = data["startTime"]
+        self.end_us = data["endTime"]
+        self.samples = len(data.get("samples", ()))
+        # A sample lasts until the next one; the last one until endTime.
+        self.self_us: dict[int, float] = defaultdict(float)
+        samples, deltas = data.get("samples", []), data.get("timeDeltas", [])
+        stamps, t = [], self.start_us
+        for delta in deltas:
+            t += delta
+            stamps.append(t)
+        for i, node_id in enumerate(samples):
+            until = stamps[i + 1] if i + 1 < len(stamps) else self.end_us
+            self.self_us[node_id] += max(0, until - stamps[i])
+
+    @classmethod
+    def load(cls, path: Path, root: Path = PROJECT_ROOT) -> CpuProfile:
+        return cls(json.loads(path.read_text(encoding="utf-8")), root)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_us - self.start_us) / 1000
+
+    @property
+    def idle_ms(self) -> float:
+        return sum(us for n, us in self.self_us.items() if self.frames[n].function == IDLE) / 1000
+
+    @property
+    def busy_ms(self) -> float:
+        return sum(self.self_us.values()) / 1000 - self.idle_ms
+
+    def stack(self, node_id: int) -> list[Frame]:
+        """Frames from the outermost call to ``node_id``, without ``(root)``."""
+        frames = []
+        while node_id in self.frames:
+            frame = self.frames[node_id]
+            if frame.function != ROOT:
+                frames.append(frame)
+            node_id = self.parent.get(node_id, -1)
+        return frames[::-1]
+
+    def self_time(self) -> dict[Frame, float]:
+        times: dict[Frame, float] = defaultdict(float)
+        for node_id, us in self.self_us.items():
+            times[self.frames[node_id]] += us / 1000
+        return times
+
+    def total_time(self) -> dict[Frame, float]:
+        times: dict[Frame, float] = defaultdict(float)
+        for node_id, us in self.self_us.items():
+            for frame in set(self.stack(node_id)):
+                times[frame] += us / 1000
+        return times
+
+    def by_file(self) -> dict[str, float]:
+        times: dict[str, float] = defaultdict(float)
+        for frame, ms in self.self_time().items():
+            if frame.function != IDLE:
+                times[frame.file] += ms
+        return times
+
+    def shares(self) -> dict[str, float]:
+        """Each function's share of busy time, keyed by ``Frame.name``."""
+        busy = self.busy_ms or 1.0
+        shares: dict[str, float] = defaultdict(float)
+        for frame, ms in self.self_time().items():
+            if frame.function != IDLE:
+                shares[frame.name] += ms / busy
+        return shares
+
+    def collapsed(self) -> Iterator[str]:
+        """Brendan Gregg's folded stacks, weighted in microseconds."""
+        folded: dict[str, float] = defaultdict(float)
+        for node_id, us in self.self_us.items():
+            stack = self.stack(node_id)
+            if stack and us:
+                # ';' separates frames; a name containing one would split a frame.
+                folded[";".join(f.name.replace(";", ",") for f in stack)] += us
+        for stack, us in sorted(folded.items()):
+            yield f"{stack} {round(us)}"
+
+
+def write_collapsed(profile: CpuProfile, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        for line in profile.collapsed():
+            fh.write(line + "\n")
+
+
+def format_profile(profile: CpuProfile, by: str = "function", limit: int = 25) -> str:
+    busy = profile.busy_ms or 1.0
+    lines = [
+        f"{profile.duration_ms / 1000:.1f} s profiled, {profile.samples} samples;"
+        f" busy {profile.busy_ms:.0f} ms, idle {profile.idle_ms:.0f} ms",
+        "",
+    ]
+    if by == "file":
+        lines.append(f"{'self ms':>9} {'self%':>6}  file")
+        for file, ms in sorted(profile.by_file().items(), key=lambda kv: -kv[1])[:limit]:
+            lines.append(f"{ms:>9.1f} {100 * ms / busy:>6.1f}  {file}")
+        return "\n".join(lines)
+    total = profile.total_time()
+    lines.append(f"{'self ms':>9} {'self%':>6} {'total ms':>9} {'total%':>7}  function")
+    ranked = sorted(
+        ((f, ms) for f, ms in profile.self_time().items() if f.function != IDLE), key=lambda kv: -kv[1]
+    )
+    for frame, ms in ranked[:limit]:
+        lines.append(
+            f"{ms:>9.1f} {100 * ms / busy:>6.1f} {total[frame]:>9.1f} {100 * total[frame] / busy:>7.1f}"
+            f"  {frame.function}  {frame.location}"
+        )
+    return "\n".join(lines)
+
+
+def format_diff(base: CpuProfile, head: CpuProfile, limit: int = 25) -> str:
+    """Functions whose share of busy time moved most between two profiles."""
+    before, after = base.shares(), head.shares()
+    changes = sorted(
+        ((name, before.get(name, 0.0), after.get(name, 0.0)) for name in before.keys() | after.keys()),
+        key=lambda row: (-abs(row[2] - row[1]), row[0]),
+    )
+    lines = [
+        f"busy {base.busy_ms:.0f} ms -> {head.busy_ms:.0f} ms"
+        f" ({base.duration_ms / 1000:.1f} s -> {head.duration_ms / 1000:.1f} s profiled); shares of busy time",
+        "",
+        f"{'base%':>6} {'head%':>6} {'Δ pp':>7}  function",
+    ]
+    for name, was, now in changes[:limit]:
+        lines.append(f"{100 * was:>6.1f} {100 * now:>6.1f} {100 * (now - was):>+7.1f}  {name}")
+    return "\n".join(lines)
@@ -0,0 +1,661 @@
+"""Synthetic club data at production cardinalities, for src/scripts/importAllData.js.
+
+local_seed.json and golden_dataset.json hold a handful of rows each: enough
+to test behaviour, too few for storage and endpoint latency. Those only
+show up once a tenant has thousands of transactions and audit-log entries.
+``python -m harness dataset`` generates M tenants in one pass. Every tenant
+gets rows in these tables:
+* users, staff, rosters and payroll;
+* tournaments, rounds and matches;
+* campaigns and contracts;
+* wallets and transactions;
+* social accounts with a daily metrics series;
+* audit logs and invites.
+Columns and vocabularies follow shared/schema.ts.
+
+How many children each parent row gets is drawn per parent from a
+configurable distribution (``Size``: Poisson, log-normal or fixed). The
+defaults give a long tail: most clubs are small and a few are large.
+``--sizes`` overrides them from a JSON file.
+
+Rows are generated column-wise with NumPy, ``chunk`` rows at a time. Every
+value is pre-formatted into a per-table template string. Python never builds
+a dict per row, which is what makes millions of rows take seconds rather
+than minutes. Output goes to either of the layouts importAllData.js reads:
+
+* one JSON file ``{"data": {"tenants": [...], "users": [...], ...}}``,
+  written table by table as it is generated;
+* a directory with one ``<collection>.ndjson`` per table, which the importer
+  streams line by line, for datasets too big for one ``JSON.parse``.
+
+Generated users have no usable password hash and cannot sign in. The
+suite's accounts come from the seed files and sessions.py.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping, Sequence
+
+import numpy as np
+
+from .config import TMP_DIR
+
+DATASET_FILE = TMP_DIR / "dataset.json"
+DEFAULT_CHUNK = 100_000
+
+# Timestamps fall in this window, so runs with the same seed are identical.
+EPOCH_START = np.datetime64("2024-01-01T00:00:00", "ms").astype(np.int64)
+EPOCH_END = np.datetime64("2026-01-01T00:00:00", "ms").astype(np.int64)
+DAY_MS = 86_400_000
+
+# Not a bcrypt hash: generated users are data, not accounts.
+NO_PASSWORD = "!generated"
+
+
+@dataclass(frozen=True)
+class Size:
+    """How many child rows each parent row gets."""
+
+    mean: float
+    dist: str = "poisson"  # poisson, lognormal or fixed
+    sigma: float = 0.6  # log-normal only
+    min: int = 0
+    max: int | None = None
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        if self.dist == "fixed":
+            counts = np.full(n, round(self.mean), dtype=np.int64)
+        elif self.dist == "lognormal":
+            # Parameterised so the mean stays ``mean`` whatever the spread.
+            mu = np.log(max(self.mean, 1e-9)) - self.sigma**2 / 2
+            counts = np.rint(rng.lognormal(mu, self.sigma, n)).astype(np.int64)
+        elif self.dist == "poisson":
+            counts = rng.poisson(self.mean, n).astype(np.int64)
+        else:
+            raise ValueError(f"unknown size distribution {self.dist!r}")
+        return np.clip(counts, self.min, self.max if self.max is not None else None)
+
+
+# table -> (parent table, children per parent row)
+DEFAULT_SIZES: dict[str, tuple[str, Size]] = {
+    "users": ("tenants", Size(3, min=1, max=20)),
+    "staff": ("tenants", Size(25, "lognormal", 0.7, min=1, max=400)),
+    "wallets": ("tenants", Size(3, min=1, max=10)),
+    "rosters": ("tenants", Size(12, "lognormal", 0.5, min=0, max=100)),
+    "payroll": ("staff", Size(12, "poisson", min=0, max=52)),
+    "tournaments": ("tenants", Size(8, "lognormal", 0.8, min=0, max=200)),
+    "tournamentRounds": ("tournaments", Size(4, min=1, max=8)),
+    "matches": ("tournamentRounds", Size(4, "lognormal", 0.6, min=1, max=64)),
+    "campaigns": ("tenants", Size(6, "lognormal", 0.6, max=100)),
+    "contracts": ("tenants", Size(20, "lognormal", 0.7, max=500)),
+    "transactions": ("wallets", Size(250, "lognormal", 1.0, max=20_000)),
+    "socialAccounts": ("tenants", Size(3, min=0, max=6)),
+    "socialMetrics": ("socialAccounts", Size(90, "fixed")),
+    "auditLogs": ("tenants", Size(500, "lognormal", 1.0, max=50_000)),
+    "invites": ("tenants", Size(4, min=0, max=50)),
+}
+
+# Generation order: every parent before its children.
+TABLES = ("tenants", *DEFAULT_SIZES)
+
+# Other tables point at a row of these in the same tenant (``pick``, ``owner``),
+# so every tenant needs at least one.
+REFERENCED = ("users", "staff", "wallets")
+
+
+def load_sizes(path: Path) -> dict[str, tuple[str, Size]]:
+    """DEFAULT_SIZES with the tables in ``path`` overridden: ``{"staff": {"mean": 40, ...}}``."""
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    sizes = dict(DEFAULT_SIZES)
+    for table, spec in data.items():
+        if table not in sizes:
+            raise ValueError(f"unknown table {table!r} in {path}")
+        sizes[table] = (sizes[table][0], Size(**spec))
+    for table in REFERENCED:
+        if sizes[table][1].min < 1:
+            raise ValueError(f"{table} needs min >= 1 in {path}: other tables reference a row of it in every tenant")
+    return sizes
+
+
+FIRST_NAMES = (
+    "Alex", "Jordan", "Sam", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn",
+    "Kai", "Rowan", "Elliot", "Hayden", "Reese", "Sasha", "Noa", "Mika", "Yuki", "Lena",
+    "Omar", "Ines", "Mateo", "Priya", "Chen", "Aisha", "Lucas", "Sofia", "Ivan", "Zara",
+)
+LAST_NAMES = (
+    "Kim", "Park", "Nguyen", "Silva", "Novak", "Larsen", "Okafor", "Rossi", "Haddad", "Kowalski",
+    "Tanaka", "Mendes", "Schmidt", "Dubois", "Ortiz", "Ahmed", "Jensen", "Moreau", "Costa", "Berg",
+)
+CLUB_WORDS = ("Nova", "Apex", "Vortex", "Phantom", "Titan", "Eclipse", "Vanguard", "Inferno", "Zenith", "Rogue")
+CLUB_TAGS = tuple(word[:3].upper() for word in CLUB_WORDS)
+CLUB_SUFFIX = ("Esports", "Gaming", "Club", "Academy", "Collective")
+GAMES = ("Valorant", "League of Legends", "Counter-Strike 2", "Dota 2", "Rocket League", "Overwatch 2", "Fortnite")
+ROLES = ("player", "manager", "staff", "analyst", "marcom", "finance", "admin")
+ROLE_WEIGHTS = (0.55, 0.1, 0.1, 0.08, 0.07, 0.05, 0.05)
+PERMISSIONS = {
+    "player": '["view_tournaments","view_rosters"]',
+    "manager": '["view_tournaments","manage_tournaments","manage_rosters","view_staff"]',
+    "staff": '["view_tournaments","view_staff"]',
+    "analyst": '["view_analytics","view_tournaments"]',
+    "marcom": '["manage_campaigns","view_social"]',
+    "finance": '["view_finance","manage_finance","view_payroll"]',
+    "admin": '["manage_staff","manage_finance","manage_tournaments","view_audit_logs"]',
+}
+
+
+@dataclass
+class Chunk:
+    """Rows ``rows`` of one table, with their parent row and position under it."""
+
+    rows: np.ndarray
+    parent: np.ndarray
+    pos: np.ndarray
+    tenant: np.ndarray
+
+    @property
+    def n(self) -> int:
+        return len(self.rows)
+
+
+# One output field: (key, format with one "{}" per value list, value lists).
+Field = tuple[str, str, Sequence[Sequence[Any]]]
+
+
+def _template(fields: Sequence[Field]) -> str:
+    return "{{" + ",".join(f'"{key}":{fmt}' for key, fmt, _ in fields) + "}}"
+
+
+def render(fields: Sequence[Field]) -> list[str]:
+    """One JSON object per row, from column-wise values."""
+    columns = [column for _, _, values in fields for column in values]
+    return list(map(_template(fields).format, *columns))
+
+
+@dataclass
+class TableStats:
+    rows: int = 0
+    seconds: float = 0.0
+
+
+class DatasetGenerator:
+    def __init__(
+        self,
+        tenants: int,
+        *,
+        sizes: Mapping[str, tuple[str, Size]] = DEFAULT_SIZES,
+        seed: int = 0,
+        chunk: int = DEFAULT_CHUNK,
+    ):
+        self.tenants = tenants
+        self.sizes = dict(sizes)
+        self.rng = np.random.default_rng(seed)
+        self.chunk = chunk
+        # Per table: row offsets of each parent's children, and the tenant of every row.
+        self.offsets: dict[str, np.ndarray] = {}
+        self.tenant_of: dict[str, np.ndarray] = {"tenants": np.arange(tenants, dtype=np.int64)}
+        # Columns later tables read back, e.g. the game of every tournament.
+        self.kept: dict[str, np.ndarray] = {}
+        self.stats: dict[str, TableStats] = {}
+
+    # -- shared helpers ----------------------------------------------------
+
+    def choice(self, vocab: Sequence[str], n: int, p: Sequence[float] | None = None) -> list[str]:
+        return np.asarray(vocab, dtype=object)[self.rng.choice(len(vocab), n, p=p)].tolist()
+
+    def dates(self, n: int, start: int | np.ndarray = EPOCH_START, end: int | np.ndarray = EPOCH_END) -> list[str]:
+        ms = self.rng.integers(start, end, n) if np.isscalar(start) else start
+        return _iso(ms)
+
+    def money(self, values: np.ndarray) -> tuple[list[int], list[int]]:
+        cents = np.rint(np.abs(values) * 100).astype(np.int64)
+        return (cents // 100).tolist(), (cents % 100).tolist()
+
+    def owner(self, tenant: np.ndarray) -> np.ndarray:
+        """Row of each tenant's owner: its first user."""
+        return self.offsets["users"][tenant]
+
+    def pick(self, table: str, tenant: np.ndarray) -> np.ndarray:
+        """A random row of ``table`` belonging to each tenant; ``table`` is one of REFERENCED."""
+        start = self.offsets[table][tenant]
+        count = self.offsets[table][tenant + 1] - start
+        return start + (self.rng.random(len(tenant)) * count).astype(np.int64)
+
+    # -- generation --------------------------------------------------------
+
+    def tables(self) -> Iterator[tuple[str, Iterator[list[str]]]]:
+        """(table, chunks of JSON rows) for every table, parents first."""
+        for table in TABLES:
+            yield table, self._chunks(table)
+
+    def _chunks(self, table: str) -> Iterator[list[str]]:
+        started = time.perf_counter()
+        stats = self.stats.setdefault(table, TableStats())
+        if table == "tenants":
+            total = self.tenants
+            parent_table = None
+        else:
+            parent_table, size = self.sizes[table]
+            counts = size.sample(self.rng, len(self.tenant_of[parent_table]))
+            offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+            np.cumsum(counts, out=offsets[1:])
+            self.offsets[table] = offsets
+            total = int(offsets[-1])
+            self.tenant_of[table] = np.empty(total, dtype=np.int64)
+        build: Callable[[Chunk], list[Field]] = getattr(self, f"_{table}")
+        for a in range(0, total, self.chunk):
+            rows = np.arange(a, min(a + self.chunk, total), dtype=np.int64)
+            if parent_table is None:
+                parent, pos, tenant = rows, np.zeros_like(rows), rows
+            else:
+                offsets = self.offsets[table]
+                parent = np.searchsorted(offsets, rows, side="right") - 1
+                pos = rows - offsets[parent]
+                tenant = self.tenant_of[parent_table][parent]
+                self.tenant_of[table][rows] = tenant
+            lines = render(build(Chunk(rows, parent, pos, tenant)))
+            stats.rows += len(lines)
+            yield lines
+        stats.seconds += time.perf_counter() - started
+
+
+    def parent_row(self, table: str, rows: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.offsets[table], rows, side="right") - 1
+
+    def keep(self, table: str, column: str, rows: np.ndarray, values: np.ndarray) -> None:
+        key = f"{table}.{column}"
+        if key not in self.kept:
+            self.kept[key] = np.zeros(len(self.tenant_of[table]), dtype=values.dtype)
+        self.kept[key][rows] = values
+
+    # -- tables ------------------------------------------------------------
+    # One method per table, named after it: the fields of a chunk of rows.
+
+    def _tenants(self, c: Chunk) -> list[Field]:
+        words = self.rng.integers(0, len(CLUB_WORDS), c.n)
+        suffix = self.rng.integers(0, len(CLUB_SUFFIX), c.n)
+        return [
+            ("id", '"t_{}"', [c.rows.tolist()]),
+            ("name", '"{} {} {}"', [_pick(CLUB_WORDS, words), _pick(CLUB_SUFFIX, suffix), c.rows.tolist()]),
+            ("clubTag", '"{}{}"', [_pick(CLUB_TAGS, words), (c.rows % 100).tolist()]),
+            ("region", '"{}"', [self.choice(("NA", "EU", "APAC", "LATAM", "MENA"), c.n, (0.35, 0.35, 0.15, 0.1, 0.05))]),
+            ("subscriptionPlan", '"{}"', [self.choice(("starter", "growth", "enterprise"), c.n, (0.6, 0.3, 0.1))]),
+            ("subscriptionStatus", '"{}"', [self.choice(("active", "trial", "suspended", "canceled"), c.n, (0.8, 0.12, 0.03, 0.05))]),
+            ("createdAt", '"{}Z"', [self.dates(c.n)]),
+        ]
+
+    def _users(self, c: Chunk) -> list[Field]:
+        first, last = _names(c.rows)
+        others = self.choice(("admin", "manager", "staff", "finance", "analyst"), c.n)
+        role = np.where(c.pos == 0, "owner", np.asarray(others, dtype=object)).tolist()
+        return [
+            ("id", '"u_{}"', [c.rows.tolist()]),
+            ("email", '"user{}@t{}.example.com"', [c.rows.tolist(), c.tenant.tolist()]),
+            ("password", f'"{NO_PASSWORD}"', []),
+            ("firstName", '"{}"', [first]),
+            ("lastName", '"{}"', [last]),
+            ("tenantId", '"t_{}"', [c.tenant.tolist()]),
+            ("role", '"{}"', [role]),
+            ("isSuperAdmin", "false", []),
+            ("isTemporaryPassword", "false", []),
+            ("createdAt", '"{}Z"', [self.dates(c.n)]),
+        ]
+
+    def _staff(self, c: Chunk) -> list[Field]:
+        first, last = _names(c.rows)
+        role = self.rng.choice(len(ROLES), c.n, p=ROLE_WEIGHTS)
+        self.keep("staff", "role", c.rows, role.astype(np.int8))
+        return [
+            ("id", '"s_{}"', [c.rows.tolist()]),
+            ("tenantId", '"t_{}"', [c.tenant.tolist()]),
+            ("name", '"{} {}"', [first, last]),
+            ("email", '"staff{}@t{}.example.com"', [c.rows.tolist(), c.tenant.tolist()]),
+            ("phone", '"+1-555-{:04d}"', [(c.rows % 10_000).tolist()]),
+            ("role", '"{}"', [_pick(ROLES, role)]),
+            ("permissions", "{}", [_pick([PERMISSIONS[r] for r in ROLES], role)]),
+            ("status", '"{}"', [self.choice(("active", "suspended"), c.n, (0.96, 0.04))]),
+            ("createdAt", '"{}Z"', [self.dates(c.n)]),
+        ]
+
+    def _wallets(self, c: Chunk) -> list[Field]:
+        names = ("Main account", "Prize winnings", "Sponsorship", "Payroll", "Petty cash", "Travel")
+        return [
+            ("id", '"w_{}"', [c.rows.tolist()]),
+            ("tenantId", '"t_{}"', [c.tenant.tolist()]),
+            ("name", '"{}"', [_pick(names, c.pos % len(names))]),
+            ("type", '"{}"', [self.choice(("bank", "cash", "card", "paypal", "crypto"), c.n, (0.5, 0.15, 0.2, 0.1, 0.05))]),
+            ("currency", '"{}"', [self.choice(("usd", "eur", "gbp"), c.n, (0.6, 0.3, 0.1))]),
+            ("balance", '"{}.{:02d}"', self.money(self.rng.lognormal(8, 1.2, c.n))),
+            ("isDefault", "{}", [np.where(c.pos == 0, "true", "false").tolist()]),
+            ("createdAt", '"{}Z"', [self.dates(c.n)]),
+        ]
+
+    def _rosters(self, c: Chunk) -> list[Field]:
+        return [
+            ("id", '"ro_{}"', [c.rows.tolist()]),
+            ("tenantId", '"t_{}"', [c.tenant.tolist()]),
+            ("playerId", '"s_{}"', [self.pick("staff", c.tenant).tolist()]),
+            ("game", '"{}"', [self.choice(GAMES, c.n)]),
+            ("role", '"{}"', [self.choice(("Player", "Sub", "Coach", "Analyst"), c.n, (0.7, 0.15, 0.1, 0.05))]),
+            ("createdAt", '"{}Z"', [self.dates(c.n)]),
+        ]
+
+    def _payroll(self, c: Chunk) -> list[Field]:
+        first, last = _names(c.parent)
+        role = self.kept["staff.role"][c.parent]
+        # One entry per month per staff member, a few days either way.
+        date = EPOCH_START + c.pos * 30 * DAY_MS + self.rng.integers(0, 3 * DAY_MS, c.n)
+        return [
+            ("id", '"pa_{}"', [c.rows.tolist()]),
+            ("tenantId", '"t_{}"', [c.tenant.tolist()]),
+            ("staffId", '"s_{}"', [c.parent.tolist()]),
+            ("name", '"{} {}"', [first, last]),
+            ("role", '"{}"', [_pick(ROLES, role)]),
+            ("amount", '"{}.{:02d}"', self.money(self.rng.lognormal(7.6, 0.5, c.n))),
+            ("type", '"{}"', [self.choice(("monthly", "weekly", "one-time"), c.n, (0.75, 0.15, 0.1))]),
+            ("status", '"{}"', [self.choice(("paid", "pending"), c.n, (0.85, 0.15))]),
+            ("date", '"{}Z"', [_iso(date)]),
+            ("walletId", '"w_{}"', [self.pick("wallets", c.tenant).tolist()]),
+            ("createdBy", '"u_{}"', [self.owner(c.tenant).tolist()]),
+            ("createdAt", '"{}Z"', [_iso(date)]),
+        ]
+
+    def _tournaments(self, c: Chunk) -> list[Field]:
+        names = ("Spring Cup", "Summer Series", "Autumn Clash", "Winter Invitational", "Open Qualifier", "League Season")
+        game = self.rng.integers(0, len(GAMES), c.n).astype(np.int8)
+        start = self.rng.integers(EPOCH_START, EPOCH_END, c.n)
+        self.keep("tournaments", "game", c.rows, game)
+        self.keep("tournaments", "start", c.rows, start)
+        formats = ("single_elimination", "double_elimination", "round_robin", "league", "custom")
+        return [
+            ("id", '"tr_{}"', [c.rows.tolist()]),
+            ("tenantId", '"t_{}"', [c.tenant.tolist()]),
+            ("name", '"{} #{}"', [self.choice(names, c.n), (c.pos + 1).tolist()]),
+            ("game", '"{}"', [_pick(GAMES, game)]),
+            ("format", '"{}"', [self.choice(formats, c.n, (0.4, 0.2, 0.2, 0.15, 0.05))]),
+            ("startDate", '"{}Z"', [_iso(start)]),
+            ("endDate", '"{}Z"', [_iso(start + self.rng.integers(1, 30, c.n) * DAY_MS)]),
+            ("prizePool", '"{}.{:02d}"', self.money(self.rng.lognormal(7, 1.5, c.n))),
+            ("status", '"{}"', [self.choice(("upcoming", "ongoing", "completed", "cancelled"), c.n, (0.3, 0.1, 0.55, 0.05))]),
+            ("maxTeams", "{}", [self.choice(("8", "16", "32", "64"), c.n)]),
+            ("createdAt", '"{}Z"', [_iso(start - 30 * DAY_MS)]),
+        ]
+
+    def _tournamentRounds(self, c: Chunk) -> list[Field]:
+        start = self.kept["tournaments.start"][c.parent] + c.pos * DAY_MS
+        return [
+            ("id", '"rd_{}"', [c.rows.tolist()]),
+            ("tournamentId", '"tr_{}"', [c.parent.tolist()]),
+            ("name", '"Round {}"', [(c.pos + 1).tolist()]),
+            ("roundNumber", "{}", [(c.pos + 1).tolist()]),
+            ("format", '"{}"', [self.choice(("bracket", "group", "best_of_3", "best_of_5"), c.n)]),
+            ("startDate", '"{}Z"', [_iso(start)]),
+            ("status", '"{}"', [self.choice(("upcoming", "ongoing", "completed"), c.n, (0.3, 0.1, 0.6))]),
+            ("createdAt", '"{}Z"', [_iso(start - DAY_MS)]),
+        ]
+
+    def _matches(self, c: Chunk) -> list[Field]:
+        tournament = self.parent_row("tournamentRounds", c.parent)
+        a = self.rng.integers(0, len(TEAMS), c.n)
+        b = (a + self.rng.integers(1, len(TEAMS), c.n)) % len(TEAMS)
+        date = self.kept["tournaments.start"][tournament] + self.rng.integers(0, 14 * DAY_MS, c.n)
+        return [
+            ("id", '"m_{}"', [c.rows.tolist()]),
+            ("tenantId", '"t_{}"', [c.tenant.tolist()]),
+            ("tournamentId", '"tr_{}"', [tournament.tolist()]),
+            ("roundId", '"rd_{}"', [c.parent.tolist()]),
+            ("teamA", '"{}"', [_pick(TEAMS, a)]),
+            ("teamB", '"{}"', [_pick(TEAMS, b)]),
+            ("scoreA", "{}", [self.rng.integers(0, 17, c.n).tolist()]),
+            ("scoreB", "{}", [self.rng.integers(0, 17, c.n).tolist()]),
+            ("date", '"{}Z"', [_iso(date)]),
+            ("game", '"{}"', [_pick(GAMES, self.kept["tournaments.game"][tournament])]),
+            ("matchNumber", "{}", [(c.pos + 1).tolist()]),
+            ("status", '"{}"', [self.choice(("upcoming", "live", "completed"), c.n, (0.3, 0.05, 0.65))]),
+            ("createdAt", '"{}Z"', [_iso(date - 7 * DAY_MS)]),
+        ]
+
+    def _campaigns(self, c: Chunk) -> list[Field]:
+        titles = ("Season launch", "Roster reveal", "Merch drop", "Tournament hype", "Sponsor spotlight", "Fan meetup")
+        platforms = ('["twitter","instagram"]', '["youtube"]', '["tiktok","instagram"]', '["twitter","youtube","twitch"]')
+        start = self.rng.integers(EPOCH_START, EPOCH_END, c.n)
+        return [
+            ("id", '"c_{}"', [c.rows.tolist()]),
+            ("tenantId", '"t_{}"', [c.tenant.tolist()]),
+            ("title", '"{} {}"', [self.choice(titles, c.n), (c.pos + 1).tolist()]),
+            ("description", '"Generated campaign"', []),
+            ("startDate", '"{}Z"', [_iso(start)]),
+            ("endDate", '"{}Z"', [_iso(start + self.rng.integers(3, 60, c.n) * DAY_MS)]),
+            ("platforms", "{}", [self.choice(platforms, c.n)]),
+            ("reach", "{}", [np.rint(self.rng.lognormal(9, 1.2, c.n)).astype(np.int64).tolist()]),
+            ("engagement", '"{}.{:02d}"', self.money(self.rng.uniform(0.5, 12, c.n))),
+            ("status", '"{}"', [self.choice(("active", "completed", "scheduled"), c.n, (0.2, 0.65, 0.15))]),
+            ("createdAt", '"{}Z"', [_iso(start - 7 * DAY_MS)]),
+        ]
+
+    def _contracts(self, c: Chunk) -> list[Field]:
+        first, last = _names(self.pick("staff", c.tenant))
+        return [
+            ("id", '"ct_{}"', [c.rows.tolist()]),
+            ("tenantId", '"t_{}"', [c.tenant.tolist()]),
+            ("fileName", '"contract_{}.pdf"', [c.rows.tolist()]),
+            ("fileUrl", '"https://files.example.com/contracts/{}.pdf"', [c.rows.tolist()]),
+            ("type", '"{}"', [self.choice(("Player", "Staff", "Sponsor"), c.n, (0.6, 0.25, 0.15))]),
+            ("linkedPerson", '"{} {}"', [first, last]),
+            ("expirationDate", '"{}Z"', [self.dates(c.n, EPOCH_START + 180 * DAY_MS, EPOCH_END + 730 * DAY_MS)]),
+            ("status", '"{}"', [self.choice(("active", "expiring", "expired"), c.n, (0.7, 0.1, 0.2))]),
+            ("createdAt", '"{}Z"', [self.dates(c.n)]),
+        ]
+
+    def _transactions(self, c: Chunk) -> list[Field]:
+        kind = self.rng.choice(len(CATEGORIES), c.n, p=CATEGORY_WEIGHTS)
+        date = _iso(self.rng.integers(EPOCH_START, EPOCH_END, c.n))
+        return [
+            ("id", '"tx_{}"', [c.rows.tolist()]),
+            ("tenantId", '"t_{}"', [c.tenant.tolist()]),
+            ("type", '"{}"', [_pick([t for t, _ in CATEGORIES], kind)]),
+            ("category", '"{}"', [_pick([cat for _, cat in CATEGORIES], kind)]),
+            ("amount", '"{}.{:02d}"', self.money(self.rng.lognormal(5.5, 1.3, c.n))),
+            ("description", '"Generated {}"', [_pick([cat.replace("_", " ") for _, cat in CATEGORIES], kind)]),
+            ("date", '"{}Z"', [date]),
+            ("paymentMethod", '"{}"', [self.choice(("bank_transfer", "credit_card", "paypal", "cash"), c.n, (0.5, 0.3, 0.15, 0.05))]),
+            ("reference", '"INV-{:08d}"', [c.rows.tolist()]),
+            ("walletId", '"w_{}"', [c.parent.tolist()]),
+            ("createdBy", '"u_{}"', [self.owner(c.tenant).tolist()]),
+            ("createdAt", '"{}Z"', [date]),
+        ]
+
+    def _socialAccounts(self, c: Chunk) -> list[Field]:
+        platform = self.rng.integers(0, len(PLATFORMS), c.n).astype(np.int8)
+        self.keep("socialAccounts", "platform", c.rows, platform)
+        self.keep("socialAccounts", "followers", c.rows, self.rng.lognormal(8, 1.5, c.n))
+        self.keep("socialAccounts", "growth", c.rows, self.rng.normal(0.002, 0.003, c.n))
+        return [
+            ("id", '"sa_{}"', [c.rows.tolist()]),
+            ("tenantId", '"t_{}"', [c.tenant.tolist()]),
+            ("platform", '"{}"', [_pick(PLATFORMS, platform)]),
+            ("accountName", '"club{}_{}"', [c.tenant.tolist(), _pick(PLATFORMS, platform)]),
+            ("accountId", '"{}"', [(c.rows * 7919 + 1_000_000).tolist()]),
+            ("isActive", "{}", [self.choice(("true", "false"), c.n, (0.9, 0.1))]),
+            ("createdAt", '"{}Z"', [_iso(np.full(c.n, EPOCH_START - 30 * DAY_MS))]),
+        ]
+
+    def _socialMetrics(self, c: Chunk) -> list[Field]:
+        # A daily series per account: compound growth plus day-to-day noise.
+        base = self.kept["socialAccounts.followers"][c.parent]
+        growth = self.kept["socialAccounts.growth"][c.parent]
+        followers = base * (1 + growth) ** c.pos * self.rng.normal(1, 0.005, c.n)
+        reach = followers * self.rng.lognormal(-0.5, 0.6, c.n)
+        engagement = reach * self.rng.uniform(0.01, 0.08, c.n)
+        date = _iso(EPOCH_START + c.pos * DAY_MS)
+        return [
+            ("id", '"sm_{}"', [c.rows.tolist()]),
+            ("accountId", '"sa_{}"', [c.parent.tolist()]),
+            ("tenantId", '"t_{}"', [c.tenant.tolist()]),
+            ("platform", '"{}"', [_pick(PLATFORMS, self.kept["socialAccounts.platform"][c.parent])]),
+            ("followers", "{}", [_ints(followers)]),
+            ("following", "{}", [_ints(base ** 0.5)]),
+            ("posts", "{}", [_ints(c.pos * 0.8 + base ** 0.3)]),
+            ("reach", "{}", [_ints(reach)]),
+            ("impressions", "{}", [_ints(reach * self.rng.uniform(1.2, 3, c.n))]),
+            ("engagement", "{}", [_ints(engagement)]),
+            ("engagementRate", '"{}.{:02d}"', self.money(100 * engagement / np.maximum(reach, 1))),
+            ("profileViews", "{}", [_ints(reach * 0.02)]),
+            ("websiteClicks", "{}", [_ints(reach * 0.004)]),
+            ("date", '"{}Z"', [date]),
+            ("createdAt", '"{}Z"', [date]),
+        ]
+
+    def _auditLogs(self, c: Chunk) -> list[Field]:
+        owner = self.owner(c.tenant)
+        first, last = _names(owner)
+        kind = self.rng.integers(0, len(AUDIT_ACTIONS), c.n)
+        return [
+            ("id", '"al_{}"', [c.rows.tolist()]),
+            ("tenantId", '"t_{}"', [c.tenant.tolist()]),
+            ("userId", '"u_{}"', [owner.tolist()]),
+            ("userName", '"{} {}"', [first, last]),
+            ("action", '"{}"', [_pick([a for a, _, _ in AUDIT_ACTIONS], kind)]),
+            ("entity", '"{}"', [_pick([e for _, e, _ in AUDIT_ACTIONS], kind)]),
+            ("entityId", '"{}"', [self.rng.integers(0, 1_000_000, c.n).tolist()]),
+            ("actionType", '"{}"', [_pick([t for _, _, t in AUDIT_ACTIONS], kind)]),
+            ("timestamp", '"{}Z"', [self.dates(c.n)]),
+        ]
+
+    def _invites(self, c: Chunk) -> list[Field]:
+        owner = self.owner(c.tenant)
+        first, last = _names(owner)
+        role = self.rng.choice(len(ROLES), c.n, p=ROLE_WEIGHTS)
+        created = self.rng.integers(EPOCH_START, EPOCH_END, c.n)
+        return [
+            ("id", '"i_{}"', [c.rows.tolist()]),
+            ("tenantId", '"t_{}"', [c.tenant.tolist()]),
+            ("email", '"invite{}@example.com"', [c.rows.tolist()]),
+            ("role", '"{}"', [_pick(ROLES, role)]),
+            ("permissions", "{}", [_pick([PERMISSIONS[r] for r in ROLES], role)]),
+            # Random high half, row in the low half: unique without a lookup.
+            ("token", '"{:016x}{:016x}"', [self.rng.integers(0, 2**63, c.n).tolist(), c.rows.tolist()]),
+            ("invitedBy", '"u_{}"', [owner.tolist()]),
+            ("inviterName", '"{} {}"', [first, last]),
+            ("status", '"{}"', [self.choice(("pending", "accepted", "expired"), c.n, (0.3, 0.55, 0.15))]),
+            ("expiresAt", '"{}Z"', [_iso(created + 7 * DAY_MS)]),
+            ("createdAt", '"{}Z"', [_iso(created)]),
+        ]
+
+
+TEAMS = tuple(f"{word} {suffix}" for word in CLUB_WORDS for suffix in CLUB_SUFFIX)
+PLATFORMS = ("twitter", "instagram", "youtube", "tiktok", "twitch", "facebook")
+# (type, category), as the finance page groups them.
+CATEGORIES = (
+    ("income", "sponsorship"),
+    ("income", "merchandise"),
+    ("income", "tournament_prize"),
+    ("income", "streaming"),
+    ("expense", "salaries"),
+    ("expense", "equipment"),
+    ("expense", "facility"),
+    ("expense", "travel"),
+    ("expense", "software"),
+    ("expense", "marketing"),
+)
+CATEGORY_WEIGHTS = (0.15, 0.1, 0.1, 0.1, 0.2, 0.1, 0.05, 0.1, 0.05, 0.05)
+# (action, entity, actionType)
+AUDIT_ACTIONS = (
+    ("Created tournament", "tournament", "create"),
+    ("Updated tournament", "tournament", "update"),
+    ("Created transaction", "transaction", "create"),
+    ("Updated wallet", "wallet", "update"),
+    ("Added staff member", "staff", "create"),
+    ("Updated staff permissions", "staff", "update"),
+    ("Deleted contract", "contract", "delete"),
+    ("Created campaign", "campaign", "create"),
+    ("Created invite", "invite", "create"),
+    ("Updated match result", "match", "update"),
+)
+
+
+def _pick(vocab: Sequence[str], codes: np.ndarray) -> list[str]:
+    return np.asarray(vocab, dtype=object)[codes].tolist()
+
+
+def _names(rows: np.ndarray) -> tuple[list[str], list[str]]:
+    """First and last name of a row, derived from its index so other tables can repeat it."""
+    return _pick(FIRST_NAMES, rows % len(FIRST_NAMES)), _pick(LAST_NAMES, (rows // len(FIRST_NAMES)) % len(LAST_NAMES))
+
+
+def _ints(values: np.ndarray) -> list[int]:
+    return np.rint(np.maximum(values, 0)).astype(np.int64).tolist()
+
+
+def _iso(ms: np.ndarray) -> list[str]:
+    # The importer turns strings matching YYYY-MM-DDTHH:MM:SS.mmmZ into timestamps.
+    return np.datetime_as_string(np.asarray(ms, dtype="datetime64[ms]"), unit="ms").tolist()
+
+
+class JsonSink:
+    """``{"data": {table: [rows]}}``, the layout importAllData.js reads by default."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp = path.with_suffix(".tmp")
+        self.fh = open(self.tmp, "w", encoding="utf-8")
+        self.fh.write('{"data": {')
+        self.count = 0
+
+    def table(self, name: str, chunks: Iterator[list[str]]) -> None:
+        self.fh.write(f'{"," if self.count else ""}\n"{name}": [')
+        sep = "\n"
+        for lines in chunks:
+            if lines:
+                self.fh.write(sep + ",\n".join(lines))
+                sep = ",\n"
+        self.fh.write("\n]")
+        self.count += 1
+
+    def close(self) -> None:
+        self.fh.write("\n}}\n")
+        self.fh.close()
+        self.tmp.replace(self.path)
+
+
+class NdjsonSink:
+    """One ``<table>.ndjson`` per table, for the importer's streaming mode."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        directory.mkdir(parents=True, exist_ok=True)
+
+    def table(self, name: str, chunks: Iterator[list[str]]) -> None:
+        path = self.directory / f"{name}.ndjson"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            for lines in chunks:
+                if lines:
+                    fh.write("\n".join(lines) + "\n")
+        tmp.replace(path)
+
+    def close(self) -> None:
+        pass
+
+
+def write_dataset(generator: DatasetGenerator, sink: JsonSink | NdjsonSink) -> dict[str, TableStats]:
+    for table, chunks in generator.tables():
+        sink.table(table, chunks)
+    sink.close()
+    return generator.stats
+
+
+def format_stats(stats: Mapping[str, TableStats]) -> str:
+    lines = [f"{'table':<18} {'rows':>12} {'seconds':>8} {'rows/s':>12}"]
+    for table, s in stats.items():
+        rate = s.rows / s.seconds if s.seconds else 0
+        lines.append(f"{table:<18} {s.rows:>12,} {s.seconds:>8.2f} {rate:>12,.0f}")
+    rows = sum(s.rows for s in stats.values())
+    seconds = sum(s.seconds for s in stats.values())
+    lines.append(f"{'total':<18} {rows:>12,} {seconds:>8.2f} {rows / seconds if seconds else 0:>12,.0f}")
+    return "\n".join(lines)
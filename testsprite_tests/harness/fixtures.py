@@ -0,0 +1,124 @@
+"""Golden-dataset fixtures: build once, restore per test.
+
+TC015 (tournament consistency) and TC017 (multi-tenant isolation) assume
+clubs that already have rosters, tournaments, rounds and matches. Building
+them through the UI costs tens of seconds per test and leaves every test
+depending on the create flows it is not testing.
+
+With ``run --local --fixtures golden_dataset.json`` the harness instead:
+
+* once per backend, posts the dataset to
+  ``/api/__test__/snapshots/golden``, which seeds it on top of the
+  backend's seed snapshot and freezes the result;
+* per test, restores a fresh store from that snapshot
+  (``POST /api/__test__/stores/<id>``) -- copy-on-write in
+  server/db/memory.ts, so a restore copies nothing until the test writes;
+* sends ``x-nexus-store: <id>`` on every request of the test's contexts,
+  so the server serves that test from its own store and concurrent tests
+  on one backend never see each other's writes;
+* drops the store when the test finishes.
+
+The dataset is a ``{table: rows}`` file in the generic-table shape the
+repos read (``{"id": ..., "data": {"tenantId": ..., ...}}``); the restore
+time lands in each result's ``details["fixture_ms"]``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import httpx
+from playwright.async_api import BrowserContext
+
+from .config import TESTS_DIR
+from .runner import Hook, TestResult
+from .scripts import TestCase
+
+GOLDEN_FILE = TESTS_DIR / "golden_dataset.json"
+SNAPSHOT = "golden"
+STORE_HEADER = "x-nexus-store"
+TEST_API = "/api/__test__"
+
+
+class FixtureError(RuntimeError):
+    pass
+
+
+class Fixtures(Hook):
+    """Restore the golden snapshot into a private store for every test.
+
+    ``base_for`` maps a case to the origin of the backend it runs against;
+    with ``LocalBackends`` that is ``backends.base_for``, which is ready
+    once the backends hook has run its ``on_run_start`` -- so add this hook
+    after it.
+    """
+
+    def __init__(
+        self,
+        base_for: Callable[[TestCase], str],
+        dataset: Path = GOLDEN_FILE,
+        *,
+        snapshot: str = SNAPSHOT,
+    ):
+        self.base_for = base_for
+        self.dataset = dataset
+        self.snapshot = snapshot
+        self.run_tag = uuid.uuid4().hex[:8]
+        self.stores: dict[str, str] = {}
+        self.timings: dict[str, float] = {}
+        self.client: httpx.AsyncClient | None = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            self.client = httpx.AsyncClient(timeout=30.0)
+        return self.client
+
+    async def _post(self, url: str, body: dict[str, Any]) -> dict[str, Any]:
+        response = await self._client().post(url, json=body)
+        if response.status_code != 200:
+            raise FixtureError(f"POST {url}: {response.status_code} {response.text[:200]}")
+        return response.json()
+
+    async def on_run_start(self, cases: Sequence[TestCase]) -> None:
+        tables = json.loads(self.dataset.read_text())
+        bases = sorted({self.base_for(case) for case in cases})
+        built = await asyncio.gather(
+            *(
+                self._post(f"{base}{TEST_API}/snapshots/{self.snapshot}", {"tables": tables})
+                for base in bases
+            )
+        )
+        rows = sum(built[0]["tables"].values()) if built else 0
+        print(f"fixtures: snapshot {self.snapshot!r} ({rows} rows) on {len(bases)} backend(s)")
+
+    async def context_options(self, case: TestCase) -> dict[str, Any]:
+        store = self.stores.get(case.key)
+        if store is None:
+            # Once per test: a second context in the same test shares the store.
+            store = f"{self.run_tag}-{case.key}"
+            started = time.perf_counter()
+            await self._post(
+                f"{self.base_for(case)}{TEST_API}/stores/{store}", {"snapshot": self.snapshot}
+            )
+            self.timings[case.key] = (time.perf_counter() - started) * 1000
+            self.stores[case.key] = store
+        return {"extra_http_headers": {STORE_HEADER: store}}
+
+    async def on_finish(
+        self, context: BrowserContext | None, case: TestCase, result: TestResult
+    ) -> None:
+        store = self.stores.pop(case.key, None)
+        if store is None:
+            return
+        result.details["fixture_ms"] = round(self.timings.pop(case.key), 1)
+        await self._client().delete(f"{self.base_for(case)}{TEST_API}/stores/{store}")
+
+    async def on_run_end(self, results: Sequence[TestResult]) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
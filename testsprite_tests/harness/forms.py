@@ -0,0 +1,138 @@
+"""Fill a whole form in one round trip.
+
+The generated scripts fill a form one input at a time through absolute
+XPaths (``html/body/div/div/div/div[2]/div[2]/form/div[4]/input``): six
+locator resolutions, six protocol round trips and six sleeps for the
+registration form alone. ``fill_form`` instead sends the form and every
+value to the page in a single ``evaluate``, which
+
+* resolves each field by ``name``, ``id``, label text, placeholder or
+  ``aria-label`` (case-insensitive), so the call survives layout changes.
+  Radix checkboxes and switches (``<button role="checkbox">``) count as
+  fields too: a boolean value clicks them into that state;
+* sets the value through the native setter and dispatches ``input`` and
+  ``change``, which is what React's onChange listens for -- assigning
+  ``el.value`` alone is swallowed by React's value tracker;
+* waits two animation frames for react-hook-form to validate and
+  re-render, then submits with ``requestSubmit()`` so the form's own
+  submit handler runs.
+
+Fields the page cannot resolve, or a page where the evaluate itself fails,
+fall back to Playwright's per-field ``fill`` and a click on the submit
+button -- slower, but with Playwright's actionability waits.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Mapping
+
+from playwright.async_api import Error, Locator
+
+FILL_FORM_SCRIPT = """
+async (form, { values, submit }) => {
+  const norm = (s) => (s || "").replace(/\\s+/g, " ").trim().toLowerCase();
+  // Radix checkboxes and switches are buttons with a role; the input they
+  // mirror their state into is aria-hidden and must not be set directly.
+  const controls = [...form.querySelectorAll(
+    'input:not([aria-hidden="true"]), textarea, select, [role="checkbox"], [role="switch"]'
+  )].filter((el) => el.type !== "hidden" && !el.disabled);
+  const labelOf = (el) => {
+    const label = (el.id && form.querySelector(`label[for="${CSS.escape(el.id)}"]`))
+      || el.closest("label");
+    return label ? norm(label.textContent) : "";
+  };
+  const find = (key) => {
+    const k = norm(key);
+    return controls.find((el) => norm(el.name) === k || norm(el.id) === k)
+      || controls.find((el) => labelOf(el) === k)
+      || controls.find((el) => norm(el.placeholder) === k
+        || norm(el.getAttribute("aria-label")) === k);
+  };
+  const set = (el, value) => {
+    if (el.type === "checkbox" || el.type === "radio") {
+      if (el.checked !== Boolean(value)) el.click();
+      return;
+    }
+    if (el.getAttribute("role")) {
+      if ((el.getAttribute("aria-checked") === "true") !== Boolean(value)) el.click();
+      return;
+    }
+    const proto = Object.getPrototypeOf(el);
+    const setter = Object.getOwnPropertyDescriptor(proto, "value").set;
+    el.focus();
+    setter.call(el, String(value));
+    el.dispatchEvent(new Event("input", { bubbles: true }));
+    el.dispatchEvent(new Event("change", { bubbles: true }));
+    el.blur();
+  };
+  const missing = [];
+  for (const [key, value] of Object.entries(values)) {
+    const el = find(key);
+    if (el) set(el, value); else missing.push(key);
+  }
+  const frame = () => new Promise((r) => requestAnimationFrame(() => r()));
+  await frame();
+  await frame();
+  const invalid = controls
+    .filter((el) => el.getAttribute("aria-invalid") === "true")
+    .map((el) => el.name || el.id || el.placeholder);
+  const submitted = Boolean(submit) && !missing.length;
+  if (submitted) form.requestSubmit();
+  return { missing, invalid, submitted };
+}
+"""
+
+SUBMIT_SELECTOR = "button[type=submit], input[type=submit]"
+
+
+@dataclass
+class FormFill:
+    """What ``fill_form`` did: ``round_trips`` is 1 on the fast path."""
+
+    missing: list[str] = field(default_factory=list)
+    invalid: list[str] = field(default_factory=list)
+    submitted: bool = False
+    round_trips: int = 1
+
+
+def _field(form: Locator, key: str) -> Locator:
+    return (
+        form.locator(f'[name="{key}"], [id="{key}"]')
+        .or_(form.get_by_label(key, exact=True))
+        .or_(form.get_by_placeholder(key, exact=True))
+        .first
+    )
+
+
+async def fill_form(
+    form: Locator,
+    values: Mapping[str, object],
+    *,
+    submit: bool = True,
+    timeout: float = 5000,
+) -> FormFill:
+    """Fill ``values`` (field name, label or placeholder -> value) into ``form``."""
+    try:
+        outcome = await form.evaluate(
+            FILL_FORM_SCRIPT, {"values": dict(values), "submit": submit}, timeout=timeout
+        )
+        result = FormFill(outcome["missing"], outcome["invalid"], outcome["submitted"])
+    except Error:
+        # Detached mid-render, CSP, a non-form target: do it field by field.
+        result = FormFill(missing=list(values))
+    if not result.missing:
+        return result
+    for key in result.missing:
+        value = values[key]
+        if isinstance(value, bool):
+            await _field(form, key).set_checked(value, timeout=timeout)
+        else:
+            await _field(form, key).fill(str(value), timeout=timeout)
+        result.round_trips += 1
+    result.missing = []
+    if submit:
+        await form.locator(SUBMIT_SELECTOR).first.click(timeout=timeout)
+        result.submitted = True
+        result.round_trips += 1
+    return result
@@ -0,0 +1,178 @@
+"""Record ``/api/*`` traffic to HAR files and replay it in place of the backend.
+
+Record mode lets Playwright write one HAR per case (tmp/har/<case>.har) with
+response bodies embedded, filtered to ``/api/*`` so assets stay out of it.
+
+Replay mode answers every ``/api/*`` request from that case's HAR through
+``context.route``; nothing reaches Express or Firestore. Requests match on
+method, path plus sorted query, and a normalized body -- JSON is compared
+with its keys sorted and form bodies with their fields sorted, so a script
+that serialises the same payload differently still hits. When a request has
+no exact match the latest recording of the same method and path is used;
+when it has none at all it gets a 404 and is reported in the result
+details. Repeated identical requests are answered in recorded order, the
+last answer repeating, so a list fetched before and after a create shows
+both states.
+
+The app shell itself is not part of the HAR: point ``static_dir`` at a
+built client (``npm run build`` writes NexusSuite/server/public) to serve it
+from disk as well and run fully offline, or leave it unset and let a plain
+Vite dev server provide it.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import re
+from pathlib import Path
+from typing import Any, Sequence
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from playwright.async_api import BrowserContext, Request, Route
+
+from .config import TMP_DIR, base_url
+from .routes import is_api_request
+from .runner import Hook, TestResult
+from .scripts import TestCase
+
+HAR_DIR = TMP_DIR / "har"
+HAR_MODES = ("record", "replay")
+
+# The body is served decoded, so the original framing headers would lie.
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def normalize_body(body: str | None, content_type: str = "") -> str:
+    if not body:
+        return ""
+    if "json" in content_type or body.lstrip()[:1] in ("{", "["):
+        try:
+            return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+        except ValueError:
+            pass
+    if "x-www-form-urlencoded" in content_type:
+        return urlencode(sorted(parse_qsl(body, keep_blank_values=True)))
+    return body.strip()
+
+
+def request_key(method: str, url: str, body: str | None = None, content_type: str = "") -> tuple[str, str, str]:
+    parsed = urlparse(url)
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    path = parsed.path + (f"?{query}" if query else "")
+    return method.upper(), path, normalize_body(body, content_type)
+
+
+class HarArchive:
+    """The responses of one HAR file, indexed for replay."""
+
+    def __init__(self, entries: Sequence[dict[str, Any]]):
+        self.exact: dict[tuple[str, str, str], list[dict[str, Any]]] = {}
+        self.by_path: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        self.served: dict[tuple[str, str, str], int] = {}
+        for entry in entries:
+            request = entry["request"]
+            post = request.get("postData") or {}
+            key = request_key(request["method"], request["url"], post.get("text"), post.get("mimeType", ""))
+            self.exact.setdefault(key, []).append(entry["response"])
+            self.by_path.setdefault(key[:2], []).append(entry["response"])
+
+    @classmethod
+    def load(cls, path: Path) -> "HarArchive":
+        with open(path, encoding="utf-8") as fh:
+            return cls(json.load(fh)["log"]["entries"])
+
+    def lookup(self, key: tuple[str, str, str]) -> tuple[dict[str, Any] | None, bool]:
+        """``(response, exact)``; ``response`` is None when nothing matches."""
+        responses = self.exact.get(key)
+        if responses:
+            n = self.served.get(key, 0)
+            self.served[key] = n + 1
+            return responses[min(n, len(responses) - 1)], True
+        responses = self.by_path.get(key[:2])
+        return (responses[-1], False) if responses else (None, False)
+
+
+def _fulfill_args(response: dict[str, Any]) -> dict[str, Any]:
+    content = response.get("content", {})
+    text = content.get("text", "")
+    body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+    headers = {
+        h["name"]: h["value"] for h in response.get("headers", []) if h["name"].lower() not in _DROP_HEADERS
+    }
+    return {"status": response["status"], "headers": headers, "body": body}
+
+
+def har_path(har_dir: Path, case: TestCase, index: int = 0) -> Path:
+    """HAR of the ``index``-th context a case opened."""
+    return har_dir / (f"{case.key}.har" if not index else f"{case.key}.{index + 1}.har")
+
+
+class HarRecorder(Hook):
+    def __init__(self, har_dir: Path = HAR_DIR):
+        self.har_dir = har_dir
+        self.contexts: dict[str, int] = {}
+
+    async def context_options(self, case: TestCase) -> dict[str, Any]:
+        # A script that opens a second context gets a second file; Playwright
+        # writes each one when its context closes.
+        index = self.contexts.get(case.key, 0)
+        self.contexts[case.key] = index + 1
+        self.har_dir.mkdir(parents=True, exist_ok=True)
+        return {
+            "record_har_path": str(har_path(self.har_dir, case, index)),
+            "record_har_url_filter": re.compile(r"^[^?#]*/api/"),
+            "record_har_content": "embed",
+        }
+
+
+class HarReplayer(Hook):
+    def __init__(self, har_dir: Path = HAR_DIR, *, static_dir: Path | None = None, base: str | None = None):
+        self.har_dir = har_dir
+        self.static_dir = static_dir
+        self.origin = "{0.scheme}://{0.netloc}".format(urlparse(base or base_url()))
+        self.contexts: dict[str, int] = {}
+        self.misses: dict[str, list[str]] = {}
+        self.loose: dict[str, int] = {}
+
+    async def on_context(self, context: BrowserContext, case: TestCase) -> None:
+        index = self.contexts.get(case.key, 0)
+        self.contexts[case.key] = index + 1
+        path = har_path(self.har_dir, case, index)
+        archive = HarArchive.load(path) if path.exists() else HarArchive([])
+        misses = self.misses.setdefault(case.key, [])
+
+        async def serve_api(route: Route, request: Request) -> None:
+            if not is_api_request(request.url):
+                await route.fallback()
+                return
+            key = request_key(
+                request.method, request.url, request.post_data, request.headers.get("content-type", "")
+            )
+            response, exact = archive.lookup(key)
+            if response is None:
+                misses.append(f"{key[0]} {key[1]}")
+                await route.fulfill(status=404, json={"message": f"not recorded in {path.name}"})
+                return
+            if not exact:
+                self.loose[case.key] = self.loose.get(case.key, 0) + 1
+            await route.fulfill(**_fulfill_args(response))
+
+        if self.static_dir is not None:
+            await context.route(f"{self.origin}/**", self._serve_static)
+        await context.route(re.compile(r"^[^?#]*/api/"), serve_api)
+
+    async def _serve_static(self, route: Route, request: Request) -> None:
+        rel = urlparse(request.url).path.lstrip("/")
+        target = (self.static_dir / rel).resolve()
+        if not rel or not target.is_file() or self.static_dir.resolve() not in target.parents:
+            target = self.static_dir / "index.html"  # client-side routes
+        await route.fulfill(path=str(target))
+
+    async def on_finish(
+        self, context: BrowserContext | None, case: TestCase, result: TestResult
+    ) -> None:
+        if self.misses.get(case.key):
+            result.details["har_misses"] = self.misses.pop(case.key)
+        if self.loose.get(case.key):
+            result.details["har_loose_matches"] = self.loose.pop(case.key)
@@ -0,0 +1,130 @@
+"""Mergeable HDR-style latency histograms.
+
+Values are recorded in integer microseconds into log-linear buckets: each
+power-of-two range is split into ``2**sub_bucket_bits`` linear sub-buckets,
+which bounds the relative error of any reported value by the configured
+number of significant figures, independent of magnitude. Counts are kept
+sparsely, so a histogram costs memory only for the buckets it uses, and two
+histograms with the same precision merge by adding counts -- across tests,
+workers, shards or runs.
+
+The JSON form (``to_dict``/``from_dict``) is this harness's own, not the
+HdrHistogram compressed-base64 interchange format.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Iterator
+
+
+class Histogram:
+    __slots__ = ("significant_figures", "sub_bucket_bits", "counts", "total", "min_us", "max_us", "sum_us")
+
+    def __init__(self, significant_figures: int = 3):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        self.significant_figures = significant_figures
+        # Enough linear sub-buckets per octave that adjacent values differ by
+        # less than one unit in the last significant figure.
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10**significant_figures))
+        self.counts: dict[int, int] = {}
+        self.total = 0
+        self.min_us = 0
+        self.max_us = 0
+        self.sum_us = 0
+
+    # -- recording -------------------------------------------------------
+
+    def _index(self, value_us: int) -> int:
+        shift = max(0, value_us.bit_length() - self.sub_bucket_bits)
+        return (shift << self.sub_bucket_bits) | (value_us >> shift)
+
+    def _highest_equivalent(self, index: int) -> int:
+        shift = index >> self.sub_bucket_bits
+        sub = index & ((1 << self.sub_bucket_bits) - 1)
+        return ((sub + 1) << shift) - 1
+
+    def record(self, value_ms: float, count: int = 1) -> None:
+        value_us = max(0, int(round(value_ms * 1000)))
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + count
+        if not self.total or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+        self.total += count
+        self.sum_us += value_us * count
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("cannot merge histograms of different precision")
+        if not other.total:
+            return self
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.min_us = other.min_us if not self.total else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+        self.total += other.total
+        self.sum_us += other.sum_us
+        return self
+
+    # -- queries (all in milliseconds) -------------------------------------
+
+    @property
+    def count(self) -> int:
+        return self.total
+
+    @property
+    def min(self) -> float:
+        return self.min_us / 1000
+
+    @property
+    def max(self) -> float:
+        return self.max_us / 1000
+
+    @property
+    def mean(self) -> float:
+        return self.sum_us / self.total / 1000 if self.total else math.nan
+
+    def value_at_percentile(self, pct: float) -> float:
+        """Highest value equivalent to the ``pct``-th percentile sample."""
+        if not self.total:
+            return math.nan
+        target = max(1, math.ceil(pct / 100 * self.total))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max_us) / 1000
+        return self.max
+
+    def percentiles(self, pcts: tuple[float, ...] = (50, 95, 99)) -> dict[float, float]:
+        return {p: self.value_at_percentile(p) for p in pcts}
+
+    def __iter__(self) -> Iterator[tuple[float, int]]:
+        """Yield ``(highest equivalent value in ms, count)`` per used bucket."""
+        for index in sorted(self.counts):
+            yield self._highest_equivalent(index) / 1000, self.counts[index]
+
+    # -- serialization ---------------------------------------------------
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "significant_figures": self.significant_figures,
+            "total": self.total,
+            "min_us": self.min_us,
+            "max_us": self.max_us,
+            "sum_us": self.sum_us,
+            "counts": [[i, self.counts[i]] for i in sorted(self.counts)],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Histogram":
+        hist = cls(data["significant_figures"])
+        hist.counts = {int(i): int(n) for i, n in data["counts"]}
+        hist.total = data["total"]
+        hist.min_us = data["min_us"]
+        hist.max_us = data["max_us"]
+        hist.sum_us = data["sum_us"]
+        return hist
@@ -0,0 +1,404 @@
+"""Run history in SQLite, and the TestSprite artifacts derived from it.
+
+Each finished case is appended to tmp/history.sqlite as it completes: its
+outcome, per-step timings and the console errors its pages logged. Rows are
+indexed by case and run, so the questions CI actually asks -- which tests
+are slowest, which keep failing, which are getting slower -- are single
+queries over the last N runs instead of archaeology across overwritten
+JSON files.
+
+With ``run --report`` (off by default: both files are committed TestSprite
+output), tmp/test_results.json and tmp/raw_report.md stay in the shape
+TestSprite writes them, but become views of the database: every case owns
+one stored JSON entry and one report section, and a finished case
+re-renders only its own fragments before the files are reassembled from the
+stored pieces. The fragments are seeded from the existing files the first
+time the database is opened, so the TestSprite ids, descriptions,
+visualization links and analysis lines are kept.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Sequence
+
+from playwright.async_api import BrowserContext, ConsoleMessage, WebError
+
+from .config import TESTS_DIR, TMP_DIR
+from .runner import PASSED, Hook, TestResult
+from .scripts import TestCase
+
+HISTORY_FILE = TMP_DIR / "history.sqlite"
+RESULTS_FILE = TMP_DIR / "test_results.json"
+REPORT_FILE = TMP_DIR / "raw_report.md"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    started_at  REAL NOT NULL,
+    finished_at REAL,
+    cases       INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id     INTEGER NOT NULL REFERENCES runs(id),
+    case_key   TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    duration   REAL NOT NULL,
+    started_at REAL NOT NULL,
+    error      TEXT,
+    PRIMARY KEY (run_id, case_key)
+);
+CREATE INDEX IF NOT EXISTS results_by_case ON results (case_key, run_id);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id   INTEGER NOT NULL,
+    case_key TEXT NOT NULL,
+    idx      INTEGER NOT NULL,
+    name     TEXT NOT NULL,
+    duration REAL NOT NULL,
+    PRIMARY KEY (run_id, case_key, idx)
+);
+CREATE INDEX IF NOT EXISTS steps_by_name ON steps (case_key, name);
+CREATE TABLE IF NOT EXISTS console (
+    run_id   INTEGER NOT NULL,
+    case_key TEXT NOT NULL,
+    level    TEXT NOT NULL,
+    text     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS console_by_case ON console (case_key, run_id);
+-- Rendered artifact fragments: one test_results.json entry and one
+-- raw_report.md section per case, plus the report's head and tail.
+CREATE TABLE IF NOT EXISTS fragments (
+    kind  TEXT NOT NULL,
+    key   TEXT NOT NULL,
+    ord   TEXT NOT NULL,
+    body  TEXT NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+"""
+
+_REPORT_SECTION = re.compile(r"^#### Test (TC\d{3})\n.*?^---\n", re.M | re.S)
+_PASS_RATE = re.compile(r"^- \*\*[\d.]+%?\*\* of tests passed$", re.M)
+VISUALIZATION = "Test Visualization and Result"
+ANALYSIS = "Analysis / Findings"
+_KEPT_LINE = re.compile(rf"^- \*\*({re.escape(VISUALIZATION)}|{re.escape(ANALYSIS)}):\*\* (.*)$", re.M)
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class History:
+    def __init__(self, path: Path = HISTORY_FILE):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    # -- writing ---------------------------------------------------------
+
+    def start_run(self, cases: int) -> int:
+        with self.db:
+            cur = self.db.execute(
+                "INSERT INTO runs (started_at, cases) VALUES (?, ?)", (time.time(), cases)
+            )
+        return cur.lastrowid
+
+    def finish_run(self, run_id: int) -> None:
+        with self.db:
+            self.db.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (time.time(), run_id))
+
+    def append(self, run_id: int, result: TestResult, console: Sequence[tuple[str, str]] = ()) -> None:
+        key = result.case.key
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, key, result.status, result.duration, result.started_at, result.error),
+            )
+            self.db.executemany(
+                "INSERT OR REPLACE INTO steps VALUES (?, ?, ?, ?, ?)",
+                [(run_id, key, s.index, s.name, s.duration) for s in result.steps],
+            )
+            self.db.executemany(
+                "INSERT INTO console VALUES (?, ?, ?, ?)",
+                [(run_id, key, level, text) for level, text in console],
+            )
+
+    # -- queries ---------------------------------------------------------
+
+    def _recent_runs(self, runs: int) -> int:
+        """Smallest run id among the last ``runs`` runs."""
+        row = self.db.execute(
+            "SELECT MIN(id) FROM (SELECT id FROM runs ORDER BY id DESC LIMIT ?)", (runs,)
+        ).fetchone()
+        return row[0] or 0
+
+    def slowest(self, limit: int = 10, runs: int = 10) -> list[sqlite3.Row]:
+        return self.db.execute(
+            """
+            SELECT case_key, COUNT(*) AS n, AVG(duration) AS mean, MAX(duration) AS worst
+            FROM results WHERE run_id >= ?
+            GROUP BY case_key ORDER BY mean DESC LIMIT ?
+            """,
+            (self._recent_runs(runs), limit),
+        ).fetchall()
+
+    def mean_durations(self, runs: int = 10) -> dict[str, float]:
+        rows = self.db.execute(
+            "SELECT case_key, AVG(duration) FROM results WHERE run_id >= ? GROUP BY case_key",
+            (self._recent_runs(runs),),
+        )
+        return {key: mean for key, mean in rows}
+
+    def slowest_steps(self, limit: int = 10, runs: int = 10) -> list[sqlite3.Row]:
+        return self.db.execute(
+            """
+            SELECT case_key, name, COUNT(*) AS n, AVG(duration) AS mean, MAX(duration) AS worst
+            FROM steps WHERE run_id >= ?
+            GROUP BY case_key, name ORDER BY mean DESC LIMIT ?
+            """,
+            (self._recent_runs(runs), limit),
+        ).fetchall()
+
+    def failure_streaks(self, runs: int = 10) -> list[tuple[str, int, str | None]]:
+        """``(case, consecutive latest failures, latest error)``, longest first."""
+        rows = self.db.execute(
+            """
+            SELECT case_key, status, error FROM results
+            WHERE run_id >= ? ORDER BY case_key, run_id DESC
+            """,
+            (self._recent_runs(runs),),
+        ).fetchall()
+        streaks: dict[str, list] = {}
+        for row in rows:
+            entry = streaks.setdefault(row["case_key"], [0, row["error"], False])
+            if entry[2]:
+                continue
+            if row["status"] == PASSED:
+                entry[2] = True
+            else:
+                entry[0] += 1
+        found = [(key, n, error) for key, (n, error, _) in streaks.items() if n]
+        return sorted(found, key=lambda s: (-s[1], s[0]))
+
+    def trend(self, case_key: str, runs: int = 10) -> list[sqlite3.Row]:
+        return self.db.execute(
+            """
+            SELECT run_id, status, duration FROM results
+            WHERE case_key = ? AND run_id >= ? ORDER BY run_id
+            """,
+            (case_key, self._recent_runs(runs)),
+        ).fetchall()
+
+    def case_keys(self) -> list[str]:
+        return [r[0] for r in self.db.execute("SELECT DISTINCT case_key FROM results ORDER BY case_key")]
+
+    def console(self, run_id: int, case_key: str) -> list[sqlite3.Row]:
+        return self.db.execute(
+            "SELECT level, text FROM console WHERE run_id = ? AND case_key = ? ORDER BY rowid",
+            (run_id, case_key),
+        ).fetchall()
+
+
+def slope(values: Sequence[float]) -> float:
+    """Least-squares change per run; 0 for fewer than two points."""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    cov = sum((i - mean_x) * (v - mean_y) for i, v in enumerate(values))
+    var = sum((i - mean_x) ** 2 for i in range(n))
+    return cov / var
+
+
+# -- artifacts --------------------------------------------------------------
+
+
+class Artifacts:
+    """test_results.json and raw_report.md, assembled from stored fragments."""
+
+    def __init__(
+        self,
+        history: History,
+        tests_dir: Path = TESTS_DIR,
+        results_path: Path = RESULTS_FILE,
+        report_path: Path = REPORT_FILE,
+    ):
+        self.db = history.db
+        self.results_path = results_path
+        self.report_path = report_path
+        try:
+            with open(tests_dir / "testsprite_frontend_test_plan.json", encoding="utf-8") as fh:
+                self.plan = {entry["id"]: entry for entry in json.load(fh)}
+        except OSError:
+            self.plan = {}
+        if not self.db.execute("SELECT 1 FROM fragments LIMIT 1").fetchone():
+            self._seed()
+
+    def _put(self, kind: str, key: str, ord_: str, body: str) -> None:
+        self.db.execute("INSERT OR REPLACE INTO fragments VALUES (?, ?, ?, ?)", (kind, key, ord_, body))
+
+    def _get(self, kind: str, key: str) -> str | None:
+        row = self.db.execute("SELECT body FROM fragments WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+        return row[0] if row else None
+
+    def _seed(self) -> None:
+        """Adopt whatever TestSprite last wrote, keyed like our cases."""
+        with self.db:
+            try:
+                entries = json.loads(self.results_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                entries = []
+            for entry in entries:
+                key = _slug(entry["title"].replace("-", " ", 1))
+                self._put("result", key, key, json.dumps(entry, indent=2, ensure_ascii=False))
+            try:
+                report = self.report_path.read_text(encoding="utf-8")
+            except OSError:
+                report = "# Test Report\n\n## Requirement Validation Summary\n\n"
+            sections = list(_REPORT_SECTION.finditer(report))
+            head = report[: sections[0].start()] if sections else report
+            tail = report[sections[-1].end():] if sections else ""
+            self._put("report", "head", "", head)
+            self._put("report", "tail", "", tail)
+            for match in sections:
+                name = re.search(r"^- \*\*Test Name:\*\* (.*)$", match.group(0), re.M)
+                key = _slug(f"{match.group(1)} {name.group(1) if name else ''}")
+                self._put("section", key, key, match.group(0))
+
+    def update(self, result: TestResult, console: Sequence[tuple[str, str]]) -> None:
+        """Re-render the fragments of one case and reassemble both files."""
+        case = result.case
+        key = _slug(case.key)
+        with self.db:
+            self._put("result", key, key, self._render_entry(key, result))
+            self._put("section", key, key, self._render_section(case, result, console, self._get("section", key)))
+        self.write()
+
+    def _plan_entry(self, case: TestCase) -> dict[str, Any]:
+        entry = self.plan.get(case.id, {})
+        return entry if _slug(entry.get("title", "")) == _slug(case.title) else {}
+
+    def _render_entry(self, key: str, result: TestResult) -> str:
+        case = result.case
+        stored = self._get("result", key)
+        entry = json.loads(stored) if stored else {
+            "title": f"{case.id}-{case.title}",
+            "description": self._plan_entry(case).get("description", ""),
+            "testType": "FRONTEND",
+            "createFrom": "harness",
+            "created": _iso(result.started_at),
+        }
+        entry.update(
+            testStatus=result.status,
+            testError=result.error or "",
+            modified=_iso(result.started_at + result.duration),
+        )
+        return json.dumps(entry, indent=2, ensure_ascii=False)
+
+    def _render_section(
+        self,
+        case: TestCase,
+        result: TestResult,
+        console: Sequence[tuple[str, str]],
+        stored: str | None = None,
+    ) -> str:
+        # TestSprite's own lines outlive our re-renders: its dashboard link
+        # goes before the status, the analysis after it.
+        kept = dict(_KEPT_LINE.findall(stored or ""))
+        lines = [
+            f"#### Test {case.id}",
+            f"- **Test Name:** {case.title}",
+            f"- **Test Code:** [{case.path.name}](./{case.path.name})",
+        ]
+        if result.error:
+            lines.append(f"- **Test Error:** {result.error}")
+            if console:
+                lines.append("Browser Console Logs:")
+                lines.extend(f"[{level.upper()}] {text}" for level, text in console)
+        if VISUALIZATION in kept:
+            lines.append(f"- **{VISUALIZATION}:** {kept[VISUALIZATION]}")
+        lines.append(f"- **Duration:** {result.duration:.1f}s")
+        lines.append(f"- **Status:** {'✅ Passed' if result.passed else '❌ Failed'}")
+        if ANALYSIS in kept:
+            lines.append(f"- **{ANALYSIS}:** {kept[ANALYSIS]}")
+        return "\n".join(lines) + "\n---\n"
+
+    def write(self) -> None:
+        entries = [r[0] for r in self.db.execute("SELECT body FROM fragments WHERE kind = 'result' ORDER BY ord")]
+        _replace(self.results_path, "[\n" + ",\n".join(entries) + "\n]\n")
+
+        sections = [r[0] for r in self.db.execute("SELECT body FROM fragments WHERE kind = 'section' ORDER BY ord")]
+        passed = sum("✅ Passed" in s for s in sections)
+        rate = 100 * passed / len(sections) if sections else 0.0
+        tail = _PASS_RATE.sub(f"- **{rate:.2f}** of tests passed", self._get("report", "tail") or "")
+        _replace(self.report_path, (self._get("report", "head") or "") + "\n".join(sections) + tail)
+
+
+def _replace(path: Path, text: str) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(path)
+
+
+# -- hook -------------------------------------------------------------------
+
+
+class HistorySink(Hook):
+    """Appends each case to the history as it finishes."""
+
+    def __init__(self, path: Path = HISTORY_FILE, *, artifacts: bool = False, tests_dir: Path = TESTS_DIR):
+        self.path = path
+        self.write_artifacts = artifacts
+        self.tests_dir = tests_dir
+        self.history: History | None = None
+        self.artifacts: Artifacts | None = None
+        self.run_id = 0
+        self.console: dict[str, list[tuple[str, str]]] = {}
+
+    async def on_run_start(self, cases: Sequence[TestCase]) -> None:
+        self.history = History(self.path)
+        self.run_id = self.history.start_run(len(cases))
+        if self.write_artifacts:
+            self.artifacts = Artifacts(self.history, self.tests_dir)
+
+    async def on_context(self, context: BrowserContext, case: TestCase) -> None:
+        log = self.console.setdefault(case.key, [])
+
+        def on_console(message: ConsoleMessage) -> None:
+            if message.type == "error":
+                at = message.location
+                where = f"{at.get('url', '')}:{at.get('lineNumber', 0)}:{at.get('columnNumber', 0)}"
+                log.append(("error", f"{message.text} (at {where})"))
+
+        def on_web_error(error: WebError) -> None:
+            log.append(("pageerror", str(error.error)))
+
+        context.on("console", on_console)
+        context.on("weberror", on_web_error)
+
+    async def on_finish(
+        self, context: BrowserContext | None, case: TestCase, result: TestResult
+    ) -> None:
+        console = self.console.pop(case.key, [])
+        self.history.append(self.run_id, result, console)
+        if self.artifacts is not None:
+            self.artifacts.update(result, console)
+
+    async def on_run_end(self, results: Sequence[TestResult]) -> None:
+        self.history.finish_run(self.run_id)
+        self.history.close()
@@ -0,0 +1,158 @@
+"""Latency recording per run, and regression gating against a baseline.
+
+Every harness run records three families of histograms:
+
+* ``tests``     -- wall time of each TC case;
+* ``steps``     -- time spent in each named script step (``<case> :: <step>``);
+* ``endpoints`` -- browser-observed latency of each ``/api/*`` route, from
+  Playwright's resource timing.
+
+They are written to tmp/latency.json next to test_results.json. Comparing a
+run against a stored baseline fails when a series' p95 or p99 grew by more
+than the tolerance, so a slower Express route shows up as a failed CI run.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Sequence
+
+from playwright.async_api import BrowserContext, Request
+
+from .config import TMP_DIR
+from .histogram import Histogram
+from .routes import is_api_request, route_key
+from .runner import Hook, TestResult
+from .scripts import TestCase
+
+LATENCY_FILE = TMP_DIR / "latency.json"
+BASELINE_FILE = TMP_DIR / "latency_baseline.json"
+KINDS = ("tests", "steps", "endpoints")
+
+
+@dataclass
+class LatencyRun:
+    series: dict[str, dict[str, Histogram]] = field(
+        default_factory=lambda: {kind: {} for kind in KINDS}
+    )
+    meta: dict[str, Any] = field(default_factory=dict)
+
+    def histogram(self, kind: str, key: str) -> Histogram:
+        family = self.series.setdefault(kind, {})
+        if key not in family:
+            family[key] = Histogram()
+        return family[key]
+
+    def record(self, kind: str, key: str, value_ms: float) -> None:
+        self.histogram(kind, key).record(value_ms)
+
+    def merge(self, other: "LatencyRun") -> "LatencyRun":
+        for kind, family in other.series.items():
+            for key, hist in family.items():
+                self.histogram(kind, key).merge(hist)
+        return self
+
+    def save(self, path: Path = LATENCY_FILE) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "meta": self.meta,
+            "series": {
+                kind: {key: hist.to_dict() for key, hist in sorted(family.items())}
+                for kind, family in self.series.items()
+            },
+        }
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path = LATENCY_FILE) -> "LatencyRun":
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        return cls(
+            series={
+                kind: {key: Histogram.from_dict(h) for key, h in family.items()}
+                for kind, family in data["series"].items()
+            },
+            meta=data.get("meta", {}),
+        )
+
+
+class LatencyRecorder(Hook):
+    def __init__(self, path: Path | None = LATENCY_FILE):
+        self.path = path
+        self.run = LatencyRun()
+
+    async def on_run_start(self, cases: Sequence[TestCase]) -> None:
+        self.run.meta = {"started_at": time.time(), "cases": len(cases)}
+
+    async def on_context(self, context: BrowserContext, case: TestCase) -> None:
+        context.on("requestfinished", self._on_request_finished)
+
+    def _on_request_finished(self, request: Request) -> None:
+        if not is_api_request(request.url):
+            return
+        end = request.timing.get("responseEnd", -1)
+        if end >= 0:
+            self.run.record("endpoints", route_key(request.method, request.url), end)
+
+    async def on_finish(
+        self, context: BrowserContext | None, case: TestCase, result: TestResult
+    ) -> None:
+        self.run.record("tests", case.key, result.duration * 1000)
+        for step in result.steps:
+            self.run.record("steps", f"{case.key} :: {step.name}", step.duration * 1000)
+
+    async def on_run_end(self, results: Sequence[TestResult]) -> None:
+        self.run.meta["finished_at"] = time.time()
+        if self.path is not None:
+            self.run.save(self.path)
+
+
+@dataclass(frozen=True)
+class Regression:
+    kind: str
+    key: str
+    pct: float
+    baseline_ms: float
+    current_ms: float
+
+    def __str__(self) -> str:
+        growth = self.current_ms / self.baseline_ms - 1 if self.baseline_ms else float("inf")
+        return (
+            f"{self.kind}/{self.key}: p{self.pct:g} {self.baseline_ms:.1f}ms"
+            f" -> {self.current_ms:.1f}ms (+{growth:.0%})"
+        )
+
+
+def compare(
+    current: LatencyRun,
+    baseline: LatencyRun,
+    *,
+    tolerance: float = 0.10,
+    min_delta_ms: float = 5.0,
+    min_count: int = 5,
+    pcts: Sequence[float] = (95, 99),
+) -> list[Regression]:
+    """Series whose percentiles grew beyond ``tolerance`` (relative).
+
+    ``min_delta_ms`` keeps sub-millisecond jitter on fast series from
+    tripping the gate, and series with fewer than ``min_count`` samples on
+    either side are too noisy to judge and are skipped.
+    """
+    regressions = []
+    for kind, family in current.series.items():
+        base_family = baseline.series.get(kind, {})
+        for key, hist in sorted(family.items()):
+            base = base_family.get(key)
+            if base is None or hist.count < min_count or base.count < min_count:
+                continue
+            for pct in pcts:
+                before = base.value_at_percentile(pct)
+                after = hist.value_at_percentile(pct)
+                if after > before * (1 + tolerance) and after - before > min_delta_ms:
+                    regressions.append(Regression(kind, key, pct, before, after))
+    return regressions
@@ -0,0 +1,241 @@
+"""Find heap leaks in the long-lived SPA by cycling through its routes.
+
+Club staff keep the dashboard open all day and switch between /dashboard,
+/tournaments, /finance and /analytics. A leak that costs a few hundred KB
+per visit never shows up in a test that loads each page once. After hours
+of switching, the tab has grown by hundreds of MB. Likely sources are query
+caches that outlive the page that filled them, and charts that never
+release their canvases and listeners.
+
+``python -m harness leaks`` signs in once and loads the app. Then it visits
+the routes in order, N times. Each visit is an in-app navigation
+(``history.pushState``, which wouter follows): the sidebar links are plain
+anchors and would reload the document, and a reload throws away exactly
+the heap under test. After every visit the page settles. The CDP
+``HeapProfiler`` then forces garbage collection twice and reads the live
+heap size.
+
+Every few cycles it takes a heap snapshot and counts objects and shallow
+bytes per constructor. The report shows three things:
+
+* heap growth per cycle -- a least-squares slope over the cycles after the
+  warm-up, so first-visit caches and lazily loaded chunks do not count;
+* growth per route -- the mean heap a visit leaves behind (live heap after
+  the route minus after the one before it), which points at the route
+  that leaks;
+* the constructors whose live count and size grew most between the first
+  and the last snapshot.
+
+The run fails when the per-cycle growth exceeds ``threshold_kb``. The
+report is written to tmp/leaks.json.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+from playwright.async_api import CDPSession, Page, async_playwright
+
+from .config import TMP_DIR
+from .history import slope
+from .ready import wait_ready
+from .runner import LAUNCH_ARGS
+from .waits import Settler
+
+LEAKS_FILE = TMP_DIR / "leaks.json"
+DEFAULT_ROUTES = ("/dashboard", "/tournaments", "/finance", "/analytics")
+
+NAVIGATE_SCRIPT = """
+(path) => {
+  history.pushState(null, "", path);
+  dispatchEvent(new PopStateEvent("popstate", { state: null }));
+}
+"""
+
+KB = 1024
+
+
+@dataclass
+class HeapCensus:
+    """Live objects per constructor in one heap snapshot: name -> [count, bytes]."""
+
+    cycle: int
+    total: int
+    by_name: dict[str, list[int]] = field(default_factory=dict)
+
+
+def census(snapshot: Mapping[str, Any], cycle: int) -> HeapCensus:
+    """Group a V8 ``.heapsnapshot`` by constructor, as DevTools' summary view does."""
+    meta = snapshot["snapshot"]["meta"]
+    fields = meta["node_fields"]
+    width = len(fields)
+    t, n, s = fields.index("type"), fields.index("name"), fields.index("self_size")
+    types = meta["node_types"][0]
+    strings = snapshot["strings"]
+    nodes = snapshot["nodes"]
+    result = HeapCensus(cycle=cycle, total=0)
+    for i in range(0, len(nodes), width):
+        kind = types[nodes[i + t]]
+        size = nodes[i + s]
+        result.total += size
+        name = strings[nodes[i + n]] if kind in ("object", "native") else f"({kind})"
+        entry = result.by_name.setdefault(name, [0, 0])
+        entry[0] += 1
+        entry[1] += size
+    return result
+
+
+def growth(first: HeapCensus, last: HeapCensus, limit: int = 15) -> list[dict[str, Any]]:
+    """Constructors whose live size grew most from ``first`` to ``last``."""
+    rows = []
+    for name, (count, size) in last.by_name.items():
+        before_count, before_size = first.by_name.get(name, (0, 0))
+        if size > before_size:
+            rows.append({"name": name, "count": count - before_count, "bytes": size - before_size})
+    rows.sort(key=lambda r: r["bytes"], reverse=True)
+    return rows[:limit]
+
+
+@dataclass
+class LeakReport:
+    routes: list[str]
+    cycles: int
+    warmup: int
+    threshold_kb: float
+    # Live heap after each visit: route -> one sample per cycle.
+    samples: dict[str, list[int]] = field(default_factory=dict)
+    snapshots: list[dict[str, int]] = field(default_factory=list)
+    top: list[dict[str, Any]] = field(default_factory=list)
+    started_at: float = field(default_factory=time.time)
+
+    @property
+    def cycle_end(self) -> list[int]:
+        return self.samples.get(self.routes[-1], [])
+
+    @property
+    def per_cycle_kb(self) -> float:
+        return slope(self.cycle_end[self.warmup:]) / KB
+
+    def route_kb(self, route: str) -> float:
+        """Mean heap left behind by a visit: after this route minus after the one before."""
+        j = self.routes.index(route)
+        before = self.samples.get(self.routes[j - 1], [])
+        after = self.samples.get(route, [])
+        # The first route follows the previous cycle's last one.
+        offset = 1 if j == 0 else 0
+        deltas = [
+            after[c] - before[c - offset]
+            for c in range(max(self.warmup, offset), len(after))
+            if c - offset < len(before)
+        ]
+        return sum(deltas) / len(deltas) / KB if deltas else 0.0
+
+    @property
+    def leaking(self) -> bool:
+        return self.per_cycle_kb > self.threshold_kb
+
+    def save(self, path: Path = LEAKS_FILE) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = asdict(self)
+        data["per_cycle_kb"] = self.per_cycle_kb
+        data["per_route_kb"] = {route: self.route_kb(route) for route in self.routes}
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        tmp.replace(path)
+
+
+def format_report(report: LeakReport) -> str:
+    measured = len(report.cycle_end) - report.warmup
+    lines = [f"{'route':<24} {'first':>9} {'last':>9} {'KB/visit':>9}"]
+    for route in report.routes:
+        samples = report.samples.get(route, [])
+        if not samples:
+            continue
+        lines.append(
+            f"{route:<24} {samples[0] / KB / KB:>7.1f}MB {samples[-1] / KB / KB:>7.1f}MB"
+            f" {report.route_kb(route):>+9.1f}"
+        )
+    verdict = "LEAK" if report.leaking else "ok"
+    lines.append(
+        f"\nheap {report.per_cycle_kb:+.1f} KB/cycle over {measured} cycles after"
+        f" {report.warmup} warm-up (threshold {report.threshold_kb:g} KB): {verdict}"
+    )
+    if report.top:
+        first, last = report.snapshots[0]["cycle"], report.snapshots[-1]["cycle"]
+        lines.append(f"\ngrew most between snapshots at cycle {first} and {last}")
+        for row in report.top:
+            lines.append(f"  {row['bytes'] / KB:>+9.1f} KB {row['count']:>+8} objects  {row['name']}")
+    return "\n".join(lines)
+
+
+async def _live_heap(cdp: CDPSession) -> int:
+    # Twice: the first pass can leave objects that only the second frees.
+    await cdp.send("HeapProfiler.collectGarbage")
+    await cdp.send("HeapProfiler.collectGarbage")
+    usage = await cdp.send("Runtime.getHeapUsage")
+    return int(usage["usedSize"])
+
+
+async def _snapshot(cdp: CDPSession) -> dict[str, Any]:
+    chunks: list[str] = []
+
+    def on_chunk(params: dict[str, Any]) -> None:
+        chunks.append(params["chunk"])
+
+    cdp.on("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+    try:
+        await cdp.send("HeapProfiler.takeHeapSnapshot", {"reportProgress": False})
+    finally:
+        cdp.remove_listener("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+    return json.loads("".join(chunks))
+
+
+async def _visit(page: Page, settler: Settler, route: str) -> None:
+    await page.evaluate(NAVIGATE_SCRIPT, route)
+    await settler.settle(page)
+
+
+async def hunt(
+    base: str,
+    storage_state: dict[str, Any] | None,
+    *,
+    routes: Sequence[str] = DEFAULT_ROUTES,
+    cycles: int = 10,
+    warmup: int = 2,
+    snapshot_every: int = 5,
+    threshold_kb: float = 256,
+    headless: bool = True,
+    settle_timeout: float = 10_000,
+) -> LeakReport:
+    report = LeakReport(list(routes), cycles, warmup, threshold_kb)
+    settler = Settler(upper_bound_ms=settle_timeout)
+    first: HeapCensus | None = None
+    last: HeapCensus | None = None
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+        try:
+            context = await browser.new_context(storage_state=storage_state)
+            await settler.attach(context)
+            page = await context.new_page()
+            await page.goto(base + routes[0], wait_until="commit")
+            await wait_ready(page)
+            cdp = await context.new_cdp_session(page)
+            await cdp.send("HeapProfiler.enable")
+            for cycle in range(1, cycles + 1):
+                for route in routes:
+                    await _visit(page, settler, route)
+                    report.samples.setdefault(route, []).append(await _live_heap(cdp))
+                if cycle == warmup + 1 or cycle == cycles or (cycle > warmup and cycle % snapshot_every == 0):
+                    last = census(await _snapshot(cdp), cycle)
+                    first = first or last
+                    report.snapshots.append({"cycle": cycle, "total": last.total})
+                    print(f"cycle {cycle}: heap snapshot {last.total / KB / KB:.1f} MB")
+        finally:
+            await browser.close()
+    if first is not None and last is not None and last is not first:
+        report.top = growth(first, last)
+    return report
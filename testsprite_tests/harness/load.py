@@ -0,0 +1,254 @@
+"""Open-loop HTTP load generation against the Express API.
+
+Requests arrive as a Poisson process at a fixed rate regardless of how fast
+earlier ones complete, the way independent users do. Latency is measured
+from each request's *intended* send time, so when the server falls behind
+the queueing delay shows up in the percentiles instead of silently lowering
+the offered load (coordinated omission).
+
+All requests share one ``httpx.AsyncClient`` -- a keep-alive HTTP/1.1
+connection pool -- authenticated with session cookies from the per-role
+storage-state cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Sequence
+
+import httpx
+
+from .config import base_url
+from .histogram import Histogram
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    path: str
+    method: str = "GET"
+    weight: float = 1.0
+    json: Any = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    endpoints: Sequence[Endpoint]
+    rate: float  # arrivals per second
+    duration: float  # seconds
+    role: str = "club_admin"
+    # Percentile -> limit in ms, checked against the aggregate of all endpoints.
+    thresholds: Mapping[int, float] = field(default_factory=lambda: {95: 300.0})
+    max_error_ratio: float = 0.01
+
+
+# Read paths behind the dashboard, tournaments, matches, contracts, rosters,
+# staff and audit pages, weighted roughly by how often the UI polls them.
+# All are served by server/routes/index.ts, the router server/index.ts
+# mounts; the legacy server/routes.ts (wallets, social) is not, and its
+# paths would only add 404s to the error ratio.
+KEY_ENDPOINTS = (
+    Endpoint("/api/tournaments", weight=3),
+    Endpoint("/api/analytics", weight=2),
+    Endpoint("/api/matches", weight=1),
+    Endpoint("/api/contracts", weight=1),
+    Endpoint("/api/rosters", weight=1),
+    Endpoint("/api/staff", weight=1),
+    Endpoint("/api/audit-logs", weight=1),
+)
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("key-endpoints", KEY_ENDPOINTS, rate=20, duration=30),
+        Scenario(
+            "key-endpoints-peak",
+            KEY_ENDPOINTS,
+            rate=100,
+            duration=30,
+            thresholds={50: 100.0, 95: 300.0, 99: 1000.0},
+        ),
+    )
+}
+
+
+@dataclass
+class EndpointStats:
+    latency: Histogram = field(default_factory=Histogram)
+    statuses: dict[int, int] = field(default_factory=dict)
+    errors: int = 0  # transport failures and non-2xx responses
+
+    @property
+    def count(self) -> int:
+        return self.latency.count
+
+    def record(self, latency_ms: float, status: int | None) -> None:
+        self.latency.record(latency_ms)
+        if status is not None:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+        if status is None or not 200 <= status < 300:
+            self.errors += 1
+
+    def merge(self, other: "EndpointStats") -> None:
+        self.latency.merge(other.latency)
+        for status, n in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + n
+        self.errors += other.errors
+
+    def percentiles(self, pcts: Sequence[int] = (50, 95, 99)) -> dict[int, float]:
+        return {p: self.latency.value_at_percentile(p) for p in pcts}
+
+
+@dataclass
+class LoadReport:
+    scenario: Scenario
+    elapsed: float
+    endpoints: dict[str, EndpointStats]
+    dropped: int = 0
+
+    @property
+    def total(self) -> EndpointStats:
+        total = EndpointStats()
+        for stats in self.endpoints.values():
+            total.merge(stats)
+        return total
+
+    def check(self) -> list[str]:
+        """Return the threshold violations; empty means the run passed."""
+        total = self.total
+        failures = []
+        if not total.count:
+            return ["no requests completed"]
+        measured = total.percentiles(tuple(sorted(self.scenario.thresholds)))
+        for pct, limit in sorted(self.scenario.thresholds.items()):
+            if measured[pct] > limit:
+                failures.append(f"p{pct} {measured[pct]:.0f}ms exceeds {limit:.0f}ms")
+        ratio = total.errors / total.count
+        if ratio > self.scenario.max_error_ratio:
+            failures.append(
+                f"error ratio {ratio:.1%} exceeds {self.scenario.max_error_ratio:.1%}"
+            )
+        if self.dropped:
+            failures.append(f"{self.dropped} arrivals dropped at the in-flight limit")
+        return failures
+
+    def format(self) -> str:
+        lines = [
+            f"scenario {self.scenario.name}: {self.total.count} requests"
+            f" in {self.elapsed:.1f}s ({self.total.count / self.elapsed:.1f}/s)",
+            f"{'endpoint':<32} {'n':>6} {'err':>5} {'p50':>7} {'p95':>7} {'p99':>7}",
+        ]
+        rows = sorted(self.endpoints.items()) + [("total", self.total)]
+        for name, stats in rows:
+            p = stats.percentiles()
+            lines.append(
+                f"{name:<32} {stats.count:>6} {stats.errors:>5}"
+                f" {p[50]:>7.1f} {p[95]:>7.1f} {p[99]:>7.1f}"
+            )
+        return "\n".join(lines)
+
+
+class LoadGenerator:
+    def __init__(
+        self,
+        scenario: Scenario,
+        *,
+        base: str | None = None,
+        cookies: Mapping[str, str] | None = None,
+        connections: int = 64,
+        max_in_flight: int = 1024,
+        timeout: float = 10.0,
+        seed: int | None = None,
+    ):
+        self.scenario = scenario
+        self.base = base or base_url()
+        self.cookies = dict(cookies or {})
+        self.connections = connections
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.random = random.Random(seed)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.base,
+            cookies=self.cookies,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.connections,
+                max_keepalive_connections=self.connections,
+            ),
+        )
+
+    async def run(self) -> LoadReport:
+        scenario = self.scenario
+        endpoints = list(scenario.endpoints)
+        weights = [e.weight for e in endpoints]
+        stats = {e.name: EndpointStats() for e in endpoints}
+        loop = asyncio.get_running_loop()
+        in_flight: set[asyncio.Task[None]] = set()
+        dropped = 0
+
+        async with self.client() as client:
+            started = loop.time()
+            intended = started
+            while True:
+                intended += self.random.expovariate(scenario.rate)
+                if intended - started >= scenario.duration:
+                    break
+                delay = intended - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if len(in_flight) >= self.max_in_flight:
+                    dropped += 1
+                    continue
+                endpoint = self.random.choices(endpoints, weights)[0]
+                task = asyncio.create_task(
+                    self._fire(client, endpoint, intended, stats[endpoint.name])
+                )
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            if in_flight:
+                await asyncio.gather(*in_flight)
+            elapsed = loop.time() - started
+        return LoadReport(scenario, elapsed, stats, dropped)
+
+    async def _fire(
+        self,
+        client: httpx.AsyncClient,
+        endpoint: Endpoint,
+        intended: float,
+        stats: EndpointStats,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        status = None
+        try:
+            response = await client.request(endpoint.method, endpoint.path, json=endpoint.json)
+            await response.aread()
+            status = response.status_code
+        except httpx.HTTPError:
+            pass
+        stats.record((loop.time() - intended) * 1000, status)
+
+
+async def run_scenario(
+    scenario: Scenario | str,
+    *,
+    cookies: Mapping[str, str] | None = None,
+    **kwargs: Any,
+) -> LoadReport:
+    """Run a scenario, signing in as its role from the session cache."""
+    if isinstance(scenario, str):
+        scenario = SCENARIOS[scenario]
+    if cookies is None:
+        from .sessions import SessionCache
+
+        cache = SessionCache(base=kwargs.get("base"))
+        await cache.ensure([scenario.role])
+        cookies = cache.cookies(scenario.role)
+    return await LoadGenerator(scenario, cookies=cookies, **kwargs).run()
@@ -0,0 +1,386 @@
+"""Per-route latency analytics over requestLogger output.
+
+The server's only record of production latency is the response line
+requestLogger (server/middleware/validation.ts) prints for every request::
+
+    [2025-10-19T16:33:05.002Z] GET /api/tournaments/abc123/rounds - 200 OK - 21ms - Request ID: <id>
+
+The path is ``req.originalUrl``. Servers from before that change logged
+``req.url``, which Express strips of the ``/api`` mount prefix, so their
+lines read ``GET /tournaments/abc123/rounds`` and auth routes collapse into
+``/login`` and ``/logout``. The report says so when a log has no ``/api/``
+path at all.
+
+``python -m harness logstats server.log...`` streams those lines -- plain or
+gzipped, gigabytes of them -- and aggregates them per route template
+(``GET /api/tournaments/:id/rounds``, as ``route_key`` groups them):
+
+* totals -- requests, handler time, 4xx and 5xx counts and a latency
+  histogram over the whole log;
+* sliding windows -- each route keeps one histogram per ``step`` bucket for
+  the last ``window``. When a route's traffic moves to a new bucket, the
+  window ending there is merged and scored: p50/p95/p99, requests per
+  second and 5xx ratio. The worst window per route is kept, so a slow
+  quarter of an hour is not averaged away by a quiet week.
+
+Memory does not grow with the log. Histograms are mergeable sketches of
+bounded size, a route holds at most ``window / step`` of them, and routes
+past ``max_routes`` (scanners probing random paths) fold into ``OTHER``.
+Lines may be slightly out of order, as when several instances' logs are
+concatenated. A line for a bucket that already left its route's window
+still counts in the totals; such lines are reported as late.
+
+The ranked report goes to the terminal and tmp/logstats.json. ``--prom``
+also writes the totals and the latest window as a Prometheus textfile,
+for node_exporter's textfile collector.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+
+from .config import TMP_DIR
+from .histogram import Histogram
+from .routes import normalize_path
+from .trace import ServerEntry, parse_log
+
+LOGSTATS_FILE = TMP_DIR / "logstats.json"
+
+OTHER = "OTHER"
+SORT_KEYS = ("time", "p99", "p95", "count", "errors")
+
+
+@dataclass
+class Bucket:
+    index: int
+    latency: Histogram = field(default_factory=Histogram)
+    errors: int = 0
+
+
+@dataclass
+class Window:
+    """One sliding window of a route, scored when it closed."""
+
+    end: float  # epoch seconds
+    count: int
+    rate: float  # requests per second
+    error_ratio: float
+    p50: float
+    p95: float
+    p99: float
+
+    @classmethod
+    def of(cls, buckets: Iterable[Bucket], end: float, seconds: float) -> Window:
+        merged, errors = Histogram(), 0
+        for bucket in buckets:
+            merged.merge(bucket.latency)
+            errors += bucket.errors
+        pct = merged.percentiles()
+        return cls(
+            end=end,
+            count=merged.count,
+            rate=merged.count / seconds,
+            error_ratio=errors / merged.count if merged.count else 0.0,
+            p50=pct[50],
+            p95=pct[95],
+            p99=pct[99],
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**self.__dict__, "end": _iso(self.end)}
+
+
+@dataclass
+class RouteStats:
+    latency: Histogram = field(default_factory=Histogram)
+    client_errors: int = 0  # 4xx
+    errors: int = 0  # 5xx
+    late: int = 0
+    buckets: deque[Bucket] = field(default_factory=deque)
+    latest: Window | None = None
+    worst: Window | None = None  # highest p99 among windows with enough requests
+    peak_rate: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return self.latency.count
+
+    @property
+    def time_ms(self) -> float:
+        return self.latency.sum_us / 1000
+
+    @property
+    def error_ratio(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        pct = self.latency.percentiles()
+        return {
+            "count": self.count,
+            "time_ms": self.time_ms,
+            "p50": pct[50],
+            "p95": pct[95],
+            "p99": pct[99],
+            "max": self.latency.max,
+            "client_errors": self.client_errors,
+            "errors": self.errors,
+            "error_ratio": self.error_ratio,
+            "late": self.late,
+            "peak_rate": self.peak_rate,
+            "latest": self.latest.to_dict() if self.latest else None,
+            "worst": self.worst.to_dict() if self.worst else None,
+            "histogram": self.latency.to_dict(),
+        }
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat(timespec="seconds")
+
+
+class LogStats:
+    """Streaming aggregation of requestLogger entries; feed it with ``add``."""
+
+    def __init__(
+        self,
+        window: float = 300.0,
+        step: float = 60.0,
+        min_count: int = 20,
+        max_routes: int = 500,
+    ):
+        if step > window:
+            raise ValueError("step must not exceed window")
+        self.window = window
+        self.step = step
+        self.span = max(1, round(window / step))  # buckets per window
+        self.min_count = min_count
+        self.max_routes = max_routes
+        self.routes: dict[str, RouteStats] = {}
+        self.lines = 0
+        self.api_lines = 0
+        self.first: float | None = None
+        self.last: float | None = None
+        # Raw URLs repeat (ids mostly do not, so the caches are capped and
+        # simply dropped when full); timestamps repeat per second.
+        self._keys: dict[tuple[str, str], str] = {}
+        self._seconds: dict[str, float] = {}
+
+    def _route(self, method: str, url: str) -> str:
+        key = self._keys.get((method, url))
+        if key is None:
+            # requestLogger logs req.originalUrl: a path and query, never a full URL.
+            key = f"{method} {normalize_path(url.partition('?')[0])}"
+            if key not in self.routes and len(self.routes) >= self.max_routes:
+                key = OTHER
+            if len(self._keys) >= 65536:
+                self._keys.clear()
+            self._keys[method, url] = key
+        return key
+
+    def _epoch(self, timestamp: str) -> float:
+        # "2025-10-19T16:33:05.002Z": parse each second once, add the millis.
+        second, _, frac = timestamp.rstrip("Z").partition(".")
+        base = self._seconds.get(second)
+        if base is None:
+            base = datetime.fromisoformat(second + "+00:00").timestamp()
+            if len(self._seconds) >= 4096:
+                self._seconds.clear()
+            self._seconds[second] = base
+        return base + (float("0." + frac) if frac else 0.0)
+
+    def add(self, entry: ServerEntry) -> None:
+        try:
+            now = self._epoch(entry.timestamp)
+        except ValueError:
+            return
+        self.lines += 1
+        if entry.url.startswith("/api/"):
+            self.api_lines += 1
+        self.first = now if self.first is None else min(self.first, now)
+        self.last = now if self.last is None else max(self.last, now)
+
+        key = self._route(entry.method, entry.url)
+        stats = self.routes.get(key)
+        if stats is None:
+            stats = self.routes[key] = RouteStats()
+        stats.latency.record(entry.handler_ms)
+        failed = entry.status >= 500
+        if failed:
+            stats.errors += 1
+        elif entry.status >= 400:
+            stats.client_errors += 1
+
+        index = int(now // self.step)
+        buckets = stats.buckets
+        if buckets and index < buckets[-1].index:
+            # Out of order: into its bucket, if the window still covers it.
+            if index <= buckets[-1].index - self.span:
+                stats.late += 1
+                return
+            position = next(i for i, b in enumerate(buckets) if b.index >= index)
+            if buckets[position].index != index:
+                buckets.insert(position, Bucket(index))
+            bucket = buckets[position]
+        else:
+            if buckets and index > buckets[-1].index:
+                self._close(stats)
+            if not buckets or index > buckets[-1].index:
+                buckets.append(Bucket(index))
+            bucket = buckets[-1]
+            while buckets[0].index <= index - self.span:
+                buckets.popleft()
+        bucket.latency.record(entry.handler_ms)
+        if failed:
+            bucket.errors += 1
+
+    def _close(self, stats: RouteStats) -> None:
+        """Score the window that ends with the route's newest bucket."""
+        end_index = stats.buckets[-1].index
+        start = max((end_index - self.span + 1) * self.step, self.first or 0.0)
+        end = (end_index + 1) * self.step
+        window = Window.of(stats.buckets, end, max(end - start, self.step))
+        stats.latest = window
+        stats.peak_rate = max(stats.peak_rate, window.rate)
+        if window.count >= self.min_count and (stats.worst is None or window.p99 > stats.worst.p99):
+            stats.worst = window
+
+    def finish(self) -> LogStats:
+        for stats in self.routes.values():
+            if stats.buckets:
+                self._close(stats)
+        return self
+
+    def consume(self, entries: Iterable[ServerEntry]) -> LogStats:
+        for entry in entries:
+            self.add(entry)
+        return self.finish()
+
+    # -- output ----------------------------------------------------------
+
+    @property
+    def seconds(self) -> float:
+        return (self.last - self.first) if self.first is not None and self.last is not None else 0.0
+
+    def ranked(self, sort: str = "time") -> list[tuple[str, RouteStats]]:
+        def score(stats: RouteStats) -> tuple[bool, float]:
+            if sort in ("p95", "p99"):
+                # A p99 of three requests says little; rank those last.
+                return stats.count >= self.min_count, stats.latency.value_at_percentile(int(sort[1:]))
+            if sort == "errors":
+                return True, stats.errors
+            if sort == "count":
+                return True, stats.count
+            return True, stats.time_ms
+
+        return sorted(self.routes.items(), key=lambda kv: score(kv[1]), reverse=True)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "lines": self.lines,
+            "first": _iso(self.first) if self.first is not None else None,
+            "last": _iso(self.last) if self.last is not None else None,
+            "window": self.window,
+            "step": self.step,
+            "routes": {route: stats.to_dict() for route, stats in self.ranked()},
+        }
+
+    def save(self, path: Path = LOGSTATS_FILE) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        tmp.replace(path)
+
+    def write_prometheus(self, path: Path) -> None:
+        """Totals and each route's latest window, in the text exposition format."""
+        families: dict[str, tuple[str, str, list[str]]] = {
+            "requests_total": ("counter", "Requests logged.", []),
+            "errors_total": ("counter", "Requests answered with a 5xx status.", []),
+            "handler_seconds_total": ("counter", "Handler time logged.", []),
+            "handler_seconds": ("gauge", "Handler time quantile over the whole log.", []),
+            "window_handler_seconds": ("gauge", "Handler time quantile over the latest window.", []),
+            "window_requests_per_second": ("gauge", "Request rate over the latest window.", []),
+            "window_error_ratio": ("gauge", "Share of 5xx replies over the latest window.", []),
+        }
+
+        def sample(name: str, labels: dict[str, str], value: float) -> None:
+            if math.isnan(value):
+                return
+            text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            families[name][2].append(f"nexus_{name}{{{text}}} {value:.6g}")
+
+        for route, stats in self.ranked():
+            method, _, template = route.partition(" ")
+            labels = {"method": method, "route": template or route}
+            sample("requests_total", labels, stats.count)
+            sample("errors_total", labels, stats.errors)
+            sample("handler_seconds_total", labels, stats.time_ms / 1000)
+            for q, value in stats.latency.percentiles().items():
+                sample("handler_seconds", {**labels, "quantile": f"{q / 100:g}"}, value / 1000)
+            if stats.latest:
+                latest = stats.latest
+                for q, value in ((0.5, latest.p50), (0.95, latest.p95), (0.99, latest.p99)):
+                    sample("window_handler_seconds", {**labels, "quantile": f"{q:g}"}, value / 1000)
+                sample("window_requests_per_second", labels, latest.rate)
+                sample("window_error_ratio", labels, latest.error_ratio)
+
+        lines: list[str] = []
+        for name, (kind, help_, samples) in families.items():
+            lines += [f"# HELP nexus_{name} {help_}", f"# TYPE nexus_{name} {kind}", *samples]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # The collector may read at any moment; never let it see half a file.
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        tmp.replace(path)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _open(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def read_logs(paths: Iterable[Path]) -> Iterator[ServerEntry]:
+    """requestLogger response lines from every file, plain or gzipped, streamed."""
+    for path in paths:
+        with _open(path) as fh:
+            # Half the lines are request lines without a duration; a
+            # substring test is cheaper than running the regex on them.
+            yield from parse_log(line for line in fh if "ms - " in line)
+
+
+def format_logstats(stats: LogStats, sort: str = "time", limit: int = 25) -> str:
+    lines = [
+        f"{stats.lines} requests over {stats.seconds / 3600:.1f} h, {len(stats.routes)} routes;"
+        f" windows of {stats.window:g} s every {stats.step:g} s, ranked by {sort}",
+        "",
+        f"{'route':<44} {'n':>8} {'time%':>6} {'p50':>6} {'p95':>7} {'p99':>7} {'5xx%':>6}"
+        f" {'peak/s':>7} {'worst p99':>10}  worst window",
+    ]
+    total = sum(s.time_ms for s in stats.routes.values()) or 1.0
+    for route, s in stats.ranked(sort)[:limit]:
+        pct = s.latency.percentiles()
+        worst = s.worst
+        lines.append(
+            f"{route[:44]:<44} {s.count:>8} {100 * s.time_ms / total:>6.1f} {pct[50]:>6.0f} {pct[95]:>7.0f}"
+            f" {pct[99]:>7.0f} {100 * s.error_ratio:>6.2f} {s.peak_rate:>7.2f}"
+            + (f" {worst.p99:>10.0f}  ending {_iso(worst.end)}" if worst else f" {'-':>10}")
+        )
+    if stats.lines and not stats.api_lines:
+        lines.append(
+            "\nno /api/ paths in this log: it predates requestLogger logging req.originalUrl,"
+            " so routes lack their /api prefix and may be merged"
+        )
+    late = sum(s.late for s in stats.routes.values())
+    if late:
+        lines.append(f"\n{late} lines arrived after their window closed; they count in the totals only")
+    return "\n".join(lines)
@@ -0,0 +1,51 @@
+"""Wait for the app's own readiness signal instead of per-frame load states.
+
+Every generated script starts with::
+
+    await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    for frame in page.frames:
+        await frame.wait_for_load_state("domcontentloaded", timeout=3000)
+
+and swallows the timeouts. DOMContentLoaded says nothing about the SPA: the
+first step can start before ``/api/auth/user`` has answered, and a slow
+frame costs up to three seconds for nothing.
+
+The client (NexusSuite/client/src/lib/ready.ts) publishes
+``window.__NEXUS_READY__``, a promise that resolves once the session and
+organization state are known and the first route's queries have settled
+and painted. ``wait_ready`` waits for DOMContentLoaded -- module scripts
+have run by then, so the promise exists if the build ships it -- and then
+awaits that promise. A build without the signal falls back to the plain
+DOMContentLoaded wait. Like the settle waits, it is bounded and never
+raises: a page that is not ready in time is left to the next action's own
+actionability checks.
+
+``ScriptPage`` routes the scripts' startup waits through here, and once a
+page is ready the per-frame loop returns immediately.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from playwright.async_api import Error, Page
+
+READY_TIMEOUT_MS = 15_000
+
+READY_SCRIPT = """
+async () => (window.__NEXUS_READY__ ? await window.__NEXUS_READY__ : null)
+"""
+
+
+async def wait_ready(page: Page, timeout_ms: float = READY_TIMEOUT_MS) -> dict[str, Any] | None:
+    """Wait until the app says it is ready; return its ``{route, ms}`` or None."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    try:
+        await page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+        remaining = timeout_ms / 1000 - (loop.time() - started)
+        return await asyncio.wait_for(page.evaluate(READY_SCRIPT), max(remaining, 0.001))
+    except (asyncio.TimeoutError, Error):
+        # Not ready in time, no signal, or navigated away mid-wait.
+        return None
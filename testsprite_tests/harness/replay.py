@@ -0,0 +1,447 @@
+"""Replay production traffic from requestLogger output.
+
+load.py and soak.py send a traffic mix someone guessed. The server's own
+log records the real one: requestLogger (server/middleware/validation.ts)
+prints a response line for every request::
+
+    [2025-10-19T16:33:05.002Z] GET /api/tournaments - 200 OK - 21ms - Tenant: <org> - Request ID: <id>
+
+``python -m harness replay server.log`` streams those lines and rebuilds
+when each request arrived: its logged finish time minus its duration. It
+then sends the requests again, in the same order, against a target server:
+
+* timing -- the original inter-arrival times, divided by ``--speed``. The
+  arrival process is open-loop: a slow reply never delays the next
+  request. How late the replayer itself sent requests is reported as lag,
+  so an overloaded client does not pass for a fast server;
+* sessions -- every tenant in the log gets its own account on the target,
+  ``replay-<hash>@example.com``, which is signed in or registered on first
+  use. Its requests go out with that session's cookies. Lines with no
+  tenant share one anonymous client;
+* ids -- ids in logged URLs do not exist on the target. Each one maps,
+  stably, to an id of the same collection that the tenant has on the
+  target: one its replayed POSTs created, or else one from listing the
+  collection. Query parameters are mapped too: ``organizationId`` (which
+  the server trusts over the session) becomes the replay account's own
+  org, and ``tournamentId``-style ids map like path ids;
+* bodies -- the log has none. Writes get a small valid body per route
+  (``BODIES``); other writes send ``{}``.
+
+The report compares, per route, the logged handler time with the replayed
+round trip. For each tenant it gives the rate and burstiness
+(inter-arrival CV: about 1 for Poisson traffic, above 1 for bursts). It
+also counts replies whose status differs from the logged one.
+Logout and registration are never replayed: they would end or duplicate the
+replay's own sessions.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import json
+import math
+import re
+import ssl
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlsplit
+
+import httpx
+
+from .config import TMP_DIR
+from .histogram import Histogram
+from .routes import is_id_segment, route_key
+from .sessions import DEFAULT_PASSWORD
+from .trace import ServerEntry, parse_log
+
+REPLAY_FILE = TMP_DIR / "replay.json"
+ANONYMOUS = "-"
+
+# Requests that would interfere with the replay itself.
+SKIP = re.compile(r"^/(?:api/(?:__test__|metrics|auth/(?:logout|register))\b|health\b)")
+
+# Query parameters naming the tenant; resolveOrgId (server/routes/index.ts)
+# takes them over the signed-in user's org.
+ORG_PARAMS = {"organizationId", "orgId", "tenantId"}
+
+# Writes whose logged body is unknown get one of these.
+BODIES: dict[str, dict[str, Any]] = {
+    "POST /api/tournaments": {
+        "name": "Replay Cup",
+        "game": "Valorant",
+        "format": "single_elimination",
+        "status": "upcoming",
+        "startDate": "2026-01-01T00:00:00.000Z",
+    },
+    "PATCH /api/tournaments/:id": {"status": "ongoing"},
+    "POST /api/tournaments/:id/rounds": {"name": "Round 1", "roundNumber": 1, "status": "upcoming"},
+    "PATCH /api/rounds/:id": {"status": "ongoing"},
+    "POST /api/rosters": {"playerId": "replay-player", "game": "Valorant", "role": "Player"},
+    "PATCH /api/rosters/:id": {"role": "Sub"},
+    "POST /api/contracts": {
+        "fileName": "replay.pdf",
+        "fileUrl": "https://files.example.com/replay.pdf",
+        "type": "Player",
+        "linkedPerson": "Replay Player",
+        "expirationDate": "2027-01-01T00:00:00.000Z",
+    },
+    "PATCH /api/contracts/:id": {"status": "expiring"},
+    "POST /api/profile": {"firstName": "Replay"},
+}
+
+# requestLogger's longest possible handler time (the timeout middleware's).
+REORDER_SECONDS = 30.0
+
+
+@dataclass(frozen=True, order=True)
+class LoggedRequest:
+    at: float  # arrival, seconds since the epoch
+    method: str
+    url: str
+    status: int
+    handler_ms: float
+    tenant: str
+
+    @property
+    def route(self) -> str:
+        return route_key(self.method, self.url)
+
+
+def _tenant(entry: ServerEntry) -> str:
+    if entry.tenant:
+        return entry.tenant
+    org = parse_qs(urlsplit(entry.url).query).get("organizationId")
+    return org[0] if org else ANONYMOUS
+
+
+def arrivals(entries: Iterable[ServerEntry], reorder: float = REORDER_SECONDS) -> Iterator[LoggedRequest]:
+    """Logged requests in arrival order.
+
+    Lines are written when a response finishes, so a slow request is
+    logged after faster ones that arrived later. A heap holds lines until
+    nothing earlier can still appear.
+    """
+    pending: list[LoggedRequest] = []
+    for entry in entries:
+        try:
+            finished = datetime.fromisoformat(entry.timestamp).timestamp()
+        except ValueError:
+            continue
+        request = LoggedRequest(
+            at=finished - entry.handler_ms / 1000,
+            method=entry.method,
+            url=entry.url,
+            status=entry.status,
+            handler_ms=entry.handler_ms,
+            tenant=_tenant(entry),
+        )
+        heapq.heappush(pending, request)
+        while pending and pending[0].at < finished - reorder:
+            yield heapq.heappop(pending)
+    while pending:
+        yield heapq.heappop(pending)
+
+
+@dataclass
+class RouteDelta:
+    logged: Histogram = field(default_factory=Histogram)
+    replayed: Histogram = field(default_factory=Histogram)
+    # "200->404": count, for replies whose status differs from the log.
+    mismatches: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.replayed.count,
+            "logged": {f"p{p:g}": v for p, v in self.logged.percentiles().items()},
+            "replayed": {f"p{p:g}": v for p, v in self.replayed.percentiles().items()},
+            "mismatches": self.mismatches,
+        }
+
+
+@dataclass
+class TenantStats:
+    """Arrival process of one tenant, accumulated online (Welford)."""
+
+    requests: int = 0
+    first: float = 0.0
+    last: float = 0.0
+    _mean_gap: float = 0.0
+    _m2: float = 0.0
+
+    def arrive(self, at: float) -> None:
+        if self.requests:
+            gap = at - self.last
+            n = self.requests  # gaps so far, including this one
+            delta = gap - self._mean_gap
+            self._mean_gap += delta / n
+            self._m2 += delta * (gap - self._mean_gap)
+        else:
+            self.first = at
+        self.requests += 1
+        self.last = at
+
+    @property
+    def rate(self) -> float:
+        span = self.last - self.first
+        return (self.requests - 1) / span if span > 0 else 0.0
+
+    @property
+    def cv(self) -> float:
+        gaps = self.requests - 1
+        if gaps < 2 or self._mean_gap <= 0:
+            return 0.0
+        return math.sqrt(self._m2 / (gaps - 1)) / self._mean_gap
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"requests": self.requests, "rate": round(self.rate, 3), "cv": round(self.cv, 2)}
+
+
+@dataclass
+class ReplayReport:
+    base: str
+    speed: float
+    routes: dict[str, RouteDelta] = field(default_factory=dict)
+    tenants: dict[str, TenantStats] = field(default_factory=dict)
+    lag: Histogram = field(default_factory=Histogram)
+    skipped: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+    log_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    started_at: float = field(default_factory=time.time)
+
+    @property
+    def sent(self) -> int:
+        return sum(r.replayed.count for r in self.routes.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "base": self.base,
+            "speed": self.speed,
+            "started_at": self.started_at,
+            "log_seconds": self.log_seconds,
+            "wall_seconds": self.wall_seconds,
+            "sent": self.sent,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "lag": {f"p{p:g}": v for p, v in self.lag.percentiles().items()},
+            "routes": {route: d.to_dict() for route, d in sorted(self.routes.items())},
+            "tenants": {tenant: t.to_dict() for tenant, t in sorted(self.tenants.items())},
+        }
+
+    def save(self, path: Path = REPLAY_FILE) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+        tmp.replace(path)
+
+
+def format_replay(report: ReplayReport, limit: int = 25) -> str:
+    lines = [
+        f"replayed {report.sent} requests ({report.skipped} skipped) from {report.log_seconds:.0f} s of log"
+        f" in {report.wall_seconds:.0f} s at {report.speed:g}x; send lag p99"
+        f" {report.lag.value_at_percentile(99):.0f} ms",
+        "",
+        f"{'route':<44} {'n':>6} {'log p50':>8} {'p95':>7} {'replay p50':>11} {'p95':>7} {'Δp95':>8} {'status≠':>8}",
+    ]
+    busiest = sorted(report.routes.items(), key=lambda kv: -kv[1].replayed.count)[:limit]
+    for route, d in busiest:
+        lp, rp = d.logged.percentiles(), d.replayed.percentiles()
+        lines.append(
+            f"{route[:44]:<44} {d.replayed.count:>6} {lp[50]:>8.0f} {lp[95]:>7.0f} {rp[50]:>11.0f}"
+            f" {rp[95]:>7.0f} {rp[95] - lp[95]:>+8.0f} {sum(d.mismatches.values()):>8}"
+        )
+    lines.append(f"\n{'tenant':<28} {'requests':>9} {'req/s':>8} {'cv':>6}")
+    for tenant, t in sorted(report.tenants.items(), key=lambda kv: -kv[1].requests)[:limit]:
+        lines.append(f"{tenant[:28]:<28} {t.requests:>9} {t.rate:>8.2f} {t.cv:>6.2f}")
+    if report.errors:
+        lines.append("\nerrors")
+        for error, n in sorted(report.errors.items(), key=lambda kv: -kv[1]):
+            lines.append(f"  {n:>6}  {error}")
+    return "\n".join(lines)
+
+
+class TenantSession:
+    """One tenant's client on the target: its cookies, and its ids per collection."""
+
+    def __init__(self, base: str, tenant: str, limits: httpx.Limits, verify: ssl.SSLContext):
+        self.tenant = tenant
+        self.client = httpx.AsyncClient(base_url=base, timeout=30.0, limits=limits, verify=verify)
+        self.ready = asyncio.Lock()
+        self.signed_in = tenant == ANONYMOUS
+        self.org_id: str | None = None
+        self.pools: dict[str, list[str]] = {}
+        self.listed: set[str] = set()
+        self.ids: dict[tuple[str, str], str] = {}
+
+    @property
+    def credentials(self) -> dict[str, str]:
+        email = f"replay-{zlib.crc32(self.tenant.encode()):08x}@example.com"
+        return {"email": email, "password": DEFAULT_PASSWORD}
+
+    async def sign_in(self) -> None:
+        async with self.ready:
+            if self.signed_in:
+                return
+            response = await self.client.post("/api/auth/login", json=self.credentials)
+            if response.status_code == 401:
+                response = await self.client.post(
+                    "/api/auth/register", json={**self.credentials, "orgName": f"Replay {self.tenant}"}
+                )
+            response.raise_for_status()
+            me = await self.client.get("/api/auth/user")
+            if me.is_success:
+                self.org_id = me.json().get("currentOrganizationId")
+            self.signed_in = True
+
+    async def map_url(self, url: str) -> str:
+        """``url`` with its path and query ids replaced by this tenant's own."""
+        parts = urlsplit(url)
+        path = await self.map_path(parts.path)
+        query = []
+        for name, value in parse_qsl(parts.query, keep_blank_values=True):
+            if name in ORG_PARAMS:
+                # Without an org of its own the session lets the server resolve one.
+                if self.org_id is None:
+                    continue
+                value = self.org_id
+            elif name.endswith("Id") and is_id_segment(value):
+                value = await self._map_id(f"{name[:-2]}s", value)
+            query.append((name, value))
+        return f"{path}?{urlencode(query)}" if query else path
+
+    async def map_path(self, path: str) -> str:
+        """``path`` with each id replaced by this tenant's id for the same collection."""
+        segments = path.split("/")
+        for i, segment in enumerate(segments):
+            if i and is_id_segment(segment):
+                segments[i] = await self._map_id(segments[i - 1], segment)
+        return "/".join(segments)
+
+    async def _map_id(self, collection: str, original: str) -> str:
+        key = (collection, original)
+        if key in self.ids:
+            return self.ids[key]
+        pool = self.pools.setdefault(collection, [])
+        if not pool and collection not in self.listed:
+            self.listed.add(collection)
+            try:
+                response = await self.client.get(f"/api/{collection}")
+                rows = response.json() if response.is_success else []
+                pool.extend(str(r["id"]) for r in rows if isinstance(r, dict) and "id" in r)
+            except (httpx.HTTPError, ValueError):
+                pass
+        # Spread distinct logged ids over the pool; with none, keep a stable unknown id (404s are reported).
+        mapped = pool[len(self.ids) % len(pool)] if pool else f"replay{zlib.crc32(original.encode()):08x}"
+        self.ids[key] = mapped
+        return mapped
+
+    def learn(self, method: str, path: str, body: Any) -> None:
+        segments = [s for s in path.split("/") if s]
+        if method == "POST" and isinstance(body, dict) and "id" in body and segments:
+            self.pools.setdefault(segments[-1], []).append(str(body["id"]))
+        elif method == "DELETE" and len(segments) >= 2:
+            collection, removed = segments[-2], segments[-1]
+            pool = self.pools.get(collection, [])
+            if removed in pool:
+                pool.remove(removed)
+            for key in [k for k, v in self.ids.items() if v == removed]:
+                del self.ids[key]
+
+
+class Replayer:
+    def __init__(self, base: str, *, speed: float = 1.0, limit: int | None = None, connections: int = 8):
+        self.base = base.rstrip("/")
+        self.speed = speed
+        self.limit = limit
+        self.limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+        # Built once: loading CA certificates per tenant client would stall the schedule.
+        self.verify = ssl.create_default_context()
+        self.sessions: dict[str, TenantSession] = {}
+        self.report = ReplayReport(self.base, speed)
+
+    def session(self, tenant: str) -> TenantSession:
+        if tenant not in self.sessions:
+            self.sessions[tenant] = TenantSession(self.base, tenant, self.limits, self.verify)
+        return self.sessions[tenant]
+
+    async def run(self, entries: Iterable[ServerEntry]) -> ReplayReport:
+        loop = asyncio.get_running_loop()
+        in_flight: set[asyncio.Task[None]] = set()
+        origin: tuple[float, float] | None = None  # (first log arrival, loop time)
+        dispatched = 0
+        last_at = 0.0
+        # The first client pays httpx's one-off setup; keep that out of the schedule.
+        self.session(ANONYMOUS)
+        started = loop.time()
+        try:
+            for request in arrivals(entries):
+                if SKIP.match(urlsplit(request.url).path):
+                    self.report.skipped += 1
+                    continue
+                if self.limit is not None and dispatched >= self.limit:
+                    break
+                if origin is None:
+                    origin = (request.at, loop.time())
+                self.report.tenants.setdefault(request.tenant, TenantStats()).arrive(request.at)
+                last_at = request.at
+                due = origin[1] + (request.at - origin[0]) / self.speed
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                task = asyncio.create_task(self._send(request, due))
+                dispatched += 1
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            if in_flight:
+                await asyncio.gather(*in_flight)
+        finally:
+            for session in self.sessions.values():
+                await session.client.aclose()
+        self.report.log_seconds = last_at - origin[0] if origin else 0.0
+        self.report.wall_seconds = loop.time() - started
+        return self.report
+
+    async def _send(self, request: LoggedRequest, due: float) -> None:
+        loop = asyncio.get_running_loop()
+        self.report.lag.record(max(0.0, loop.time() - due) * 1000)
+        session = self.session(request.tenant)
+        delta = self.report.routes.setdefault(request.route, RouteDelta())
+        try:
+            # First use of a tenant signs it in; that wait is not the request's latency.
+            await session.sign_in()
+            url = await session.map_url(request.url)
+            path = urlsplit(url).path
+            if request.route == "POST /api/auth/login":
+                body: Any = session.credentials
+            else:
+                body = BODIES.get(request.route, {} if request.method in ("POST", "PUT", "PATCH") else None)
+            started = loop.time()
+            response = await session.client.request(request.method, url, json=body)
+            elapsed = (loop.time() - started) * 1000
+        except (httpx.HTTPError, ValueError) as exc:
+            key = f"{request.route}: {type(exc).__name__}"
+            self.report.errors[key] = self.report.errors.get(key, 0) + 1
+            return
+        delta.logged.record(request.handler_ms)
+        delta.replayed.record(elapsed)
+        if response.status_code != request.status:
+            key = f"{request.status}->{response.status_code}"
+            delta.mismatches[key] = delta.mismatches.get(key, 0) + 1
+        if response.is_success and request.method in ("POST", "DELETE"):
+            try:
+                reply = response.json() if response.content else None
+            except ValueError:
+                reply = None
+            session.learn(request.method, path, reply)
+
+
+def read_entries(paths: Iterable[Path]) -> Iterator[ServerEntry]:
+    """requestLogger response lines from every file, streamed."""
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as fh:
+            yield from parse_log(fh)
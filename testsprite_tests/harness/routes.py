@@ -0,0 +1,82 @@
+"""Grouping request URLs by route.
+
+Latency keyed by raw URL would split ``/api/tournaments/abc123/rounds`` and
+``/api/tournaments/def456/rounds`` into separate series; ``route_key``
+collapses path segments that look like identifiers into ``:id``. Page loads
+are grouped the same way by the client's own wouter patterns.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Sequence
+from urllib.parse import urlparse
+
+API_PREFIX = "/api/"
+
+_ID_SEGMENT = re.compile(
+    r"""^(
+        \d+                                             # numeric id
+      | [0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}  # uuid
+      | (?=[A-Za-z0-9_-]*\d)[A-Za-z0-9_-]{16,}          # Firestore / token ids
+    )$""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+def is_id_segment(segment: str) -> bool:
+    return bool(_ID_SEGMENT.match(segment))
+
+
+def normalize_path(path: str) -> str:
+    segments = path.split("/")
+    return "/".join(":id" if is_id_segment(s) else s for s in segments)
+
+
+def route_key(method: str, url: str) -> str:
+    """``"GET /api/tournaments/:id/rounds"`` for a full or path-only URL."""
+    return f"{method.upper()} {normalize_path(urlparse(url).path or '/')}"
+
+
+def is_api_request(url: str) -> bool:
+    return urlparse(url).path.startswith(API_PREFIX)
+
+
+# -- client routes ------------------------------------------------------------
+
+_CLIENT_ROUTE = re.compile(r"""<Route\s+path=["']([^"']+)["']""")
+
+
+def app_tsx(project_root: Path) -> Path:
+    """The route table of the served client (vite.config.ts root), not the stale root client/."""
+    return project_root / "NexusSuite" / "client" / "src" / "App.tsx"
+
+
+def client_routes(app_tsx: Path) -> list[str]:
+    """The wouter ``<Route path=...>`` patterns declared in App.tsx, in order.
+
+    A missing file raises: with no patterns every page view would fall back
+    to its raw path and the per-route budgets would silently match nothing.
+    """
+    try:
+        source = app_tsx.read_text(encoding="utf-8")
+    except OSError as exc:
+        raise FileNotFoundError(f"cannot read the client route table {app_tsx}: {exc.strerror}") from exc
+    return list(dict.fromkeys(_CLIENT_ROUTE.findall(source)))
+
+
+def match_client_route(path: str, patterns: Sequence[str]) -> str:
+    """The pattern wouter would render for ``path``, e.g. ``/invite/:token``.
+
+    Paths no pattern claims come back as-is with id-like segments
+    collapsed, so they still group sensibly.
+    """
+    parts = path.rstrip("/").split("/") if path != "/" else [""]
+    for pattern in patterns:
+        expected = pattern.rstrip("/").split("/") if pattern != "/" else [""]
+        if len(expected) == len(parts) and all(
+            e.startswith(":") or e == p for e, p in zip(expected, parts)
+        ):
+            return pattern
+    return normalize_path(path)
@@ -0,0 +1,240 @@
+"""Concurrent in-process runner for the TC scripts.
+
+One Chromium is launched per worker and shared by every test scheduled on it;
+each test gets its own ``browser.new_context()``, so cookies, storage and
+routes never leak between tests. Tests run concurrently under a semaphore,
+which is what bounds load on the app under test -- the worker count only
+decides how many browser processes that load is spread over. The cases in
+``EXCLUSIVE_CASES`` generate load themselves and run one at a time, last.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+from playwright.async_api import Browser, BrowserContext, Page, async_playwright
+
+from .browsers import acquire
+from .config import CASE_BASE
+from .scripts import (
+    ScriptContext,
+    ScriptSleep,
+    Step,
+    StepClock,
+    TestCase,
+    bind_script,
+    load_script,
+)
+
+LAUNCH_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+]
+
+PASSED = "PASSED"
+FAILED = "FAILED"
+
+
+@dataclass
+class TestResult:
+    case: TestCase
+    status: str
+    duration: float
+    started_at: float
+    error: str | None = None
+    steps: list[Step] = field(default_factory=list)
+    details: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def passed(self) -> bool:
+        return self.status == PASSED
+
+
+class Hook:
+    """Extension point for the runner; every method is optional.
+
+    ``context_options`` contributes ``browser.new_context()`` keyword
+    arguments, ``on_context`` instruments a context before the script sees
+    it, ``on_page`` does the same for each page the script opens, before
+    its first navigation, ``on_step`` is told (synchronously) when the
+    script enters a new step, and ``on_finish`` runs while the context is
+    still open, after the script's flow has ended. ``case_base`` names the
+    origin of the app a hook runs the case against, for scripts that call
+    the server without a browser.
+    """
+
+    async def on_run_start(self, cases: Sequence[TestCase]) -> None:
+        return None
+
+    async def context_options(self, case: TestCase) -> dict[str, Any]:
+        return {}
+
+    def case_base(self, case: TestCase) -> str | None:
+        return None
+
+    async def on_context(self, context: BrowserContext, case: TestCase) -> None:
+        return None
+
+    async def on_page(self, page: Page, case: TestCase) -> None:
+        return None
+
+    def on_step(self, case: TestCase, step: Step) -> None:
+        return None
+
+    async def on_finish(
+        self, context: BrowserContext | None, case: TestCase, result: TestResult
+    ) -> None:
+        return None
+
+    async def on_run_end(self, results: Sequence[TestResult]) -> None:
+        return None
+
+
+# Cases that put load on the server themselves (harness/load.py). They run
+# alone, after the rest: UI cases sharing the server would skew their
+# latency gates, and their load would slow the UI cases.
+EXCLUSIVE_CASES = {
+    "TC012_API_Response_Performance_Under_Load",
+    "TC013_API_Performance_Testing_Under_Load",
+}
+
+
+def default_concurrency() -> int:
+    return os.cpu_count() or 4
+
+
+class SuiteRunner:
+    def __init__(
+        self,
+        *,
+        concurrency: int | None = None,
+        workers: int | None = None,
+        headless: bool = True,
+        hooks: Sequence[Hook] = (),
+        sleep: ScriptSleep | None = None,
+        default_timeout: float = 5000,
+        test_timeout: float = 300,
+        use_daemon: bool = True,
+    ):
+        self.concurrency = max(1, concurrency or default_concurrency())
+        # A Chromium process copes well with a handful of contexts; beyond
+        # that the renderer threads contend, so spread over more browsers.
+        self.workers = max(1, min(workers or -(-self.concurrency // 4), self.concurrency))
+        self.headless = headless
+        self.hooks = list(hooks)
+        self.sleep = sleep
+        self.default_timeout = default_timeout
+        self.test_timeout = test_timeout
+        self.use_daemon = use_daemon
+
+    async def run(self, cases: Sequence[TestCase]) -> list[TestResult]:
+        for hook in self.hooks:
+            await hook.on_run_start(cases)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with async_playwright() as pw:
+            # Warm browsers from the pool daemon when it runs (browsers.py).
+            leases = await asyncio.gather(
+                *(
+                    acquire(pw, headless=self.headless, args=LAUNCH_ARGS, use_daemon=self.use_daemon)
+                    for _ in range(min(self.workers, len(cases)) or 1)
+                )
+            )
+            browsers = [lease.browser for lease in leases]
+            for i in range(len(cases)):
+                leases[i % len(leases)].contexts += 1
+            # Indexes, not positions in each group: case i uses browser (and
+            # LocalBackends' backend) i % workers either way.
+            shared = [(i, c) for i, c in enumerate(cases) if c.key not in EXCLUSIVE_CASES]
+            alone = [(i, c) for i, c in enumerate(cases) if c.key in EXCLUSIVE_CASES]
+            try:
+                done = await asyncio.gather(
+                    *(self._run_case(case, browsers[i % len(browsers)], semaphore) for i, case in shared)
+                )
+                for i, case in alone:
+                    done.append(await self._run_case(case, browsers[i % len(browsers)], semaphore))
+            finally:
+                await asyncio.gather(
+                    *(lease.close() for lease in leases), return_exceptions=True
+                )
+        by_index = dict(zip([i for i, _ in shared + alone], done))
+        results = [by_index[i] for i in range(len(cases))]
+        for hook in self.hooks:
+            await hook.on_run_end(results)
+        return results
+
+    async def _new_context(
+        self, browser: Browser, case: TestCase, kwargs: dict[str, Any]
+    ) -> tuple[BrowserContext, str | None]:
+        """The instrumented context, and the origin a hook moved it to."""
+        options = dict(kwargs)
+        for hook in self.hooks:
+            options.update(await hook.context_options(case))
+        context = await browser.new_context(**options)
+        context.set_default_timeout(self.default_timeout)
+        for hook in self.hooks:
+            await hook.on_context(context, case)
+        return context, options.get("base_url")
+
+    async def _on_page(self, page: Page, case: TestCase) -> None:
+        for hook in self.hooks:
+            await hook.on_page(page, case)
+
+    async def _run_case(
+        self, case: TestCase, browser: Browser, semaphore: asyncio.Semaphore
+    ) -> TestResult:
+        async with semaphore:
+            contexts: list[BrowserContext] = []
+            clock = StepClock(
+                listeners=[lambda step, h=hook: h.on_step(case, step) for hook in self.hooks]
+            )
+
+            async def new_context(**kwargs: Any) -> ScriptContext:
+                context, base = await self._new_context(browser, case, kwargs)
+                contexts.append(context)
+                return ScriptContext(
+                    context, self.sleep, clock, base, lambda page: self._on_page(page, case)
+                )
+
+            # Scripts that talk to the server directly (load.py) find it through base_url().
+            token = CASE_BASE.set(next(filter(None, (h.case_base(case) for h in self.hooks)), None))
+            started_at = time.time()
+            started = time.perf_counter()
+            status, error = PASSED, None
+            try:
+                module = load_script(case.path)
+                clock.labels = module.__harness_steps__
+                bind_script(module, new_context, self.sleep)
+                await asyncio.wait_for(module.run_test(), self.test_timeout)
+            except asyncio.TimeoutError:
+                status, error = FAILED, f"timed out after {self.test_timeout:g}s"
+            except Exception as exc:
+                status = FAILED
+                error = "".join(traceback.format_exception_only(exc)).strip()
+            finally:
+                CASE_BASE.reset(token)
+            clock.finish()
+            result = TestResult(
+                case=case,
+                status=status,
+                duration=time.perf_counter() - started,
+                started_at=started_at,
+                error=error,
+                steps=clock.steps,
+            )
+            context = contexts[-1] if contexts else None
+            for hook in self.hooks:
+                try:
+                    await hook.on_finish(context, case, result)
+                except Exception as exc:
+                    result.details.setdefault("hook_errors", []).append(
+                        f"{type(hook).__name__}: {exc}"
+                    )
+            await asyncio.gather(
+                *(c.close() for c in contexts), return_exceptions=True
+            )
+            return result
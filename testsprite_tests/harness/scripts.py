@@ -0,0 +1,336 @@
+"""Discovery and loading of the generated TC scripts.
+
+A TC script ends with a bare ``asyncio.run(run_test())``, so importing it
+would run it. ``load_script`` strips that entry point from the AST before
+executing the module, and ``bind_script`` swaps the script's ``async_api``
+global for a shim whose ``async_playwright().start()`` hands back the
+harness-owned browser instead of launching a new one.
+
+Every generated step has the shape
+``await page.wait_for_timeout(3000); await elem.fill(...)``, so the pages a
+script gets route ``wait_for_timeout`` through an optional ``ScriptSleep``
+(see waits.py) instead of always sleeping. The same call marks a step
+boundary for the ``StepClock``; the step is named after the comment the
+generator wrote above it (``# Enter valid email in the email input field``).
+
+The scripts' startup ``wait_for_load_state("domcontentloaded")`` and the
+per-frame loop after it wait on the app's readiness signal instead (see
+ready.py).
+"""
+
+from __future__ import annotations
+
+import ast
+import asyncio
+import fnmatch
+import re
+import sys
+import time
+import types
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable
+
+from .config import TESTS_DIR, rebase
+from .ready import wait_ready
+
+TC_FILE = re.compile(r"^(TC\d{3})_(\w+)\.py$")
+
+ContextFactory = Callable[..., Awaitable[Any]]
+ScriptSleep = Callable[[Any, float], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class TestCase:
+    """One TC*.py script on disk.
+
+    TestSprite reuses ids across regenerations (there are two TC001 scripts),
+    so ``key`` -- the file stem -- is what identifies a case.
+    """
+
+    id: str
+    name: str
+    path: Path
+
+    @property
+    def key(self) -> str:
+        return self.path.stem
+
+    @property
+    def title(self) -> str:
+        return self.name.replace("_", " ")
+
+
+def discover(
+    tests_dir: Path = TESTS_DIR, patterns: Iterable[str] = ()
+) -> list[TestCase]:
+    """Return the TC scripts in ``tests_dir``, filtered by glob ``patterns``."""
+    patterns = list(patterns)
+    cases = []
+    for path in sorted(tests_dir.glob("TC*.py")):
+        match = TC_FILE.match(path.name)
+        if not match:
+            continue
+        if patterns and not any(
+            fnmatch.fnmatch(path.stem, p) or fnmatch.fnmatch(path.name, p)
+            for p in patterns
+        ):
+            continue
+        cases.append(TestCase(id=match.group(1), name=match.group(2), path=path))
+    return cases
+
+
+def _is_entry_point(node: ast.stmt) -> bool:
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "run"
+        and isinstance(func.value, ast.Name)
+        and func.value.id == "asyncio"
+    )
+
+
+def step_labels(source: str) -> dict[int, str]:
+    """Map each ``wait_for_timeout`` line to the comment closest above it."""
+    labels = {}
+    comment = None
+    for lineno, line in enumerate(source.splitlines(), 1):
+        stripped = line.strip()
+        if stripped.startswith("#") and not stripped.startswith(("# ->", "# -->")):
+            comment = stripped.lstrip("# ").strip()
+        elif "wait_for_timeout(" in stripped:
+            labels[lineno] = comment or f"line {lineno}"
+            comment = None
+    return labels
+
+
+def load_script(path: Path) -> types.ModuleType:
+    """Execute a TC script as a module without running its entry point."""
+    source = path.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(path))
+    tree.body = [node for node in tree.body if not _is_entry_point(node)]
+    module = types.ModuleType(f"testsprite_case_{path.stem}")
+    module.__file__ = str(path)
+    exec(compile(tree, str(path), "exec"), module.__dict__)
+    if not callable(getattr(module, "run_test", None)):
+        raise LookupError(f"{path.name} does not define run_test()")
+    module.__harness_steps__ = step_labels(source)
+    return module
+
+
+@dataclass
+class Step:
+    index: int
+    name: str
+    started: float  # time.perf_counter()
+    ended: float | None = None
+
+    @property
+    def duration(self) -> float:
+        return (self.ended or time.perf_counter()) - self.started
+
+
+@dataclass
+class StepClock:
+    """Splits one test's run into named steps as the script reaches them."""
+
+    labels: dict[int, str] = field(default_factory=dict)
+    steps: list[Step] = field(default_factory=list)
+    listeners: list[Callable[[Step], None]] = field(default_factory=list)
+
+    @property
+    def current(self) -> Step | None:
+        return self.steps[-1] if self.steps and self.steps[-1].ended is None else None
+
+    def begin(self, name: str) -> Step:
+        self.finish()
+        step = Step(len(self.steps), name, time.perf_counter())
+        self.steps.append(step)
+        for listener in self.listeners:
+            listener(step)
+        return step
+
+    def mark(self, lineno: int) -> Step:
+        return self.begin(self.labels.get(lineno, f"line {lineno}"))
+
+    def finish(self) -> None:
+        if self.current is not None:
+            self.current.ended = time.perf_counter()
+
+
+class ScriptPage:
+    """Page handed to a script; its fixed sleeps go through ``sleep``.
+
+    ``base`` is the origin this page's context talks to when it is not the
+    suite-wide one (a per-worker local backend, see backend.py).
+    """
+
+    def __init__(
+        self,
+        page: Any,
+        sleep: ScriptSleep | None = None,
+        clock: StepClock | None = None,
+        base: str | None = None,
+    ):
+        self._page = page
+        self._sleep = sleep
+        self._clock = clock
+        self._base = base
+        self.ready: dict[str, Any] | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._page, name)
+
+    @property
+    def frames(self) -> list[Any]:
+        if self.ready is None:
+            return self._page.frames
+        # The app has said it is ready; the loop has nothing left to wait for.
+        return [_ReadyFrame(frame) for frame in self._page.frames]
+
+    async def goto(self, url: str, **kwargs: Any) -> Any:
+        url = rebase(url, self._base)
+        if self._clock is not None:
+            self._clock.begin(f"Navigate to {url}")
+        self.ready = None
+        return await self._page.goto(url, **kwargs)
+
+    async def wait_for_load_state(self, state: str | None = None, **kwargs: Any) -> None:
+        if state != "domcontentloaded":
+            return await self._page.wait_for_load_state(state, **kwargs)
+        # The script's own timeout (3 s) would cut off a cold start; the
+        # readiness wait carries its own bound.
+        self.ready = await wait_ready(self._page)
+
+    async def wait_for_timeout(self, timeout: float) -> None:
+        if self._clock is not None:
+            self._clock.mark(sys._getframe(1).f_lineno)
+        if self._sleep is None:
+            await self._page.wait_for_timeout(timeout)
+        else:
+            await self._sleep(self._page, timeout)
+
+
+class _ReadyFrame:
+    def __init__(self, frame: Any):
+        self._frame = frame
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._frame, name)
+
+    async def wait_for_load_state(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+
+class ScriptContext:
+    """Browser context handed to a script.
+
+    The harness owns the context's lifetime (hooks still need it after the
+    flow ends), so the script's own ``context.close()`` is a no-op.
+    """
+
+    def __init__(
+        self,
+        context: Any,
+        sleep: ScriptSleep | None = None,
+        clock: StepClock | None = None,
+        base: str | None = None,
+        on_page: Callable[[Any], Awaitable[None]] | None = None,
+    ):
+        self._context = context
+        self._sleep = sleep
+        self._clock = clock
+        self._base = base
+        self._on_page = on_page
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._context, name)
+
+    async def new_page(self) -> ScriptPage:
+        page = await self._context.new_page()
+        if self._on_page is not None:
+            await self._on_page(page)
+        return ScriptPage(page, self._sleep, self._clock, self._base)
+
+    async def close(self) -> None:
+        return None
+
+
+class _ScriptBrowser:
+    def __init__(self, new_context: ContextFactory):
+        self._new_context = new_context
+
+    async def new_context(self, **kwargs: Any) -> Any:
+        return await self._new_context(**kwargs)
+
+    async def close(self) -> None:
+        return None
+
+
+class _ScriptChromium:
+    def __init__(self, new_context: ContextFactory):
+        self._browser = _ScriptBrowser(new_context)
+
+    async def launch(self, **_: Any) -> _ScriptBrowser:
+        # The script's launch arguments (notably --single-process) are
+        # ignored; the harness launches its browsers once per worker.
+        return self._browser
+
+
+class _ScriptPlaywright:
+    def __init__(self, new_context: ContextFactory):
+        self.chromium = _ScriptChromium(new_context)
+
+    async def start(self) -> "_ScriptPlaywright":
+        return self
+
+    async def stop(self) -> None:
+        return None
+
+
+class _AsyncApiShim:
+    """Stands in for ``playwright.async_api`` inside a loaded script."""
+
+    def __init__(self, real: types.ModuleType, new_context: ContextFactory):
+        self._real = real
+        self._new_context = new_context
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._real, name)
+
+    def async_playwright(self) -> _ScriptPlaywright:
+        return _ScriptPlaywright(self._new_context)
+
+
+class _AsyncioShim:
+    """Stands in for ``asyncio`` inside a script whose sleeps are replaced.
+
+    The only direct ``asyncio`` use in a generated script is the
+    ``await asyncio.sleep(5)`` after its final assertion, which holds the page
+    open for TestSprite's video recording and has nothing to wait for.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(asyncio, name)
+
+    async def sleep(self, delay: float, result: Any = None) -> Any:
+        return result
+
+
+def bind_script(
+    module: types.ModuleType,
+    new_context: ContextFactory,
+    sleep: ScriptSleep | None = None,
+) -> None:
+    """Route the script's browser/context creation through ``new_context``.
+
+    Scripts that drive the API rather than a browser (the load cases) have
+    no ``async_api`` to bind. With a ``sleep`` replacement the script's
+    trailing ``asyncio.sleep`` is dropped as well.
+    """
+    if hasattr(module, "async_api"):
+        module.async_api = _AsyncApiShim(module.async_api, new_context)
+    if sleep is not None and hasattr(module, "asyncio"):
+        module.asyncio = _AsyncioShim()
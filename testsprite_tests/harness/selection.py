@@ -0,0 +1,360 @@
+"""Change-impact test selection and the pass-result cache.
+
+Selection resolves a change set to TC cases in two hops, both driven by the
+TestSprite artifacts already in tmp/:
+
+1. touched file -> features, via the ``files`` globs of code_summary.json;
+2. feature -> test ids, by matching the feature against each test-plan
+   entry (testsprite_frontend_test_plan.json) and the case's own file name:
+   one term in common with the feature's name, or ``min_score`` with its
+   description, selects the case.
+
+Features every flow goes through (server bootstrap, build config) select
+the whole suite, and so does any code file no feature claims -- an unknown
+change is never assumed harmless. Client pages are matched by page name
+rather than through the catch-all "Frontend Application" feature, so
+editing finance.tsx selects the finance cases only.
+
+code_summary.json predates the app that actually runs -- NexusSuite/client
+and the server/auth, server/org, ... modules mounted by server/routes/index.ts
+-- so ``LIVE_FEATURES`` maps those alongside it.
+
+The result cache records passing runs keyed by the hash of the case's
+script and of the harness it imports, plus a build hash of the app
+sources; a case whose key already passed is skipped.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import functools
+import hashlib
+import json
+import os
+import re
+import subprocess
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from .config import PROJECT_ROOT, TESTS_DIR, TMP_DIR
+from .runner import Hook, TestResult
+from .scripts import TestCase
+
+RESULT_CACHE_FILE = TMP_DIR / "result_cache.json"
+
+# Features whose files sit under every request or every build.
+BROAD_FEATURES = {
+    "Express Server Bootstrapping",
+    "API Routes & Middleware",
+    "Build & Dev Config",
+    "Shared Domain Schema",
+    "Storage Abstraction",
+    "Database & ORM (Drizzle)",
+}
+
+# Touching these never changes what a test observes.
+INERT_SUFFIXES = (".md", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".txt")
+
+# Sources the app under test is built from; they make up the build hash.
+# NexusSuite/client is the client vite.config.ts and server/vite.ts serve;
+# the root client/ is kept because code_summary.json still maps it.
+BUILD_INPUTS = (
+    "server",
+    "NexusSuite/client",
+    "NexusSuite/shared",
+    "client",
+    "shared",
+    "api",
+    "package.json",
+    "package-lock.json",
+    "vite.config.ts",
+)
+
+# Features of the modules server/index.ts and vite.config.ts actually serve,
+# in code_summary.json's shape. server/routes/index.ts mounts the auth, org
+# and other routers, but what changes in it is the domain handlers it holds.
+LIVE_FEATURES = (
+    {
+        "name": "API Routes & Middleware",
+        "description": "The middleware every request passes through.",
+        "files": ["server/middleware/validation.ts"],
+    },
+    {
+        "name": "Club Data API",
+        "description": (
+            "Tournaments, rounds, matches, rosters, players, contracts, staff, payroll,"
+            " campaigns, audit logs, the analytics dashboard and profile handlers."
+        ),
+        "files": ["server/routes/index.ts"],
+    },
+    {
+        "name": "Authentication (Register/Login/Logout)",
+        "description": "Registration, login, logout, sessions and one-time passcodes.",
+        "files": ["server/auth/**/*", "server/otp/**/*"],
+    },
+    {
+        "name": "Role-Based Access Control (RBAC)",
+        "description": "Role checks on routes.",
+        "files": ["server/middleware/rbac.ts"],
+    },
+    {
+        "name": "Club Organizations",
+        "description": "Club organization profile, members, invites and settings.",
+        "files": ["server/org/**/*"],
+    },
+    {
+        "name": "Admin Console",
+        "description": "Super admin access to users, roles, billing and logs.",
+        "files": ["server/admin/**/*"],
+    },
+    {
+        "name": "Tenant Isolation",
+        "description": "Multi-tenant data isolation between clubs.",
+        "files": ["server/tenant/**/*"],
+    },
+    {
+        "name": "Subscriptions",
+        "description": "Plans and billing through Polar.",
+        "files": ["server/subscription/**/*"],
+    },
+    {
+        "name": "Error Tracking",
+        "description": "Global error handler and error logging.",
+        "files": ["server/middleware/errorHandler.ts"],
+    },
+    {
+        "name": "Storage Abstraction",
+        "description": "In-memory and Firestore storage.",
+        "files": ["server/memory/**/*", "server/db/**/*"],
+    },
+    {
+        "name": "Shared Domain Schema",
+        "description": "Types shared by the client and the server.",
+        "files": ["NexusSuite/shared/**/*"],
+    },
+    {
+        "name": "Frontend Application",
+        "description": "The served React client.",
+        "files": ["NexusSuite/client/index.html", "NexusSuite/client/src/**/*"],
+    },
+)
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "check", "data",
+    "e", "ensure", "for", "from", "g", "in", "into", "is", "it", "of", "on",
+    "or", "that", "the", "their", "them", "to", "under", "used", "user",
+    "users", "using", "valid", "verify", "via", "when", "with", "within",
+}
+
+
+def _terms(text: str) -> set[str]:
+    """Crude stems: lower-cased words, stop words dropped, cut at 5 letters.
+
+    Cutting at a fixed prefix is enough to line up "finance"/"financial",
+    "tournaments"/"tournament" and "analytics"/"analytic" in this corpus.
+    """
+    words = re.findall(r"[a-z]+", re.sub(r"([a-z])([A-Z])", r"\1 \2", text).lower())
+    return {w[:5] for w in words if w not in _STOPWORDS and len(w) > 2}
+
+
+def _glob_match(path: str, pattern: str) -> bool:
+    if pattern.endswith("/**/*"):
+        return path.startswith(pattern[: -len("**/*")])
+    # Exact match first: "api/[[...route]].ts" is a file name, not a class.
+    return path == pattern or fnmatch.fnmatch(path, pattern)
+
+
+@dataclass
+class Feature:
+    name: str
+    description: str
+    files: list[str]
+
+    def owns(self, path: str) -> bool:
+        return any(_glob_match(path, pattern) for pattern in self.files)
+
+
+@dataclass
+class Selection:
+    cases: list[TestCase]
+    reasons: dict[str, list[str]]  # case key -> why it was selected
+    everything: bool = False
+
+
+class ImpactSelector:
+    def __init__(self, tests_dir: Path = TESTS_DIR, *, project_root: Path = PROJECT_ROOT, min_score: int = 2):
+        self.tests_dir = tests_dir
+        self.project_root = project_root
+        self.min_score = min_score
+        tmp = tests_dir / "tmp"
+        with open(tmp / "code_summary.json", encoding="utf-8") as fh:
+            self.features = [Feature(**f) for f in [*json.load(fh)["features"], *LIVE_FEATURES]]
+        try:
+            with open(tests_dir / "testsprite_frontend_test_plan.json", encoding="utf-8") as fh:
+                self.plan = {entry["id"]: entry for entry in json.load(fh)}
+        except OSError:
+            self.plan = {}
+
+    # -- change set ------------------------------------------------------
+
+    def changed_files(self, base: str | None = None) -> list[str]:
+        """Files changed since ``base`` (committed or not), project-relative.
+
+        Without ``base`` only uncommitted changes are considered.
+        """
+        def git(*args: str) -> list[str]:
+            out = subprocess.run(
+                ["git", "-C", str(self.project_root), *args],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            return [line for line in out.splitlines() if line]
+
+        files = set(git("diff", "--name-only", "--relative", "HEAD"))
+        files.update(git("ls-files", "--others", "--exclude-standard"))
+        if base:
+            files.update(git("diff", "--name-only", "--relative", f"{base}...HEAD"))
+        return sorted(files)
+
+    # -- mapping ---------------------------------------------------------
+
+    def _case_terms(self, case: TestCase) -> set[str]:
+        # Scripts were generated in several rounds, so two files can share an
+        # id; the plan entry only describes the one whose title it carries.
+        entry = self.plan.get(case.id, {})
+        if _terms(entry.get("title", "")) != _terms(case.title):
+            entry = {}
+        return _terms(" ".join([case.title, entry.get("title", ""), entry.get("description", "")]))
+
+    def _matching(self, cases: Sequence[TestCase], feature: Feature) -> list[TestCase]:
+        name = _terms(feature.name)
+        described = _terms(feature.description)
+        return [
+            c
+            for c in cases
+            if name & self._case_terms(c) or len(described & self._case_terms(c)) >= self.min_score
+        ]
+
+    def select(self, files: Iterable[str], cases: Sequence[TestCase]) -> Selection:
+        reasons: dict[str, list[str]] = {}
+
+        def pick(matched: Iterable[TestCase], why: str) -> None:
+            for case in matched:
+                reasons.setdefault(case.key, []).append(why)
+
+        everything = False
+        for path in files:
+            path = path.replace(os.sep, "/")
+            if path.endswith(INERT_SUFFIXES):
+                continue
+            test_dir = os.path.relpath(self.tests_dir, self.project_root).replace(os.sep, "/")
+            if path.startswith(f"{test_dir}/TC"):
+                pick([c for c in cases if f"{test_dir}/{c.path.name}" == path], f"{path} changed")
+                continue
+            if path.startswith((f"{test_dir}/harness/", f"{test_dir}/tmp/")):
+                everything = True
+                pick(cases, f"{path} is harness code")
+                continue
+            page = re.match(r"(?:NexusSuite/)?client/src/pages/(?:admin/)?([\w-]+)\.tsx$", path)
+            if page:
+                # Page names are short ("team", "audit"); one shared term is
+                # as specific as it gets.
+                terms = _terms(page.group(1).replace("-", " "))
+                pick([c for c in cases if terms & self._case_terms(c)], f"page {path}")
+                continue
+            owners = [f for f in self.features if f.owns(path)]
+            if not owners or any(f.name in BROAD_FEATURES for f in owners):
+                everything = True
+                why = f"{path} is unmapped" if not owners else f"{path} is shared by every flow"
+                pick(cases, why)
+                continue
+            for feature in owners:
+                if feature.name == "Frontend Application":
+                    everything = True
+                    pick(cases, f"{path} is shared client code")
+                    continue
+                pick(self._matching(cases, feature), f"{path} -> {feature.name}")
+        selected = [c for c in cases if c.key in reasons]
+        return Selection(selected, reasons, everything)
+
+
+# -- result cache -----------------------------------------------------------
+
+
+def build_hash(project_root: Path) -> str:
+    """Hash of the app sources, including uncommitted edits.
+
+    CI can pass the hash of the artifact it actually deployed through
+    NEXUS_BUILD_HASH instead.
+    """
+    env = os.environ.get("NEXUS_BUILD_HASH")
+    if env:
+        return env
+    inputs = [p for p in BUILD_INPUTS if (project_root / p).exists()]
+    digest = hashlib.sha256()
+    for args in (["ls-files", "-s", "--", *inputs], ["diff", "HEAD", "--", *inputs]):
+        digest.update(
+            subprocess.run(
+                ["git", "-C", str(project_root), *args],
+                check=True, capture_output=True,
+            ).stdout
+        )
+    return digest.hexdigest()[:16]
+
+
+@functools.cache
+def harness_hash(harness_dir: Path = Path(__file__).parent) -> str:
+    """Hash of the harness sources the scripts import (``harness.forms`` and the rest)."""
+    digest = hashlib.sha256()
+    for path in sorted(harness_dir.rglob("*.py")):
+        if "tests" in path.relative_to(harness_dir).parts:
+            continue
+        digest.update(path.relative_to(harness_dir).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def case_hash(case: TestCase) -> str:
+    digest = hashlib.sha256(case.path.read_bytes())
+    digest.update(harness_hash().encode())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache(Hook):
+    def __init__(self, build: str, path: Path = RESULT_CACHE_FILE):
+        self.build = build
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as fh:
+                self.entries: dict[str, dict] = json.load(fh)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def key(self, case: TestCase) -> str:
+        return f"{case.key}:{case_hash(case)}:{self.build}"
+
+    def hit(self, case: TestCase) -> bool:
+        return self.key(case) in self.entries
+
+    def partition(self, cases: Sequence[TestCase]) -> tuple[list[TestCase], list[TestCase]]:
+        """Split ``cases`` into (to run, already passed with these inputs)."""
+        run, skip = [], []
+        for case in cases:
+            (skip if self.hit(case) else run).append(case)
+        return run, skip
+
+    async def on_finish(self, context, case: TestCase, result: TestResult) -> None:
+        key = self.key(case)
+        if result.passed:
+            self.entries[key] = {"duration": round(result.duration, 3), "at": time.time()}
+        else:
+            self.entries.pop(key, None)
+
+    async def on_run_end(self, results: Sequence[TestResult]) -> None:
+        # Keep only entries for the current build; older ones can never hit.
+        self.entries = {k: v for k, v in self.entries.items() if k.endswith(f":{self.build}")}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.entries, indent=1), encoding="utf-8")
+        tmp.replace(self.path)
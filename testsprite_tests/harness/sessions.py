@@ -0,0 +1,281 @@
+"""Per-role authenticated storage-state cache.
+
+Instead of each test registering and logging in through the UI, one account
+per role is provisioned over the API and its Playwright ``storage_state``
+(the session cookies ``/api/auth/login`` sets) is cached under
+tmp/auth/<role>.json. Tests mapped to a role get a context created from that
+state and start out signed in.
+
+Provisioning follows what the server actually exposes:
+
+* Club Admin -- ``POST /api/auth/register`` creates the user as owner of a
+  new organization;
+* Coach and Player -- the Club Admin invites them through
+  ``POST /api/organizations/:orgId/invite`` (roles ``manager``/``member``)
+  and they complete ``POST /api/organizations/invite/signup``;
+* Super Admin -- there is no API that grants ``super_admin``, so this role
+  only logs in, with credentials from NEXUS_SUPER_ADMIN_EMAIL/_PASSWORD.
+
+A cached entry is trusted until ``expires_at``; after that it is probed with
+``GET /api/auth/user`` and only rebuilt when that answers 401. Failures to
+reach the server surface as ``SessionError``, like refused provisioning.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+from playwright.async_api import APIRequestContext, Error, Playwright, async_playwright
+
+from .config import TMP_DIR, base_url
+from .runner import Hook
+from .scripts import TestCase
+
+AUTH_DIR = TMP_DIR / "auth"
+DEFAULT_TTL = 12 * 60 * 60
+DEFAULT_PASSWORD = "ValidPassword123"
+
+
+class SessionError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class Role:
+    key: str
+    label: str
+    email: str
+    provision: str  # "register", "invite" or "login"
+    org_role: str | None = None
+
+    @property
+    def password(self) -> str:
+        return os.environ.get(self._env("PASSWORD"), DEFAULT_PASSWORD)
+
+    @property
+    def login_email(self) -> str:
+        return os.environ.get(self._env("EMAIL"), self.email)
+
+    def _env(self, suffix: str) -> str:
+        return f"NEXUS_{self.key.upper()}_{suffix}"
+
+
+# Emails match the accounts the generated scripts type into the login form.
+ROLES = {
+    role.key: role
+    for role in (
+        Role("super_admin", "Super Admin", "superadmin@example.com", "login"),
+        Role("club_admin", "Club Admin", "clubadmin@example.com", "register"),
+        Role("coach", "Coach", "coach@example.com", "invite", org_role="manager"),
+        Role("player", "Player", "player@example.com", "invite", org_role="member"),
+    )
+}
+
+CLUB_NAME = "Acme Esports"
+
+# Cases whose flow is about a feature rather than the auth forms. Login,
+# registration and session tests are deliberately absent: they have to start
+# signed out.
+ROLE_BY_CASE = {
+    "TC005_Create_and_Manage_Club_Profile": "club_admin",
+    "TC005_Role_Based_Access_Control_Enforcement___Admin_Access": "super_admin",
+    "TC006_Role_Based_Access_Control_Enforcement___Player_Permissions": "player",
+    "TC006_Team_Creation_and_Player_Assignment": "club_admin",
+    "TC007_Create_and_Edit_Club_Profile": "club_admin",
+    "TC007_Tournament_Creation_and_Publishing": "club_admin",
+    "TC008_Match_Result_Entry_and_Bracket_Updates": "coach",
+    "TC008_Team_Creation_and_Player_Role_Assignment": "club_admin",
+    "TC009_Financial_Transaction_Creation_and_Categorization": "club_admin",
+    "TC009_Tournament_Creation_Scheduling_and_Match_Management": "club_admin",
+    "TC010_Financial_Transaction_Creation_and_Categorization": "club_admin",
+    "TC010_Viewing_and_Exporting_Analytics_Dashboards": "club_admin",
+    "TC011_Analytics_Dashboard_Data_Refresh_and_Export": "club_admin",
+    "TC015_Audit_Logs_Creation_and_Access": "club_admin",
+    "TC015_Data_Consistency_During_Tournament_Modifications": "club_admin",
+    "TC016_Player_Profile_Management_and_History_Viewing": "player",
+    "TC017_Multi_tenant_Data_Isolation_Between_Clubs": "club_admin",
+}
+
+
+class SessionCache(Hook):
+    def __init__(
+        self,
+        *,
+        base: str | None = None,
+        cache_dir: Path = AUTH_DIR,
+        ttl: float = DEFAULT_TTL,
+        roles_by_case: dict[str, str] | None = None,
+    ):
+        self.base = base or base_url()
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.roles_by_case = ROLE_BY_CASE if roles_by_case is None else roles_by_case
+        self._states: dict[str, dict[str, Any]] = {}
+
+    def path(self, role: str) -> Path:
+        return self.cache_dir / f"{role}.json"
+
+    # -- runner hook -----------------------------------------------------
+
+    async def on_run_start(self, cases: Sequence[TestCase]) -> None:
+        roles = {self.roles_by_case[c.key] for c in cases if c.key in self.roles_by_case}
+        if roles:
+            await self.ensure(roles)
+
+    async def context_options(self, case: TestCase) -> dict[str, Any]:
+        role = self.roles_by_case.get(case.key)
+        if role is None or role not in self._states:
+            return {}
+        return {"storage_state": self._states[role]}
+
+    # -- cache -----------------------------------------------------------
+
+    async def ensure(
+        self, roles: Sequence[str] | set[str], *, refresh: bool = False
+    ) -> dict[str, dict[str, Any]]:
+        """Load or rebuild the storage state of each role in ``roles``."""
+        unknown = set(roles) - ROLES.keys()
+        if unknown:
+            raise SessionError(f"unknown role(s): {', '.join(sorted(unknown))}")
+        async with async_playwright() as pw:
+            # Invited roles need the Club Admin's session, so it goes first.
+            for key in sorted(roles, key=lambda r: ROLES[r].provision != "register"):
+                try:
+                    self._states[key] = await self._ensure_role(pw, ROLES[key], refresh)
+                except Error as exc:
+                    # The first line names the failure; the rest is Playwright's call log.
+                    reason = exc.message.splitlines()[0]
+                    raise SessionError(f"cannot sign in as {ROLES[key].label} at {self.base}: {reason}") from exc
+                except ValueError as exc:
+                    raise SessionError(f"{self.base} answered {ROLES[key].label}'s sign-in with non-JSON: {exc}") from exc
+        return {key: self._states[key] for key in roles}
+
+    def storage_state(self, role: str) -> dict[str, Any]:
+        """Return a role's cached state without validating it."""
+        if role not in self._states:
+            entry = self._read(role)
+            if entry is None:
+                raise SessionError(f"no cached session for {role}; run `python -m harness sessions {role}`")
+            self._states[role] = entry["storage_state"]
+        return self._states[role]
+
+    def cookies(self, role: str) -> dict[str, str]:
+        return {c["name"]: c["value"] for c in self.storage_state(role)["cookies"]}
+
+    def _read(self, role: str) -> dict[str, Any] | None:
+        try:
+            with open(self.path(role), encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("base_url") == self.base else None
+
+    def _write(self, role: Role, state: dict[str, Any]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "role": role.key,
+            "email": role.login_email,
+            "base_url": self.base,
+            "expires_at": time.time() + self.ttl,
+            "storage_state": state,
+        }
+        tmp = self.path(role.key).with_suffix(".tmp")
+        tmp.write_text(json.dumps(entry, indent=2), encoding="utf-8")
+        tmp.replace(self.path(role.key))
+
+    async def _ensure_role(
+        self, pw: Playwright, role: Role, refresh: bool
+    ) -> dict[str, Any]:
+        entry = None if refresh else self._read(role.key)
+        if entry is not None:
+            if entry["expires_at"] > time.time():
+                return entry["storage_state"]
+            probe = await pw.request.new_context(
+                base_url=self.base, storage_state=entry["storage_state"]
+            )
+            try:
+                response = await probe.get("/api/auth/user")
+                if response.status != 401:
+                    self._write(role, entry["storage_state"])
+                    return entry["storage_state"]
+            finally:
+                await probe.dispose()
+        return await self._rebuild(pw, role)
+
+    async def _rebuild(self, pw: Playwright, role: Role) -> dict[str, Any]:
+        request = await pw.request.new_context(base_url=self.base)
+        try:
+            if not await self._login(request, role):
+                await self._provision(pw, request, role)
+            state = await request.storage_state()
+        finally:
+            await request.dispose()
+        self._write(role, state)
+        return state
+
+    async def _login(self, request: APIRequestContext, role: Role) -> bool:
+        response = await request.post(
+            "/api/auth/login",
+            data={"email": role.login_email, "password": role.password},
+        )
+        return response.ok
+
+    async def _provision(
+        self, pw: Playwright, request: APIRequestContext, role: Role
+    ) -> None:
+        if role.provision == "login":
+            raise SessionError(
+                f"cannot sign in as {role.label}: no API grants that role, so point"
+                f" {role._env('EMAIL')}/{role._env('PASSWORD')} at an existing account"
+            )
+        if role.provision == "register":
+            response = await request.post(
+                "/api/auth/register",
+                data={
+                    "email": role.login_email,
+                    "password": role.password,
+                    "orgName": CLUB_NAME,
+                },
+            )
+        else:
+            token = await self._invite(pw, role)
+            response = await request.post(
+                "/api/organizations/invite/signup",
+                data={
+                    "token": token,
+                    "password": role.password,
+                    "confirmPassword": role.password,
+                },
+            )
+        if not response.ok:
+            raise SessionError(
+                f"provisioning {role.label} failed: {response.status} {await response.text()}"
+            )
+
+    async def _invite(self, pw: Playwright, role: Role) -> str:
+        admin_state = self._states.get("club_admin") or await self._ensure_role(
+            pw, ROLES["club_admin"], refresh=False
+        )
+        self._states["club_admin"] = admin_state
+        admin = await pw.request.new_context(base_url=self.base, storage_state=admin_state)
+        try:
+            me = await admin.get("/api/auth/user")
+            org_id = (await me.json()).get("currentOrganizationId") if me.ok else None
+            if not org_id:
+                raise SessionError(f"Club Admin has no organization ({me.status})")
+            response = await admin.post(
+                f"/api/organizations/{org_id}/invite",
+                data={"email": role.login_email, "role": role.org_role, "sendEmail": False},
+            )
+            body = await response.json() if response.ok else {}
+        finally:
+            await admin.dispose()
+        token = (body.get("data") or {}).get("token")
+        if not token:
+            raise SessionError(f"inviting {role.label} failed: {response.status}")
+        return token
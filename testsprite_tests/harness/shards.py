@@ -0,0 +1,264 @@
+"""Duration-aware sharding of the suite across processes or machines.
+
+``plan`` bin-packs cases into K shards longest-processing-time first: cases
+sorted by their mean duration over recent runs (tmp/history.sqlite), each
+placed on the currently lightest shard. LPT's makespan is within 4/3 of
+optimal, and once K is large enough it is bounded by the longest single
+case -- which is as fast as the suite can possibly go.
+
+Planning only needs the TC files and the history, so it works the same
+for testsprite_tests/ and the NexusSuite/testsprite_tests/ mirror; history
+is keyed by file stem, which the two share.
+
+``run_sharded`` runs the plan on a local process pool. Every shard is its
+own process with its own browsers, and with ``serve`` (or ``local``, see
+backend.py) its own app server started on a free port, so shards never
+contend for one Express instance or share its in-memory state. A CI
+matrix can instead run one shard per machine with ``run --shard i/K``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import heapq
+import multiprocessing
+import os
+import shlex
+import signal
+import socket
+import statistics
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Sequence
+
+from .config import PROJECT_ROOT, TMP_DIR
+from .history import HISTORY_FILE, History
+from .latency import LatencyRecorder, LatencyRun
+from .routes import app_tsx
+from .runner import Hook, SuiteRunner, TestResult
+from .scripts import TestCase
+from .vitals import VITALS_ALL_FILE, VITALS_FILE, VitalsRecorder
+from .waits import Settler
+
+SHARDS_DIR = TMP_DIR / "shards"
+DEFAULT_DURATION = 60.0  # seconds, for a case with no history at all
+
+
+@dataclass
+class Shard:
+    index: int
+    cases: list[TestCase] = field(default_factory=list)
+    estimate: float = 0.0  # seconds
+
+
+def durations(cases: Sequence[TestCase], history_path: Path = HISTORY_FILE, runs: int = 10) -> dict[str, float]:
+    """Mean recent duration per case; unknown cases get the median of the known."""
+    known: dict[str, float] = {}
+    if history_path.exists():
+        history = History(history_path)
+        try:
+            known = history.mean_durations(runs)
+        finally:
+            history.close()
+    fallback = statistics.median(known.values()) if known else DEFAULT_DURATION
+    return {case.key: known.get(case.key, fallback) for case in cases}
+
+
+def plan(cases: Sequence[TestCase], k: int, estimates: dict[str, float]) -> list[Shard]:
+    shards = [Shard(i) for i in range(max(1, k))]
+    heap = [(0.0, shard.index) for shard in shards]
+    for case in sorted(cases, key=lambda c: (-estimates[c.key], c.key)):
+        load, index = heapq.heappop(heap)
+        shard = shards[index]
+        shard.cases.append(case)  # longest first within the shard, too
+        shard.estimate = load + estimates[case.key]
+        heapq.heappush(heap, (shard.estimate, index))
+    return shards
+
+
+def format_plan(shards: Sequence[Shard], estimates: dict[str, float]) -> str:
+    longest = max(estimates.values(), default=0.0)
+    makespan = max((s.estimate for s in shards), default=0.0)
+    lines = [
+        f"{len(shards)} shards, estimated wall {makespan:.0f}s"
+        f" (longest case {longest:.0f}s, serial {sum(estimates.values()):.0f}s)"
+    ]
+    for shard in shards:
+        lines.append(f"shard {shard.index + 1}: {len(shard.cases)} cases, ~{shard.estimate:.0f}s")
+        lines.extend(f"    {estimates[c.key]:6.0f}s  {c.key}" for c in shard.cases)
+    return "\n".join(lines)
+
+
+# -- local execution --------------------------------------------------------
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ShardServer:
+    """An app server for one shard: ``command`` run with ``PORT`` set."""
+
+    health_path = "/health"
+
+    def __init__(self, command: str, cwd: Path, log_path: Path, ready_timeout: float = 120.0):
+        self.command = command
+        self.cwd = cwd
+        self.log_path = log_path
+        self.ready_timeout = ready_timeout
+        self.port = free_port()
+        self.process: subprocess.Popen[bytes] | None = None
+
+    @property
+    def base(self) -> str:
+        return f"http://localhost:{self.port}"
+
+    def environment(self) -> dict[str, str]:
+        return {**os.environ, "PORT": str(self.port)}
+
+    def __enter__(self) -> "ShardServer":
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        log = open(self.log_path, "wb")
+        self.process = subprocess.Popen(
+            shlex.split(self.command),
+            cwd=self.cwd,
+            env=self.environment(),
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+        log.close()
+        try:
+            self._wait_ready()
+        except BaseException:
+            # Its own process group outlives us unless it is stopped here,
+            # on a timeout and on Ctrl-C alike.
+            self.__exit__()
+            raise
+        return self
+
+    def _wait_ready(self) -> None:
+        assert self.process is not None
+        deadline = time.monotonic() + self.ready_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"server exited with {self.process.returncode}; see {self.log_path}")
+            try:
+                with urllib.request.urlopen(self.base + self.health_path, timeout=2):
+                    return
+            except urllib.error.HTTPError:
+                return  # answering at all means it is up
+            except OSError:
+                time.sleep(0.25)
+        raise RuntimeError(f"server not ready on port {self.port} after {self.ready_timeout:g}s")
+
+    def __exit__(self, *exc: object) -> None:
+        if self.process is None or self.process.poll() is not None:
+            return
+        os.killpg(self.process.pid, signal.SIGTERM)
+        try:
+            self.process.wait(10)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+
+
+@dataclass
+class ShardSpec:
+    index: int
+    cases: list[TestCase]
+    concurrency: int | None = None
+    sleeps: str = "settle"
+    settle_timeout: float = 10_000
+    test_timeout: float = 300
+    headless: bool = True
+    serve: str | None = None
+    local: bool = False
+    seed: Path | None = None
+    fixtures: Path | None = None
+    vitals: bool = True
+    project_root: Path = PROJECT_ROOT
+
+    @property
+    def dir(self) -> Path:
+        return SHARDS_DIR / str(self.index + 1)
+
+
+def run_shard(spec: ShardSpec) -> list[TestResult]:
+    """Process-pool entry point: run one shard to completion."""
+    server: ShardServer | None = None
+    if spec.local:
+        from .backend import SEED_FILE, LocalBackend  # backend builds on this module
+
+        server = LocalBackend(spec.dir / "server.log", seed=spec.seed or SEED_FILE, project_root=spec.project_root)
+    elif spec.serve:
+        server = ShardServer(spec.serve, spec.project_root, spec.dir / "server.log")
+    if server is not None:
+        server.__enter__()
+        os.environ["NEXUS_BASE_URL"] = server.base
+    try:
+        settler = Settler(upper_bound_ms=spec.settle_timeout)
+        hooks: list[Hook] = [settler, LatencyRecorder(spec.dir / "latency.json")]
+        (spec.dir / "vitals.json").unlink(missing_ok=True)
+        if spec.vitals:
+            hooks.append(
+                VitalsRecorder(app_tsx=app_tsx(spec.project_root), path=spec.dir / "vitals.json", all_path=None)
+            )
+        if spec.local and spec.fixtures:
+            from .fixtures import Fixtures
+
+            base = server.base
+            hooks.append(Fixtures(lambda case: base, spec.fixtures))
+        runner = SuiteRunner(
+            concurrency=spec.concurrency,
+            headless=spec.headless,
+            hooks=hooks,
+            sleep=settler.script_sleep(spec.sleeps),
+            test_timeout=spec.test_timeout,
+        )
+        return asyncio.run(runner.run(spec.cases))
+    finally:
+        if server is not None:
+            server.__exit__()
+
+
+def run_sharded(specs: Sequence[ShardSpec]) -> list[TestResult]:
+    """Run shards in parallel processes.
+
+    The merged latency goes to tmp/latency.json and the merged vitals, when
+    recorded, to tmp/vitals.json (and into tmp/vitals_all.json), as an
+    unsharded run writes them.
+    """
+    # spawn, not fork: Playwright's driver and the event loop do not survive fork.
+    context = multiprocessing.get_context("spawn")
+    results: list[TestResult] = []
+    with concurrent.futures.ProcessPoolExecutor(len(specs), mp_context=context) as pool:
+        for shard_results in pool.map(run_shard, specs):
+            results.extend(shard_results)
+    merged = LatencyRun(meta={"shards": len(specs)})
+    for spec in specs:
+        path = spec.dir / "latency.json"
+        if path.exists():
+            merged.merge(LatencyRun.load(path))
+    merged.save()
+    if any(spec.vitals for spec in specs):
+        # Else a shard that died before recording would gate the last run's vitals.
+        VITALS_FILE.unlink(missing_ok=True)
+    vitals = [spec.dir / "vitals.json" for spec in specs if (spec.dir / "vitals.json").exists()]
+    if vitals:
+        run = LatencyRun(series={}, meta={"shards": len(specs)})
+        for path in vitals:
+            run.merge(LatencyRun.load(path))
+        run.save(VITALS_FILE)
+        combined = LatencyRun.load(VITALS_ALL_FILE) if VITALS_ALL_FILE.exists() else LatencyRun(series={})
+        combined.merge(run)
+        combined.meta = {"runs": combined.meta.get("runs", 0) + 1, "updated_at": time.time()}
+        combined.save(VITALS_ALL_FILE)
+    return results
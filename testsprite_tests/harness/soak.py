@@ -0,0 +1,447 @@
+"""Soak mode: hours of mixed traffic, reported as drift per time window.
+
+TC014 asks for 99.9% uptime and clean error logging, but it runs for
+seconds, and the failures it is meant to catch take hours to appear:
+* RSS that creeps up by a few MB per hour;
+* an event loop that slows as a cache grows;
+* a tab whose heap never stops growing;
+* p95 latency that doubles once the sessions table is large.
+
+``python -m harness soak --duration 4h`` keeps two kinds of traffic going
+for the whole duration:
+
+* API flows -- a weighted mix of what users do (sign in and out, list
+  tournaments, create and delete a tournament, read the audit log),
+  arriving open-loop as in load.py, each step timed on its own;
+* a browser -- one long-lived signed-in tab that moves between pages in
+  the app, timed to settle, as a user leaving the app open all day would.
+
+Every ``window`` seconds the run closes a window. It records:
+* per-step latency percentiles;
+* request and error counts, with each distinct error;
+* the server's RSS, heap and event-loop delay, read from
+  ``GET /api/metrics?reset=1`` (server/middleware/validation.ts). The
+  server mounts that endpoint only with ``NEXUS_STORAGE=memory``, as under
+  ``--local``, or with ``NEXUS_METRICS=true``; otherwise these stay empty;
+* the tab's live heap after a forced GC.
+
+Windows are appended to tmp/soak.json as they close, so an interrupted run
+keeps what it measured. The final report fits a least-squares slope per
+hour to every series. The run fails below the availability target (default
+99.9%) or above ``max_rss_drift`` MB/hour when that is given.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+import httpx
+from playwright.async_api import CDPSession, Page, async_playwright
+
+from .config import TMP_DIR
+from .histogram import Histogram
+from .history import slope
+from .leaks import NAVIGATE_SCRIPT
+from .load import Endpoint
+from .ready import wait_ready
+from .runner import LAUNCH_ARGS
+from .sessions import ROLES, SessionCache
+from .waits import Settler
+
+SOAK_FILE = TMP_DIR / "soak.json"
+MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Flow:
+    """A user flow: API steps run in order, ``{id}`` filled from the previous reply."""
+
+    name: str
+    steps: Sequence[Endpoint]
+    weight: float = 1.0
+    # Sign in on a fresh connection first, instead of using the shared session.
+    sign_in: bool = False
+
+
+FLOWS = (
+    Flow(
+        "login",
+        (Endpoint("/api/profile"), Endpoint("/api/auth/logout", "POST")),
+        weight=1,
+        sign_in=True,
+    ),
+    Flow("list-tournaments", (Endpoint("/api/tournaments"),), weight=4),
+    Flow(
+        "create-tournament",
+        (
+            Endpoint(
+                "/api/tournaments",
+                "POST",
+                json={"name": "Soak Cup", "game": "Valorant", "format": "single_elimination", "status": "upcoming"},
+            ),
+            Endpoint("/api/tournaments/{id}", "DELETE"),
+        ),
+        weight=1,
+    ),
+    Flow("view-audit-log", (Endpoint("/api/audit-logs"),), weight=2),
+)
+
+# Pages the browser moves between, weighted like the API flows. They are
+# NexusSuite/client/src/App.tsx routes; a path it lacks renders NotFound,
+# which would still count as a successful view.
+UI_ROUTES = {"/tournaments": 4, "/dashboard": 2, "/audit-log": 2, "/finance": 1}
+
+
+@dataclass
+class Window:
+    index: int
+    started: float  # seconds since the start of the run
+    latency: dict[str, Histogram] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+    requests: int = 0
+    failed: int = 0
+    server: dict[str, float] | None = None
+    client_heap_mb: float | None = None
+
+    def record(self, name: str, latency_ms: float, error: str | None = None) -> None:
+        self.latency.setdefault(name, Histogram()).record(latency_ms)
+        self.requests += 1
+        if error is not None:
+            self.failed += 1
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "started": round(self.started, 1),
+            "requests": self.requests,
+            "failed": self.failed,
+            "latency": {
+                name: {"n": hist.count, **{f"p{p:g}": round(v, 1) for p, v in hist.percentiles().items()}}
+                for name, hist in sorted(self.latency.items())
+            },
+            "errors": self.errors,
+            "server": self.server,
+            "client_heap_mb": self.client_heap_mb,
+        }
+
+
+def _server_sample(metrics: Mapping[str, Any]) -> dict[str, float]:
+    memory = metrics.get("memory", {})
+    loop = metrics.get("eventLoopDelay", {})
+    responses = metrics.get("responses", {})
+    return {
+        "rss_mb": round(memory.get("rss", 0) / MB, 1),
+        "heap_mb": round(memory.get("heapUsed", 0) / MB, 1),
+        "loop_mean_ms": round(loop.get("mean", 0), 2),
+        "loop_p99_ms": round(loop.get("p99", 0), 2),
+        "server_errors": responses.get("serverErrors", 0),
+    }
+
+
+@dataclass
+class SoakReport:
+    base: str
+    duration: float
+    window: float
+    availability_target: float
+    max_rss_drift: float | None = None
+    windows: list[dict[str, Any]] = field(default_factory=list)
+    started_at: float = field(default_factory=time.time)
+
+    @property
+    def requests(self) -> int:
+        return sum(w["requests"] for w in self.windows)
+
+    @property
+    def failed(self) -> int:
+        return sum(w["failed"] for w in self.windows)
+
+    @property
+    def availability(self) -> float:
+        return 100.0 * (1 - self.failed / self.requests) if self.requests else 0.0
+
+    def series(self) -> dict[str, list[float]]:
+        """Every per-window value worth a drift slope, keyed by a readable name."""
+        out: dict[str, list[float]] = {}
+        for w in self.windows:
+            for key, value in (w["server"] or {}).items():
+                if key != "server_errors":
+                    out.setdefault(f"server {key}", []).append(value)
+            if w["client_heap_mb"] is not None:
+                out.setdefault("client heap_mb", []).append(w["client_heap_mb"])
+            for name, stats in w["latency"].items():
+                out.setdefault(f"p95 {name}", []).append(stats["p95"])
+        return out
+
+    def drift(self) -> dict[str, float]:
+        """Least-squares change per hour of every series."""
+        per_hour = 3600 / self.window
+        return {name: slope(values) * per_hour for name, values in sorted(self.series().items())}
+
+    def errors(self) -> dict[str, int]:
+        totals: dict[str, int] = {}
+        for w in self.windows:
+            for error, n in w["errors"].items():
+                totals[error] = totals.get(error, 0) + n
+        return dict(sorted(totals.items(), key=lambda kv: -kv[1]))
+
+    def check(self) -> list[str]:
+        failures = []
+        if not self.requests:
+            return ["no requests completed"]
+        if self.availability < self.availability_target:
+            failures.append(f"availability {self.availability:.3f}% below {self.availability_target:g}%")
+        rss = self.drift().get("server rss_mb")
+        if self.max_rss_drift is not None and rss is not None and rss > self.max_rss_drift:
+            failures.append(f"server RSS drifts {rss:+.1f} MB/h, over {self.max_rss_drift:g}")
+        return failures
+
+    def save(self, path: Path = SOAK_FILE) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "base": self.base,
+            "duration": self.duration,
+            "window": self.window,
+            "started_at": self.started_at,
+            "windows": self.windows,
+            "drift_per_hour": self.drift(),
+        }
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        tmp.replace(path)
+
+
+
+def format_soak(report: SoakReport) -> str:
+    hours = len(report.windows) * report.window / 3600
+    lines = [
+        f"soak {report.base}: {len(report.windows)} windows ({hours:.2f} h), {report.requests} requests,"
+        f" {report.failed} failed, availability {report.availability:.3f}%",
+        "",
+        f"{'series':<40} {'first':>9} {'last':>9} {'per hour':>10}",
+    ]
+    series = report.series()
+    for name, per_hour in report.drift().items():
+        values = series[name]
+        lines.append(f"{name:<40} {values[0]:>9.1f} {values[-1]:>9.1f} {per_hour:>+10.2f}")
+    errors = report.errors()
+    if errors:
+        lines.append("\nerrors")
+        for error, n in list(errors.items())[:15]:
+            lines.append(f"  {n:>6}  {error}")
+    return "\n".join(lines)
+
+
+class Soak:
+    def __init__(
+        self,
+        base: str,
+        cache: SessionCache,
+        *,
+        role: str = "club_admin",
+        duration: float = 3600,
+        window: float = 60,
+        rate: float = 2.0,
+        browser: bool = True,
+        headless: bool = True,
+        think_time: float = 3.0,
+        flows: Sequence[Flow] = FLOWS,
+        availability_target: float = 99.9,
+        max_rss_drift: float | None = None,
+        path: Path | None = SOAK_FILE,
+        seed: int | None = None,
+    ):
+        self.base = base
+        self.cache = cache
+        self.role = ROLES[role]
+        self.duration = duration
+        self.window_s = window
+        self.rate = rate
+        self.browser = browser
+        self.headless = headless
+        self.think_time = think_time
+        self.flows = list(flows)
+        self.path = path
+        self.random = random.Random(seed)
+        self.report = SoakReport(base, duration, window, availability_target, max_rss_drift)
+        self.current = Window(0, 0.0)
+        self.cdp: CDPSession | None = None
+
+    async def run(self) -> SoakReport:
+        await self.cache.ensure([self.role.key])
+        loop = asyncio.get_running_loop()
+        self.started = loop.time()
+        self.deadline = self.started + self.duration
+        async with httpx.AsyncClient(
+            base_url=self.base, cookies=self.cache.cookies(self.role.key), timeout=30.0
+        ) as client:
+            # Start the server's first window now, not at its boot.
+            await self._server_metrics(client)
+            tasks = [self._arrivals(client), self._windows(client)]
+            if self.browser:
+                tasks.append(self._browse())
+            await asyncio.gather(*tasks)
+        return self.report
+
+    # -- API traffic -------------------------------------------------------
+
+    async def _arrivals(self, client: httpx.AsyncClient) -> None:
+        loop = asyncio.get_running_loop()
+        weights = [flow.weight for flow in self.flows]
+        in_flight: set[asyncio.Task[None]] = set()
+        intended = loop.time()
+        while True:
+            intended += self.random.expovariate(self.rate)
+            if intended >= self.deadline:
+                break
+            delay = intended - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            flow = self.random.choices(self.flows, weights)[0]
+            task = asyncio.create_task(self._flow(client, flow, intended))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    async def _flow(self, client: httpx.AsyncClient, flow: Flow, intended: float) -> None:
+        own: httpx.AsyncClient | None = None
+        if flow.sign_in:
+            own = httpx.AsyncClient(base_url=self.base, timeout=30.0)
+            client = own
+        try:
+            steps = list(flow.steps)
+            if flow.sign_in:
+                credentials = {"email": self.role.login_email, "password": self.role.password}
+                steps.insert(0, Endpoint("/api/auth/login", "POST", json=credentials))
+            values: dict[str, Any] = {}
+            # The first step is timed from its intended arrival (coordinated omission).
+            started = intended
+            for step in steps:
+                name = f"{flow.name}: {step.name}"
+                body = await self._request(client, step, values, name, started)
+                if body is None:
+                    return  # later steps depend on this one
+                if isinstance(body, dict) and "id" in body:
+                    values["id"] = body["id"]
+                started = asyncio.get_running_loop().time()
+        finally:
+            if own is not None:
+                await own.aclose()
+
+    async def _request(
+        self,
+        client: httpx.AsyncClient,
+        step: Endpoint,
+        values: Mapping[str, Any],
+        name: str,
+        started: float,
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        error = None
+        body: Any = None
+        try:
+            response = await client.request(step.method, step.path.format(**values), json=step.json)
+            if 200 <= response.status_code < 300:
+                body = response.json() if response.content else {}
+            else:
+                error = f"{step.name} -> {response.status_code}"
+        except (httpx.HTTPError, ValueError) as exc:
+            error = f"{step.name} -> {type(exc).__name__}"
+        self.current.record(name, (loop.time() - started) * 1000, error)
+        return None if error else body
+
+    # -- browser -----------------------------------------------------------
+
+    async def _browse(self) -> None:
+        loop = asyncio.get_running_loop()
+        routes, weights = list(UI_ROUTES), list(UI_ROUTES.values())
+        settler = Settler()
+        async with async_playwright() as pw:
+            browser = await pw.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+            try:
+                context = await browser.new_context(storage_state=self.cache.storage_state(self.role.key))
+                await settler.attach(context)
+                page = await context.new_page()
+                page.on("pageerror", lambda exc: self._ui_error(f"pageerror: {str(exc)[:120]}"))
+                await page.goto(self.base + routes[0], wait_until="commit")
+                await wait_ready(page)
+                self.cdp = await context.new_cdp_session(page)
+                await self.cdp.send("HeapProfiler.enable")
+                while loop.time() + self.think_time < self.deadline:
+                    await asyncio.sleep(self.think_time * self.random.uniform(0.5, 1.5))
+                    await self._view(page, settler, self.random.choices(routes, weights)[0])
+            finally:
+                self.cdp = None
+                await browser.close()
+
+    async def _view(self, page: Page, settler: Settler, route: str) -> None:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        error = None
+        try:
+            await page.evaluate(NAVIGATE_SCRIPT, route)
+            await settler.settle(page)
+        except Exception as exc:  # a crashed tab must not end an hours-long run
+            error = f"ui {route} -> {type(exc).__name__}"
+        self.current.record(f"ui {route}", (loop.time() - started) * 1000, error)
+
+    def _ui_error(self, error: str) -> None:
+        self.current.errors[error] = self.current.errors.get(error, 0) + 1
+
+    async def _client_heap(self) -> float | None:
+        if self.cdp is None:
+            return None
+        try:
+            await self.cdp.send("HeapProfiler.collectGarbage")
+            usage = await self.cdp.send("Runtime.getHeapUsage")
+        except Exception:
+            return None
+        return round(usage["usedSize"] / MB, 1)
+
+    # -- windows -----------------------------------------------------------
+
+    async def _server_metrics(self, client: httpx.AsyncClient) -> dict[str, float] | None:
+        try:
+            response = await client.get("/api/metrics", params={"reset": 1})
+            response.raise_for_status()
+            return _server_sample(response.json())
+        except (httpx.HTTPError, ValueError):
+            return None
+
+    async def _windows(self, client: httpx.AsyncClient) -> None:
+        loop = asyncio.get_running_loop()
+        index = 0
+        while True:
+            close_at = self.started + (index + 1) * self.window_s
+            last = close_at >= self.deadline
+            await asyncio.sleep(max(0.0, min(close_at, self.deadline) - loop.time()))
+            if last:
+                # Let the flows still in flight land in this window.
+                await asyncio.sleep(1.0)
+            window, self.current = self.current, Window(index + 1, close_at - self.started)
+            window.server = await self._server_metrics(client)
+            window.client_heap_mb = await self._client_heap()
+            self.report.windows.append(window.to_dict())
+            if self.path is not None:
+                self.report.save(self.path)
+            print(self._progress(window))
+            index += 1
+            if last:
+                return
+
+    def _progress(self, window: Window) -> str:
+        elapsed = time.strftime("%H:%M:%S", time.gmtime(window.started + self.window_s))
+        server = window.server or {}
+        return (
+            f"[{elapsed}] {window.requests} req, {window.failed} failed"
+            f" | rss {server.get('rss_mb', '-')} MB, loop p99 {server.get('loop_p99_ms', '-')} ms"
+            f" | tab heap {window.client_heap_mb if window.client_heap_mb is not None else '-'} MB"
+        )
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from harness.config import TESTS_DIR
+
+VALIDATION_TS = TESTS_DIR.parent / "server" / "middleware" / "validation.ts"
+
+# Verbatim requestLogger output (server/middleware/validation.ts): a request
+# line, then the response line once the reply has been sent.
+SERVER_LOG = """\
+[2025-10-19T16:33:00.001Z] POST /api/auth/login - Request ID: r1
+[2025-10-19T16:33:00.185Z] POST /api/auth/login - 200 OK - 184ms - Request ID: r1
+[2025-10-19T16:33:01.000Z] GET /api/tournaments?organizationId=org_a - Request ID: r2
+[2025-10-19T16:33:01.021Z] GET /api/tournaments?organizationId=org_a - 200 OK - 21ms - Tenant: org_a - Request ID: r2
+[2025-10-19T16:33:02.000Z] GET /api/tournaments/Xk3pL9qRt2VwYz8AbCdE/rounds - Request ID: r3
+[2025-10-19T16:33:02.034Z] GET /api/tournaments/Xk3pL9qRt2VwYz8AbCdE/rounds - 200 OK - 34ms - Tenant: org_a - Request ID: r3
+Tournament created successfully
+[2025-10-19T16:33:03.000Z] POST /api/tournaments - Request ID: r4
+[2025-10-19T16:33:03.250Z] POST /api/tournaments - 500 Internal Server Error - 250ms - Tenant: org_b - Request ID: r4
+[2025-10-19T16:33:04.000Z] POST /api/auth/logout - Request ID: r5
+[2025-10-19T16:33:04.003Z] POST /api/auth/logout - 200 OK - 3ms - Request ID: r5
+"""
+
+
+@pytest.fixture
+def server_log() -> list[str]:
+    return SERVER_LOG.splitlines(keepends=True)
+
+
+@pytest.fixture(scope="session")
+def request_logger_source() -> str:
+    source = VALIDATION_TS.read_text(encoding="utf-8")
+    match = re.search(r"export function requestLogger\(.*?\n}\n", source, re.S)
+    assert match, "requestLogger not found in validation.ts"
+    return match[0]
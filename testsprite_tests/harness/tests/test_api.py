@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from harness.api import ApiError, NexusClient, RetryPolicy
+from harness.api import client as client_module
+
+
+@pytest.fixture
+def delays(monkeypatch) -> list[float]:
+    slept: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        slept.append(delay)
+
+    monkeypatch.setattr(client_module.asyncio, "sleep", sleep)
+    return slept
+
+
+def _request(replies: list, *, retry: RetryPolicy = RetryPolicy(), method: str = "GET") -> tuple[object, int]:
+    """Serve ``replies`` in turn (a Response, or an exception to raise); return the outcome and the requests sent."""
+    sent = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal sent
+        reply = replies[min(sent, len(replies) - 1)]
+        sent += 1
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    async def run() -> object:
+        async with NexusClient("http://nexus", retry=retry) as api:
+            await api.http.aclose()
+            api.http = httpx.AsyncClient(base_url="http://nexus", transport=httpx.MockTransport(handler))
+            try:
+                return await api.request(method, "/api/tournaments", params={"status": None, "limit": 5})
+            except (ApiError, httpx.ConnectError) as exc:
+                return exc
+
+    return asyncio.run(run()), sent
+
+
+def test_retries_throttled_replies_and_honours_retry_after(delays):
+    busy = httpx.Response(429, headers={"Retry-After": "3"})
+    outcome, sent = _request([httpx.Response(503), busy, httpx.Response(200, json=[{"id": "t1"}])])
+    assert outcome == [{"id": "t1"}] and sent == 3
+    assert 0 <= delays[0] <= 0.2 and delays[1] == 3
+
+
+def test_gives_up_after_the_last_attempt(delays):
+    outcome, sent = _request([httpx.Response(503, json={"message": "overloaded"})])
+    assert isinstance(outcome, ApiError) and outcome.status == 503
+    assert str(outcome) == "GET /api/tournaments -> 503: overloaded"
+    assert sent == 4 and len(delays) == 3
+    # Full jitter, capped by the exponential bound of each attempt.
+    assert all(0 <= d <= 0.2 * 2**n for n, d in enumerate(delays))
+
+
+def test_other_errors_are_not_retried(delays):
+    outcome, sent = _request([httpx.Response(400, text="bad")], method="POST")
+    assert isinstance(outcome, ApiError) and (outcome.status, outcome.body) == (400, "bad")
+    assert sent == 1 and delays == []
+
+
+def test_connection_errors_are_retried_then_raised(delays):
+    refused = httpx.ConnectError("refused")
+    outcome, sent = _request([refused, httpx.Response(200, json={"ok": True})], method="POST")
+    assert outcome == {"ok": True} and sent == 2
+    outcome, sent = _request([refused], retry=RetryPolicy(attempts=2))
+    assert outcome is refused and sent == 2
+
+
+def test_delay_is_capped_and_never_below_retry_after():
+    policy = RetryPolicy(base_delay=1, max_delay=2)
+    assert all(0 <= policy.delay(10) <= 2 for _ in range(50))
+    assert policy.delay(0, retry_after=7) == 7
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from harness import browsers
+from harness.cli import main
+
+
+def test_serve_refuses_without_the_private_driver_entry_point(monkeypatch, capsys):
+    # What a Playwright release that moved playwright._impl._driver looks like.
+    monkeypatch.setattr(browsers, "compute_driver_executable", None)
+    assert not browsers.pool_supported()
+    assert main(["browsers", "serve"]) == 1
+    assert "requirements.txt" in capsys.readouterr().out
+    with pytest.raises(RuntimeError, match="Node driver"):
+        asyncio.run(browsers.BrowserServer.start([]))
+
+
+def test_the_pinned_playwright_has_it():
+    node, cli = browsers.compute_driver_executable()
+    assert cli.endswith("cli.js")
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import contextvars
+
+import pytest
+
+from harness.config import CASE_BASE, PROJECT_ROOT, base_url
+from harness.routes import app_tsx, client_routes
+
+
+def test_the_running_cases_backend_wins(monkeypatch):
+    monkeypatch.setenv("NEXUS_BASE_URL", "http://shared:5000/")
+    assert base_url() == "http://shared:5000"
+
+    def in_case() -> str:
+        CASE_BASE.set("http://127.0.0.1:41234/")
+        return base_url()
+
+    # Set in the case's own context, as the runner does; others keep the shared one.
+    assert contextvars.copy_context().run(in_case) == "http://127.0.0.1:41234"
+    assert base_url() == "http://shared:5000"
+
+
+def test_project_root_is_the_repo_the_app_runs_from(tmp_path):
+    # Not --tests-dir's parent: a mirror under NexusSuite/ has no server/index.ts.
+    assert (PROJECT_ROOT / "server" / "index.ts").is_file()
+    assert "/tournaments" in client_routes(app_tsx(PROJECT_ROOT))
+    with pytest.raises(FileNotFoundError, match="client route table"):
+        client_routes(app_tsx(tmp_path))
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import struct
+
+import pytest
+
+from harness.cpuprofile import CpuProfile, Inspector, InspectorError
+
+
+class _Writer:
+    """Collects what the client sends, as asyncio.StreamWriter would."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    def write(self, data: bytes) -> None:
+        self.data += data
+
+    async def drain(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def _server_frame(opcode: int, payload: bytes, fin: bool = True) -> bytes:
+    """An unmasked frame, as the inspector sends them."""
+    first = (0x80 if fin else 0) | opcode
+    size = len(payload)
+    if size < 126:
+        return struct.pack("!BB", first, size) + payload
+    if size < 1 << 16:
+        return struct.pack("!BBH", first, 126, size) + payload
+    return struct.pack("!BBQ", first, 127, size) + payload
+
+
+def _client_frames(data: bytes) -> list[tuple[int, bytes]]:
+    """Decode what the client wrote: (opcode, unmasked payload) per frame."""
+    frames = []
+    i = 0
+    while i < len(data):
+        first, second = data[i], data[i + 1]
+        assert first & 0x80 and second & 0x80, "client frames are final and masked"
+        size, i = second & 0x7F, i + 2
+        if size == 126:
+            (size,) = struct.unpack_from("!H", data, i)
+            i += 2
+        elif size == 127:
+            (size,) = struct.unpack_from("!Q", data, i)
+            i += 8
+        mask, i = data[i : i + 4], i + 4
+        frames.append((first & 0x0F, bytes(b ^ mask[j % 4] for j, b in enumerate(data[i : i + size]))))
+        i += size
+    return frames
+
+
+def _inspector(*frames: bytes) -> tuple[Inspector, _Writer]:
+    # Inside a running loop: StreamReader binds to it.
+    reader = asyncio.StreamReader()
+    reader.feed_data(b"".join(frames))
+    reader.feed_eof()
+    writer = _Writer()
+    return Inspector(reader, writer), writer
+
+
+def _call(method: str, *frames: bytes) -> tuple[dict, _Writer]:
+    async def call() -> tuple[dict, _Writer]:
+        inspector, writer = _inspector(*frames)
+        return await inspector.call(method), writer
+
+    return asyncio.run(call())
+
+
+@pytest.mark.parametrize("size", [10, 125, 126, 65_535, 65_536])
+def test_send_frame_length_encodings(size):
+    async def send() -> bytes:
+        inspector, writer = _inspector()
+        await inspector._send_frame(0x1, b"x" * size)
+        return bytes(writer.data)
+
+    data = asyncio.run(send())
+    header = 2 if size < 126 else 4 if size < 1 << 16 else 10
+    assert len(data) == header + 4 + size
+    assert _client_frames(data) == [(0x1, b"x" * size)]
+
+
+def test_call_skips_events_answers_pings_and_joins_fragments():
+    reply = json.dumps({"id": 1, "result": {"profile": {"nodes": []}, "pad": "y" * 300}}).encode()
+    result, writer = _call(
+        "Profiler.stop",
+        _server_frame(0x1, json.dumps({"method": "Profiler.consoleProfileStarted"}).encode()),
+        _server_frame(0x9, b"beat"),
+        _server_frame(0x1, reply[:200], fin=False),
+        _server_frame(0x0, reply[200:]),  # a 16-bit length continuation
+    )
+    assert result["profile"] == {"nodes": []}
+    (sent, sent_payload), pong = _client_frames(bytes(writer.data))
+    assert sent == 0x1 and json.loads(sent_payload) == {"id": 1, "method": "Profiler.stop", "params": {}}
+    assert pong == (0xA, b"beat")
+
+
+def test_call_reads_64_bit_lengths():
+    reply = json.dumps({"id": 1, "result": {"pad": "z" * 70_000}}).encode()
+    result, _ = _call("Profiler.stop", _server_frame(0x1, reply))
+    assert len(result["pad"]) == 70_000
+
+
+def test_call_reports_errors_and_closed_connections():
+    error = json.dumps({"id": 1, "error": {"code": -32601, "message": "not found"}}).encode()
+    with pytest.raises(InspectorError, match="Nope.nope: not found"):
+        _call("Nope.nope", _server_frame(0x1, error))
+    with pytest.raises(InspectorError, match="closed"):
+        _call("Profiler.enable", _server_frame(0x8, struct.pack("!H", 1000)))
+
+
+def _node(node_id: int, name: str, children: list[int] = (), url: str = "", line: int = -1) -> dict:
+    return {
+        "id": node_id,
+        "callFrame": {"functionName": name, "url": url, "lineNumber": line},
+        "children": list(children),
+    }
+
+
+@pytest.fixture
+def profile(tmp_path) -> CpuProfile:
+    # (root) -> handler -> query -> handler (recursion), plus (idle).
+    url = f"file://{tmp_path}/server/routes/tournaments.ts"
+    data = {
+        "nodes": [
+            _node(1, "(root)", [2, 5]),
+            _node(2, "handler", [3], url, 9),
+            _node(3, "query", [4], url, 41),
+            _node(4, "handler", [], url, 9),
+            _node(5, "(idle)"),
+        ],
+        "startTime": 0,
+        "endTime": 10_000,
+        # Samples at 1, 3, 4, 7 and 9 ms.
+        "samples": [2, 3, 4, 5, 3],
+        "timeDeltas": [1000, 2000, 1000, 3000, 2000],
+    }
+    return CpuProfile(data, root=tmp_path)
+
+
+def test_profile_self_and_total_time(profile):
+    # Each sample lasts until the next; the last one until endTime.
+    self_ms = {f.name: ms for f, ms in profile.self_time().items()}
+    assert self_ms == {
+        "handler (server/routes/tournaments.ts)": 5.0,  # 2 ms, and 3 ms in the recursive call
+        "query (server/routes/tournaments.ts)": 2.0,
+        "(idle)": 2.0,
+    }
+    assert profile.idle_ms == 2.0 and profile.busy_ms == 7.0
+    total_ms = {f.name: ms for f, ms in profile.total_time().items()}
+    # Recursion counts once per sample.
+    assert total_ms["handler (server/routes/tournaments.ts)"] == 7.0
+    assert total_ms["query (server/routes/tournaments.ts)"] == 5.0
+    frame = next(f for f in profile.self_time() if f.function == "query")
+    assert frame.location == "server/routes/tournaments.ts:42"
+
+
+def test_profile_collapsed_stacks_and_shares(profile):
+    assert list(profile.collapsed()) == [
+        "(idle) 2000",
+        "handler (server/routes/tournaments.ts) 2000",
+        "handler (server/routes/tournaments.ts);query (server/routes/tournaments.ts) 2000",
+        "handler (server/routes/tournaments.ts);query (server/routes/tournaments.ts);"
+        "handler (server/routes/tournaments.ts) 3000",
+    ]
+    shares = profile.shares()
+    assert "(idle)" not in shares
+    assert shares["handler (server/routes/tournaments.ts)"] == pytest.approx(5 / 7)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from harness.dataset import DEFAULT_SIZES, DatasetGenerator, JsonSink, Size, load_sizes, write_dataset
+
+# (table, column) -> the table its id points into.
+FOREIGN_KEYS = {
+    ("users", "tenantId"): "tenants",
+    ("rosters", "playerId"): "staff",
+    ("payroll", "staffId"): "staff",
+    ("payroll", "walletId"): "wallets",
+    ("payroll", "createdBy"): "users",
+    ("tournamentRounds", "tournamentId"): "tournaments",
+    ("matches", "tournamentId"): "tournaments",
+    ("matches", "roundId"): "tournamentRounds",
+    ("transactions", "walletId"): "wallets",
+    ("transactions", "createdBy"): "users",
+    ("socialMetrics", "accountId"): "socialAccounts",
+    ("auditLogs", "userId"): "users",
+    ("invites", "invitedBy"): "users",
+}
+
+
+def _generate(tmp_path, sizes=DEFAULT_SIZES) -> dict[str, list[dict]]:
+    path = tmp_path / "dataset.json"
+    # A small chunk, so tables span several.
+    write_dataset(DatasetGenerator(40, sizes=sizes, seed=7, chunk=64), JsonSink(path))
+    return json.loads(path.read_text())["data"]
+
+
+def test_foreign_keys_resolve_within_the_tenant(tmp_path):
+    data = _generate(tmp_path)
+    by_id = {table: {row["id"]: row for row in rows} for table, rows in data.items()}
+    for (table, column), target in FOREIGN_KEYS.items():
+        assert data[table], table
+        for row in data[table]:
+            parent = by_id[target].get(row[column])
+            assert parent is not None, (table, column, row[column])
+            # Rounds carry no tenantId; their tournament does.
+            tenant = parent["id"] if target == "tenants" else parent.get("tenantId")
+            assert tenant is None or row.get("tenantId", tenant) == tenant, (table, column)
+    # Every tenant has its owner first.
+    owners = {row["tenantId"] for row in data["users"] if row["role"] == "owner"}
+    assert owners == set(by_id["tenants"])
+
+
+def test_same_seed_same_rows(tmp_path):
+    assert _generate(tmp_path / "a") == _generate(tmp_path / "b")
+
+
+def test_load_sizes_overrides_and_validates(tmp_path):
+    path = tmp_path / "sizes.json"
+    path.write_text(json.dumps({"staff": {"mean": 40, "dist": "fixed", "min": 1}}))
+    sizes = load_sizes(path)
+    assert sizes["staff"] == ("tenants", Size(40, "fixed", min=1)) and sizes["users"] == DEFAULT_SIZES["users"]
+    for table in ("users", "staff", "wallets"):
+        path.write_text(json.dumps({table: {"mean": 3}}))
+        with pytest.raises(ValueError, match=f"{table} needs min >= 1"):
+            load_sizes(path)
+    path.write_text(json.dumps({"rosters": {"mean": 0}}))
+    assert load_sizes(path)["rosters"][1].mean == 0
+    path.write_text(json.dumps({"players": {"mean": 3}}))
+    with pytest.raises(ValueError, match="unknown table"):
+        load_sizes(path)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+
+from playwright.async_api import Error
+
+from harness.forms import SUBMIT_SELECTOR, FormFill, fill_form
+
+
+class _Form:
+    """Stands in for a form Locator: answers evaluate, records the fallbacks."""
+
+    def __init__(self, outcome: dict | Exception) -> None:
+        self.outcome = outcome
+        self.calls: list[tuple] = []
+        self.selector = ""
+
+    async def evaluate(self, script: str, arg: dict, timeout: float) -> dict:
+        self.calls.append(("evaluate", arg))
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+    def locator(self, selector: str) -> _Form:
+        self.selector = selector
+        return self
+
+    def get_by_label(self, key: str, exact: bool) -> _Form:
+        return self
+
+    get_by_placeholder = get_by_label
+
+    def or_(self, other: _Form) -> _Form:
+        return self
+
+    @property
+    def first(self) -> _Form:
+        return self
+
+    async def fill(self, value: str, timeout: float) -> None:
+        self.calls.append(("fill", self.selector, value))
+
+    async def set_checked(self, value: bool, timeout: float) -> None:
+        self.calls.append(("check", self.selector, value))
+
+    async def click(self, timeout: float) -> None:
+        self.calls.append(("click", self.selector))
+
+
+def _fill(form: _Form, values: dict, **kwargs) -> FormFill:
+    return asyncio.run(fill_form(form, values, **kwargs))
+
+
+def test_one_evaluate_when_the_page_resolves_every_field():
+    form = _Form({"missing": [], "invalid": ["email"], "submitted": True})
+    result = _fill(form, {"email": "x", "Password": "p"})
+    assert result == FormFill(invalid=["email"], submitted=True, round_trips=1)
+    assert form.calls == [("evaluate", {"values": {"email": "x", "Password": "p"}, "submit": True})]
+
+
+def test_unresolved_fields_fall_back_to_playwright():
+    form = _Form({"missing": ["terms", "age"], "invalid": [], "submitted": False})
+    result = _fill(form, {"email": "x", "terms": True, "age": 30})
+    assert result == FormFill(submitted=True, round_trips=4)
+    assert form.calls[1:] == [
+        ("check", '[name="terms"], [id="terms"]', True),
+        ("fill", '[name="age"], [id="age"]', "30"),
+        ("click", SUBMIT_SELECTOR),
+    ]
+
+
+def test_a_failed_evaluate_fills_every_field_without_submitting_if_asked():
+    form = _Form(Error("Execution context was destroyed"))
+    result = _fill(form, {"email": "x"}, submit=False)
+    assert result == FormFill(round_trips=2)
+    assert [call[0] for call in form.calls] == ["evaluate", "fill"]
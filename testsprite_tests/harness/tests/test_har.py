@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import base64
+import json
+
+from harness.har import HarArchive, _fulfill_args, request_key
+
+
+def test_request_key_ignores_origin_query_order_and_json_layout():
+    a = request_key("post", "http://localhost:5000/api/rounds?b=2&a=1", '{"x": 1, "y": [1, 2]}', "application/json")
+    b = request_key("POST", "http://127.0.0.1:4173/api/rounds?a=1&b=2", '{"y":[1,2],"x":1}')
+    assert a == b == ("POST", "/api/rounds?a=1&b=2", '{"x":1,"y":[1,2]}')
+    form = request_key("POST", "/api/auth/login", "password=p&email=e", "application/x-www-form-urlencoded")
+    assert form[2] == "email=e&password=p"
+    assert request_key("GET", "/api/x?empty=")[1] == "/api/x?empty="
+    assert request_key("POST", "/api/x", " not json ")[2] == "not json"
+
+
+def _entry(method: str, url: str, status: int, text: str = "", body: str | None = None) -> dict:
+    request = {"method": method, "url": url}
+    if body is not None:
+        request["postData"] = {"mimeType": "application/json", "text": body}
+    return {"request": request, "response": {"status": status, "content": {"text": text}, "headers": []}}
+
+
+def test_lookup_serves_repeats_in_order_then_falls_back_to_the_path():
+    archive = HarArchive([
+        _entry("GET", "http://h/api/tournaments", 200, "first"),
+        _entry("GET", "http://h/api/tournaments", 200, "second"),
+        _entry("POST", "http://h/api/tournaments", 201, "made", '{"name": "Cup"}'),
+    ])
+    key = request_key("GET", "/api/tournaments")
+    texts = [archive.lookup(key)[0]["content"]["text"] for _ in range(3)]
+    assert texts == ["first", "second", "second"]  # the last one repeats
+    response, exact = archive.lookup(request_key("POST", "/api/tournaments", '{"name": "Other"}'))
+    assert response["status"] == 201 and not exact
+    assert archive.lookup(request_key("DELETE", "/api/tournaments")) == (None, False)
+
+
+def test_fulfill_args_decode_the_body_and_drop_framing_headers():
+    response = {
+        "status": 200,
+        "headers": [{"name": "Content-Encoding", "value": "gzip"}, {"name": "Content-Type", "value": "application/json"}],
+        "content": {"text": base64.b64encode(json.dumps([1]).encode()).decode(), "encoding": "base64"},
+    }
+    assert _fulfill_args(response) == {"status": 200, "headers": {"Content-Type": "application/json"}, "body": b"[1]"}
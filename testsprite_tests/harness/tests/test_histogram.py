@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from harness.histogram import Histogram
+
+
+def test_small_values_get_a_bucket_each():
+    hist = Histogram(3)
+    assert hist.sub_bucket_bits == 11
+    for value in (0, 1, 999, 2047):
+        index = hist._index(value)
+        assert index == value and hist._highest_equivalent(index) == value
+
+
+def test_bucket_error_stays_under_the_significant_figures():
+    hist = Histogram(3)
+    previous = 0
+    for value in [*range(2040, 2060), *range(4090, 4110), 65_537, 1_000_003, 30_000_000_000]:
+        index = hist._index(value)
+        assert index >= previous
+        previous = index
+        top = hist._highest_equivalent(index)
+        assert value <= top and (top - value) / value < 1e-3
+        # ``top`` is the bucket's last value.
+        assert hist._index(top) == index and hist._index(top + 1) > index
+
+
+def test_percentiles_of_a_uniform_run():
+    hist = Histogram()
+    for ms in range(1, 101):
+        hist.record(ms)
+    assert hist.count == 100 and hist.min == 1 and hist.max == 100
+    assert hist.mean == pytest.approx(50.5)
+    p = hist.percentiles((50, 95, 99, 100))
+    assert p[50] == pytest.approx(50, rel=1e-3)
+    assert p[95] == pytest.approx(95, rel=1e-3)
+    assert p[99] == pytest.approx(99, rel=1e-3)
+    assert p[100] == 100  # capped at the largest recorded value
+    assert math.isnan(Histogram().value_at_percentile(50))
+
+
+def test_merge_equals_recording_everything_once():
+    whole, low, high = Histogram(), Histogram(), Histogram()
+    for ms in range(1, 201):
+        whole.record(ms / 3)
+        (low if ms <= 100 else high).record(ms / 3)
+    merged = Histogram().merge(high).merge(low)
+    assert merged.to_dict() == whole.to_dict()
+    assert Histogram.from_dict(merged.to_dict()).percentiles() == whole.percentiles()
+
+
+def test_merge_refuses_other_precision():
+    with pytest.raises(ValueError):
+        Histogram(3).merge(Histogram(2))
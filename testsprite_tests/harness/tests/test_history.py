@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from harness import runner, scripts
+from harness.history import History, slope
+
+
+def _result(key: str, status: str, duration: float, error: str | None = None) -> runner.TestResult:
+    case = scripts.TestCase(id=key, name=key, path=Path(f"{key}.py"))
+    steps = [scripts.Step(0, "open", 0.0, duration / 2), scripts.Step(1, "submit", 0.0, duration)]
+    return runner.TestResult(case=case, status=status, duration=duration, started_at=0.0, error=error, steps=steps)
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = History(tmp_path / "history.sqlite")
+    yield history
+    history.close()
+
+
+def _run(history: History, *results: runner.TestResult) -> int:
+    run_id = history.start_run(len(results))
+    for result in results:
+        history.append(run_id, result)
+    history.finish_run(run_id)
+    return run_id
+
+
+def test_failure_streaks_count_the_latest_failures_only(history):
+    _run(history, _result("a", "failed", 1, "old"), _result("b", runner.PASSED, 1), _result("c", "failed", 1))
+    _run(history, _result("a", runner.PASSED, 1), _result("b", "failed", 1, "b1"), _result("c", "failed", 1))
+    _run(history, _result("a", "failed", 1, "new"), _result("b", "failed", 1, "b2"), _result("c", runner.PASSED, 1))
+    assert history.failure_streaks() == [("b", 2, "b2"), ("a", 1, "new")]
+    # Only the last run counts with runs=1.
+    assert history.failure_streaks(runs=1) == [("a", 1, "new"), ("b", 1, "b2")]
+
+
+def test_slowest_averages_over_the_recent_runs(history):
+    _run(history, _result("a", runner.PASSED, 100), _result("b", runner.PASSED, 1))
+    _run(history, _result("a", runner.PASSED, 2), _result("b", runner.PASSED, 4))
+    _run(history, _result("a", runner.PASSED, 4), _result("b", runner.PASSED, 6))
+    assert [(r["case_key"], r["n"], r["mean"], r["worst"]) for r in history.slowest()] == [
+        ("a", 3, pytest.approx(106 / 3), 100),
+        ("b", 3, pytest.approx(11 / 3), 6),
+    ]
+    assert [(r["case_key"], r["mean"]) for r in history.slowest(runs=2)] == [("b", 5), ("a", 3)]
+    assert [r["case_key"] for r in history.slowest(limit=1, runs=2)] == ["b"]
+    assert history.mean_durations(runs=2) == {"a": 3, "b": 5}
+    steps = history.slowest_steps(limit=2, runs=2)
+    assert [(r["case_key"], r["name"], r["mean"]) for r in steps] == [("b", "submit", 5), ("a", "submit", 3)]
+
+
+def test_trend_and_slope(history):
+    for duration in (1, 2, 3):
+        _run(history, _result("a", runner.PASSED, duration))
+    assert [r["duration"] for r in history.trend("a")] == [1, 2, 3]
+    assert slope([1, 2, 3]) == pytest.approx(1) and slope([5]) == 0
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from harness.leaks import KB, HeapCensus, LeakReport, census, growth
+
+NODE_TYPES = ["hidden", "array", "string", "object", "code", "closure", "regexp", "number", "native", "synthetic"]
+
+
+def _snapshot(nodes: list[tuple[str, str, int]]) -> dict:
+    """A minimal V8 .heapsnapshot: (type, name, self_size) per node."""
+    strings: list[str] = []
+    flat: list[int] = []
+    for kind, name, size in nodes:
+        if name not in strings:
+            strings.append(name)
+        flat += [NODE_TYPES.index(kind), strings.index(name), len(flat), size, 0]
+    return {
+        "snapshot": {
+            "meta": {
+                "node_fields": ["type", "name", "id", "self_size", "edge_count"],
+                "node_types": [NODE_TYPES, "string", "number", "number", "number"],
+            }
+        },
+        "nodes": flat,
+        "strings": strings,
+    }
+
+
+def test_census_groups_objects_by_constructor_and_the_rest_by_type():
+    snapshot = _snapshot(
+        [
+            ("object", "Match", 100),
+            ("object", "Match", 50),
+            ("string", "Xk3pL9qRt2VwYz8AbCdE", 20),
+            ("native", "Buffer", 30),
+            ("closure", "onClick", 10),
+        ]
+    )
+    result = census(snapshot, cycle=3)
+    assert result.cycle == 3 and result.total == 210
+    assert result.by_name == {"Match": [2, 150], "(string)": [1, 20], "Buffer": [1, 30], "(closure)": [1, 10]}
+
+
+def test_growth_ranks_constructors_by_added_bytes():
+    first = HeapCensus(cycle=0, total=0, by_name={"Match": [1, 100], "Team": [1, 40]})
+    last = HeapCensus(cycle=5, total=0, by_name={"Match": [4, 400], "Team": [1, 40], "Round": [2, 500]})
+    assert growth(first, last) == [
+        {"name": "Round", "count": 2, "bytes": 500},
+        {"name": "Match", "count": 3, "bytes": 300},
+    ]
+
+
+def test_route_kb_charges_each_visit_with_what_it_left_behind():
+    # Each cycle /dashboard adds 5 KB over the /tournaments visit before it,
+    # and /tournaments 5 KB over /dashboard: 10 KB a cycle.
+    dashboard = [(100 + 10 * c) * KB for c in range(4)]
+    report = LeakReport(
+        routes=["/dashboard", "/tournaments"],
+        cycles=4,
+        warmup=1,
+        threshold_kb=8,
+        samples={"/dashboard": dashboard, "/tournaments": [s + 5 * KB for s in dashboard]},
+    )
+    assert report.route_kb("/dashboard") == 5
+    assert report.route_kb("/tournaments") == 5
+    assert report.per_cycle_kb == 10
+    assert report.leaking
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import gzip
+
+from harness.logstats import OTHER, LogStats, format_logstats, read_logs
+from harness.trace import parse_log
+
+
+def test_server_logs_the_mounted_path(request_logger_source):
+    # req.url inside app.use("/api", apiRouter) has lost its /api prefix.
+    assert request_logger_source.count("${req.originalUrl}") == 2
+    assert "${req.url}" not in request_logger_source
+
+
+def test_groups_request_logger_lines_by_route_template(server_log):
+    stats = LogStats(min_count=1).consume(parse_log(server_log))
+    assert stats.lines == 5
+    assert set(stats.routes) == {
+        "POST /api/auth/login",
+        "GET /api/tournaments",
+        "GET /api/tournaments/:id/rounds",
+        "POST /api/tournaments",
+        "POST /api/auth/logout",
+    }
+    created = stats.routes["POST /api/tournaments"]
+    assert created.errors == 1 and created.error_ratio == 1.0
+    assert created.latency.max == 250
+    assert stats.routes["POST /api/auth/login"].time_ms == 184
+
+
+def test_read_logs_streams_gzip(tmp_path, server_log):
+    path = tmp_path / "server.log.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as fh:
+        fh.writelines(server_log)
+    assert [e.request_id for e in read_logs([path])] == ["r1", "r2", "r3", "r4", "r5"]
+
+
+def test_warns_about_logs_without_the_api_prefix(server_log):
+    old = [line.replace("/api/", "/") for line in server_log]
+    stats = LogStats().consume(parse_log(old))
+    assert "no /api/ paths" in format_logstats(stats)
+    assert "no /api/ paths" not in format_logstats(LogStats().consume(parse_log(server_log)))
+
+
+def _line(second: int, ms: int, path: str = "/api/matches", status: int = 200) -> str:
+    return (
+        f"[2025-10-19T16:{second // 60:02d}:{second % 60:02d}.000Z] GET {path} - {status} OK - {ms}ms"
+        f" - Request ID: r{second}\n"
+    )
+
+
+def test_sliding_window_keeps_the_worst_window():
+    lines = [_line(s, 10) for s in range(0, 600, 5)]
+    lines += [_line(600 + s, 900) for s in range(0, 60, 2)]  # one slow minute
+    lines += [_line(660 + s, 10) for s in range(0, 600, 5)]
+    stats = LogStats(window=120, step=60, min_count=5).consume(parse_log(lines))
+    route = stats.routes["GET /api/matches"]
+    assert route.worst is not None and route.worst.p99 >= 900
+    assert route.latest is not None and route.latest.p99 < 20
+    assert route.peak_rate > 0.2
+
+
+def test_late_lines_count_in_totals_only():
+    lines = [_line(0, 10), _line(600, 10), _line(1, 10)]
+    stats = LogStats(window=120, step=60).consume(parse_log(lines))
+    route = stats.routes["GET /api/matches"]
+    assert route.count == 3 and route.late == 1
+
+
+def test_routes_past_the_cap_fold_into_other():
+    lines = [_line(i, 5, path=f"/probe{i}") for i in range(5)]
+    stats = LogStats(max_routes=2).consume(parse_log(lines))
+    assert len(stats.routes) == 3 and stats.routes[OTHER].count == 3
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import ssl
+from itertools import islice
+from urllib.parse import urlsplit
+
+import httpx
+import pytest
+
+from harness.replay import ANONYMOUS, SKIP, TenantSession, arrivals
+from harness.routes import is_id_segment, route_key
+from harness.trace import parse_log
+
+
+def test_parse_log_reads_response_lines_only(server_log):
+    entries = list(parse_log(server_log))
+    assert [e.request_id for e in entries] == ["r1", "r2", "r3", "r4", "r5"]
+    login, listed, _, failed, _ = entries
+    assert (login.method, login.url, login.status, login.handler_ms) == ("POST", "/api/auth/login", 200, 184)
+    assert login.tenant is None and login.timestamp == "2025-10-19T16:33:00.185Z"
+    assert listed.url == "/api/tournaments?organizationId=org_a" and listed.tenant == "org_a"
+    assert (failed.status, failed.tenant) == (500, "org_b")
+
+
+@pytest.mark.parametrize(
+    ("segment", "expected"),
+    [
+        ("42", True),
+        ("3f2504e0-4f89-11d3-9a0c-0305e82c3301", True),
+        ("Xk3pL9qRt2VwYz8AbCdE", True),  # Firestore auto-id
+        ("tournaments", False),
+        ("organization-settings", False),  # long, but no digit
+        ("v2", False),
+    ],
+)
+def test_is_id_segment(segment, expected):
+    assert is_id_segment(segment) is expected
+
+
+def test_route_key_templates_ids_and_drops_the_query():
+    assert route_key("get", "/api/tournaments/Xk3pL9qRt2VwYz8AbCdE/rounds?x=1") == "GET /api/tournaments/:id/rounds"
+    assert route_key("PATCH", "http://localhost:5000/api/rounds/17") == "PATCH /api/rounds/:id"
+    assert route_key("GET", "") == "GET /"
+
+
+def test_arrivals_orders_by_start_and_resolves_tenants(server_log):
+    # The slow request finished last but arrived first.
+    slow = "[2025-10-19T16:33:10.000Z] GET /api/analytics?organizationId=org_c - 200 OK - 12000ms - Request ID: r6\n"
+    requests = list(arrivals(parse_log([*server_log, slow])))
+    assert requests[0].url.startswith("/api/analytics") and requests[0].tenant == "org_c"
+    assert [r.at for r in requests] == sorted(r.at for r in requests)
+    by_route = {r.route: r for r in requests}
+    assert by_route["POST /api/auth/login"].tenant == ANONYMOUS
+    # Logged at 03.250 after 250ms; login at 00.185 after 184ms.
+    assert by_route["POST /api/tournaments"].at - by_route["POST /api/auth/login"].at == pytest.approx(2.999)
+
+
+def test_arrivals_streams(server_log):
+    late = "[2025-10-19T16:40:00.000Z] GET /api/matches - 200 OK - 5ms - Request ID: r7\n"
+
+    def entries():
+        yield from parse_log([*server_log, late])
+        raise AssertionError("read past the line that released the rest")
+
+    # A line past the reorder window releases everything before it.
+    assert len(list(islice(arrivals(entries()), 5))) == 5
+
+
+def test_skip_spares_the_replay_its_own_session(server_log):
+    replayed = [r.route for r in arrivals(parse_log(server_log)) if not SKIP.match(urlsplit(r.url).path)]
+    assert "POST /api/auth/logout" not in replayed and "POST /api/auth/login" in replayed
+    for path in ("/api/__test__/reset", "/api/metrics", "/api/auth/register", "/health"):
+        assert SKIP.match(path)
+    for path in ("/api/metricsfoo", "/healthz", "/api/auth/login"):
+        assert not SKIP.match(path)
+
+
+def _target(request: httpx.Request) -> httpx.Response:
+    """The replay account's view of the target: its org and one tournament."""
+    if request.url.path == "/api/auth/login":
+        return httpx.Response(200, json={"success": True})
+    if request.url.path == "/api/auth/user":
+        return httpx.Response(200, json={"currentOrganizationId": "org_replay"})
+    if request.url.path == "/api/tournaments":
+        return httpx.Response(200, json=[{"id": "t_replay"}])
+    return httpx.Response(404)
+
+
+def _map(tenant: str, url: str) -> str:
+    async def run() -> str:
+        session = TenantSession("http://target", tenant, httpx.Limits(), ssl.create_default_context())
+        await session.client.aclose()
+        session.client = httpx.AsyncClient(base_url="http://target", transport=httpx.MockTransport(_target))
+        try:
+            await session.sign_in()
+            return await session.map_url(url)
+        finally:
+            await session.client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_map_url_sends_the_replay_org_instead_of_the_logged_one():
+    logged = "/api/tournaments/Xk3pL9qRt2VwYz8AbCdE/rounds?organizationId=org_prod&limit=5"
+    assert _map("org_prod", logged) == "/api/tournaments/t_replay/rounds?organizationId=org_replay&limit=5"
+    assert _map("org_prod", "/api/finance?tournamentId=Xk3pL9qRt2VwYz8AbCdE") == "/api/finance?tournamentId=t_replay"
+    # Anonymous traffic has no org of its own: the logged one is dropped, not sent.
+    assert _map(ANONYMOUS, "/api/finance?organizationId=org_prod") == "/api/finance"
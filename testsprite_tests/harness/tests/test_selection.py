@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from harness import runner, scripts
+from harness.config import TESTS_DIR
+from harness.selection import ImpactSelector, ResultCache
+
+
+@pytest.fixture(scope="module")
+def cases() -> list[scripts.TestCase]:
+    return scripts.discover(TESTS_DIR)
+
+
+@pytest.fixture(scope="module")
+def selector() -> ImpactSelector:
+    return ImpactSelector(TESTS_DIR)
+
+
+def _selected(selector, cases, *files: str) -> set[str]:
+    return {c.key for c in selector.select(files, cases).cases}
+
+
+def test_a_served_page_selects_its_own_cases(selector, cases):
+    selected = _selected(selector, cases, "NexusSuite/client/src/pages/tournaments.tsx")
+    assert {
+        "TC007_Tournament_Creation_and_Publishing",
+        "TC009_Tournament_Creation_Scheduling_and_Match_Management",
+        "TC015_Data_Consistency_During_Tournament_Modifications",
+    } <= selected
+    assert len(selected) < len(cases) // 4
+    assert not any("Login" in key or "Registration" in key for key in selected)
+
+
+def test_live_server_modules_are_mapped(selector, cases):
+    auth = selector.select(["server/auth/authRoutes.ts"], cases)
+    assert not auth.everything
+    assert {c.key for c in auth.cases} >= {"TC002_User_Login_with_Correct_Credentials", "TC001_User_Registration_with_Valid_Data"}
+    assert "TC007_Tournament_Creation_and_Publishing" not in {c.key for c in auth.cases}
+    assert _selected(selector, cases, "server/tenant/routes.ts") == {"TC017_Multi_tenant_Data_Isolation_Between_Clubs"}
+    data = selector.select(["server/routes/index.ts"], cases)
+    assert not data.everything and "TC003_User_Login_with_Incorrect_Credentials" not in {c.key for c in data.cases}
+
+
+def test_unknown_and_shared_files_select_everything(selector, cases):
+    for path in ("server/brand-new.ts", "NexusSuite/client/src/components/Sidebar.tsx", "server/index.ts"):
+        selection = selector.select([path], cases)
+        assert selection.everything and len(selection.cases) == len(cases), path
+    assert _selected(selector, cases, "README.md") == set()
+
+
+def test_a_changed_script_selects_itself(selector, cases):
+    path = "testsprite_tests/TC017_Multi_tenant_Data_Isolation_Between_Clubs.py"
+    assert _selected(selector, cases, path) == {"TC017_Multi_tenant_Data_Isolation_Between_Clubs"}
+
+
+def test_result_cache_keys_on_script_and_build(tmp_path):
+    script = tmp_path / "TC001_Demo.py"
+    script.write_text("x = 1\n")
+    case = scripts.TestCase(id="TC001", name="Demo", path=script)
+    path = tmp_path / "cache.json"
+
+    def finish(cache: ResultCache, status: str) -> None:
+        result = runner.TestResult(case=case, status=status, duration=1.0, started_at=0.0)
+        asyncio.run(cache.on_finish(None, case, result))
+        asyncio.run(cache.on_run_end([result]))
+
+    finish(ResultCache("build-a", path), runner.PASSED)
+    assert ResultCache("build-a", path).partition([case]) == ([], [case])
+    assert ResultCache("build-b", path).partition([case]) == ([case], [])
+    script.write_text("x = 2\n")
+    assert not ResultCache("build-a", path).hit(case)
+    # A failure forgets the pass, and a new build drops the old entries.
+    finish(ResultCache("build-a", path), runner.PASSED)
+    finish(ResultCache("build-a", path), "failed")
+    assert not ResultCache("build-a", path).hit(case)
+    finish(ResultCache("build-a", path), runner.PASSED)
+    finish(ResultCache("build-b", path), runner.PASSED)
+    assert all(key.endswith(":build-b") for key in ResultCache("build-b", path).entries)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from harness.sessions import ROLES, SessionCache, SessionError
+
+OLD = {"cookies": [{"name": "connect.sid", "value": "old"}], "origins": []}
+NEW = {"cookies": [{"name": "connect.sid", "value": "new"}], "origins": []}
+
+
+class _Api:
+    """Stands in for Playwright's APIRequestContext: fixed statuses, calls recorded."""
+
+    def __init__(self, calls: list[str], statuses: dict[str, int]) -> None:
+        self.calls = calls
+        self.statuses = statuses
+
+    async def get(self, path: str) -> SimpleNamespace:
+        self.calls.append(f"GET {path}")
+        return SimpleNamespace(status=self.statuses[path])
+
+    async def post(self, path: str, data: dict) -> SimpleNamespace:
+        self.calls.append(f"POST {path}")
+        return SimpleNamespace(ok=self.statuses[path] < 400)
+
+    async def storage_state(self) -> dict:
+        return NEW
+
+    async def dispose(self) -> None:
+        pass
+
+
+def _ensure(cache: SessionCache, statuses: dict[str, int] | None = None) -> tuple[dict, list[str]]:
+    calls: list[str] = []
+
+    async def new_context(**kwargs) -> _Api:
+        if statuses is None:
+            raise AssertionError("the cache went to the server")
+        return _Api(calls, statuses)
+
+    pw = SimpleNamespace(request=SimpleNamespace(new_context=new_context))
+    state = asyncio.run(cache._ensure_role(pw, ROLES["club_admin"], False))
+    return state, calls
+
+
+def _cache(tmp_path, expires_in: float) -> SessionCache:
+    cache = SessionCache(base="http://nexus", cache_dir=tmp_path)
+    cache._write(ROLES["club_admin"], OLD)
+    entry = json.loads(cache.path("club_admin").read_text())
+    cache.path("club_admin").write_text(json.dumps({**entry, "expires_at": time.time() + expires_in}))
+    return cache
+
+
+def test_an_unexpired_entry_is_used_without_asking_the_server(tmp_path):
+    assert _ensure(_cache(tmp_path, 60)) == (OLD, [])
+
+
+def test_an_expired_entry_is_probed_and_kept_while_the_session_lives(tmp_path):
+    cache = _cache(tmp_path, -60)
+    assert _ensure(cache, {"/api/auth/user": 200}) == (OLD, ["GET /api/auth/user"])
+    # Trusted again for another ttl.
+    assert cache._read("club_admin")["expires_at"] > time.time() + cache.ttl - 60
+
+
+def test_an_expired_session_is_rebuilt(tmp_path):
+    cache = _cache(tmp_path, -60)
+    statuses = {"/api/auth/user": 401, "/api/auth/login": 200}
+    assert _ensure(cache, statuses) == (NEW, ["GET /api/auth/user", "POST /api/auth/login"])
+    assert cache._read("club_admin")["storage_state"] == NEW
+
+
+def test_entries_for_another_server_are_ignored(tmp_path):
+    _cache(tmp_path, 60)
+    other = SessionCache(base="http://elsewhere", cache_dir=tmp_path)
+    assert other._read("club_admin") is None
+    with pytest.raises(SessionError, match="no cached session for club_admin"):
+        other.storage_state("club_admin")
+    assert SessionCache(base="http://nexus", cache_dir=tmp_path).cookies("club_admin") == {"connect.sid": "old"}
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from harness import scripts
+from harness.shards import plan
+
+
+def _cases(*keys: str) -> list[scripts.TestCase]:
+    # Through the module: a bare TestCase name would be collected by pytest.
+    return [scripts.TestCase(id=key, name=key, path=Path(f"{key}.py")) for key in keys]
+
+
+def test_plan_places_longest_cases_first_on_the_least_loaded_shard():
+    estimates = {"a": 10.0, "b": 9.0, "c": 8.0, "d": 3.0, "e": 2.0}
+    shards = plan(_cases(*"edcba"), 2, estimates)
+    assert [[c.key for c in s.cases] for s in shards] == [["a", "d", "e"], ["b", "c"]]
+    assert [s.estimate for s in shards] == [15.0, 17.0]
+
+
+def test_plan_breaks_ties_by_key():
+    estimates = dict.fromkeys("dcba", 5.0)
+    shards = plan(_cases(*"dcba"), 2, estimates)
+    assert [[c.key for c in s.cases] for s in shards] == [["a", "c"], ["b", "d"]]
+
+
+def test_plan_with_more_shards_than_cases_leaves_some_empty():
+    shards = plan(_cases("a"), 3, {"a": 1.0})
+    assert [len(s.cases) for s in shards] == [1, 0, 0]
+    assert len(plan(_cases("a"), 0, {"a": 1.0})) == 1
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import gc
+
+import pytest
+
+from harness.trace import RequestIds, format_splits, join, parse_log
+from harness.waterfall import Call, StepWaterfall
+
+
+def _call(request_id: str | None, offset: float, ttfb: float) -> Call:
+    return Call(0, "GET /api/x", "/api/x", 200, offset, waiting=1.0, ttfb=ttfb, transfer=0.0, request_id=request_id)
+
+
+def test_join_splits_each_step_by_the_server_log(server_log):
+    # r2 was 21 ms in the handler of a 31 ms call; the second call has no log line.
+    step = StepWaterfall(0, "open the tournaments list", 0.0, duration=0.1, calls=[_call("r2", 0, 30), _call("zz", 50, 9)])
+    quick = StepWaterfall(1, "click", 0.0, duration=0.01)
+    (split, idle) = join({"TC007": [quick, step]}, parse_log(server_log))
+    assert split.step is step and idle.step is quick  # slowest first
+    assert split.duration == pytest.approx(100)
+    assert (split.handler, split.network, split.client) == pytest.approx((21, 20, 59))
+    assert split.joined == 1 and split.calls[1][1] is None
+    assert join({"TC007": [quick, step]}, [], min_ms=50)[0].handler == 0
+    assert "server      ?" in format_splits([split])
+
+
+def test_join_shares_overlapping_calls():
+    # Both in flight for 10 ms: each gets half of it.
+    step = StepWaterfall(0, "load", 0.0, duration=0.0, calls=[_call("a", 0, 9), _call("b", 0, 9)])
+    (split,) = join({"TC001": [step]}, [])
+    assert split.duration == pytest.approx(10) and split.client == 0
+
+
+class _Request:
+    """Stands in for a Playwright Request: hashable and weakly referenced."""
+
+
+def test_request_ids_forget_requests_playwright_has_dropped():
+    ids = RequestIds("t")
+    request = _Request()
+    ids.ids[request] = "t-TC001-s01-001"
+    assert ids.id_for(request) == "t-TC001-s01-001"
+    del request
+    gc.collect()
+    assert len(ids.ids) == 0
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+
+import pytest
+
+from harness.waterfall import Call, StepWaterfall, attribute, load_waterfalls, rank_endpoints
+
+
+def _call(route: str, offset: float, total: float, bytes: int = 0) -> Call:
+    return Call(0, route, route, 200, offset, waiting=0.0, ttfb=total, transfer=0.0, bytes=bytes)
+
+
+def test_attribute_shares_overlaps_evenly():
+    # a: 0-30, b: 10-20, c: 50-60 (alone). 10-20 is split between a and b.
+    calls = [_call("GET /a", 0, 30), _call("GET /b", 10, 10), _call("GET /c", 50, 10)]
+    assert attribute(calls) == pytest.approx({"GET /a": 25, "GET /b": 5, "GET /c": 10})
+    # Gaps count for nobody, and the shares add up to the time anything was in flight.
+    assert sum(attribute(calls).values()) == pytest.approx(40)
+
+
+def test_attribute_by_another_key_and_back_to_back_calls():
+    calls = [_call("GET /a", 0, 10), _call("GET /a", 10, 10), _call("GET /a", 5, 10)]
+    assert attribute(calls) == pytest.approx({"GET /a": 20})
+    by_call = attribute(calls, key=id)
+    assert [by_call[id(c)] for c in calls] == pytest.approx([7.5, 7.5, 5])
+    assert attribute([]) == {}
+
+
+def test_rank_endpoints_orders_by_ui_time():
+    steps = [
+        StepWaterfall(0, "load", 0.0, calls=[_call("GET /a", 0, 10, 100), _call("GET /b", 0, 30, 50)]),
+        StepWaterfall(1, "save", 0.0, calls=[_call("GET /a", 0, 40, 100)]),
+    ]
+    ranking = rank_endpoints({"TC001": steps})
+    assert [(e.route, e.calls, e.attributed, e.bytes) for e in ranking] == [
+        ("GET /a", 2, pytest.approx(45), 200),
+        ("GET /b", 1, pytest.approx(25), 50),
+    ]
+
+
+def test_load_waterfalls_reads_what_the_recorder_writes(tmp_path):
+    step = StepWaterfall(0, "load", 1.5, duration=0.2, calls=[_call("GET /a", 3, 4)])
+    path = tmp_path / "waterfall.json"
+    path.write_text(json.dumps({"TC001": [asdict(step)]}))
+    assert load_waterfalls(path) == {"TC001": [step]}
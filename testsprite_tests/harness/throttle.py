@@ -0,0 +1,107 @@
+"""Run the suite as a slow client would: CDP network and CPU throttling.
+
+The vitals budgets are measured on unthrottled localhost, where a bigger
+bundle or one more request in a waterfall costs a few milliseconds. On a
+mid-tier phone on 3G the same change costs seconds. ``python -m harness
+throttle`` runs the selected cases once per named profile. It applies the
+profile to every page before its first navigation, through the page's CDP
+session:
+
+* ``Network.emulateNetworkConditions`` -- added round-trip latency and
+  download/upload throughput;
+* ``Emulation.setCPUThrottlingRate`` -- the renderer runs N times slower.
+
+Each profile's Web Vitals (see vitals.py) are saved to
+tmp/throttle/<profile>.json and checked against that profile's own budgets
+in throttle_profiles.json, so a regression that only hurts slow clients
+fails here before release.
+
+Throttling applies to the pages a script opens; popups the app opens
+itself run unthrottled. CPU throttling is relative to the host, and
+concurrent renderers contend for it, so keep ``--concurrency`` low for
+numbers worth comparing.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from playwright.async_api import BrowserContext, CDPSession, Page
+
+from .config import TESTS_DIR, TMP_DIR
+from .runner import Hook, TestResult
+from .scripts import TestCase
+
+PROFILES_FILE = TESTS_DIR / "throttle_profiles.json"
+THROTTLE_DIR = TMP_DIR / "throttle"
+
+
+def _bytes_per_second(kbps: float | None) -> float:
+    # -1 tells CDP not to throttle that direction.
+    return -1 if kbps is None else kbps * 1000 / 8
+
+
+@dataclass(frozen=True)
+class Profile:
+    name: str
+    label: str = ""
+    cpu_rate: float = 1
+    latency_ms: float = 0
+    download_kbps: float | None = None
+    upload_kbps: float | None = None
+    # {route: {metric: limit}}, as in vitals_budgets.json.
+    budgets: dict[str, dict[str, float]] = field(default_factory=dict)
+
+    def network_conditions(self) -> dict[str, Any]:
+        return {
+            "offline": False,
+            "latency": self.latency_ms,
+            "downloadThroughput": _bytes_per_second(self.download_kbps),
+            "uploadThroughput": _bytes_per_second(self.upload_kbps),
+        }
+
+    def vitals_path(self, root: Path = THROTTLE_DIR) -> Path:
+        return root / f"{self.name}.json"
+
+
+def load_profiles(path: Path = PROFILES_FILE) -> dict[str, Profile]:
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    return {
+        name: Profile(
+            name=name,
+            label=spec.get("label", ""),
+            cpu_rate=spec.get("cpu_rate", 1),
+            latency_ms=spec.get("latency_ms", 0),
+            download_kbps=spec.get("download_kbps"),
+            upload_kbps=spec.get("upload_kbps"),
+            budgets={route: dict(limits) for route, limits in spec.get("routes", {}).items()},
+        )
+        for name, spec in data.get("profiles", {}).items()
+    }
+
+
+class Throttle(Hook):
+    """Applies one profile to every page a script opens."""
+
+    def __init__(self, profile: Profile):
+        self.profile = profile
+        self.sessions: dict[str, list[CDPSession]] = {}
+
+    async def on_page(self, page: Page, case: TestCase) -> None:
+        cdp = await page.context.new_cdp_session(page)
+        await cdp.send("Network.enable")
+        await cdp.send("Network.emulateNetworkConditions", self.profile.network_conditions())
+        if self.profile.cpu_rate > 1:
+            await cdp.send("Emulation.setCPUThrottlingRate", {"rate": self.profile.cpu_rate})
+        # Emulation lasts as long as the session; keep it until the case ends.
+        self.sessions.setdefault(case.key, []).append(cdp)
+
+    async def on_finish(
+        self, context: BrowserContext | None, case: TestCase, result: TestResult
+    ) -> None:
+        result.details["throttle"] = self.profile.name
+        self.sessions.pop(case.key, None)
@@ -0,0 +1,189 @@
+"""Join browser timings with the server's requestLogger by X-Request-Id.
+
+The server's ``requestId`` middleware (server/middleware/validation.ts)
+keeps an incoming ``x-request-id`` and ``requestLogger`` prints it on the
+response line together with the handler time. The path is
+``req.originalUrl``, mount prefix included; ``Tenant`` appears once a route
+has resolved the caller's organization::
+
+    [2025-10-19T16:33:04.120Z] POST /api/auth/login - 200 OK - 184ms - Request ID: <id>
+    [2025-10-19T16:33:05.002Z] GET /api/tournaments - 200 OK - 21ms - Tenant: <org> - Request ID: <id>
+
+``RequestIds`` stamps every ``/api/*`` request with a deterministic id --
+run tag, case, step index, sequence within the step -- by overriding the
+header in a ``context.route`` fallback, so it composes with HAR replay.
+The waterfall stores the id with each call, and ``join`` matches the
+server log against it to split each step into:
+
+* handler -- Express time as logged, middleware and Firestore included;
+* network -- the rest of the time the page waited on ``/api/*``:
+  queueing, connection, transfer, and anything between the socket and
+  the logger;
+* client  -- step time with no API call in flight: script actions,
+  rendering and the readiness wait.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+import weakref
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Sequence
+
+from playwright.async_api import BrowserContext, Request, Route
+
+from .routes import is_api_request
+from .runner import Hook
+from .scripts import Step, TestCase
+from .waterfall import Call, StepWaterfall, attribute
+
+REQUEST_ID_HEADER = "x-request-id"
+
+_LOG_LINE = re.compile(
+    r"\[(?P<ts>[^\]]+)\] (?P<method>[A-Z]+) (?P<url>\S+) - (?P<status>\d{3})\b.*?"
+    r" - (?P<ms>\d+(?:\.\d+)?)ms(?: - Tenant: (?P<tenant>\S+))? - Request ID: (?P<id>\S+)\s*$"
+)
+
+
+class RequestIds(Hook):
+    def __init__(self, run_tag: str | None = None):
+        self.run_tag = run_tag or time.strftime("%H%M%S")
+        self.steps: dict[str, int] = {}
+        self.counters: dict[tuple[str, int], int] = {}
+        # Weakly keyed: the waterfall reads the id after ``requestfinished``
+        # (once the response has been awaited), so entries can't be dropped
+        # on that event; they go once Playwright lets go of the request.
+        self.ids: weakref.WeakKeyDictionary[Request, str] = weakref.WeakKeyDictionary()
+
+    def on_step(self, case: TestCase, step: Step) -> None:
+        self.steps[case.key] = step.index
+
+    def next_id(self, case: TestCase) -> str:
+        step = self.steps.get(case.key, -1)
+        n = self.counters.get((case.key, step), 0) + 1
+        self.counters[case.key, step] = n
+        # Case ids repeat across generation rounds; the checksum tells the
+        # two TC001 scripts apart.
+        tag = f"{zlib.crc32(case.key.encode()) & 0xFFFF:04x}"
+        return f"{self.run_tag}-{case.id}.{tag}-s{step + 1:02d}-{n:03d}"
+
+    def id_for(self, request: Request) -> str | None:
+        return self.ids.get(request)
+
+    async def on_context(self, context: BrowserContext, case: TestCase) -> None:
+        async def stamp(route: Route, request: Request) -> None:
+            if not is_api_request(request.url):
+                await route.fallback()
+                return
+            rid = self.next_id(case)
+            self.ids[request] = rid
+            await route.fallback(headers={**request.headers, REQUEST_ID_HEADER: rid})
+
+        await context.route(re.compile(r"^[^?#]*/api/"), stamp)
+
+
+@dataclass(frozen=True)
+class ServerEntry:
+    request_id: str
+    method: str
+    url: str
+    status: int
+    handler_ms: float
+    timestamp: str
+    tenant: str | None = None  # once a route has resolved it
+
+
+def parse_log(lines: Iterable[str]) -> Iterator[ServerEntry]:
+    """Response lines of requestLogger; request lines and other output are skipped."""
+    for line in lines:
+        match = _LOG_LINE.search(line)
+        if match:
+            yield ServerEntry(
+                request_id=match["id"],
+                method=match["method"],
+                url=match["url"],
+                status=int(match["status"]),
+                handler_ms=float(match["ms"]),
+                timestamp=match["ts"],
+                tenant=match["tenant"],
+            )
+
+
+@dataclass
+class StepSplit:
+    case: str
+    step: StepWaterfall
+    duration: float  # ms
+    handler: float
+    network: float
+    client: float
+    joined: int
+    calls: list[tuple[Call, ServerEntry | None]]
+
+
+def split_step(case: str, step: StepWaterfall, server: Mapping[str, ServerEntry]) -> StepSplit:
+    pairs = [(call, server.get(call.request_id or "")) for call in step.calls]
+    shares = _call_shares(step.calls)
+    handler = 0.0
+    for (call, entry), share in zip(pairs, shares):
+        if entry is not None and call.total > 0:
+            # Scale the call's share of waiting by the part the server spent.
+            handler += share * min(1.0, entry.handler_ms / call.total)
+    waiting = sum(shares)
+    duration = max(step.duration * 1000, waiting)
+    return StepSplit(
+        case=case,
+        step=step,
+        duration=duration,
+        handler=handler,
+        network=waiting - handler,
+        client=duration - waiting,
+        joined=sum(entry is not None for _, entry in pairs),
+        calls=pairs,
+    )
+
+
+def _call_shares(calls: Sequence[Call]) -> list[float]:
+    """Each call's slice of the step's API waiting time (overlaps shared)."""
+    shares = attribute(calls, key=id)
+    return [shares.get(id(call), 0.0) for call in calls]
+
+
+def join(
+    waterfalls: Mapping[str, Sequence[StepWaterfall]],
+    server: Iterable[ServerEntry],
+    *,
+    min_ms: float = 0.0,
+) -> list[StepSplit]:
+    """Steps at least ``min_ms`` long, slowest first, with their time split."""
+    by_id = {entry.request_id: entry for entry in server}
+    splits = [
+        split_step(case, step, by_id) for case, steps in waterfalls.items() for step in steps
+    ]
+    return sorted((s for s in splits if s.duration >= min_ms), key=lambda s: -s.duration)
+
+
+def format_splits(splits: Sequence[StepSplit], *, calls: bool = True) -> str:
+    lines = []
+    for s in splits:
+        lines.append(
+            f"{s.duration:7.0f} ms  handler {s.handler:6.0f}  network {s.network:6.0f}"
+            f"  client {s.client:6.0f}  {s.case} :: {s.step.name}"
+        )
+        if not calls:
+            continue
+        for call, entry in s.calls:
+            server = f"{entry.handler_ms:6.0f}" if entry else "     ?"
+            lines.append(
+                f"             {call.route:<40} browser {call.total:6.0f} server {server}"
+                f"  {call.request_id or ''}"
+            )
+    return "\n".join(lines)
+
+
+def read_log(path: Path) -> list[ServerEntry]:
+    with open(path, encoding="utf-8", errors="replace") as fh:
+        return list(parse_log(fh))
@@ -0,0 +1,278 @@
+"""Page-load timing and Web Vitals per client route, with budgets.
+
+An init script keeps one record per *view* -- a document load or a
+client-side route change through ``history.pushState`` -- holding the
+navigation timing (TTFB, DOMContentLoaded, load), LCP, CLS, an INP
+approximation (the slowest event-timing entry of an interaction) and the
+JS heap size when the view ended. Finished views are parked in
+sessionStorage so they survive full-page navigations, and the hook reads
+them back when the case finishes. At every step boundary the hook also
+samples CDP ``Performance.getMetrics`` for the heap and DOM size Chromium
+itself reports.
+
+Views are attributed to the wouter pattern in NexusSuite/client/src/App.tsx that
+renders them, so ``/invite/abc`` and ``/invite/def`` are one route. Each
+run is written to tmp/vitals.json and merged into tmp/vitals_all.json;
+budgets (vitals_budgets.json, checked at p75 like the Web Vitals
+thresholds) fail the run when a route crosses them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+from urllib.parse import urlparse
+
+from playwright.async_api import BrowserContext, CDPSession, Error, Page
+
+from .config import PROJECT_ROOT, TESTS_DIR, TMP_DIR
+from .latency import LatencyRun
+from .routes import app_tsx as served_app_tsx, client_routes, match_client_route
+from .runner import Hook, TestResult
+from .scripts import Step, TestCase
+
+VITALS_FILE = TMP_DIR / "vitals.json"
+VITALS_ALL_FILE = TMP_DIR / "vitals_all.json"
+BUDGETS_FILE = TESTS_DIR / "vitals_budgets.json"
+
+# Metric -> unit, in the order reports list them.
+METRICS = {
+    "ttfb": "ms",
+    "dcl": "ms",
+    "load": "ms",
+    "lcp": "ms",
+    "cls": "",
+    "inp": "ms",
+    "heap_mb": "MB",
+    "cdp_heap_mb": "MB",
+    "cdp_nodes": "",
+}
+
+VITALS_SCRIPT = """
+(() => {
+  if (window.__nexusVitals || !/^https?:$/.test(location.protocol)) return;
+  const KEY = "__nexusVitals";
+  const load = () => { try { return JSON.parse(sessionStorage.getItem(KEY) || "[]"); } catch (e) { return []; } };
+  const save = (views) => { try { sessionStorage.setItem(KEY, JSON.stringify(views)); } catch (e) {} };
+  const heap = () => (performance.memory ? performance.memory.usedJSHeapSize / 1048576 : null);
+  const open = (kind) => ({ path: location.pathname, kind, lcp: null, cls: 0, inp: null });
+  let view = open("navigation");
+
+  const closed = (v) => {
+    const out = Object.assign({}, v, { heap_mb: heap() });
+    const nav = v.kind === "navigation" && performance.getEntriesByType("navigation")[0];
+    if (nav) {
+      out.ttfb = nav.responseStart;
+      out.dcl = nav.domContentLoadedEventEnd || null;
+      out.load = nav.loadEventEnd || null;
+    }
+    return out;
+  };
+  const finish = () => {
+    if (!view) return;
+    const views = load();
+    views.push(closed(view));
+    save(views);
+    view = null;
+  };
+  const routeChanged = () => {
+    if (view && view.path === location.pathname) return;
+    finish();
+    view = open("route");
+  };
+
+  for (const name of ["pushState", "replaceState"]) {
+    const original = history[name];
+    history[name] = function () {
+      const result = original.apply(this, arguments);
+      routeChanged();
+      return result;
+    };
+  }
+  addEventListener("popstate", routeChanged);
+  addEventListener("pagehide", finish);
+
+  const observe = (type, handle, extra) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(handle))
+        .observe(Object.assign({ type, buffered: true }, extra || {}));
+    } catch (e) {}
+  };
+  observe("largest-contentful-paint", (e) => {
+    if (view && view.kind === "navigation") view.lcp = e.startTime;
+  });
+  observe("layout-shift", (e) => {
+    if (view && !e.hadRecentInput) view.cls += e.value;
+  });
+  observe("event", (e) => {
+    if (view && e.interactionId) view.inp = Math.max(view.inp || 0, e.duration);
+  }, { durationThreshold: 16 });
+
+  window.__nexusVitals = {
+    snapshot: () => load().concat(view ? [closed(view)] : []),
+  };
+})();
+"""
+
+
+def _fmt(value: float) -> str:
+    return f"{value:.0f}" if value >= 100 else f"{value:.3g}"
+
+
+@dataclass(frozen=True)
+class BudgetViolation:
+    route: str
+    metric: str
+    pct: float
+    limit: float
+    value: float
+
+    def __str__(self) -> str:
+        unit = METRICS.get(self.metric, "")
+        return (
+            f"{self.route}: {self.metric} p{self.pct:g} {_fmt(self.value)}{unit}"
+            f" exceeds {self.limit:g}{unit}"
+        )
+
+
+def load_budgets(path: Path = BUDGETS_FILE) -> dict[str, dict[str, float]]:
+    """``{route: {metric: limit}}``; ``"*"`` applies to every route."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+    except OSError:
+        return {}
+    return {route: dict(limits) for route, limits in data.get("routes", {}).items()}
+
+
+def check_budgets(
+    run: LatencyRun,
+    budgets: Mapping[str, Mapping[str, float]],
+    *,
+    pct: float = 75,
+    min_count: int = 1,
+) -> list[BudgetViolation]:
+    defaults = budgets.get("*", {})
+    violations = []
+    routes = sorted({route for family in run.series.values() for route in family})
+    for route in routes:
+        limits = {**defaults, **budgets.get(route, {})}
+        for metric, limit in sorted(limits.items()):
+            hist = run.series.get(metric, {}).get(route)
+            if hist is None or hist.count < min_count:
+                continue
+            value = hist.value_at_percentile(pct)
+            if value > limit:
+                violations.append(BudgetViolation(route, metric, pct, limit, value))
+    return violations
+
+
+class VitalsRecorder(Hook):
+    def __init__(
+        self,
+        *,
+        app_tsx: Path | None = None,
+        path: Path | None = VITALS_FILE,
+        all_path: Path | None = VITALS_ALL_FILE,
+    ):
+        self.routes = client_routes(app_tsx or served_app_tsx(PROJECT_ROOT))
+        self.path = path
+        self.all_path = all_path
+        self.run = LatencyRun(series={})
+        self.pages: dict[str, list[tuple[Page, CDPSession | None]]] = {}
+        self.samples: dict[str, list[asyncio.Task[None]]] = {}
+
+    def route(self, url: str) -> str:
+        return match_client_route(urlparse(url).path or "/", self.routes)
+
+    async def on_run_start(self, cases: Sequence[TestCase]) -> None:
+        self.run.meta = {"started_at": time.time(), "cases": len(cases)}
+
+    async def on_context(self, context: BrowserContext, case: TestCase) -> None:
+        await context.add_init_script(VITALS_SCRIPT)
+        pages = self.pages.setdefault(case.key, [])
+
+        async def track(page: Page) -> None:
+            try:
+                cdp = await context.new_cdp_session(page)
+                await cdp.send("Performance.enable")
+            except Error:
+                cdp = None
+            pages.append((page, cdp))
+
+        def on_page(page: Page) -> None:
+            self.samples.setdefault(case.key, []).append(asyncio.ensure_future(track(page)))
+
+        context.on("page", on_page)
+
+    def on_step(self, case: TestCase, step: Step) -> None:
+        # Step boundaries sit where the script waited for the page to settle.
+        self.samples.setdefault(case.key, []).append(asyncio.ensure_future(self._sample(case.key)))
+
+    async def _sample(self, key: str) -> None:
+        for page, cdp in list(self.pages.get(key, [])):
+            if cdp is None or page.is_closed() or not page.url.startswith("http"):
+                continue
+            try:
+                reply = await cdp.send("Performance.getMetrics")
+            except Error:
+                continue
+            metrics = {m["name"]: m["value"] for m in reply["metrics"]}
+            route = self.route(page.url)
+            if "JSHeapUsedSize" in metrics:
+                self.run.record("cdp_heap_mb", route, metrics["JSHeapUsedSize"] / 1048576)
+            if "Nodes" in metrics:
+                self.run.record("cdp_nodes", route, metrics["Nodes"])
+
+    async def on_finish(
+        self, context: BrowserContext | None, case: TestCase, result: TestResult
+    ) -> None:
+        await asyncio.gather(*self.samples.pop(case.key, []), return_exceptions=True)
+        await self._sample(case.key)
+        for page, _ in self.pages.pop(case.key, []):
+            if page.is_closed():
+                continue
+            try:
+                views = await page.evaluate("window.__nexusVitals ? window.__nexusVitals.snapshot() : []")
+            except Error:
+                continue
+            for view in views:
+                self._record_view(view)
+
+    def _record_view(self, view: dict[str, Any]) -> None:
+        route = match_client_route(view["path"], self.routes)
+        self.run.record("views", route, 1)
+        for metric in METRICS:
+            value = view.get(metric)
+            if value is not None and not metric.startswith("cdp_"):
+                # CLS is unitless and small; histograms keep 3 significant
+                # figures of it all the same.
+                self.run.record(metric, route, value)
+
+    async def on_run_end(self, results: Sequence[TestResult]) -> None:
+        self.run.meta["finished_at"] = time.time()
+        if self.path is not None:
+            self.run.save(self.path)
+        if self.all_path is not None:
+            combined = LatencyRun.load(self.all_path) if self.all_path.exists() else LatencyRun(series={})
+            combined.merge(self.run)
+            combined.meta = {"runs": combined.meta.get("runs", 0) + 1, "updated_at": time.time()}
+            combined.save(self.all_path)
+
+
+def format_vitals(run: LatencyRun, pct: float = 75) -> str:
+    metrics = [m for m in METRICS if m in run.series]
+    routes = sorted({route for family in run.series.values() for route in family})
+    lines = [f"{'route':<24} {'views':>5} " + " ".join(f"{m:>11}" for m in metrics)]
+    for route in routes:
+        views = run.series.get("views", {}).get(route)
+        cells = []
+        for metric in metrics:
+            hist = run.series[metric].get(route)
+            cells.append(f"{_fmt(hist.value_at_percentile(pct)) if hist else '-':>11}")
+        lines.append(f"{route:<24} {views.count if views else 0:>5} " + " ".join(cells))
+    return "\n".join(lines)
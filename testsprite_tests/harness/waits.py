@@ -0,0 +1,199 @@
+"""Event-driven waits and the harness action API.
+
+Instead of sleeping a fixed three seconds before every step, an action waits
+on signals the app actually emits:
+
+* locator actionability -- Playwright's ``fill``/``click`` already wait for
+  the element to be attached, visible, enabled and stable;
+* network idle on ``/api/*`` -- no request to the Express API in flight for
+  ``idle_ms``;
+* DOM quiescence -- no mutation observed for ``quiet_ms``, which covers
+  React re-rendering after a response arrives.
+
+Every wait is bounded by ``upper_bound_ms`` and never raises: a settle that
+times out means the app is still busy, and the next action's own
+actionability wait takes it from there.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import Any
+
+from playwright.async_api import BrowserContext, Error, Locator, Page
+
+from .forms import FormFill, fill_form
+from .ready import wait_ready
+from .routes import is_api_request
+from .runner import Hook
+from .scripts import ScriptSleep, TestCase
+
+SLEEP_MODES = ("settle", "noop", "keep")
+
+DOM_QUIET_SCRIPT = """
+(() => {
+  if (window.__nexusDomQuiet) return;
+  let last = performance.now();
+  new MutationObserver(() => { last = performance.now(); }).observe(document, {
+    subtree: true, childList: true, attributes: true, characterData: true,
+  });
+  window.__nexusDomQuiet = (quietMs) => performance.now() - last >= quietMs;
+})();
+"""
+
+
+class ApiTracker:
+    """Counts in-flight ``/api/*`` requests for one browser context."""
+
+    def __init__(self) -> None:
+        self._inflight: set[Any] = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._generation = 0
+
+    def attach(self, context: BrowserContext) -> None:
+        context.on("request", self._on_request)
+        context.on("requestfinished", self._on_done)
+        context.on("requestfailed", self._on_done)
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def _on_request(self, request: Any) -> None:
+        if is_api_request(request.url):
+            self._inflight.add(request)
+            self._generation += 1
+            self._idle.clear()
+
+    def _on_done(self, request: Any) -> None:
+        if request in self._inflight:
+            self._inflight.discard(request)
+            self._generation += 1
+            if not self._inflight:
+                self._idle.set()
+
+    async def wait_idle(self, idle_ms: float) -> None:
+        """Return once no API request has been in flight for ``idle_ms``."""
+        while True:
+            await self._idle.wait()
+            generation = self._generation
+            await asyncio.sleep(idle_ms / 1000)
+            if self._idle.is_set() and generation == self._generation:
+                return
+
+
+class Settler(Hook):
+    """Waits for a page to settle; installs its probes on every context."""
+
+    def __init__(
+        self,
+        *,
+        idle_ms: float = 100,
+        quiet_ms: float = 150,
+        upper_bound_ms: float = 10_000,
+    ):
+        self.idle_ms = idle_ms
+        self.quiet_ms = quiet_ms
+        self.upper_bound_ms = upper_bound_ms
+        self._trackers: weakref.WeakKeyDictionary[BrowserContext, ApiTracker] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def on_context(self, context: BrowserContext, case: TestCase) -> None:
+        await self.attach(context)
+
+    async def attach(self, context: BrowserContext) -> None:
+        tracker = ApiTracker()
+        tracker.attach(context)
+        self._trackers[context] = tracker
+        await context.add_init_script(DOM_QUIET_SCRIPT)
+
+    async def settle(self, page: Page, timeout_ms: float | None = None) -> float:
+        """Wait for API idle and DOM quiet; return the seconds spent waiting."""
+        bound = self.upper_bound_ms if timeout_ms is None else min(
+            timeout_ms, self.upper_bound_ms
+        )
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        tracker = self._trackers.get(page.context)
+        try:
+            if tracker is not None:
+                await asyncio.wait_for(tracker.wait_idle(self.idle_ms), bound / 1000)
+            remaining = bound - (loop.time() - started) * 1000
+            if remaining > 0:
+                await page.wait_for_function(
+                    "ms => !window.__nexusDomQuiet || window.__nexusDomQuiet(ms)",
+                    arg=self.quiet_ms,
+                    polling=max(16, self.quiet_ms / 3),
+                    timeout=remaining,
+                )
+        except (asyncio.TimeoutError, Error):
+            # Still busy (or mid-navigation); the next action's actionability
+            # checks cover whatever is left.
+            pass
+        return loop.time() - started
+
+    def script_sleep(self, mode: str) -> ScriptSleep | None:
+        """Replacement for the scripts' ``page.wait_for_timeout`` calls.
+
+        ``settle`` waits for readiness, capped at the sleep it replaces, so a
+        step is never slower than before; ``noop`` drops the sleep outright;
+        ``keep`` leaves the original fixed sleeps in place.
+        """
+        if mode not in SLEEP_MODES:
+            raise ValueError(f"unknown sleep mode {mode!r}")
+        if mode == "keep":
+            return None
+        if mode == "noop":
+            async def skip(page: Page, timeout: float) -> None:
+                return None
+
+            return skip
+
+        async def settle(page: Page, timeout: float) -> None:
+            await self.settle(page, timeout)
+
+        return settle
+
+
+class Actions:
+    """``fill``/``click``/``navigate`` that wait on readiness, not the clock."""
+
+    def __init__(
+        self,
+        page: Page,
+        settler: Settler | None = None,
+        *,
+        timeout_ms: float = 5000,
+    ):
+        self.page = page
+        self.settler = settler or Settler()
+        self.timeout_ms = timeout_ms
+
+    def locator(self, target: str | Locator) -> Locator:
+        if isinstance(target, str):
+            return self.page.locator(target).first
+        return target
+
+    async def settle(self) -> float:
+        return await self.settler.settle(self.page)
+
+    async def fill(self, target: str | Locator, value: str) -> None:
+        await self.locator(target).fill(value, timeout=self.timeout_ms)
+        await self.settle()
+
+    async def click(self, target: str | Locator) -> None:
+        await self.locator(target).click(timeout=self.timeout_ms)
+        await self.settle()
+
+    async def fill_form(self, form: str | Locator, values: dict[str, object], *, submit: bool = True) -> FormFill:
+        result = await fill_form(self.locator(form), values, submit=submit, timeout=self.timeout_ms)
+        await self.settle()
+        return result
+
+    async def navigate(self, url: str) -> None:
+        await self.page.goto(url, wait_until="commit", timeout=self.timeout_ms * 2)
+        await wait_ready(self.page, self.timeout_ms * 2)
+        await self.settle()
@@ -0,0 +1,252 @@
+"""Per-step network waterfalls, and which endpoints the UI spends its time on.
+
+Every request a page fires is tagged with the script step that was running
+when it started. When it finishes, Playwright's resource timing splits it
+into waiting (queueing, DNS, connect, request sent), TTFB (request sent to
+first response byte -- the server's time, including every Firestore round
+trip behind the handler) and transfer (first to last byte).
+
+The waterfall of each case goes to tmp/waterfall.json. The suite summary
+ranks ``/api/*`` routes by the UI time attributed to them: within a step,
+time during which several calls were in flight is split evenly between
+them, so ten parallel 100 ms fetches cost the page 100 ms, not a second.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Hashable, Iterable, Sequence
+
+from playwright.async_api import BrowserContext, Error, Request
+
+from .config import TMP_DIR
+from .routes import is_api_request, route_key
+from .runner import Hook, TestResult
+from .scripts import Step, TestCase
+
+WATERFALL_FILE = TMP_DIR / "waterfall.json"
+
+
+@dataclass
+class Call:
+    step: int
+    route: str
+    url: str
+    status: int | None
+    offset: float  # ms from the start of the step
+    waiting: float  # ms before the request was sent
+    ttfb: float
+    transfer: float
+    bytes: int = 0
+    failed: bool = False
+    request_id: str | None = None
+
+    @property
+    def total(self) -> float:
+        return self.waiting + self.ttfb + self.transfer
+
+
+@dataclass
+class StepWaterfall:
+    index: int
+    name: str
+    started_at: float  # epoch seconds
+    duration: float = 0.0  # seconds
+    calls: list[Call] = field(default_factory=list)
+    other_requests: int = 0
+
+
+def attribute(
+    calls: Iterable[Call], key: Callable[[Call], Hashable] = lambda call: call.route
+) -> dict[Hashable, float]:
+    """UI milliseconds per route (or other ``key``), overlapping time shared evenly."""
+    events = []
+    for n, call in enumerate(calls):
+        events.append((call.offset, 1, n, key(call)))
+        events.append((call.offset + call.total, -1, n, key(call)))
+    events.sort(key=lambda e: (e[0], e[1]))
+    shares: dict[Hashable, float] = {}
+    in_flight: dict[int, Hashable] = {}
+    last = 0.0
+    for at, kind, n, route in events:
+        if in_flight and at > last:
+            share = (at - last) / len(in_flight)
+            for open_route in in_flight.values():
+                shares[open_route] = shares.get(open_route, 0.0) + share
+        last = at
+        if kind > 0:
+            in_flight[n] = route
+        else:
+            in_flight.pop(n, None)
+    return shares
+
+
+class WaterfallRecorder(Hook):
+    def __init__(
+        self,
+        path: Path | None = WATERFALL_FILE,
+        *,
+        request_id: Callable[[Request], str | None] | None = None,
+    ):
+        self.path = path
+        self.request_id = request_id
+        self.steps: dict[str, list[StepWaterfall]] = {}
+        self.pending: dict[str, list[asyncio.Future[None]]] = {}
+
+    def on_step(self, case: TestCase, step: Step) -> None:
+        steps = self.steps.setdefault(case.key, [])
+        steps.append(StepWaterfall(step.index, step.name, time.time()))
+
+    def _current(self, key: str) -> StepWaterfall:
+        steps = self.steps.setdefault(key, [])
+        if not steps:
+            # Requests before the first step: the script's own setup.
+            steps.append(StepWaterfall(-1, "setup", time.time()))
+        return steps[-1]
+
+    async def on_context(self, context: BrowserContext, case: TestCase) -> None:
+        tags: dict[Request, StepWaterfall] = {}
+
+        def on_request(request: Request) -> None:
+            step = self._current(case.key)
+            if is_api_request(request.url):
+                tags[request] = step
+            else:
+                step.other_requests += 1
+
+        def on_done(request: Request, failed: bool) -> None:
+            step = tags.pop(request, None)
+            if step is not None:
+                future = asyncio.ensure_future(self._record(step, request, failed))
+                self.pending.setdefault(case.key, []).append(future)
+
+        context.on("request", on_request)
+        context.on("requestfinished", lambda request: on_done(request, False))
+        context.on("requestfailed", lambda request: on_done(request, True))
+
+    async def _record(self, step: StepWaterfall, request: Request, failed: bool) -> None:
+        timing = request.timing
+        start = timing.get("startTime", 0.0)
+        sent = max(timing.get("requestStart", -1), 0.0)
+        first = timing.get("responseStart", -1)
+        end = timing.get("responseEnd", -1)
+        status, size = None, 0
+        if not failed:
+            try:
+                response = await request.response()
+                status = response.status if response else None
+                sizes = await request.sizes()
+                size = sizes["responseBodySize"] + sizes["responseHeadersSize"]
+            except Error:
+                pass
+        step.calls.append(
+            Call(
+                step=step.index,
+                route=route_key(request.method, request.url),
+                url=request.url,
+                status=status,
+                offset=max(0.0, start - step.started_at * 1000),
+                waiting=sent,
+                ttfb=max(first - sent, 0.0) if first >= 0 else 0.0,
+                transfer=max(end - first, 0.0) if end >= 0 and first >= 0 else 0.0,
+                bytes=size,
+                failed=failed,
+                request_id=self.request_id(request) if self.request_id else None,
+            )
+        )
+
+    async def on_finish(
+        self, context: BrowserContext | None, case: TestCase, result: TestResult
+    ) -> None:
+        await asyncio.gather(*self.pending.pop(case.key, []), return_exceptions=True)
+        durations = {step.index: step.duration for step in result.steps}
+        for step in self.steps.get(case.key, []):
+            step.duration = durations.get(step.index, 0.0)
+            step.calls.sort(key=lambda c: c.offset)
+
+    async def on_run_end(self, results: Sequence[TestResult]) -> None:
+        if self.path is None:
+            return
+        data = {
+            key: [asdict(step) for step in steps]
+            for key, steps in sorted(self.steps.items())
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        tmp.replace(self.path)
+
+
+def load_waterfalls(path: Path = WATERFALL_FILE) -> dict[str, list[StepWaterfall]]:
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    return {
+        key: [
+            StepWaterfall(**{**step, "calls": [Call(**c) for c in step["calls"]]})
+            for step in steps
+        ]
+        for key, steps in data.items()
+    }
+
+
+def format_waterfall(key: str, steps: Sequence[StepWaterfall], width: int = 40) -> str:
+    lines = [key]
+    for step in steps:
+        lines.append(
+            f"  [{step.index:>2}] {step.name}  ({step.duration * 1000:.0f} ms,"
+            f" {len(step.calls)} api, {step.other_requests} other)"
+        )
+        span = max([c.offset + c.total for c in step.calls] + [step.duration * 1000, 1.0])
+        for call in step.calls:
+            lead = round(call.offset / span * width)
+            wait = round(call.waiting / span * width)
+            server = max(1, round(call.ttfb / span * width))
+            body = round(call.transfer / span * width)
+            bar = (" " * lead + "." * wait + "=" * server + "-" * body).ljust(width)[:width]
+            status = "fail" if call.failed else call.status or "?"
+            lines.append(
+                f"       |{bar}| {call.route:<40} {status!s:>4}"
+                f" ttfb {call.ttfb:7.1f} xfer {call.transfer:6.1f} ms"
+            )
+    return "\n".join(lines)
+
+
+@dataclass
+class EndpointContribution:
+    route: str
+    calls: int = 0
+    attributed: float = 0.0  # ms of UI time
+    ttfb: float = 0.0  # summed ms
+    transfer: float = 0.0
+    bytes: int = 0
+
+
+def rank_endpoints(waterfalls: dict[str, list[StepWaterfall]]) -> list[EndpointContribution]:
+    ranked: dict[str, EndpointContribution] = {}
+    for steps in waterfalls.values():
+        for step in steps:
+            for route, ms in attribute(step.calls).items():
+                ranked.setdefault(route, EndpointContribution(route)).attributed += ms
+            for call in step.calls:
+                entry = ranked.setdefault(call.route, EndpointContribution(call.route))
+                entry.calls += 1
+                entry.ttfb += call.ttfb
+                entry.transfer += call.transfer
+                entry.bytes += call.bytes
+    return sorted(ranked.values(), key=lambda e: -e.attributed)
+
+
+def format_ranking(ranking: Sequence[EndpointContribution], limit: int = 15) -> str:
+    total = sum(e.attributed for e in ranking) or 1.0
+    lines = [f"{'endpoint':<44} {'calls':>5} {'UI ms':>9} {'share':>6} {'ttfb avg':>9} {'xfer avg':>9} {'KB':>8}"]
+    for e in ranking[:limit]:
+        lines.append(
+            f"{e.route:<44} {e.calls:>5} {e.attributed:>9.0f} {e.attributed / total:>6.1%}"
+            f" {e.ttfb / e.calls:>9.1f} {e.transfer / e.calls:>9.1f} {e.bytes / 1024:>8.1f}"
+        )
+    return "\n".join(lines)
+